@@ -0,0 +1 @@
+"""Offline performance benchmarks for the scrape → process → extract → score hot path."""
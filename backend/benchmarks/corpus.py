@@ -0,0 +1,164 @@
+"""Synthetic corpus generator — realistic AI search answers of a target size.
+
+Documents mimic what Firecrawl returns for the three platforms: ChatGPT /
+Google AI come back as HTML (scripts, nav/footer boilerplate, entities),
+Perplexity as markdown (headers, numbered lists, source links). Each answer
+recommends a subset of the query's brands in a numbered list, mentions some
+others in passing and pads with filler paragraphs up to the target size.
+
+Generation is seeded, so the same (size, brand_count, fmt, seed) always
+yields byte-identical documents and benchmark runs are comparable.
+"""
+
+import random
+from dataclasses import dataclass
+
+# Brand pool the query brand lists are drawn from (Levoit is always first)
+BRAND_POOL: list[str] = [
+    "Levoit", "Dyson", "Coway", "Honeywell", "Winix", "Blueair", "Molekule",
+    "Rabbit Air", "Alen", "IQAir", "Philips", "Shark", "Medify", "Austin Air",
+    "Black & Decker", "Germ Guardian",
+]
+
+# Default corpus grid: 1KB – 100KB answers with 2 – 16 brands per query
+DEFAULT_SIZES: tuple[int, ...] = (1_024, 10_240, 51_200, 102_400)
+DEFAULT_BRAND_COUNTS: tuple[int, ...] = (2, 4, 8, 16)
+FORMATS: tuple[str, ...] = ("html", "markdown")
+
+_MODELS = ["Core 300S", "Purifier Big Quiet", "Airmega 400", "HPA300", "5500-2", "Blue Pure 211+"]
+
+_RECOMMEND_LINES = [
+    "{brand} {model} is the best choice for most rooms thanks to true HEPA filtration.",
+    "We recommend the {brand} {model} for allergy sufferers and pet owners.",
+    "{brand} {model} stands out for its quiet sleep mode and low filter costs.",
+    "Top pick: {brand} {model}, which covers large open-plan spaces with ease.",
+    "{brand} {model} is a great budget option with a washable pre-filter.",
+]
+
+_MENTION_LINES = [
+    "Some reviewers also compare it with {brand}, though availability varies.",
+    "{brand} offers similar specs at a higher price point.",
+    "Owners of {brand} units report comparable noise levels.",
+]
+
+_FILLER = [
+    "When choosing an air purifier, consider room size, noise level and filter costs.",
+    "CADR (clean air delivery rate) measures how quickly a unit removes smoke, dust and pollen.",
+    "HEPA filters capture 99.97% of particles as small as 0.3 microns in laboratory tests.",
+    "Replacement filters typically last six to twelve months depending on air quality.",
+    "Smart models add app control, scheduling and real-time PM2.5 readings.",
+    "Activated carbon layers help with odors but need replacing more often.",
+    "Running a purifier on auto mode balances energy use against air quality.",
+    "Placement matters: keep units a few feet from walls for the best airflow.",
+]
+
+_HTML_HEAD = (
+    "<html><head><title>AI Answer</title>\n"
+    "<script>window.__analytics = {{\"q\": \"{query}\"}};</script>\n"
+    "<style>.nav {{ display: flex; }} .answer p {{ margin: 0 0 1em; }}</style>\n"
+    "</head><body>\n"
+    "<nav>Skip to content | Sign in | Subscribe to newsletter</nav>\n"
+    "<div class=\"answer\">\n"
+)
+_HTML_TAIL = (
+    "</div>\n"
+    "<footer>&copy; 2026 Example Corp. All rights reserved. "
+    "Privacy policy | Terms of service</footer>\n"
+    "</body></html>\n"
+)
+
+
+@dataclass(frozen=True)
+class CorpusDoc:
+    """One synthetic answer plus the brand list the pipeline would search for."""
+
+    name: str
+    fmt: str
+    content: str
+    brands: list[str]
+
+    @property
+    def size(self) -> int:
+        return len(self.content.encode("utf-8"))
+
+
+def _escape(text: str) -> str:
+    return text.replace("&", "&amp;").replace("'", "&#39;")
+
+
+def generate_answer(size: int, brands: list[str], fmt: str = "html", seed: int = 0) -> str:
+    """Generate one AI answer of roughly `size` bytes mentioning `brands`.
+
+    About half of the brands are recommended in a numbered list, a quarter
+    are mentioned in passing and the rest are absent — matching the mix the
+    rank extractor sees in production.
+    """
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown format: {fmt!r}")
+
+    rng = random.Random(f"{seed}:{size}:{len(brands)}:{fmt}")
+    shuffled = brands[:]
+    rng.shuffle(shuffled)
+    n_rec = max(1, len(brands) // 2)
+    recommended = shuffled[:n_rec]
+    mentioned = shuffled[n_rec:n_rec + max(0, len(brands) // 4)]
+
+    items = [
+        rng.choice(_RECOMMEND_LINES).format(brand=b, model=rng.choice(_MODELS))
+        for b in recommended
+    ]
+    mentions = [rng.choice(_MENTION_LINES).format(brand=b) for b in mentioned]
+
+    if fmt == "html":
+        parts = [
+            _HTML_HEAD.format(query="best air purifier"),
+            "<h1>Best Air Purifiers for 2026</h1>\n",
+        ]
+        parts.append("<p>Here are the top air purifiers recommended by experts:</p>\n<ol>\n")
+        parts.extend(f"<li><strong>{_escape(line)}</strong></li>\n" for line in items)
+        parts.append("</ol>\n")
+        parts.extend(f"<p>{_escape(line)}</p>\n" for line in mentions)
+        tail = _HTML_TAIL
+    else:
+        parts = [
+            "# Best Air Purifiers in 2026\n\n",
+            "Based on expert reviews, here are our top picks:\n\n",
+        ]
+        parts.extend(f"{i}. {line}\n" for i, line in enumerate(items, start=1))
+        parts.append("\n")
+        parts.extend(f"{line}\n\n" for line in mentions)
+        tail = "Sources: [Wirecutter](https://wirecutter.com) [RTINGS](https://rtings.com)\n"
+
+    used = sum(len(p) for p in parts) + len(tail)
+    while used < size:
+        sentences = " ".join(rng.choice(_FILLER) for _ in range(rng.randint(2, 5)))
+        para = f"<p>{sentences}</p>\n" if fmt == "html" else f"{sentences}\n\n"
+        if rng.random() < 0.15:
+            header = rng.choice(["Buying guide", "Filter costs", "Noise levels", "Room size"])
+            para = (f"<h2>{header}</h2>\n" if fmt == "html" else f"## {header}\n\n") + para
+        parts.append(para)
+        used += len(para)
+
+    parts.append(tail)
+    return "".join(parts)
+
+
+def build_corpus(
+    sizes: tuple[int, ...] = DEFAULT_SIZES,
+    brand_counts: tuple[int, ...] = DEFAULT_BRAND_COUNTS,
+    formats: tuple[str, ...] = FORMATS,
+    seed: int = 0,
+) -> list[CorpusDoc]:
+    """Build the full (size × brand_count × format) grid of synthetic answers."""
+    corpus: list[CorpusDoc] = []
+    for size in sizes:
+        for count in brand_counts:
+            brands = BRAND_POOL[:count]
+            for fmt in formats:
+                corpus.append(CorpusDoc(
+                    name=f"{fmt}-{size // 1024}kb-{count}b",
+                    fmt=fmt,
+                    content=generate_answer(size, brands, fmt, seed),
+                    brands=brands,
+                ))
+    return corpus
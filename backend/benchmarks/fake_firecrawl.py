@@ -0,0 +1,136 @@
+"""Fake Firecrawl server — /v1/scrape with configurable latency, errors and 429s.
+
+Responses carry synthetic AI answers from benchmarks/corpus.py in the same
+envelope the real self-hosted Firecrawl returns:
+
+    {"success": true, "data": {"markdown": "...", "metadata": {"statusCode": 200, ...}}}
+
+Per request the server sleeps for a log-normal latency, then answers 429
+(rate_limit_rate), 500 (error_rate), an empty page that the processing layer
+quarantines (empty_rate) or a normal answer. The app runs in-process through
+httpx.ASGITransport (see benchmarks/load.py) or as a real HTTP server:
+
+    python -m benchmarks.fake_firecrawl --port 3002 --latency-ms 800 --rate-limit-rate 0.05
+"""
+
+import argparse
+import asyncio
+import math
+import random
+from collections import Counter
+from dataclasses import dataclass
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+
+from benchmarks.corpus import BRAND_POOL, generate_answer
+
+# Distinct answers pre-generated per format; requests pick one at random
+ANSWER_POOL_SIZE = 32
+
+
+@dataclass
+class FirecrawlProfile:
+    """Latency and failure distribution of the fake server."""
+
+    latency_ms: float = 800.0  # median latency
+    latency_sigma: float = 0.5  # log-normal shape; 0 = constant latency
+    error_rate: float = 0.02  # HTTP 500
+    rate_limit_rate: float = 0.01  # HTTP 429
+    empty_rate: float = 0.01  # 200 with no usable content → QuarantineError
+    min_kb: int = 1
+    max_kb: int = 100
+    brand_count: int = 8
+    seed: int = 0
+
+    def sample_latency(self, rng: random.Random) -> float:
+        """Return one latency sample in seconds."""
+        if self.latency_sigma <= 0:
+            return self.latency_ms / 1000
+        return rng.lognormvariate(math.log(max(self.latency_ms, 1e-3)), self.latency_sigma) / 1000
+
+
+def _answer_pool(profile: FirecrawlProfile) -> list[str]:
+    rng = random.Random(profile.seed)
+    brands = BRAND_POOL[:profile.brand_count]
+    return [
+        generate_answer(
+            rng.randint(profile.min_kb, profile.max_kb) * 1024,
+            brands,
+            "html" if i % 2 == 0 else "markdown",
+            seed=profile.seed + i,
+        )
+        for i in range(ANSWER_POOL_SIZE)
+    ]
+
+
+def create_app(profile: FirecrawlProfile | None = None) -> FastAPI:
+    """Build the fake Firecrawl app; `app.state.stats` counts responses by status."""
+    profile = profile or FirecrawlProfile()
+    rng = random.Random(profile.seed)
+    answers = _answer_pool(profile)
+
+    app = FastAPI(title="Fake Firecrawl")
+    app.state.profile = profile
+    app.state.stats = Counter()
+
+    @app.post("/v1/scrape")
+    async def scrape(request: Request) -> JSONResponse:
+        body = await request.json()
+        url = body.get("url", "")
+        await asyncio.sleep(profile.sample_latency(rng))
+
+        roll = rng.random()
+        if roll < profile.rate_limit_rate:
+            app.state.stats[429] += 1
+            return JSONResponse(
+                {"success": False, "error": "Rate limit exceeded"},
+                status_code=429,
+                headers={"Retry-After": "1"},
+            )
+        roll -= profile.rate_limit_rate
+        if roll < profile.error_rate:
+            app.state.stats[500] += 1
+            return JSONResponse({"success": False, "error": "Internal error"}, status_code=500)
+        roll -= profile.error_rate
+
+        content = "" if roll < profile.empty_rate else rng.choice(answers)
+        app.state.stats[200] += 1
+        return JSONResponse({
+            "success": True,
+            "data": {
+                "markdown": content,
+                "metadata": {"statusCode": 200, "sourceURL": url},
+            },
+        })
+
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.fake_firecrawl")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=3002)
+    parser.add_argument("--latency-ms", type=float, default=800.0)
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.01)
+    parser.add_argument("--empty-rate", type=float, default=0.01)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    uvicorn.run(
+        create_app(FirecrawlProfile(
+            latency_ms=args.latency_ms,
+            latency_sigma=args.latency_sigma,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            empty_rate=args.empty_rate,
+            seed=args.seed,
+        )),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,385 @@
+"""In-process Postgres / TimescaleDB / MongoDB stand-ins for the load harness.
+
+FakeSession answers the raw SQL the pipelines issue (src/pipelines/tasks.py)
+from in-memory tables and counts round trips — one per execute() (an
+executemany with a parameter list is one round trip, as with asyncpg) and one
+per commit(). An optional per-round-trip latency models the network hop, so
+batching changes show up in wall-clock time as well as in the counters.
+
+Statements the fake does not recognise are counted and return an empty
+result, so new SQL never breaks a load run; it just isn't simulated.
+"""
+
+import asyncio
+import itertools
+import re
+from collections import Counter
+from datetime import datetime
+from typing import Any
+
+from bson import ObjectId
+
+from src.services.aggregation_service import bucket_start
+
+_INSERT_RE = re.compile(r"^INSERT INTO (\w+)", re.IGNORECASE)
+_ATTACH_RE = re.compile(r"^ALTER TABLE (\w+) ATTACH PARTITION (\w+)")
+_PRIORITY_ORDER = {"high": 1, "medium": 2}
+
+
+class FakeResult:
+    """The subset of SQLAlchemy's Result API used by the pipelines."""
+
+    def __init__(self, rows: list[dict] | None = None, scalar: Any = None) -> None:
+        self._rows = rows or []
+        self._scalar = scalar
+
+    def mappings(self) -> "FakeResult":
+        return self
+
+    def all(self) -> list[dict]:
+        return self._rows
+
+    def first(self) -> dict | None:
+        return self._rows[0] if self._rows else None
+
+    def scalar(self) -> Any:
+        return self._scalar
+
+    def scalar_one(self) -> Any:
+        return self._scalar
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class FakeDatabase:
+    """Shared in-memory tables and round-trip counters for one database."""
+
+    def __init__(self, name: str, latency_ms: float = 0.0) -> None:
+        self.name = name
+        self.latency_ms = latency_ms
+        self.tables: dict[str, list[dict]] = {}
+        self.statements = 0
+        self.commits = 0
+        self.unhandled: Counter[str] = Counter()
+        # vis_ranking_latest: query_id → (platform, brand) → newest vis_ranking row
+        self.latest: dict[int, dict[tuple[str, str], dict]] = {}
+        # Partitioned table → attached partition names (src.db.partitions)
+        self.partitions: dict[str, set[str]] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+    def session(self) -> "FakeSession":
+        return FakeSession(self)
+
+    def next_id(self) -> int:
+        return next(self._ids)
+
+
+class FakeSession:
+    """AsyncSession stand-in dispatching on the SQL text."""
+
+    def __init__(self, database: FakeDatabase) -> None:
+        self._db = database
+
+    async def _round_trip(self) -> None:
+        if self._db.latency_ms > 0:
+            await asyncio.sleep(self._db.latency_ms / 1000)
+        else:
+            await asyncio.sleep(0)
+
+    async def commit(self) -> None:
+        self._db.commits += 1
+        await self._round_trip()
+
+    async def rollback(self) -> None:
+        await self._round_trip()
+
+    async def close(self) -> None:
+        return None
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc: object) -> None:
+        return None
+
+    async def execute(self, statement: Any, params: dict | list[dict] | None = None) -> FakeResult:
+        self._db.statements += 1
+        await self._round_trip()
+
+        sql = " ".join(str(statement).split())
+        tables = self._db.tables
+        param_list = params if isinstance(params, list) else [params or {}]
+
+        if sql.startswith("SELECT id, query_text") and "FROM vis_query" in sql:
+            rows = [q for q in tables.get("vis_query", []) if q.get("is_active", True)]
+            rows.sort(key=lambda q: _PRIORITY_ORDER.get(q["priority"], 3))
+            return FakeResult([
+                {k: q[k] for k in ("id", "query_text", "category", "priority", "brands")}
+                for q in rows
+            ])
+
+        if sql.startswith("SELECT DISTINCT ON (platform, brand) platform, brand, rank_position"):
+            p = param_list[0]
+            newest: dict[tuple[str, str], dict] = {}
+            for r in tables.get("vis_ranking", []):
+                if r["qid"] == p["qid"] and r["run"] == p["run"]:
+                    key = (r["plat"], r["brand"])
+                    if key not in newest or newest[key]["at"] < r["at"]:
+                        newest[key] = r
+            return FakeResult([
+                {"platform": r["plat"], "brand": r["brand"], "rank_position": r["rank"]}
+                for _, r in sorted(newest.items())
+            ])
+
+        if sql.startswith("WITH inserted AS (INSERT INTO vis_ranking "):
+            table = tables.setdefault("vis_ranking", [])
+            for p in param_list:
+                row = {"id": self._db.next_id(), **p}
+                table.append(row)
+                latest = self._db.latest.setdefault(p["qid"], {})
+                key = (p["plat"], p["brand"])
+                if key not in latest or latest[key]["at"] <= p["at"]:
+                    latest[key] = row
+            return FakeResult()
+
+        if sql.startswith("SELECT query_id, brand, time_bucket('1 day', time) AS bucket"):
+            p = param_list[0]
+            groups: dict[tuple[int, str, datetime], list[float]] = {}
+            for row in tables.get("ts_search_rank", []):
+                if p["start"] <= row["time"] < p["until"]:
+                    key = (row["qid"], row["brand"], bucket_start("daily", row["time"]))
+                    groups.setdefault(key, []).append(row["score"])
+            return FakeResult([
+                {
+                    "query_id": qid, "brand": brand, "bucket": bucket,
+                    "avg_score": sum(v) / len(v), "sample_count": len(v),
+                }
+                for (qid, brand, bucket), v in groups.items()
+            ])
+
+        if "vis_aggregation_watermark" in sql or sql.startswith((
+            "INSERT INTO vis_score (query_id, brand, visibility_score, sample_count, period, "
+            "computed_at) VALUES (:qid, :brand, :score, :count, 'daily'",
+            "INSERT INTO vis_score (query_id, brand, visibility_score, sample_count, period, "
+            "computed_at) SELECT",
+            "SELECT query_id, brand, period, computed_at", "UPDATE vis_score SET competitive_gap",
+        )):
+            return self._aggregation(sql, param_list)
+
+        if sql.startswith("SELECT c.relname FROM pg_inherits"):
+            parent = param_list[0]["table"]
+            return FakeResult([(name,) for name in sorted(self._db.partitions.get(parent, ()))])
+
+        match = _ATTACH_RE.match(sql)
+        if match:
+            self._db.partitions.setdefault(match.group(1), set()).add(match.group(2))
+            return FakeResult()
+
+        if sql.startswith(("CREATE TABLE ", "WITH moved AS (DELETE ")):
+            return FakeResult()  # partition DDL: rows stay in the parent's in-memory table
+
+        if sql.startswith("WITH latest_scores AS ("):
+            return FakeResult(self._comparison(param_list[0]))
+
+        if sql.startswith("DELETE FROM vis_comparison_snapshot WHERE computed_at <"):
+            cutoff = param_list[0]["cutoff"]
+            tables["vis_comparison_snapshot"] = [
+                r for r in tables.get("vis_comparison_snapshot", []) if r["at"] >= cutoff
+            ]
+            return FakeResult()
+
+        if sql.startswith("UPDATE vis_pipeline_run"):
+            p = param_list[0]
+            for row in tables.get("vis_pipeline_run", []):
+                if row["id"] == p["id"]:
+                    row.update(p)
+            return FakeResult()
+
+        match = _INSERT_RE.match(sql)
+        if match:
+            name = match.group(1)
+            table = tables.setdefault(name, [])
+            ids = []
+            for p in param_list:
+                row = {"id": self._db.next_id(), **p}
+                table.append(row)
+                ids.append(row["id"])
+            return FakeResult(scalar=ids[-1] if "RETURNING id" in sql else None)
+
+        self._db.unhandled[sql[:60]] += 1
+        return FakeResult()
+
+
+    def _aggregation(self, sql: str, param_list: list[dict]) -> FakeResult:
+        """vis_score aggregate buckets and watermarks (AggregationService)."""
+        tables = self._db.tables
+        marks = tables.setdefault("vis_aggregation_watermark", [])
+        scores = tables.setdefault("vis_score", [])
+        buckets = {
+            (r["qid"], r["brand"], r["period"], r["at"]): r
+            for r in scores if r.get("period", "raw") != "raw"
+        }
+
+        if sql.startswith("SELECT period, watermark"):
+            return FakeResult(marks)
+        if sql.startswith("INSERT INTO vis_aggregation_watermark"):
+            by_period = {m["period"]: m for m in marks}
+            for p in param_list:
+                by_period[p["period"]] = {"period": p["period"], "watermark": p["watermark"]}
+            tables["vis_aggregation_watermark"] = list(by_period.values())
+            return FakeResult()
+        if "VALUES" in sql:  # daily buckets
+            for p in param_list:
+                row = buckets.get((p["qid"], p["brand"], "daily", p["bucket"]))
+                if row is None:
+                    scores.append({
+                        "id": self._db.next_id(), "qid": p["qid"], "brand": p["brand"],
+                        "score": p["score"], "count": p["count"], "gap": None,
+                        "period": "daily", "at": p["bucket"],
+                    })
+                else:
+                    row.update(score=p["score"], count=p["count"])
+            return FakeResult()
+        if sql.startswith("INSERT INTO vis_score"):  # weekly / monthly rollup
+            p = param_list[0]
+            groups: dict[tuple[int, str, datetime], list[dict]] = {}
+            for (qid, brand, period, at), row in buckets.items():
+                if period == "daily" and p["start"] <= at < p["end"]:
+                    key = (qid, brand, bucket_start(p["period"], at))
+                    groups.setdefault(key, []).append(row)
+            for (qid, brand, at), rows in groups.items():
+                count = sum(r["count"] for r in rows)
+                score = sum(r["score"] * r["count"] for r in rows) / count
+                row = buckets.get((qid, brand, p["period"], at))
+                if row is None:
+                    scores.append({
+                        "id": self._db.next_id(), "qid": qid, "brand": brand, "score": score,
+                        "count": count, "gap": None, "period": p["period"], "at": at,
+                    })
+                else:
+                    row.update(score=score, count=count)
+            return FakeResult([(qid, at) for qid, _, at in groups])
+        if sql.startswith("SELECT query_id, brand, period"):
+            p = param_list[0]
+            return FakeResult([
+                {
+                    "query_id": qid, "brand": brand, "period": period,
+                    "computed_at": at, "visibility_score": row["score"],
+                }
+                for (qid, brand, period, at), row in buckets.items()
+                if at >= p["start"] and qid in p["qids"]
+            ])
+        for p in param_list:  # UPDATE vis_score SET competitive_gap
+            row = buckets.get((p["qid"], p["brand"], p["period"], p["bucket"]))
+            if row is not None:
+                row["gap"] = p["gap"]
+        return FakeResult()
+
+    def _comparison(self, p: dict) -> list[dict]:
+        """Latest score per query × tracked brand, pivoted per query (ScoreService)."""
+        tables = self._db.tables
+        brands = sorted(tables.get("vis_brand", []), key=lambda b: b["id"])
+        tracked = {b["name"] for b in brands}
+        primary = next((b["name"] for b in brands if b.get("is_primary")), None)
+        queries = {
+            q["id"]: q for q in tables.get("vis_query", [])
+            if q.get("is_active", True) and p.get("category") in (None, q["category"])
+        }
+        latest: dict[tuple[int, str], dict] = {}
+        for row in tables.get("vis_score", []):
+            key = (row["qid"], row["brand"])
+            if row["qid"] in queries and row["brand"] in tracked:
+                if key not in latest or latest[key]["at"] <= row["at"]:
+                    latest[key] = row
+        pivot: dict[int, dict[str, float]] = {}
+        for (qid, brand), row in latest.items():
+            pivot.setdefault(qid, {})[brand] = row["score"]
+        return [
+            {
+                "query_id": qid, "query_text": queries[qid]["query_text"],
+                "category": queries[qid]["category"], "scores": scores,
+                "brands": [b["name"] for b in brands], "primary_brand": primary,
+            }
+            for qid, scores in sorted(pivot.items())
+        ]
+
+
+def load_queries(database: FakeDatabase, queries: list[dict]) -> None:
+    """Load seed-shaped query dicts (see src.db.seed.generate_load_queries) into vis_query.
+
+    Every brand the queries mention is tracked in vis_brand, Levoit as primary.
+    """
+    database.tables["vis_query"] = [
+        {
+            "id": i,
+            "query_text": q["text"],
+            "category": q["category"],
+            "priority": q["priority"],
+            "brands": q["brands"],
+            "is_active": True,
+        }
+        for i, q in enumerate(queries, start=1)
+    ]
+    names = dict.fromkeys(brand for q in queries for brand in q["brands"])
+    database.tables["vis_brand"] = [
+        {"id": i, "name": name, "is_primary": name == "Levoit"}
+        for i, name in enumerate(names, start=1)
+    ]
+
+
+# ── MongoDB ──────────────────────────────────────────────────
+
+
+class _InsertOneResult:
+    def __init__(self, inserted_id: ObjectId) -> None:
+        self.inserted_id = inserted_id
+
+
+class FakeCollection:
+    """Motor collection stand-in: inserts are stored and counted, reads are by _id."""
+
+    def __init__(self, mongo: "FakeMongo") -> None:
+        self._mongo = mongo
+        self.docs: dict[ObjectId, dict] = {}
+
+    async def _round_trip(self) -> None:
+        self._mongo.ops += 1
+        if self._mongo.latency_ms > 0:
+            await asyncio.sleep(self._mongo.latency_ms / 1000)
+        else:
+            await asyncio.sleep(0)
+
+    async def insert_one(self, doc: dict) -> _InsertOneResult:
+        await self._round_trip()
+        oid = ObjectId()
+        self.docs[oid] = {"_id": oid, **doc}
+        return _InsertOneResult(oid)
+
+    async def insert_many(self, docs: list[dict], ordered: bool = True) -> None:
+        await self._round_trip()
+        for doc in docs:
+            oid = ObjectId()
+            self.docs[oid] = {"_id": oid, **doc}
+
+    async def find_one(self, filters: dict) -> dict | None:
+        await self._round_trip()
+        return self.docs.get(filters.get("_id"))
+
+
+class FakeMongo(dict):
+    """AsyncIOMotorDatabase stand-in; collections are created on first access."""
+
+    def __init__(self, latency_ms: float = 0.0) -> None:
+        super().__init__()
+        self.latency_ms = latency_ms
+        self.ops = 0
+
+    def __missing__(self, name: str) -> FakeCollection:
+        self[name] = FakeCollection(self)
+        return self[name]
+
@@ -0,0 +1,297 @@
+"""Hot-path benchmark runner — process → extract → score, offline and per core.
+
+Stages measured for every document in the synthetic corpus (benchmarks/corpus.py):
+  process      ScrapeProcessor.process on the raw Firecrawl-style answer
+  brand_match  BrandMatcher.find_all on the cleaned text
+  snippet      SnippetExtractor.extract at each brand's first mention
+  extract      RankExtractor.extract (sections, recommendation context, snippets)
+  score        calculate_visibility_score per brand + calculate_competitive_gap
+  pipeline     process + extract + score end-to-end for one platform answer
+
+Each stage is timed single-threaded (loops calibrated to --min-time, best and
+median of --repeat samples), so 1 / pipeline time is the throughput ceiling
+of one core. Results can be saved as a baseline and later runs compared
+against it; a stage whose best time grows by more than --tolerance is
+reported as a regression and the runner exits non-zero.
+
+Usage:
+    python -m benchmarks.hot_path                       # full grid, print table
+    python -m benchmarks.hot_path --quick --compare     # CI-sized run vs. baseline
+    python -m benchmarks.hot_path --save-baseline       # record a new baseline
+"""
+
+import argparse
+import json
+import platform as host_platform
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+from benchmarks.corpus import DEFAULT_BRAND_COUNTS, DEFAULT_SIZES, CorpusDoc, build_corpus
+from src.models.enums import Platform
+from src.models.scrape_models import ScrapeResult
+from src.services.analyzer.brand_matcher import BrandMatcher
+from src.services.analyzer.rank_extractor import RankExtractor
+from src.services.analyzer.score_calculator import (
+    PlatformRanking,
+    calculate_competitive_gap,
+    calculate_visibility_score,
+)
+from src.services.analyzer.snippet_extractor import SnippetExtractor
+from src.services.scraper.processing import ScrapeProcessor
+
+BASELINE_PATH = Path(__file__).parent / "baselines" / "hot_path.json"
+
+STAGES: tuple[str, ...] = ("process", "brand_match", "snippet", "extract", "score", "pipeline")
+
+# Best time may grow by this fraction before a stage counts as regressed.
+# Baselines are host-specific: compare on the machine that recorded them.
+DEFAULT_TOLERANCE = 0.5
+
+# Reduced grid for CI / pre-commit runs
+QUICK_SIZES: tuple[int, ...] = (1_024, 51_200)
+QUICK_BRAND_COUNTS: tuple[int, ...] = (4, 16)
+
+_SCRAPED_AT = datetime(2026, 2, 10, tzinfo=timezone.utc)
+
+
+@dataclass
+class BenchResult:
+    """Timing for one (stage, document) pair."""
+
+    name: str
+    stage: str
+    input_bytes: int
+    loops: int
+    best_us: float
+    median_us: float
+
+    @property
+    def ops_per_sec(self) -> float:
+        return 1e6 / self.best_us if self.best_us else 0.0
+
+    @property
+    def mb_per_sec(self) -> float:
+        return self.input_bytes * self.ops_per_sec / 1e6
+
+
+# ── Timing ───────────────────────────────────────────────────
+
+
+def measure(
+    fn: Callable[[], object], *, min_time: float = 0.05, repeat: int = 5,
+) -> tuple[int, float, float]:
+    """Time fn; returns (loops per sample, best µs/op, median µs/op)."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time or loops >= 1_000_000:
+            break
+        loops *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+
+    return loops, min(samples) * 1e6, statistics.median(samples) * 1e6
+
+
+# ── Stage setup ──────────────────────────────────────────────
+
+
+def _score_all(brands: list[str], ranks: dict[str, int]) -> float:
+    """Score every brand on all three platforms, then Levoit's competitive gap."""
+    scores = {
+        brand: calculate_visibility_score([
+            PlatformRanking(platform=p, rank_position=ranks.get(brand, 0)) for p in Platform
+        ])
+        for brand in brands
+    }
+    own = scores.pop(brands[0], 0.0)
+    return calculate_competitive_gap(own, scores)
+
+
+def _stage_fns(doc: CorpusDoc) -> dict[str, tuple[int, Callable[[], object]]]:
+    """Build the zero-arg callable (and its input size) for each stage."""
+    processor = ScrapeProcessor()
+    extractor = RankExtractor()
+    snippets = SnippetExtractor()
+    matcher = BrandMatcher(doc.brands)
+
+    raw = ScrapeResult(
+        url="https://example.com/search",
+        content=doc.content,
+        content_length=doc.size,
+        scraped_at=_SCRAPED_AT,
+    )
+    text = processor.process(raw).clean_text
+    text_bytes = len(text.encode("utf-8"))
+    positions = [
+        pos for pos in (matcher.first_position(text, b) for b in doc.brands) if pos is not None
+    ]
+    ranks = {r.brand: r.rank_position for r in extractor.extract(text, doc.brands)}
+
+    def pipeline() -> float:
+        clean = processor.process(raw).clean_text
+        results = extractor.extract(clean, doc.brands)
+        return _score_all(doc.brands, {r.brand: r.rank_position for r in results})
+
+    return {
+        "process": (doc.size, lambda: processor.process(raw)),
+        "brand_match": (text_bytes, lambda: matcher.find_all(text)),
+        "snippet": (text_bytes, lambda: [snippets.extract(text, pos) for pos in positions]),
+        "extract": (text_bytes, lambda: extractor.extract(text, doc.brands)),
+        "score": (0, lambda: _score_all(doc.brands, ranks)),
+        "pipeline": (doc.size, pipeline),
+    }
+
+
+def run_benchmarks(
+    corpus: list[CorpusDoc],
+    *,
+    stages: tuple[str, ...] = STAGES,
+    min_time: float = 0.05,
+    repeat: int = 5,
+    progress: Callable[[BenchResult], None] | None = None,
+) -> list[BenchResult]:
+    """Run the selected stages over every corpus document."""
+    results: list[BenchResult] = []
+    scored_counts: set[int] = set()
+    for doc in corpus:
+        for stage, (size, fn) in _stage_fns(doc).items():
+            if stage not in stages:
+                continue
+            # Scoring cost depends only on the brand count, not the document
+            if stage == "score":
+                if len(doc.brands) in scored_counts:
+                    continue
+                scored_counts.add(len(doc.brands))
+                name = f"score/{len(doc.brands)}b"
+            else:
+                name = f"{stage}/{doc.name}"
+
+            loops, best, median = measure(fn, min_time=min_time, repeat=repeat)
+            result = BenchResult(name, stage, size, loops, round(best, 3), round(median, 3))
+            results.append(result)
+            if progress is not None:
+                progress(result)
+    return results
+
+
+# ── Baselines ────────────────────────────────────────────────
+
+
+def save_baseline(results: list[BenchResult], path: Path = BASELINE_PATH) -> None:
+    """Write results plus host metadata as the new baseline."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    payload = {
+        "meta": {
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": host_platform.python_version(),
+            "machine": host_platform.machine(),
+            "processor": host_platform.processor(),
+        },
+        "results": {r.name: asdict(r) for r in results},
+    }
+    path.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n")
+
+
+def load_baseline(path: Path = BASELINE_PATH) -> dict[str, dict]:
+    """Return the baseline results keyed by benchmark name ({} if none recorded)."""
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text())["results"]
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: dict[str, dict],
+    tolerance: float = DEFAULT_TOLERANCE,
+) -> list[tuple[str, float, float]]:
+    """Return (name, baseline µs, current µs) for every stage slower than tolerance allows."""
+    regressions = []
+    for r in results:
+        base = baseline.get(r.name)
+        if base is None:
+            continue
+        if r.best_us > base["best_us"] * (1 + tolerance):
+            regressions.append((r.name, base["best_us"], r.best_us))
+    return regressions
+
+
+def ceiling(results: list[BenchResult]) -> float:
+    """Per-core throughput ceiling (answers/sec) over the measured pipeline runs."""
+    times = [r.best_us for r in results if r.stage == "pipeline"]
+    if not times:
+        return 0.0
+    return 1e6 / statistics.mean(times)
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+
+def _print_row(r: BenchResult) -> None:
+    rate = f"{r.mb_per_sec:8.1f}" if r.input_bytes else "       -"
+    print(f"{r.name:<32} {r.input_bytes:>8} {r.best_us:>12.1f} {r.median_us:>12.1f} "
+          f"{r.ops_per_sec:>12.0f} {rate}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.hot_path", description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("--quick", action="store_true", help="reduced corpus grid")
+    parser.add_argument("--stage", action="append", choices=STAGES, help="only run these stages")
+    parser.add_argument("--min-time", type=float, default=0.05, help="seconds per timing sample")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples per benchmark")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true", help="fail on regressions vs. baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    corpus = build_corpus(
+        sizes=QUICK_SIZES if args.quick else DEFAULT_SIZES,
+        brand_counts=QUICK_BRAND_COUNTS if args.quick else DEFAULT_BRAND_COUNTS,
+    )
+    print(f"{'benchmark':<32} {'bytes':>8} {'best µs':>12} {'median µs':>12} "
+          f"{'ops/s':>12} {'MB/s':>8}")
+    results = run_benchmarks(
+        corpus,
+        stages=tuple(args.stage or STAGES),
+        min_time=args.min_time,
+        repeat=args.repeat,
+        progress=_print_row,
+    )
+
+    per_core = ceiling(results)
+    if per_core:
+        print(f"\nPer-core ceiling: {per_core:,.0f} answers/s ({per_core * 3600:,.0f} answers/h)")
+
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+
+    if args.compare:
+        regressions = compare(results, load_baseline(args.baseline), args.tolerance)
+        for name, base, current in regressions:
+            change = current / base - 1
+            print(f"REGRESSION {name}: {base:.1f} µs → {current:.1f} µs ({change:+.0%})")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} of baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
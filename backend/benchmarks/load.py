@@ -0,0 +1,413 @@
+"""End-to-end load harness — run a pipeline flow against local stand-ins.
+
+Runs hourly_rank_check or daily_full_scan through the built-in runner
+(src/pipelines/runner.py, no Prefect) over N synthetic queries
+(src.db.seed.generate_load_queries) with:
+  - Firecrawl  the fake server from benchmarks/fake_firecrawl.py, in-process via
+               httpx.ASGITransport or over HTTP with --firecrawl-url
+  - Postgres / TimescaleDB / MongoDB / Redis
+               in-process fakes (benchmarks/fakes.py + fakeredis) by default, or
+               the services from settings with --real-services (DESTRUCTIVE:
+               the databases are wiped and re-seeded via src.db.seed.seed_load)
+
+Reported: run wall-clock, per-stage latency percentiles (rate-limit wait,
+Firecrawl call, snapshot write, processing, whole scrape incl. retries,
+extract+store, score, daily aggregation) and DB round trips.
+
+Retry back-off (5s/15s/45s per R-DC-06) is scaled by --retry-delay-scale so
+that error/429 distributions can be exercised without real-time waits.
+
+Usage:
+    python -m benchmarks.load --queries 2000 --latency-ms 200 --error-rate 0.05
+    python -m benchmarks.load --flow daily --queries 5000 --db-latency-ms 1.0 --json out.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import logging
+import math
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass, field
+from functools import wraps
+from typing import Any
+
+import httpx
+from sqlalchemy import event
+
+from benchmarks.fake_firecrawl import FirecrawlProfile, create_app
+from benchmarks.fakes import FakeDatabase, FakeMongo, load_queries
+from src.config import settings
+from src.db.seed import generate_load_queries
+from src.models.enums import Platform
+from src.pipelines import daily_full_scan, hourly_rank_check
+from src.pipelines.runner import run_flow
+from src.services.scraper import base as scraper_base
+from src.services.scraper import orchestrator as scraper_orchestrator
+from src.services.scraper.chatgpt import ChatGPTScraper
+from src.services.scraper.google_ai import GoogleAIScraper
+from src.services.scraper.orchestrator import ScrapeOrchestrator
+from src.services.scraper.perplexity import PerplexityScraper
+from src.services.scraper.processing import ScrapeProcessor
+from src.services.scraper.quarantine import QuarantineSink
+from src.services.scraper.rate_limiter import PlatformRateLimiter
+
+FLOWS = {"hourly": hourly_rank_check, "daily": daily_full_scan}
+
+# Pipeline task functions timed as stages, by the name the flow module imports them under
+_TASK_STAGES = {
+    "extract_and_store_rankings_impl": "extract_store",
+    "compute_scores_impl": "score",
+    "compute_daily_aggregated_scores_impl": "daily_aggregate",
+}
+
+# The in-process transport ignores the host; any absolute URL works
+_IN_PROCESS_FIRECRAWL_URL = "http://fake-firecrawl"
+
+
+# ── Stage timing ─────────────────────────────────────────────
+
+
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0-100)."""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100 * len(values)))
+    return values[rank - 1]
+
+
+class StageTimer:
+    """Collects wall-clock durations per stage from wrapped callables."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = defaultdict(list)
+
+    def wrap(self, stage: str, fn: Callable) -> Callable:
+        """Return fn wrapped so every call (sync or async) records a sample."""
+        samples = self.samples[stage]
+
+        if asyncio.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def timed_async(*args: Any, **kwargs: Any) -> Any:
+                start = time.perf_counter()
+                try:
+                    return await fn(*args, **kwargs)
+                finally:
+                    samples.append(time.perf_counter() - start)
+            return timed_async
+
+        @wraps(fn)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                samples.append(time.perf_counter() - start)
+        return timed
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """Per-stage count, p50/p90/p99/max in ms and total seconds."""
+        out: dict[str, dict[str, float]] = {}
+        for stage, samples in self.samples.items():
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            out[stage] = {
+                "count": len(ordered),
+                "p50_ms": round(percentile(ordered, 50) * 1000, 3),
+                "p90_ms": round(percentile(ordered, 90) * 1000, 3),
+                "p99_ms": round(percentile(ordered, 99) * 1000, 3),
+                "max_ms": round(ordered[-1] * 1000, 3),
+                "total_s": round(sum(ordered), 3),
+            }
+        return out
+
+
+@contextlib.contextmanager
+def _patched(obj: Any, name: str, value: Any) -> Iterator[None]:
+    original = getattr(obj, name)
+    setattr(obj, name, value)
+    try:
+        yield
+    finally:
+        setattr(obj, name, original)
+
+
+# ── Config / report ──────────────────────────────────────────
+
+
+@dataclass
+class LoadConfig:
+    """One load run: flow, query count, Firecrawl profile and stand-in settings."""
+
+    queries: int = 1000
+    flow: str = "hourly"
+    firecrawl: FirecrawlProfile = field(default_factory=FirecrawlProfile)
+    firecrawl_url: str | None = None
+    per_platform_concurrency: int | None = None
+    retry_delay_scale: float = 0.01
+    db_latency_ms: float = 0.5
+    mongo_latency_ms: float = 0.3
+    real_services: bool = False
+
+
+@dataclass
+class LoadReport:
+    """Outcome of one load run."""
+
+    flow: str
+    queries: int
+    tasks: int
+    wall_clock_s: float
+    result: dict
+    stages: dict[str, dict[str, float]]
+    round_trips: dict[str, dict[str, int]]
+    firecrawl_responses: dict[str, int] = field(default_factory=dict)
+    unhandled_sql: dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    def format(self) -> str:
+        rate = self.tasks / self.wall_clock_s if self.wall_clock_s else 0.0
+        lines = [
+            f"{self.flow}: {self.queries} queries → {self.tasks} scrape tasks "
+            f"in {self.wall_clock_s:.2f}s ({rate:.1f} tasks/s)",
+            "result: " + ", ".join(f"{k}={v}" for k, v in self.result.items()),
+            "",
+            f"{'stage':<18} {'count':>7} {'p50 ms':>10} {'p90 ms':>10} {'p99 ms':>10} "
+            f"{'max ms':>10} {'total s':>9}",
+        ]
+        for stage, s in self.stages.items():
+            lines.append(
+                f"{stage:<18} {s['count']:>7} {s['p50_ms']:>10.2f} {s['p90_ms']:>10.2f} "
+                f"{s['p99_ms']:>10.2f} {s['max_ms']:>10.2f} {s['total_s']:>9.2f}"
+            )
+        lines.append("")
+        for name, counts in self.round_trips.items():
+            detail = ", ".join(f"{k} {v}" for k, v in counts.items())
+            lines.append(f"round trips {name:<10} {detail}")
+        if self.firecrawl_responses:
+            detail = ", ".join(f"{k}={v}" for k, v in sorted(self.firecrawl_responses.items()))
+            lines.append(f"firecrawl responses     {detail}")
+        for sql, count in self.unhandled_sql.items():
+            lines.append(f"unsimulated SQL ×{count}: {sql}")
+        return "\n".join(lines)
+
+
+# ── Stand-ins ────────────────────────────────────────────────
+
+
+def _count_round_trips(engine: Any, counts: dict[str, int]) -> None:
+    """Count statements and commits on a real engine via SQLAlchemy events."""
+    counts.update(statements=0, commits=0)
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _on_execute(*_: Any) -> None:
+        counts["statements"] += 1
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _on_commit(*_: Any) -> None:
+        counts["commits"] += 1
+
+
+@contextlib.asynccontextmanager
+async def _fake_services(config: LoadConfig):
+    from fakeredis.aioredis import FakeRedis
+
+    pg = FakeDatabase("postgres", config.db_latency_ms)
+    ts = FakeDatabase("timescale", config.db_latency_ms)
+    mongo = FakeMongo(config.mongo_latency_ms)
+    load_queries(pg, generate_load_queries(config.queries))
+
+    def round_trips() -> dict[str, dict[str, int]]:
+        return {
+            db.name: {"statements": db.statements, "commits": db.commits, "total": db.round_trips}
+            for db in (pg, ts)
+        } | {"mongo": {"ops": mongo.ops}}
+
+    def unhandled() -> dict[str, int]:
+        return dict(pg.unhandled + ts.unhandled)
+
+    # redis-py >= 8 caps pools at 100 connections; the orchestrator issues one
+    # command per task concurrently, so size the fake like the pre-8 default
+    redis = FakeRedis(decode_responses=True, max_connections=2**31)
+    yield pg.session(), ts.session(), redis, mongo, round_trips, unhandled
+
+
+@contextlib.asynccontextmanager
+async def _real_services(config: LoadConfig):
+    import redis.asyncio as aioredis
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+    from src.db.seed import seed_load
+
+    await seed_load(config.queries)
+
+    pg_engine = create_async_engine(settings.database_url)
+    ts_engine = create_async_engine(settings.timescale_url)
+    counts: dict[str, dict[str, int]] = {"postgres": {}, "timescale": {}}
+    _count_round_trips(pg_engine, counts["postgres"])
+    _count_round_trips(ts_engine, counts["timescale"])
+
+    redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+    # Stale dedup / rate-limit keys from an earlier run would skip every task
+    async for key in redis.scan_iter(match="dedup:*"):
+        await redis.delete(key)
+    async for key in redis.scan_iter(match="rl:*"):
+        await redis.delete(key)
+
+    mongo_client = AsyncIOMotorClient(settings.mongo_url)
+    try:
+        pg_factory = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+        ts_factory = async_sessionmaker(ts_engine, class_=AsyncSession, expire_on_commit=False)
+        async with pg_factory() as db, ts_factory() as ts_db:
+            yield db, ts_db, redis, mongo_client[settings.mongo_db], lambda: counts, dict
+    finally:
+        await redis.aclose()
+        mongo_client.close()
+        await pg_engine.dispose()
+        await ts_engine.dispose()
+
+
+# ── Runner ───────────────────────────────────────────────────
+
+
+async def run_load(config: LoadConfig) -> LoadReport:
+    """Run one flow end-to-end against the stand-ins and collect the report."""
+    flow_module = FLOWS[config.flow]
+    timer = StageTimer()
+
+    app = None
+    if config.firecrawl_url:
+        http = httpx.AsyncClient()
+        firecrawl_url = config.firecrawl_url
+    else:
+        app = create_app(config.firecrawl)
+        http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app))
+        firecrawl_url = _IN_PROCESS_FIRECRAWL_URL
+
+    services = _real_services(config) if config.real_services else _fake_services(config)
+
+    with contextlib.ExitStack() as patches:
+        patches.enter_context(_patched(
+            scraper_base, "RETRY_DELAYS",
+            [d * config.retry_delay_scale for d in scraper_base.RETRY_DELAYS],
+        ))
+        if config.per_platform_concurrency:
+            patches.enter_context(_patched(
+                scraper_orchestrator, "MAX_CONCURRENT_PER_PLATFORM",
+                config.per_platform_concurrency,
+            ))
+        for task_name, stage in _TASK_STAGES.items():
+            if hasattr(flow_module, task_name):
+                patches.enter_context(_patched(
+                    flow_module, task_name, timer.wrap(stage, getattr(flow_module, task_name)),
+                ))
+
+        async with http, services as (db, ts_db, redis, mongo, round_trips, unhandled):
+            processor = ScrapeProcessor()
+            processor.process = timer.wrap("process", processor.process)
+
+            scrapers = {}
+            for cls in (ChatGPTScraper, PerplexityScraper, GoogleAIScraper):
+                scraper = cls(http, mongo, processor)
+                scraper._firecrawl_url = firecrawl_url
+                scraper._call_firecrawl = timer.wrap("firecrawl", scraper._call_firecrawl)
+                scraper._store_snapshot = timer.wrap("snapshot", scraper._store_snapshot)
+                scraper.scrape = timer.wrap("scrape", scraper.scrape)
+                scrapers[cls.platform] = scraper
+
+            rate_limiter = PlatformRateLimiter(redis)
+            rate_limiter._limits = {p.value: 10**9 for p in Platform}
+            rate_limiter.wait_and_acquire = timer.wrap(
+                "rate_limit_wait", rate_limiter.wait_and_acquire,
+            )
+            orchestrator = ScrapeOrchestrator(
+                scrapers=scrapers,
+                rate_limiter=rate_limiter,
+                redis=redis,
+                quarantine_sink=QuarantineSink(mongo),
+            )
+
+            start = time.perf_counter()
+            result = await run_flow(
+                flow_module.FLOW_NAME, db=db, ts_db=ts_db, redis=redis, orchestrator=orchestrator,
+                daily_budget_usd=float("inf"),
+            )
+            wall_clock = time.perf_counter() - start
+
+            return LoadReport(
+                flow=flow_module.FLOW_NAME,
+                queries=config.queries,
+                tasks=config.queries * len(scrapers),
+                wall_clock_s=round(wall_clock, 3),
+                result=result,
+                stages=timer.summary(),
+                round_trips=round_trips(),
+                firecrawl_responses={str(k): v for k, v in app.state.stats.items()} if app else {},
+                unhandled_sql=unhandled(),
+            )
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.load", description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("--flow", choices=sorted(FLOWS), default="hourly")
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--latency-ms", type=float, default=800.0, help="median Firecrawl latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5)
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.01)
+    parser.add_argument("--empty-rate", type=float, default=0.01)
+    parser.add_argument("--min-kb", type=int, default=1)
+    parser.add_argument("--max-kb", type=int, default=100)
+    parser.add_argument("--firecrawl-url", help="use a running fake/real Firecrawl instead")
+    parser.add_argument("--per-platform-concurrency", type=int)
+    parser.add_argument("--retry-delay-scale", type=float, default=0.01)
+    parser.add_argument("--db-latency-ms", type=float, default=0.5, help="fake DB round trip")
+    parser.add_argument("--mongo-latency-ms", type=float, default=0.3)
+    parser.add_argument("--real-services", action="store_true",
+                        help="use the databases from settings (wipes and re-seeds them)")
+    parser.add_argument("--json", type=argparse.FileType("w"), help="also write the report as JSON")
+    parser.add_argument("--log-level", default="CRITICAL", help="pipeline log level during the run")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=args.log_level)
+
+    config = LoadConfig(
+        queries=args.queries,
+        flow=args.flow,
+        firecrawl=FirecrawlProfile(
+            latency_ms=args.latency_ms,
+            latency_sigma=args.latency_sigma,
+            error_rate=args.error_rate,
+            rate_limit_rate=args.rate_limit_rate,
+            empty_rate=args.empty_rate,
+            min_kb=args.min_kb,
+            max_kb=args.max_kb,
+        ),
+        firecrawl_url=args.firecrawl_url,
+        per_platform_concurrency=args.per_platform_concurrency,
+        retry_delay_scale=args.retry_delay_scale,
+        db_latency_ms=args.db_latency_ms,
+        mongo_latency_ms=args.mongo_latency_ms,
+        real_services=args.real_services,
+    )
+    report = asyncio.run(run_load(config))
+    print(report.format())
+    if args.json:
+        json.dump(report.to_dict(), args.json, indent=2, default=str)
+    return 0 if report.result.get("status") == "completed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,308 @@
+"""Trend-query benchmark — get_trends latency and storage before/after compression.
+
+Builds a scratch copy of ts_search_rank (plus its ts_daily_rank continuous
+aggregate, left unrefreshed) in its own schema on the TimescaleDB from settings
+(or --ts-url), fills it server-side with generate_series (queries × 3 platforms
+× brands × runs per day over --days), then times RankingService.get_trends for
+each (range, granularity) pair in three states:
+
+  uncompressed  hypertable with the chunk interval of src/db/timescale.py; the
+                empty aggregate serves everything from raw rows (real-time part)
+  compressed    after applying the same compression settings as migration 007
+                and compressing every chunk older than COMPRESS_AFTER
+  materialized  after refreshing the aggregate up to today, as the refresh
+                policy keeps it in production
+
+Reported per pair: best / median ms over --repeat runs and the speed-up, plus
+the hypertable's total size in both states. The scratch schema is dropped at
+the end unless --keep is given; production tables are never touched.
+
+Usage:
+    python -m benchmarks.trends                              # 50 queries, 1 year
+    python -m benchmarks.trends --queries 500 --days 365 --ranges 30,90,365 --json out.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from benchmarks.corpus import BRAND_POOL
+from src.config import settings
+from src.db.timescale import (
+    CHUNK_INTERVAL,
+    COMPRESS_AFTER,
+    compression_sql,
+    continuous_aggregate_sql,
+)
+from src.services.ranking_service import RankingService
+
+# Scratch schema holding the benchmark's ts_search_rank; dropped afterwards
+BENCH_SCHEMA = "bench_trends"
+
+GRANULARITIES: tuple[str, ...] = ("daily", "weekly", "monthly")
+DEFAULT_RANGES: tuple[int, ...] = (30, 90, 365)
+PLATFORMS: tuple[str, ...] = ("chatgpt", "perplexity", "google_ai")
+
+
+@dataclass
+class TrendTiming:
+    """Latency of one get_trends shape in one storage state."""
+
+    state: str
+    range_days: int
+    granularity: str
+    best_ms: float
+    median_ms: float
+    points: int
+
+    @property
+    def key(self) -> tuple[int, str]:
+        return self.range_days, self.granularity
+
+
+def parse_ranges(value: str) -> tuple[int, ...]:
+    """Parse "30,90,365" into positive day counts."""
+    ranges = tuple(int(part) for part in value.split(",") if part.strip())
+    if not ranges or any(days <= 0 for days in ranges):
+        raise argparse.ArgumentTypeError(f"Expected positive day counts, got {value!r}")
+    return ranges
+
+
+def expected_rows(queries: int, brands: int, days: int, runs_per_day: int) -> int:
+    """Rows generated by FILL_SQL (inclusive of both series ends)."""
+    samples = days * runs_per_day + 1
+    return samples * queries * len(PLATFORMS) * brands
+
+
+def speedups(
+    timings: list[TrendTiming], state: str = "compressed",
+) -> dict[tuple[int, str], float]:
+    """Uncompressed best / best in state for every shape measured in both states."""
+    before = {t.key: t.best_ms for t in timings if t.state == "uncompressed"}
+    after = {t.key: t.best_ms for t in timings if t.state == state}
+    return {
+        key: round(before[key] / after[key], 2)
+        for key in before
+        if key in after and after[key] > 0
+    }
+
+
+# ── Scratch hypertable ───────────────────────────────────────
+
+
+def setup_sql() -> list[str]:
+    """Schema + hypertable mirroring migration 002, with 007's chunk interval.
+
+    The aggregate has no refresh policy here so a background job cannot
+    materialize it halfway through the raw-row measurements.
+    """
+    return [
+        f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE",
+        f"CREATE SCHEMA {BENCH_SCHEMA}",
+        """
+        CREATE TABLE ts_search_rank (
+            time              TIMESTAMPTZ  NOT NULL,
+            query_id          INTEGER      NOT NULL,
+            platform          VARCHAR(20)  NOT NULL,
+            brand             VARCHAR(100) NOT NULL,
+            rank_position     INTEGER      NOT NULL DEFAULT 0,
+            visibility_score  FLOAT        NOT NULL DEFAULT 0
+        )
+        """,
+        f"SELECT create_hypertable('ts_search_rank', 'time', "
+        f"chunk_time_interval => INTERVAL '{CHUNK_INTERVAL}')",
+        "CREATE INDEX idx_ts_rank_query ON ts_search_rank(query_id, time DESC)",
+        *continuous_aggregate_sql("ts_daily_rank", policy=False),
+    ]
+
+
+FILL_SQL = """
+    INSERT INTO ts_search_rank (time, query_id, platform, brand, rank_position, visibility_score)
+    SELECT t, q, p, b, (random() * 10)::int, random() * 100
+    FROM generate_series(
+            CAST(:end AS timestamptz) - make_interval(days => CAST(:days AS int)),
+            CAST(:end AS timestamptz),
+            make_interval(secs => 86400.0 / CAST(:runs_per_day AS int))
+         ) AS t,
+         generate_series(1, CAST(:queries AS int)) AS q,
+         unnest(CAST(:platforms AS text[])) AS p,
+         unnest(CAST(:brands AS text[])) AS b
+"""
+
+COMPRESS_SQL = (
+    f"SELECT compress_chunk(c, if_not_compressed => TRUE) "
+    f"FROM show_chunks('ts_search_rank', older_than => INTERVAL '{COMPRESS_AFTER}') c"
+)
+
+
+
+def refresh_sql(end: datetime) -> str:
+    """Materialize ts_daily_rank for every closed day before end (a UTC midnight)."""
+    return f"CALL refresh_continuous_aggregate('ts_daily_rank', NULL, '{end.isoformat()}')"
+
+
+async def _size(db: AsyncSession) -> int:
+    return int((await db.execute(text("SELECT hypertable_size('ts_search_rank')"))).scalar())
+
+
+async def time_trends(
+    service: RankingService,
+    *,
+    state: str,
+    ranges: tuple[int, ...],
+    queries: int,
+    brands: list[str],
+    now: datetime,
+    repeat: int,
+) -> list[TrendTiming]:
+    """Time get_trends for every (range, granularity), random query per sample."""
+    rng = random.Random(0)
+    timings = []
+    for days in ranges:
+        for granularity in GRANULARITIES:
+            samples, points = [], 0
+            for _ in range(repeat):
+                start = time.perf_counter()
+                trend = await service.get_trends(
+                    query_id=rng.randint(1, queries),
+                    brands=brands,
+                    from_date=now - timedelta(days=days),
+                    to_date=now,
+                    granularity=granularity,
+                )
+                samples.append((time.perf_counter() - start) * 1000)
+                points = len(trend)
+            timings.append(TrendTiming(
+                state, days, granularity,
+                round(min(samples), 3), round(statistics.median(samples), 3), points,
+            ))
+    return timings
+
+
+async def run(args: argparse.Namespace) -> dict:
+    """Build, measure, compress, measure again; returns the JSON-able report."""
+    engine = create_async_engine(
+        args.ts_url,
+        connect_args={"server_settings": {"search_path": f"{BENCH_SCHEMA},public"}},
+    )
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    brands = BRAND_POOL[:args.brands]
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+
+    try:
+        async with session_factory() as db:
+            for statement in setup_sql():
+                await db.execute(text(statement))
+            await db.execute(text(FILL_SQL), {
+                "end": now, "days": args.days, "runs_per_day": args.runs_per_day,
+                "queries": args.queries, "platforms": list(PLATFORMS), "brands": brands,
+            })
+            await db.execute(text("ANALYZE ts_search_rank"))
+            await db.commit()
+
+            service = RankingService(db, ts_db=db)
+            measure = {
+                "ranges": args.ranges, "queries": args.queries, "brands": brands,
+                "now": now, "repeat": args.repeat,
+            }
+            size_before = await _size(db)
+            timings = await time_trends(service, state="uncompressed", **measure)
+
+            for statement in compression_sql():
+                await db.execute(text(statement))
+            await db.execute(text(COMPRESS_SQL))
+            await db.execute(text("ANALYZE ts_search_rank"))
+            await db.commit()
+
+            size_after = await _size(db)
+            timings += await time_trends(service, state="compressed", **measure)
+
+            # CALL cannot run inside a transaction block
+            async with engine.connect() as conn:
+                conn = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                midnight = now.replace(hour=0, minute=0, second=0)
+                await conn.execute(text(refresh_sql(midnight)))
+            timings += await time_trends(service, state="materialized", **measure)
+
+            if not args.keep:
+                await db.execute(text(f"DROP SCHEMA {BENCH_SCHEMA} CASCADE"))
+                await db.commit()
+    finally:
+        await engine.dispose()
+
+    return {
+        "rows": expected_rows(args.queries, len(brands), args.days, args.runs_per_day),
+        "chunk_interval": CHUNK_INTERVAL,
+        "compress_after": COMPRESS_AFTER,
+        "size_bytes": {"uncompressed": size_before, "compressed": size_after},
+        "timings": [asdict(t) for t in timings],
+        "speedup": {f"{days}d/{gran}": x for (days, gran), x in speedups(timings).items()},
+        "speedup_materialized": {
+            f"{days}d/{gran}": x
+            for (days, gran), x in speedups(timings, "materialized").items()
+        },
+    }
+
+
+# ── CLI ──────────────────────────────────────────────────────
+
+
+def format_report(report: dict) -> str:
+    """Human-readable table of a run() report."""
+    sizes = report["size_bytes"]
+    ratio = sizes["uncompressed"] / sizes["compressed"] if sizes["compressed"] else 0.0
+    lines = [
+        f"rows: {report['rows']:,}  chunk interval: {report['chunk_interval']}  "
+        f"compress after: {report['compress_after']}",
+        f"size: {sizes['uncompressed'] / 1e6:,.1f} MB → {sizes['compressed'] / 1e6:,.1f} MB "
+        f"({ratio:.1f}x smaller)",
+        "",
+        f"{'shape':<14} {'state':<13} {'best ms':>10} {'median ms':>10} {'points':>7}",
+    ]
+    for t in report["timings"]:
+        shape = f"{t['range_days']}d/{t['granularity']}"
+        lines.append(f"{shape:<14} {t['state']:<13} {t['best_ms']:>10.2f} "
+                     f"{t['median_ms']:>10.2f} {t['points']:>7}")
+    lines.append("")
+    for shape, factor in report["speedup"].items():
+        lines.append(f"speed-up {shape:<14} {factor:.2f}x")
+    for shape, factor in report.get("speedup_materialized", {}).items():
+        lines.append(f"speed-up {shape:<14} {factor:.2f}x (materialized aggregate)")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.trends", description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("--ts-url", default=settings.timescale_url, help="TimescaleDB URL")
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--brands", type=int, default=6, help=f"1–{len(BRAND_POOL)}")
+    parser.add_argument("--days", type=int, default=365, help="history to generate")
+    parser.add_argument("--runs-per-day", type=int, default=4)
+    parser.add_argument("--ranges", type=parse_ranges, default=DEFAULT_RANGES,
+                        help="comma-separated trend ranges in days")
+    parser.add_argument("--repeat", type=int, default=5, help="timing samples per shape")
+    parser.add_argument("--keep", action="store_true", help=f"keep the {BENCH_SCHEMA} schema")
+    parser.add_argument("--json", dest="json_path", help="also write the report here")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print(format_report(report))
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
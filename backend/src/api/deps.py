@@ -9,7 +9,7 @@ from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.db.mongo import get_mongo_db
-from src.db.postgres import get_db, get_ts_db
+from src.db.postgres import get_db, get_read_db, get_read_ts_db, get_ts_db
 from src.db.redis import get_redis
 
 # ── Type aliases for FastAPI Depends ───────────────────────
@@ -25,6 +25,16 @@ async def _get_ts_db() -> AsyncGenerator[AsyncSession, None]:
         yield session
 
 
+async def _get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_read_db():
+        yield session
+
+
+async def _get_read_ts_db() -> AsyncGenerator[AsyncSession, None]:
+    async for session in get_read_ts_db():
+        yield session
+
+
 def _get_mongo() -> AsyncIOMotorDatabase:
     return get_mongo_db()
 
@@ -35,5 +45,8 @@ def _get_redis() -> Redis:
 
 DbSession = Annotated[AsyncSession, Depends(_get_db)]
 TsDbSession = Annotated[AsyncSession, Depends(_get_ts_db)]
+# Read-only endpoints: may be served by a replica (src/db/replicas.py)
+ReadDbSession = Annotated[AsyncSession, Depends(_get_read_db)]
+ReadTsDbSession = Annotated[AsyncSession, Depends(_get_read_ts_db)]
 MongoDb = Annotated[AsyncIOMotorDatabase, Depends(_get_mongo)]
 RedisClient = Annotated[Redis, Depends(_get_redis)]
@@ -0,0 +1,97 @@
+"""API request metrics — ASGI middleware, DB pool gauges, Prometheus text for /metrics."""
+
+import time
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.shared.metrics import (
+    CACHE_REQUESTS,
+    DB_READ_ROUTES,
+    CounterVec,
+    HistogramVec,
+    format_labels,
+    render_metric_header,
+)
+
+# Dashboard reads are served from Redis in ms; DB misses take tens to hundreds of ms
+HTTP_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Requests that matched no route share one label so 404 scans can't explode cardinality
+UNMATCHED_ROUTE = "<unmatched>"
+
+HTTP_REQUESTS = CounterVec(
+    "levoit_http_requests_total",
+    "HTTP requests by method, route template and status code.",
+    ("method", "route", "status"),
+)
+HTTP_LATENCY = HistogramVec(
+    "levoit_http_request_duration_seconds",
+    "HTTP request latency by method and route template.",
+    ("method", "route"),
+    buckets=HTTP_BUCKETS,
+)
+
+
+class MetricsMiddleware:
+    """Counts requests and records latency per route template (pure ASGI, no body buffering)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            # The router stores the matched route on the shared scope
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            method = scope["method"]
+            HTTP_REQUESTS.inc(method=method, route=route_path, status=str(status))
+            HTTP_LATENCY.observe(time.perf_counter() - start, method=method, route=route_path)
+
+
+# ── SQLAlchemy pool gauges ───────────────────────────────────
+
+_POOL_GAUGES = (
+    ("levoit_db_pool_size", "Configured pool size (persistent connections).", "size"),
+    ("levoit_db_pool_checked_out", "Connections currently checked out.", "checkedout"),
+    ("levoit_db_pool_checked_in", "Idle connections in the pool.", "checkedin"),
+    ("levoit_db_pool_overflow", "Overflow connections open beyond pool_size.", "overflow"),
+)
+
+
+def render_pool_gauges(engines: dict[str, AsyncEngine]) -> list[str]:
+    """Render QueuePool gauges for each named engine (pools without counters are skipped)."""
+    lines: list[str] = []
+    for name, help_text, attr in _POOL_GAUGES:
+        lines += render_metric_header(name, "gauge", help_text)
+        for label, engine in engines.items():
+            getter = getattr(engine.pool, attr, None)
+            if getter is None:
+                continue
+            # QueuePool.overflow() starts at -pool_size; only opened overflow connections count
+            value = max(getter(), 0)
+            lines.append(f"{name}{format_labels({'engine': label})} {value}")
+    return lines
+
+
+def render_api_metrics(engines: dict[str, AsyncEngine]) -> str:
+    """Request, cache, read-routing and pool metrics of this process in Prometheus text format."""
+    lines = HTTP_REQUESTS.render() + HTTP_LATENCY.render() + CACHE_REQUESTS.render()
+    lines += DB_READ_ROUTES.render()
+    lines += render_pool_gauges(engines)
+    return "\n".join(lines) + "\n"
@@ -2,7 +2,7 @@
 
 from fastapi import APIRouter, HTTPException, Query
 
-from src.api.deps import DbSession
+from src.api.deps import DbSession, ReadDbSession
 from src.models.enums import QueryCategory, QueryPriority
 from src.models.schemas import VisQueryCreate, VisQueryResponse, VisQueryUpdate
 from src.services.query_service import QueryService
@@ -17,7 +17,7 @@ def _to_response(query) -> VisQueryResponse:
 
 @router.get("", response_model=PaginatedResponse[VisQueryResponse])
 async def list_queries(
-    db: DbSession,
+    db: ReadDbSession,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     category: QueryCategory | None = Query(None, description="Filter by category"),
@@ -2,19 +2,24 @@
 
 from datetime import datetime
 
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
-from src.api.deps import DbSession, RedisClient, TsDbSession
-from src.models.schemas import RankingResponse, TrendPoint
+from src.api.deps import ReadDbSession, ReadTsDbSession, RedisClient
+from src.models.enums import Platform, QueryCategory
+from src.models.schemas import LatestRankingsResponse, RankingResponse, TrendPoint
 from src.services.ranking_service import RankingService
 from src.shared.pagination import PaginatedResponse, paginate
+from src.shared.responses import JSONBytesResponse, join_json_array
 
 router = APIRouter()
 
+# Upper bound on query IDs per batch request (one dashboard page)
+MAX_BATCH_QUERY_IDS = 200
+
 
 @router.get("", response_model=PaginatedResponse[RankingResponse])
 async def list_rankings(
-    db: DbSession,
+    db: ReadDbSession,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     query_id: int | None = Query(None, description="Filter by query ID"),
@@ -36,32 +41,70 @@ async def list_rankings(
     )
 
 
-@router.get("/latest", response_model=list[RankingResponse])
+@router.get(
+    "/latest", response_model=list[RankingResponse], response_class=JSONBytesResponse,
+)
 async def get_latest_rankings(
-    db: DbSession,
+    db: ReadDbSession,
     redis: RedisClient,
     query_id: int = Query(..., description="Query ID"),
 ):
-    """Get most recent ranking per platform+brand for a query (cached 1h)."""
+    """Get most recent ranking per platform+brand for a query (cached 1h, served as stored)."""
     svc = RankingService(db, redis=redis)
-    return await svc.get_latest(query_id)
+    return JSONBytesResponse(await svc.get_latest_json(query_id))
+
+
+@router.get(
+    "/latest/batch",
+    response_model=list[LatestRankingsResponse],
+    response_class=JSONBytesResponse,
+)
+async def get_latest_rankings_batch(
+    db: ReadDbSession,
+    redis: RedisClient,
+    query_ids: list[int] = Query(
+        ..., min_length=1, max_length=MAX_BATCH_QUERY_IDS,
+        description="Query IDs (repeat the parameter: ?query_ids=1&query_ids=2)",
+    ),
+):
+    """Latest rankings for many queries in one request (one MGET + one DB query).
+
+    Each query's cached body is spliced into the response without re-parsing.
+    """
+    svc = RankingService(db, redis=redis)
+    latest = await svc.get_latest_many_json(query_ids)
+    return JSONBytesResponse(join_json_array([
+        b'{"query_id":%d,"rankings":%s}' % (qid, body) for qid, body in latest.items()
+    ]))
 
 
 @router.get("/trends", response_model=list[TrendPoint])
 async def get_ranking_trends(
-    db: DbSession,
-    ts_db: TsDbSession,
-    query_id: int = Query(..., description="Query ID"),
+    db: ReadDbSession,
+    ts_db: ReadTsDbSession,
+    query_id: int | None = Query(None, description="Query ID"),
+    category: QueryCategory | None = Query(None, description="All queries of a category"),
+    all_queries: bool = Query(False, description="Brand trends across every query"),
     brands: str | None = Query(None, description="Comma-separated brand names"),
+    platform: Platform | None = Query(None, description="Restrict to one platform"),
+    by_platform: bool = Query(False, description="One series per platform"),
     from_date: datetime | None = Query(None, alias="from", description="Start date"),
     to_date: datetime | None = Query(None, alias="to", description="End date"),
     granularity: str = Query("daily", pattern="^(daily|weekly|monthly)$", description="Time bucket"),
 ):
-    """Get time-series trend data from TimescaleDB."""
+    """Get time-series trend data from TimescaleDB's daily aggregates.
+
+    Exactly one scope is required: query_id, category, or all_queries=true.
+    """
+    if sum((query_id is not None, category is not None, all_queries)) != 1:
+        raise HTTPException(
+            status_code=422, detail="Give exactly one of query_id, category or all_queries",
+        )
     brand_list = [b.strip() for b in brands.split(",")] if brands else None
     svc = RankingService(db, ts_db=ts_db)
     return await svc.get_trends(
-        query_id=query_id, brands=brand_list,
+        query_id=query_id, category=category, brands=brand_list,
+        platform=platform, by_platform=by_platform,
         from_date=from_date, to_date=to_date,
         granularity=granularity,
     )
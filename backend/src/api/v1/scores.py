@@ -4,17 +4,18 @@ from datetime import datetime
 
 from fastapi import APIRouter, Query
 
-from src.api.deps import DbSession, RedisClient
+from src.api.deps import ReadDbSession, RedisClient
 from src.models.schemas import ComparisonRow, ScoreResponse
 from src.services.score_service import ScoreService
 from src.shared.pagination import PaginatedResponse, paginate
+from src.shared.responses import JSONBytesResponse
 
 router = APIRouter()
 
 
 @router.get("", response_model=PaginatedResponse[ScoreResponse])
 async def list_scores(
-    db: DbSession,
+    db: ReadDbSession,
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     query_id: int | None = Query(None, description="Filter by query ID"),
@@ -33,16 +34,18 @@ async def list_scores(
     )
 
 
-@router.get("/comparison", response_model=list[ComparisonRow])
+@router.get(
+    "/comparison", response_model=list[ComparisonRow], response_class=JSONBytesResponse,
+)
 async def get_comparison(
-    db: DbSession,
+    db: ReadDbSession,
     redis: RedisClient,
     category: str | None = Query(None, description="Filter by query category"),
     from_date: datetime | None = Query(None, alias="from", description="Start date"),
     to_date: datetime | None = Query(None, alias="to", description="End date"),
 ):
-    """Get competitive comparison: Levoit vs competitors per query (cached 1h)."""
+    """Get competitive comparison: brand→score map per query for every tracked brand (cached 1h)."""
     svc = ScoreService(db, redis=redis)
-    return await svc.get_comparison(
+    return JSONBytesResponse(await svc.get_comparison_json(
         category=category, from_date=from_date, to_date=to_date,
-    )
+    ))
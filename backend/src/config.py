@@ -15,6 +15,9 @@ class Settings(BaseSettings):
     app_env: str = Field("development", description="Runtime environment")
     app_debug: bool = Field(True, description="Enable debug mode")
     log_level: str = Field("INFO", description="Logging level")
+    startup_check_timeout: float = Field(
+        5.0, description="Seconds each dependency gets to answer its startup probe",
+    )
 
     # ── PostgreSQL ─────────────────────────────────────────
     database_url: str = Field(
@@ -26,6 +29,43 @@ class Settings(BaseSettings):
         description="Async SQLAlchemy connection string for TimescaleDB",
     )
 
+    # ── Read replicas (read-only API endpoints; empty = primary) ─
+    database_replica_urls: str = Field(
+        "", description="Comma-separated read replica URLs for the main DB",
+    )
+    timescale_replica_urls: str = Field(
+        "", description="Comma-separated read replica URLs for TimescaleDB",
+    )
+    replica_max_lag_s: float = Field(
+        10.0, description="Replicas further behind than this serve no reads",
+    )
+    replica_lag_check_interval_s: float = Field(
+        5.0, description="Seconds a replica's measured lag is trusted before re-checking",
+    )
+
+    # ── Connection pools (src/db/postgres.py engine profiles) ─
+    db_role: str = Field(
+        "api", description="Engine profile of this process: api | pipeline",
+    )
+    db_pool_size_api: int = Field(10, description="Pooled connections per API engine")
+    db_max_overflow_api: int = Field(10, description="Burst connections per API engine")
+    db_pool_size_pipeline: int = Field(4, description="Pooled connections per pipeline engine")
+    db_max_overflow_pipeline: int = Field(2, description="Burst connections per pipeline engine")
+    db_pool_timeout: float = Field(10.0, description="Seconds to wait for a free connection")
+    db_pool_recycle: int = Field(
+        1800, description="Seconds before a pooled connection is replaced (-1 never)",
+    )
+    db_pool_pre_ping: bool = Field(True, description="Ping connections on checkout")
+    db_statement_cache_size: int = Field(
+        100, description="asyncpg prepared statements cached per connection (0 behind PgBouncer)",
+    )
+    db_statement_timeout_ms_api: int = Field(
+        10_000, description="Server-side statement_timeout for API sessions (0 disables)",
+    )
+    db_statement_timeout_ms_pipeline: int = Field(
+        600_000, description="Server-side statement_timeout for pipeline sessions (0 disables)",
+    )
+
     # ── MongoDB ────────────────────────────────────────────
     mongo_url: str = Field(
         "mongodb://localhost:27017/levoit_geo",
@@ -50,8 +90,51 @@ class Settings(BaseSettings):
     rate_limit_perplexity: int = Field(20, description="Perplexity requests/hour")
     rate_limit_google_ai: int = Field(15, description="Google AI requests/hour")
 
+    # ── Distributed scrape queue (src/services/scraper/work_queue.py) ─
+    scrape_queue_enabled: bool = Field(
+        False, description="Flows enqueue scrapes for queue workers instead of scraping in-process",
+    )
+    scrape_queue_run_timeout_s: float = Field(
+        4 * 3600, description="Seconds a flow waits for workers before failing unreported tasks",
+    )
+    scrape_queue_claim_idle_s: float = Field(
+        600, description="Seconds a task may stay unacknowledged before another worker reclaims it",
+    )
+    scrape_worker_batch_size: int = Field(9, description="Tasks a worker executes concurrently")
+
+    # ── Cluster-wide scrape concurrency (distributed_semaphore.py) ─
+    scrape_cluster_concurrency: bool = Field(
+        False, description="Hold the per-platform scrape limit across all processes via Redis",
+    )
+    scrape_slot_lease_s: float = Field(
+        30.0, description="Seconds a crashed process keeps a scrape slot before it is freed",
+    )
+    scrape_slot_timeout_s: float = Field(
+        300.0, description="Seconds a task waits for a cluster scrape slot before it is skipped",
+    )
+
+    # ── Adaptive scrape concurrency (adaptive_concurrency.py) ─
+    scrape_adaptive_concurrency: bool = Field(
+        False, description="Tune per-platform concurrency from latency and errors (AIMD)",
+    )
+    scrape_concurrency_min: int = Field(1, description="Lowest adaptive concurrency per platform")
+    scrape_concurrency_max: int = Field(8, description="Highest adaptive concurrency per platform")
+    scrape_target_p95_s: float = Field(
+        30.0, description="Scrape p95 latency (s) up to which concurrency may grow",
+    )
+    scrape_max_error_rate: float = Field(
+        0.1, description="Scrape error rate up to which concurrency may grow",
+    )
+
     # ── Cost Control ───────────────────────────────────────
     daily_cost_budget_usd: float = Field(10.0, description="Daily cost budget in USD")
 
+    # ── Data retention (monthly partitions; 0 keeps all) ───
+    vis_ranking_retention_months: int = Field(24, description="Months of vis_ranking kept")
+    vis_score_retention_months: int = Field(36, description="Months of vis_score kept")
+    partition_archive: bool = Field(
+        True, description="Move expired partitions to the archive schema instead of dropping",
+    )
+
 
 settings = Settings()
@@ -0,0 +1,53 @@
+"""Startup dependency checks — every probe runs concurrently under its own timeout."""
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+Probe = Callable[[], Awaitable[object]]
+
+
+class DependencyCheckError(RuntimeError):
+    """One or more dependencies failed their startup probe."""
+
+    def __init__(self, failures: dict[str, BaseException]) -> None:
+        self.failures = failures
+        detail = "; ".join(f"{name}: {_describe(exc)}" for name, exc in failures.items())
+        super().__init__(f"Dependency checks failed — {detail}")
+
+
+def _describe(exc: BaseException) -> str:
+    if isinstance(exc, TimeoutError):
+        return "timed out"
+    return f"{type(exc).__name__}: {exc}"
+
+
+async def _timed(name: str, probe: Probe, timeout: float) -> float:
+    start = time.perf_counter()
+    await asyncio.wait_for(probe(), timeout)
+    elapsed = time.perf_counter() - start
+    logger.info("%s reachable in %.0f ms", name, elapsed * 1000)
+    return elapsed
+
+
+async def check_dependencies(probes: dict[str, Probe], *, timeout: float) -> dict[str, float]:
+    """Run every probe at once, each bounded by timeout seconds.
+
+    Startup costs the slowest dependency instead of the sum of all of them.
+    Returns seconds per dependency; raises DependencyCheckError naming every
+    failed or timed-out probe (not just the first).
+    """
+    names = list(probes)
+    results = await asyncio.gather(
+        *(_timed(name, probes[name], timeout) for name in names), return_exceptions=True,
+    )
+    failures = {
+        name: result for name, result in zip(names, results)
+        if isinstance(result, BaseException)
+    }
+    if failures:
+        raise DependencyCheckError(failures)
+    return dict(zip(names, results))
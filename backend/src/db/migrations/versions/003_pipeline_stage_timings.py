@@ -0,0 +1,25 @@
+"""Add per-stage timing breakdown to vis_pipeline_run.
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("vis_pipeline_run", sa.Column("stage_timings", JSONB, nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("vis_pipeline_run", "stage_timings")
@@ -0,0 +1,52 @@
+"""Create vis_ranking_latest and backfill it from vis_ranking.
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19
+
+One row per (query_id, platform, brand) holding its newest vis_ranking row,
+so "latest" reads are primary-key lookups whatever the size of the history.
+The pipeline keeps it current (src/pipelines/tasks.py).
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vis_ranking_latest",
+        sa.Column("query_id", sa.Integer(), sa.ForeignKey("vis_query.id"), primary_key=True),
+        sa.Column("platform", sa.String(20), primary_key=True),
+        sa.Column("brand", sa.String(100), primary_key=True),
+        sa.Column("ranking_id", sa.BigInteger(), nullable=False),
+        sa.Column("rank_position", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("snippet", sa.Text(), nullable=True),
+        sa.Column("source_urls", JSONB, server_default=sa.text("'[]'::jsonb")),
+        sa.Column("snapshot_id", sa.String(24), nullable=True),
+        sa.Column("scraped_at", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column("pipeline_run_id", sa.Integer(), nullable=True),
+    )
+
+    op.execute("""
+        INSERT INTO vis_ranking_latest
+            (ranking_id, query_id, platform, brand, rank_position, snippet,
+             source_urls, snapshot_id, scraped_at, pipeline_run_id)
+        SELECT DISTINCT ON (query_id, platform, brand)
+            id, query_id, platform, brand, rank_position, snippet,
+            source_urls, snapshot_id, scraped_at, pipeline_run_id
+        FROM vis_ranking
+        ORDER BY query_id, platform, brand, scraped_at DESC
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table("vis_ranking_latest")
@@ -0,0 +1,45 @@
+"""Create vis_comparison_snapshot for per-run materialized comparison rows.
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19
+
+Pipelines write the default comparison view (latest score per query and
+tracked brand) once per run and category; /scores/comparison without a date
+range serves the newest snapshot with a single indexed read.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "vis_comparison_snapshot",
+        sa.Column(
+            "pipeline_run_id", sa.Integer(),
+            sa.ForeignKey("vis_pipeline_run.id", ondelete="CASCADE"), primary_key=True,
+        ),
+        sa.Column("category", sa.String(50), primary_key=True),
+        sa.Column("rows", JSONB, nullable=False),
+        sa.Column(
+            "computed_at", sa.TIMESTAMP(timezone=True), nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+    op.create_index(
+        "idx_vis_comparison_snapshot_computed", "vis_comparison_snapshot",
+        [sa.text("computed_at DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("vis_comparison_snapshot")
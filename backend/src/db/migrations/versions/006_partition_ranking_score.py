@@ -0,0 +1,126 @@
+"""Partition vis_ranking / vis_score by month and add covering indexes.
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19
+
+Both tables are rebuilt as RANGE partitioned tables (scraped_at / computed_at),
+one partition per month from the oldest existing row through
+PARTITION_MONTHS_AHEAD months ahead, plus a DEFAULT partition. Existing rows
+and id sequences are carried over. The primary key becomes (id, <partition key>)
+because PostgreSQL requires the partition key in unique constraints.
+
+New indexes (created on the parent, so every partition inherits them):
+  - idx_vis_ranking_run_query: (pipeline_run_id, query_id)
+      INCLUDE (platform, brand, rank_position)
+  - idx_vis_ranking_query_plat_brand: (query_id, platform, brand, scraped_at DESC)
+      INCLUDE (rank_position)
+  - idx_vis_score_query_brand: now INCLUDE (visibility_score) for index-only comparisons
+
+Retention: src/db/partitions.maintain_partitions (daily_full_scan) keeps future
+partitions ready and detaches months past settings.vis_*_retention_months into
+the "archive" schema (or drops them when settings.partition_archive is off).
+"""
+
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from src.db.partitions import (
+    ARCHIVE_SCHEMA,
+    PARTITION_MONTHS_AHEAD,
+    PARTITIONED_TABLES,
+    add_months,
+    create_default_partition_sql,
+    create_partition_sql,
+    month_start,
+)
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Indexes per table, recreated on the partitioned parent
+INDEXES: dict[str, list[str]] = {
+    "vis_ranking": [
+        "CREATE INDEX idx_vis_ranking_query_time ON vis_ranking (query_id, scraped_at DESC)",
+        "CREATE INDEX idx_vis_ranking_brand_time ON vis_ranking (brand, scraped_at DESC)",
+        "CREATE INDEX idx_vis_ranking_run_query ON vis_ranking (pipeline_run_id, query_id) "
+        "INCLUDE (platform, brand, rank_position)",
+        "CREATE INDEX idx_vis_ranking_query_plat_brand "
+        "ON vis_ranking (query_id, platform, brand, scraped_at DESC) INCLUDE (rank_position)",
+    ],
+    "vis_score": [
+        "CREATE INDEX idx_vis_score_query_brand ON vis_score (query_id, brand, computed_at DESC) "
+        "INCLUDE (visibility_score)",
+    ],
+}
+
+# Pre-006 indexes, restored on downgrade
+LEGACY_INDEXES: dict[str, list[str]] = {
+    "vis_ranking": [
+        "CREATE INDEX idx_vis_ranking_query_time ON vis_ranking (query_id, scraped_at DESC)",
+        "CREATE INDEX idx_vis_ranking_brand_time ON vis_ranking (brand, scraped_at DESC)",
+    ],
+    "vis_score": [
+        "CREATE INDEX idx_vis_score_query_brand ON vis_score (query_id, brand, computed_at DESC)",
+    ],
+}
+
+
+def _detach_old(table: str) -> str:
+    """Rename the table (and its pkey index) out of the way, keeping the id sequence."""
+    old = f"{table}_old"
+    op.execute(f"ALTER TABLE {table} RENAME TO {old}")
+    op.execute(f"ALTER INDEX {table}_pkey RENAME TO {old}_pkey")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY NONE")
+    for statement in LEGACY_INDEXES[table] + INDEXES[table]:
+        index_name = statement.split()[2]
+        op.execute(f"DROP INDEX IF EXISTS {index_name}")
+    return old
+
+
+def _finish(table: str, old: str, indexes: list[str]) -> None:
+    op.execute(f"INSERT INTO {table} SELECT * FROM {old}")
+    op.execute(f"DROP TABLE {old}")
+    op.execute(f"ALTER SEQUENCE {table}_id_seq OWNED BY {table}.id")
+    op.execute(f"ALTER TABLE {table} ADD FOREIGN KEY (query_id) REFERENCES vis_query (id)")
+    for statement in indexes:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    op.execute(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}")
+    current = month_start(datetime.now(timezone.utc))
+
+    for table, column in PARTITIONED_TABLES.items():
+        old = _detach_old(table)
+
+        op.execute(
+            f"CREATE TABLE {table} ("
+            f"LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id, {column})"
+            f") PARTITION BY RANGE ({column})"
+        )
+
+        oldest = op.get_bind().execute(sa.text(f"SELECT MIN({column}) FROM {old}")).scalar()
+        if oldest is not None:
+            month = min(month_start(oldest.astimezone(timezone.utc)), current)
+        else:
+            month = current
+        while month <= add_months(current, PARTITION_MONTHS_AHEAD):
+            op.execute(create_partition_sql(table, month))
+            month = add_months(month, 1)
+        op.execute(create_default_partition_sql(table))
+
+        _finish(table, old, INDEXES[table])
+
+
+def downgrade() -> None:
+    for table in PARTITIONED_TABLES:
+        old = _detach_old(table)
+        op.execute(f"CREATE TABLE {table} (LIKE {old} INCLUDING DEFAULTS, PRIMARY KEY (id))")
+        # Rows in archived (detached) partitions are not restored
+        _finish(table, old, LEGACY_INDEXES[table])
@@ -0,0 +1,46 @@
+"""Tune ts_search_rank chunk interval and enable native compression.
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19
+
+NOTE: This migration runs against the levoit_ts database (like 002).
+
+  - chunk_time_interval → 14 days (new chunks; sizing in src/db/timescale.py)
+  - compression segmented by (query_id, brand), ordered by time DESC
+  - compression policy for chunks older than 3 days
+
+Existing chunks past the threshold are compressed by the policy's first run.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from src.config import settings
+from src.db.timescale import compression_sql, decompression_sql
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _run(statements: list[str]) -> None:
+    ts_url = settings.timescale_url.replace("postgresql+asyncpg://", "postgresql+psycopg2://")
+    bind = sa.create_engine(ts_url)
+
+    with bind.connect() as conn:
+        for statement in statements:
+            conn.execute(sa.text(statement))
+            conn.commit()
+
+    bind.dispose()
+
+
+def upgrade() -> None:
+    _run(compression_sql())
+
+
+def downgrade() -> None:
+    _run(decompression_sql())
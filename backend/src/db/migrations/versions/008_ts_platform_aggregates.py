@@ -0,0 +1,75 @@
+"""Per-platform and brand-wide continuous aggregates for trend dashboards.
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19
+
+NOTE: This migration runs against the levoit_ts database (like 002 and 007).
+
+  - ts_daily_platform_rank: day × query_id × platform × brand
+  - ts_daily_brand_rank: day × platform × brand, across all queries
+  - both refreshed hourly over the last 3 days (same policy as ts_daily_rank),
+    with a lookup index matching RankingService.get_trends
+  - materialized_only = false on all three aggregates, so the open day is served
+    from raw rows while closed days only ever read materialized buckets
+  - idx_ts_rank_brand on ts_search_rank (brand, time DESC) for the real-time part
+    of the brand-wide aggregate
+
+The new aggregates are created empty and then backfilled over their full
+range with refresh_continuous_aggregate(); the policy only covers the last
+3 days, so without the backfill trends would lose all older history. The
+refresh cannot run inside a transaction, so statements run in autocommit.
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+
+from src.config import settings
+from src.db.timescale import continuous_aggregate_sql
+
+revision: str = "008"
+down_revision: Union[str, None] = "007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+NEW_AGGREGATES: tuple[str, ...] = ("ts_daily_platform_rank", "ts_daily_brand_rank")
+
+
+def _run(statements: list[str]) -> None:
+    ts_url = settings.timescale_url.replace("postgresql+asyncpg://", "postgresql+psycopg2://")
+    bind = sa.create_engine(ts_url)
+
+    with bind.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for statement in statements:
+            conn.execute(sa.text(statement))
+
+    bind.dispose()
+
+
+def upgrade() -> None:
+    statements = [
+        "ALTER MATERIALIZED VIEW ts_daily_rank SET (timescaledb.materialized_only = false)",
+        "CREATE INDEX IF NOT EXISTS idx_ts_rank_brand ON ts_search_rank (brand, time DESC)",
+    ]
+    for view in NEW_AGGREGATES:
+        statements += continuous_aggregate_sql(view)
+    # Materialize all existing history (NULL window = whole range)
+    statements += [
+        f"CALL refresh_continuous_aggregate('{view}', NULL, NULL)" for view in NEW_AGGREGATES
+    ]
+    _run(statements)
+
+
+def downgrade() -> None:
+    statements = []
+    for view in NEW_AGGREGATES:
+        statements += [
+            f"SELECT remove_continuous_aggregate_policy('{view}', if_exists => TRUE)",
+            f"DROP MATERIALIZED VIEW IF EXISTS {view}",
+        ]
+    statements += [
+        "DROP INDEX IF EXISTS idx_ts_rank_brand",
+        "ALTER MATERIALIZED VIEW ts_daily_rank SET (timescaledb.materialized_only = true)",
+    ]
+    _run(statements)
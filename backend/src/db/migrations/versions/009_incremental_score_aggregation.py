@@ -0,0 +1,77 @@
+"""Incremental score aggregation: bucket-keyed upserts and per-period watermarks.
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19
+
+  - vis_score.sample_count: raw samples behind a score, so aggregated buckets
+    can be merged incrementally (existing rows count as one sample)
+  - uq_vis_score_bucket: unique (query_id, brand, period, computed_at) for every
+    non-raw period; aggregated rows store their bucket start in computed_at,
+    which keeps the partition key inside the unique index
+  - vis_aggregation_watermark: per-period upper bound of ts_search_rank time
+    already aggregated (src/services/aggregation_service.py)
+
+Existing period='daily' rows were appended on every daily run: the newest one
+per query, brand and UTC day is kept and moved to the day's start.
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = "009"
+down_revision: Union[str, None] = "008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "vis_score",
+        sa.Column("sample_count", sa.Integer(), nullable=False, server_default="1"),
+    )
+
+    op.execute("""
+        DELETE FROM vis_score s
+        USING (
+            SELECT id, computed_at,
+                   ROW_NUMBER() OVER (
+                       PARTITION BY query_id, brand,
+                                    date_trunc('day', computed_at AT TIME ZONE 'UTC')
+                       ORDER BY computed_at DESC
+                   ) AS rn
+            FROM vis_score
+            WHERE period = 'daily'
+        ) d
+        WHERE s.id = d.id AND s.computed_at = d.computed_at AND d.rn > 1
+    """)
+    op.execute("""
+        UPDATE vis_score
+        SET computed_at = date_trunc('day', computed_at AT TIME ZONE 'UTC') AT TIME ZONE 'UTC'
+        WHERE period = 'daily'
+    """)
+
+    op.create_index(
+        "uq_vis_score_bucket", "vis_score",
+        ["query_id", "brand", "period", "computed_at"],
+        unique=True, postgresql_where=sa.text("period <> 'raw'"),
+    )
+
+    op.create_table(
+        "vis_aggregation_watermark",
+        sa.Column("period", sa.String(10), primary_key=True),
+        sa.Column("watermark", sa.TIMESTAMP(timezone=True), nullable=False),
+        sa.Column(
+            "updated_at", sa.TIMESTAMP(timezone=True), nullable=False,
+            server_default=sa.text("now()"),
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("vis_aggregation_watermark")
+    op.drop_index("uq_vis_score_bucket", table_name="vis_score")
+    op.execute("DELETE FROM vis_score WHERE period IN ('weekly', 'monthly')")
+    op.drop_column("vis_score", "sample_count")
@@ -0,0 +1,178 @@
+"""Monthly range partitions for vis_ranking and vis_score — creation and retention.
+
+Both tables are partitioned by month on their timestamp column (migration 006),
+with a DEFAULT partition catching anything outside the created range.
+maintain_partitions() runs from daily_full_scan:
+
+  - creates partitions up to PARTITION_MONTHS_AHEAD months ahead, first moving
+    any rows the DEFAULT partition already holds for that month (PostgreSQL
+    refuses to attach a range the default partition has rows for)
+  - detaches partitions older than the table's retention window and either
+    moves them to the ARCHIVE_SCHEMA (to be dumped and dropped by ops) or drops them
+"""
+
+import logging
+from datetime import date, datetime, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Partitioned table → range partition key column
+PARTITIONED_TABLES: dict[str, str] = {
+    "vis_ranking": "scraped_at",
+    "vis_score": "computed_at",
+}
+
+# Months of empty partitions kept ready so inserts never land in DEFAULT
+PARTITION_MONTHS_AHEAD = 3
+
+# Detached partitions are parked here when archiving instead of dropping
+ARCHIVE_SCHEMA = "archive"
+
+
+def month_start(value: datetime | date) -> date:
+    """First day of the month containing value."""
+    return date(value.year, value.month, 1)
+
+
+def add_months(month: date, months: int) -> date:
+    """Shift a month-start date by a (possibly negative) number of months."""
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table: str, month: date) -> str:
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table: str) -> str:
+    return f"{table}_default"
+
+
+def partition_month(table: str, name: str) -> date | None:
+    """Parse the month back out of a partition name; None for DEFAULT or foreign names."""
+    suffix = name.removeprefix(f"{table}_p")
+    if suffix == name or len(suffix) != 6 or not suffix.isdigit():
+        return None
+    return date(int(suffix[:4]), int(suffix[4:]), 1)
+
+
+def month_bound(month: date) -> str:
+    """Timestamptz literal for a month boundary, pinned to UTC whatever the session TimeZone."""
+    return f"'{month.isoformat()} 00:00:00+00'"
+
+
+def create_partition_sql(table: str, month: date) -> str:
+    """DDL for an empty month partition (safe while DEFAULT holds no rows for it)."""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(table, month)} "
+        f"PARTITION OF {table} "
+        f"FOR VALUES FROM ({month_bound(month)}) TO ({month_bound(add_months(month, 1))})"
+    )
+
+
+def create_default_partition_sql(table: str) -> str:
+    name = default_partition_name(table)
+    return f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table} DEFAULT"
+
+
+def retention_months() -> dict[str, int]:
+    """Per-table retention window from settings."""
+    return {
+        "vis_ranking": settings.vis_ranking_retention_months,
+        "vis_score": settings.vis_score_retention_months,
+    }
+
+
+async def _partitions(db: AsyncSession, table: str) -> list[str]:
+    result = await db.execute(
+        text(
+            "SELECT c.relname FROM pg_inherits i "
+            "JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass)"
+        ),
+        {"table": table},
+    )
+    return [row[0] for row in result.all()]
+
+
+async def _create_partition(db: AsyncSession, table: str, month: date) -> None:
+    """Create one month partition, draining matching rows out of DEFAULT first."""
+    name = partition_name(table, month)
+    column = PARTITIONED_TABLES[table]
+    lower, upper = month_bound(month), month_bound(add_months(month, 1))
+
+    await db.execute(text(
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+    ))
+    await db.execute(text(
+        f"WITH moved AS ("
+        f"DELETE FROM {default_partition_name(table)} "
+        f"WHERE {column} >= {lower} AND {column} < {upper} RETURNING *"
+        f") INSERT INTO {name} SELECT * FROM moved"
+    ))
+    await db.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} FOR VALUES FROM ({lower}) TO ({upper})"
+    ))
+
+
+async def maintain_partitions(
+    db: AsyncSession,
+    *,
+    now: datetime | None = None,
+    months_ahead: int = PARTITION_MONTHS_AHEAD,
+    retention: dict[str, int] | None = None,
+    archive: bool | None = None,
+) -> dict[str, list[str]]:
+    """Create upcoming month partitions and retire expired ones.
+
+    Args:
+        db: PostgreSQL session (committed on return).
+        now: Reference time (defaults to now, UTC).
+        months_ahead: Future months to keep partitioned beyond the current one.
+        retention: Months of history kept per table (defaults to settings).
+        archive: Move expired partitions to ARCHIVE_SCHEMA instead of dropping them
+            (defaults to settings.partition_archive).
+
+    Returns:
+        {"created": [...], "archived": [...], "dropped": [...]} partition names.
+    """
+    current = month_start(now or datetime.now(timezone.utc))
+    retention = retention if retention is not None else retention_months()
+    archive = settings.partition_archive if archive is None else archive
+    report: dict[str, list[str]] = {"created": [], "archived": [], "dropped": []}
+
+    for table in PARTITIONED_TABLES:
+        existing = set(await _partitions(db, table))
+
+        for offset in range(months_ahead + 1):
+            month = add_months(current, offset)
+            if partition_name(table, month) not in existing:
+                await _create_partition(db, table, month)
+                report["created"].append(partition_name(table, month))
+
+        keep = retention.get(table)
+        if not keep:
+            continue
+        # A partition expires once its whole month is older than the window
+        cutoff = add_months(current, -keep)
+        for name in sorted(existing):
+            month = partition_month(table, name)
+            if month is None or month >= cutoff:
+                continue
+            await db.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name}"))
+            if archive:
+                await db.execute(text(f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+                report["archived"].append(name)
+            else:
+                await db.execute(text(f"DROP TABLE {name}"))
+                report["dropped"].append(name)
+
+    await db.commit()
+    if any(report.values()):
+        logger.info("Partition maintenance: %s", report)
+    return report
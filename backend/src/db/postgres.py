@@ -1,31 +1,120 @@
 """Async SQLAlchemy engines and session factories for PostgreSQL + TimescaleDB."""
 
 from collections.abc import AsyncGenerator
+from typing import Any
 
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
 
-from src.config import settings
+from src.config import Settings, settings
+from src.db.replicas import ReplicaRouter, parse_urls
+from src.shared.metrics import DB_READ_ROUTES
 
-# ── Main PostgreSQL engine (levoit_geo) ────────────────────
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.app_debug,
-    pool_size=5,
-    max_overflow=10,
-)
+# Engine profiles: the API serves many short reads, pipeline workers run few long writes
+DB_ROLES: tuple[str, ...] = ("api", "pipeline")
 
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
-# ── TimescaleDB engine (levoit_ts) ─────────────────────────
-ts_engine = create_async_engine(
-    settings.timescale_url,
-    echo=settings.app_debug,
-    pool_size=5,
-    max_overflow=10,
-)
+def engine_options(role: str | None = None, config: Settings = settings) -> dict[str, Any]:
+    """create_async_engine kwargs for a process role (defaults to config.db_role).
+
+    Pool sizing and the server-side statement_timeout come from the role's
+    settings; application_name tags every connection so pg_stat_activity shows
+    which process holds it. SQL echo only ever runs in development.
+    """
+    role = role or config.db_role
+    if role not in DB_ROLES:
+        raise ValueError(f"Unknown db role {role!r}; expected one of {', '.join(DB_ROLES)}")
+    return {
+        "echo": config.app_debug and config.app_env == "development",
+        "pool_size": getattr(config, f"db_pool_size_{role}"),
+        "max_overflow": getattr(config, f"db_max_overflow_{role}"),
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+        "connect_args": {
+            "statement_cache_size": config.db_statement_cache_size,
+            "server_settings": {
+                "application_name": f"levoit-{role}",
+                "statement_timeout": str(getattr(config, f"db_statement_timeout_ms_{role}")),
+            },
+        },
+    }
+
+
+def create_engine(url: str, role: str | None = None) -> AsyncEngine:
+    """Async engine for url with the role's profile (see engine_options)."""
+    return create_async_engine(url, **engine_options(role))
+
+
+# ── Engines (levoit_geo + levoit_ts), created on first use ─
+# Name → settings attribute holding the URL
+ENGINE_URLS: dict[str, str] = {"postgres": "database_url", "timescale": "timescale_url"}
+# Name → settings attribute holding its comma-separated read replica URLs
+REPLICA_URLS: dict[str, str] = {
+    "postgres": "database_replica_urls",
+    "timescale": "timescale_replica_urls",
+}
+
+_engines: dict[str, AsyncEngine] = {}
+_session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+_routers: dict[str, ReplicaRouter] = {}
+
+
+def get_engine(name: str = "postgres") -> AsyncEngine:
+    """Process-wide engine for "postgres" or "timescale".
+
+    Built lazily (the lifespan creates both at startup), so importing this
+    module never loads the asyncpg dialect.
+    """
+    if name not in _engines:
+        _engines[name] = create_engine(getattr(settings, ENGINE_URLS[name]))
+        _session_factories[name] = async_sessionmaker(
+            _engines[name], class_=AsyncSession, expire_on_commit=False,
+        )
+    return _engines[name]
+
+
+def get_session_factory(name: str = "postgres") -> async_sessionmaker[AsyncSession]:
+    get_engine(name)
+    return _session_factories[name]
 
-ts_async_session = async_sessionmaker(ts_engine, class_=AsyncSession, expire_on_commit=False)
+
+def get_replica_router(name: str = "postgres") -> ReplicaRouter:
+    """Replica router for an engine name; routes everything to the primary without replicas."""
+    if name not in _routers:
+        _routers[name] = ReplicaRouter(
+            [create_engine(url) for url in parse_urls(getattr(settings, REPLICA_URLS[name]))],
+            max_lag_s=settings.replica_max_lag_s,
+            check_interval_s=settings.replica_lag_check_interval_s,
+        )
+    return _routers[name]
+
+
+def active_engines() -> dict[str, AsyncEngine]:
+    """Both primaries plus the replicas routed so far as "<name>_replica<i>" (pool gauges)."""
+    engines = {name: get_engine(name) for name in ENGINE_URLS}
+    for name, router in _routers.items():
+        for i, engine in enumerate(router.engines):
+            engines[f"{name}_replica{i}"] = engine
+    return engines
+
+
+async def dispose_engines() -> None:
+    """Close every engine created so far; the next get_engine() builds a fresh one."""
+    engines = list(_engines.values())
+    routers = list(_routers.values())
+    _engines.clear()
+    _session_factories.clear()
+    _routers.clear()
+    for engine in engines:
+        await engine.dispose()
+    for router in routers:
+        await router.dispose()
 
 
 # ── Declarative base ───────────────────────────────────────
@@ -35,10 +124,33 @@ class Base(DeclarativeBase):
 
 # ── Session generators ─────────────────────────────────────
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async with async_session() as session:
+    async with get_session_factory("postgres")() as session:
         yield session
 
 
 async def get_ts_db() -> AsyncGenerator[AsyncSession, None]:
-    async with ts_async_session() as session:
+    async with get_session_factory("timescale")() as session:
+        yield session
+
+
+async def _read_session(name: str) -> AsyncGenerator[AsyncSession, None]:
+    replica = await get_replica_router(name).pick()
+    DB_READ_ROUTES.inc(engine=name, target="primary" if replica is None else "replica")
+    if replica is None:
+        async with get_session_factory(name)() as session:
+            yield session
+        return
+    async with AsyncSession(replica, expire_on_commit=False) as session:
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session: a fresh enough replica when configured, else the primary."""
+    async for session in _read_session("postgres"):
+        yield session
+
+
+async def get_read_ts_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only TimescaleDB session: a fresh enough replica when configured, else the primary."""
+    async for session in _read_session("timescale"):
         yield session
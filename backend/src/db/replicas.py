@@ -0,0 +1,110 @@
+"""Read-replica routing for read-only API sessions, with lag-aware fallback to the primary.
+
+Each engine name ("postgres", "timescale") may list streaming replicas in
+settings. Read-only endpoints take their session from get_read_db() /
+get_read_ts_db() (src/db/postgres.py), which asks the engine's ReplicaRouter
+for a replica:
+
+  - replicas are used round-robin among those whose replay lag is within
+    REPLICA_MAX_LAG_S; the lag is measured on the replica itself and trusted
+    for REPLICA_LAG_CHECK_INTERVAL_S
+  - an unreachable replica counts as infinitely behind until its next check
+  - with no healthy replica (or none configured) the primary serves the read
+
+Writes never go through the router. Endpoints that must see their own
+writes immediately (e.g. GET /queries/{id} after a PUT) stay on the primary.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Seconds the replica has to answer the lag probe before it counts as down
+LAG_PROBE_TIMEOUT_S = 1.0
+
+# Replay lag in seconds; 0 when every received WAL record is replayed, so an
+# idle primary (no new transactions to replay) does not look like lag
+LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+    END
+"""
+
+
+def parse_urls(value: str) -> list[str]:
+    """Split a comma-separated settings value into URLs."""
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+@dataclass
+class _Replica:
+    engine: AsyncEngine
+    lag_s: float = math.inf
+    checked_at: float = -math.inf
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+class ReplicaRouter:
+    """Picks a sufficiently fresh replica engine for a read, or None for the primary."""
+
+    def __init__(
+        self,
+        engines: list[AsyncEngine],
+        *,
+        max_lag_s: float,
+        check_interval_s: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._replicas = [_Replica(engine) for engine in engines]
+        self._max_lag_s = max_lag_s
+        self._check_interval_s = check_interval_s
+        self._clock = clock
+        self._next = 0
+
+    @property
+    def engines(self) -> list[AsyncEngine]:
+        return [replica.engine for replica in self._replicas]
+
+    async def pick(self) -> AsyncEngine | None:
+        """Next healthy replica in round-robin order; None when all lag or are down."""
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[self._next]
+            self._next = (self._next + 1) % len(self._replicas)
+            if await self._lag(replica) <= self._max_lag_s:
+                return replica.engine
+        return None
+
+    async def _lag(self, replica: _Replica) -> float:
+        if self._clock() - replica.checked_at < self._check_interval_s:
+            return replica.lag_s
+        async with replica.lock:
+            # Another request may have refreshed it while we waited for the lock
+            if self._clock() - replica.checked_at >= self._check_interval_s:
+                replica.lag_s = await self._measure(replica.engine)
+                replica.checked_at = self._clock()
+        return replica.lag_s
+
+    async def _measure(self, engine: AsyncEngine) -> float:
+        try:
+            async with asyncio.timeout(LAG_PROBE_TIMEOUT_S):
+                async with engine.connect() as conn:
+                    lag = (await conn.execute(text(LAG_SQL))).scalar()
+        except Exception as e:
+            logger.warning("Replica %s unavailable: %s", engine.url.host, e)
+            return math.inf
+        # NULL: the replica has not replayed any transaction yet
+        return math.inf if lag is None else float(lag)
+
+    async def dispose(self) -> None:
+        for replica in self._replicas:
+            await replica.engine.dispose()
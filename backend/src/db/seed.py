@@ -1,9 +1,13 @@
 """Seed script — populate all tables with realistic sample data.
 
-Usage: uv run python -m src.db.seed
+Usage:
+    uv run python -m src.db.seed                       # 10 queries + 30 days of history
+    uv run python -m src.db.seed --load-queries 5000   # N synthetic queries for load tests
 """
 
+import argparse
 import asyncio
+import json
 import random
 from datetime import datetime, timedelta, timezone
 
@@ -12,6 +16,7 @@ from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from src.config import settings
+from src.pipelines.tasks import rebuild_ranking_latest_impl
 
 # ── Constants ─────────────────────────────────────────────
 
@@ -59,6 +64,74 @@ SNIPPETS = {
 }
 
 
+# ── Load-test queries ─────────────────────────────────────
+
+# Competitors added on top of BRANDS for load-test queries (0-4 per query)
+LOAD_EXTRA_BRANDS = ["Winix", "Blueair", "Molekule", "Rabbit Air"]
+
+LOAD_QUERY_TEMPLATES = {
+    "product_comparison": [
+        "best air purifier for {room}",
+        "{brand} vs {other} air purifier",
+        "top rated {feature} air purifiers",
+    ],
+    "brand_search": [
+        "is {brand} a good brand",
+        "{brand} air purifier review",
+        "{brand} {feature} air purifier worth it",
+    ],
+    "category_search": [
+        "air purifier for {need}",
+        "{room} air purifier with {feature}",
+    ],
+    "general": [
+        "do air purifiers help with {need}",
+        "how to choose an air purifier for {room}",
+    ],
+}
+
+_ROOMS = ["bedroom", "living room", "nursery", "office", "basement", "large rooms", "small rooms"]
+_FEATURES = ["HEPA", "smart", "quiet", "UV-C", "carbon filter", "low-energy", "portable"]
+_NEEDS = ["allergies", "pet hair", "smoke", "mold", "dust", "asthma", "wildfire smoke"]
+
+# Same mix as production: few high-priority queries, most medium/low
+_PRIORITY_WEIGHTS = {"high": 0.2, "medium": 0.4, "low": 0.4}
+
+
+def generate_load_queries(n: int, rng: random.Random | None = None) -> list[dict]:
+    """Generate n distinct synthetic queries shaped like QUERIES, with per-query brand lists."""
+    rng = rng or random.Random(42)
+    all_brands = BRANDS + LOAD_EXTRA_BRANDS
+    priorities = list(_PRIORITY_WEIGHTS)
+    weights = list(_PRIORITY_WEIGHTS.values())
+
+    queries: list[dict] = []
+    seen: set[str] = set()
+    for i in range(n):
+        category = rng.choice(list(LOAD_QUERY_TEMPLATES))
+        brand, other = rng.sample(all_brands, 2)
+        query_text = rng.choice(LOAD_QUERY_TEMPLATES[category]).format(
+            room=rng.choice(_ROOMS),
+            feature=rng.choice(_FEATURES),
+            need=rng.choice(_NEEDS),
+            brand=brand,
+            other=other,
+        )
+        # Templates never contain "#", so the suffixed text is always unique
+        if query_text in seen:
+            query_text = f"{query_text} #{i}"
+        seen.add(query_text)
+
+        extra = rng.sample(LOAD_EXTRA_BRANDS, rng.randint(0, len(LOAD_EXTRA_BRANDS)))
+        queries.append({
+            "text": query_text,
+            "category": category,
+            "priority": rng.choices(priorities, weights)[0],
+            "brands": BRANDS + extra,
+        })
+    return queries
+
+
 def _rand_rank(brand: str, platform: str, day_offset: int) -> int:
     """Generate a somewhat realistic rank with brand/platform bias."""
     base = {
@@ -84,6 +157,72 @@ def _score_from_rank(rank: int) -> float:
     return round(max(0.0, min(100.0, raw)), 1)
 
 
+async def _clean_all(pg_engine, ts_engine, mongo_db) -> None:
+    """Delete all seeded rows (dependents first) and reset the id sequences."""
+    async with pg_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
+        await conn.execute(text("DELETE FROM vis_ranking"))
+        await conn.execute(text("DELETE FROM vis_pipeline_run"))
+        await conn.execute(text("DELETE FROM vis_brand"))
+        await conn.execute(text("DELETE FROM vis_query"))
+        await conn.execute(text("ALTER SEQUENCE vis_query_id_seq RESTART WITH 1"))
+        await conn.execute(text("ALTER SEQUENCE vis_brand_id_seq RESTART WITH 1"))
+
+    async with ts_engine.begin() as conn:
+        await conn.execute(text("DELETE FROM ts_search_rank"))
+
+    await mongo_db["snapshots"].delete_many({})
+
+
+async def seed_load_queries(session: AsyncSession, n: int, batch_size: int = 1000) -> int:
+    """Insert n synthetic queries (plus vis_brand rows) in batches; returns rows inserted."""
+    queries = generate_load_queries(n)
+    for start in range(0, len(queries), batch_size):
+        batch = queries[start:start + batch_size]
+        await session.execute(text("""
+            INSERT INTO vis_query (query_text, category, priority, brands)
+            VALUES (:text, :category, :priority, :brands)
+        """), [
+            {
+                "text": q["text"],
+                "category": q["category"],
+                "priority": q["priority"],
+                "brands": json.dumps(q["brands"]),
+            }
+            for q in batch
+        ])
+
+    await session.execute(text("""
+        INSERT INTO vis_brand (name, is_primary) VALUES (:name, :is_primary)
+    """), [
+        {"name": brand, "is_primary": brand == "Levoit"}
+        for brand in BRANDS + LOAD_EXTRA_BRANDS
+    ])
+    await session.commit()
+    return len(queries)
+
+
+async def seed_load(n: int) -> None:
+    """Replace all data with n synthetic queries and no history (load-test mode)."""
+    pg_engine = create_async_engine(settings.database_url, echo=False)
+    session_factory = async_sessionmaker(pg_engine, class_=AsyncSession, expire_on_commit=False)
+    ts_engine = create_async_engine(settings.timescale_url, echo=False)
+    mongo_client = AsyncIOMotorClient(settings.mongo_url)
+
+    print("Cleaning existing data...")
+    await _clean_all(pg_engine, ts_engine, mongo_client[settings.mongo_db])
+
+    print(f"Seeding {n} load-test queries...")
+    async with session_factory() as session:
+        count = await seed_load_queries(session, n)
+    print(f"  vis_query:        {count}")
+
+    await pg_engine.dispose()
+    await ts_engine.dispose()
+    mongo_client.close()
+
+
 async def seed() -> None:
     """Populate PostgreSQL + TimescaleDB + MongoDB with sample data."""
     print("Connecting to PostgreSQL...")
@@ -102,19 +241,7 @@ async def seed() -> None:
 
     # ── Clean existing data ────────────────────────────────
     print("Cleaning existing data...")
-    async with pg_engine.begin() as conn:
-        await conn.execute(text("DELETE FROM vis_score"))
-        await conn.execute(text("DELETE FROM vis_ranking"))
-        await conn.execute(text("DELETE FROM vis_pipeline_run"))
-        await conn.execute(text("DELETE FROM vis_brand"))
-        await conn.execute(text("DELETE FROM vis_query"))
-        await conn.execute(text("ALTER SEQUENCE vis_query_id_seq RESTART WITH 1"))
-        await conn.execute(text("ALTER SEQUENCE vis_brand_id_seq RESTART WITH 1"))
-
-    async with ts_engine.begin() as conn:
-        await conn.execute(text("DELETE FROM ts_search_rank"))
-
-    await mongo_db["snapshots"].delete_many({})
+    await _clean_all(pg_engine, ts_engine, mongo_db)
 
     # ── Seed queries ───────────────────────────────────────
     print(f"Seeding {len(QUERIES)} queries...")
@@ -228,6 +355,10 @@ async def seed() -> None:
                             })
                             await ts_session.commit()
 
+    # ── Latest rankings (normally upserted by the pipeline) ─
+    async with session_factory() as session:
+        await rebuild_ranking_latest_impl(session)
+
     # ── Compute competitive gaps for latest scores ─────────
     print("Computing competitive gaps...")
     async with session_factory() as session:
@@ -281,5 +412,15 @@ async def seed() -> None:
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m src.db.seed")
+    parser.add_argument(
+        "--load-queries", type=int, metavar="N",
+        help="seed N synthetic queries (no history) instead of the sample data",
+    )
+    args = parser.parse_args()
+
     random.seed(42)  # Reproducible data
-    asyncio.run(seed())
+    if args.load_queries:
+        asyncio.run(seed_load(args.load_queries))
+    else:
+        asyncio.run(seed())
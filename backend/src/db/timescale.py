@@ -0,0 +1,102 @@
+"""ts_search_rank hypertable storage settings — chunks, compression, continuous aggregates.
+
+Shared by migrations 007/008 and the trend-query benchmark (benchmarks/trends.py)
+so both apply exactly the same layout.
+
+Sizing: ~500 active queries × 3 platforms × ~6 brands × 5 runs/day is ~45k rows
+per day. 14-day chunks (~630k rows, well under 25% of memory with indexes) keep
+a one-year trend scan to ~26 chunks instead of ~52, and give each compressed
+(query_id, brand) segment ~200 rows per batch — enough for the columnar
+encodings to pay off.
+"""
+
+# New chunks only; existing chunks keep the interval they were created with
+CHUNK_INTERVAL = "14 days"
+
+# get_trends filters on query_id (+ brand list) and scans time ranges per brand
+COMPRESS_SEGMENTBY = "query_id, brand"
+COMPRESS_ORDERBY = "time DESC"
+
+# Chunks whose whole range is older than this are compressed by the policy job.
+# Late rows (quarantine reprocessing) still insert into compressed chunks (TimescaleDB ≥ 2.11).
+COMPRESS_AFTER = "3 days"
+
+# TimescaleDB's default, restored on downgrade
+DEFAULT_CHUNK_INTERVAL = "7 days"
+
+
+def compression_sql(table: str = "ts_search_rank") -> list[str]:
+    """Statements applying the chunk interval, compression settings and policy to a hypertable."""
+    return [
+        f"SELECT set_chunk_time_interval('{table}', INTERVAL '{CHUNK_INTERVAL}')",
+        f"ALTER TABLE {table} SET ("
+        f"timescaledb.compress, "
+        f"timescaledb.compress_segmentby = '{COMPRESS_SEGMENTBY}', "
+        f"timescaledb.compress_orderby = '{COMPRESS_ORDERBY}')",
+        f"SELECT add_compression_policy('{table}', INTERVAL '{COMPRESS_AFTER}', "
+        f"if_not_exists => TRUE)",
+    ]
+
+
+def decompression_sql(table: str = "ts_search_rank") -> list[str]:
+    """Inverse of compression_sql: drop the policy, decompress chunks, disable compression."""
+    return [
+        f"SELECT remove_compression_policy('{table}', if_exists => TRUE)",
+        f"SELECT decompress_chunk(c, if_compressed => TRUE) FROM show_chunks('{table}') c",
+        f"ALTER TABLE {table} SET (timescaledb.compress = false)",
+        f"SELECT set_chunk_time_interval('{table}', INTERVAL '{DEFAULT_CHUNK_INTERVAL}')",
+    ]
+
+
+# ── Continuous aggregates ────────────────────────────────────
+
+# Daily rollups of ts_search_rank: view → GROUP BY columns besides the day bucket.
+# ts_daily_rank comes from migration 002; the other two from 008.
+CONTINUOUS_AGGREGATES: dict[str, tuple[str, ...]] = {
+    "ts_daily_rank": ("query_id", "brand"),
+    "ts_daily_platform_rank": ("query_id", "platform", "brand"),
+    "ts_daily_brand_rank": ("platform", "brand"),
+}
+
+# Lookup indexes on each aggregate, matching the get_trends filters
+AGGREGATE_INDEXES: dict[str, str] = {
+    "ts_daily_platform_rank": "(query_id, platform, brand, day DESC)",
+    "ts_daily_brand_rank": "(brand, platform, day DESC)",
+}
+
+# Refresh window shared by every aggregate policy: late rows up to 3 days old are
+# picked up, the last hour is left to real-time aggregation
+REFRESH_START_OFFSET = "3 days"
+REFRESH_END_OFFSET = "1 hour"
+REFRESH_SCHEDULE = "1 hour"
+
+
+def continuous_aggregate_sql(
+    view: str, table: str = "ts_search_rank", *, policy: bool = True,
+) -> list[str]:
+    """Create one daily aggregate over table, with lookup index and (optionally) refresh policy.
+
+    materialized_only = false makes the view union in raw rows newer than the last
+    refresh, so the open day stays current while closed days read only materialized rows.
+    """
+    columns = ", ".join(CONTINUOUS_AGGREGATES[view])
+    statements = [
+        f"CREATE MATERIALIZED VIEW IF NOT EXISTS {view} "
+        f"WITH (timescaledb.continuous, timescaledb.materialized_only = false) AS "
+        f"SELECT time_bucket('1 day', time) AS day, {columns}, "
+        f"AVG(rank_position) AS avg_rank, AVG(visibility_score) AS avg_score, "
+        f"COUNT(*) AS sample_count "
+        f"FROM {table} GROUP BY day, {columns} WITH NO DATA",
+    ]
+    if policy:
+        statements.append(
+            f"SELECT add_continuous_aggregate_policy('{view}', "
+            f"start_offset => INTERVAL '{REFRESH_START_OFFSET}', "
+            f"end_offset => INTERVAL '{REFRESH_END_OFFSET}', "
+            f"schedule_interval => INTERVAL '{REFRESH_SCHEDULE}', if_not_exists => TRUE)"
+        )
+    if view in AGGREGATE_INDEXES:
+        statements.append(
+            f"CREATE INDEX IF NOT EXISTS idx_{view}_lookup ON {view} {AGGREGATE_INDEXES[view]}"
+        )
+    return statements
@@ -6,52 +6,75 @@ from collections.abc import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
 
+from src.api.deps import DbSession
+from src.api.metrics import MetricsMiddleware, render_api_metrics
 from src.config import settings
+from src.db.health import DependencyCheckError, Probe, check_dependencies
 from src.db.mongo import close_mongo, connect_mongo, get_mongo_db
-from src.db.postgres import engine, ts_engine
+from src.db.postgres import (
+    ENGINE_URLS,
+    active_engines,
+    dispose_engines,
+    get_engine,
+    get_replica_router,
+)
 from src.db.redis import close_redis, connect_redis, get_redis
+from src.services.metrics_service import MetricsService
 
 logger = logging.getLogger(__name__)
 
 
+def _startup_probes() -> dict[str, Probe]:
+    """One round-trip per dependency; clients and engines must already exist."""
+
+    async def ping_sql(name: str) -> None:
+        async with get_engine(name).connect() as conn:
+            await conn.execute(text("SELECT 1"))
+
+    return {
+        "postgres": lambda: ping_sql("postgres"),
+        "timescale": lambda: ping_sql("timescale"),
+        "mongodb": lambda: get_mongo_db().command("ping"),
+        "redis": lambda: get_redis().ping(),
+    }
+
+
+async def _close_connections() -> None:
+    await close_redis()
+    await close_mongo()
+    await dispose_engines()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
-    """Startup: verify DB connections. Shutdown: close pools."""
+    """Startup: create clients and verify every dependency concurrently. Shutdown: close pools."""
     # ── Startup ────────────────────────────────────────────
     logging.basicConfig(level=settings.log_level)
 
-    # PostgreSQL
-    from sqlalchemy import text
-
-    async with engine.connect() as conn:
-        await conn.execute(text("SELECT 1"))
-    logger.info("PostgreSQL connected: %s", settings.database_url.split("@")[-1])
-
-    # TimescaleDB
-    async with ts_engine.connect() as conn:
-        await conn.execute(text("SELECT 1"))
-    logger.info("TimescaleDB connected: %s", settings.timescale_url.split("@")[-1])
-
-    # MongoDB
+    for name in ENGINE_URLS:
+        get_engine(name)
+        get_replica_router(name)
     await connect_mongo()
-    mongo = get_mongo_db()
-    await mongo.command("ping")
-    logger.info("MongoDB connected: %s", settings.mongo_db)
-
-    # Redis
     await connect_redis()
-    redis = get_redis()
-    await redis.ping()
-    logger.info("Redis connected: %s", settings.redis_url)
+    try:
+        await check_dependencies(_startup_probes(), timeout=settings.startup_check_timeout)
+    except DependencyCheckError:
+        await _close_connections()
+        raise
+    logger.info(
+        "Connected: PostgreSQL %s, TimescaleDB %s, MongoDB %s, Redis %s",
+        settings.database_url.split("@")[-1], settings.timescale_url.split("@")[-1],
+        settings.mongo_db, settings.redis_url,
+    )
 
     yield
 
     # ── Shutdown ───────────────────────────────────────────
-    await close_redis()
-    await close_mongo()
-    await engine.dispose()
-    await ts_engine.dispose()
+    await _close_connections()
     logger.info("All connections closed")
 
 
@@ -71,6 +94,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# ── Request metrics (exported at /metrics) ─────────────────
+app.add_middleware(MetricsMiddleware)
+
 
 # ── Health ─────────────────────────────────────────────────
 @app.get("/health", tags=["system"])
@@ -78,6 +104,18 @@ async def health_check() -> dict[str, str]:
     return {"status": "ok", "service": "levoit-geo"}
 
 
+# ── Metrics (Prometheus text format) ───────────────────────
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def metrics(db: DbSession) -> PlainTextResponse:
+    body = render_api_metrics(active_engines())
+    # Pipeline timings come from the DB; keep the in-process series if it is unreachable
+    try:
+        body += await MetricsService(db).render_pipeline_metrics()
+    except SQLAlchemyError as e:
+        logger.warning("Pipeline metrics unavailable: %s", e)
+    return PlainTextResponse(body, media_type="text/plain; version=0.0.4")
+
+
 # ── API Router mount point ─────────────────────────────────
 from src.api.v1 import router as v1_router  # noqa: E402
 
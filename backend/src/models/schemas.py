@@ -60,6 +60,13 @@ class RankingResponse(BaseModel):
     pipeline_run_id: int | None = Field(None, description="Pipeline run ID")
 
 
+class LatestRankingsResponse(BaseModel):
+    query_id: int = Field(..., description="Query ID")
+    rankings: list[RankingResponse] = Field(
+        ..., description="Most recent ranking per platform+brand",
+    )
+
+
 # ── Score schemas ──────────────────────────────────────────
 
 
@@ -83,6 +90,7 @@ class ScoreResponse(BaseModel):
 class TrendPoint(BaseModel):
     timestamp: datetime = Field(..., description="Time bucket start")
     brand: str = Field(..., description="Brand name")
+    platform: str | None = Field(None, description="Platform (null when platforms are combined)")
     avg_rank: float = Field(..., description="Average rank position in period")
     avg_score: float = Field(..., description="Average visibility score in period")
     sample_count: int = Field(..., description="Number of data points in period")
@@ -94,11 +102,11 @@ class TrendPoint(BaseModel):
 class ComparisonRow(BaseModel):
     query_id: int = Field(..., description="Query ID")
     query_text: str = Field(..., description="Query text")
-    levoit_score: float = Field(..., ge=0, le=100, description="Levoit visibility score")
-    dyson_score: float = Field(0.0, ge=0, le=100, description="Dyson visibility score")
-    coway_score: float = Field(0.0, ge=0, le=100, description="Coway visibility score")
-    honeywell_score: float = Field(0.0, ge=0, le=100, description="Honeywell visibility score")
-    competitive_gap: float = Field(..., description="Levoit gap vs best competitor")
+    primary_brand: str = Field(..., description="Own brand the gap is measured for")
+    scores: dict[str, float] = Field(
+        ..., description="Latest visibility score per tracked brand (0 when not seen)"
+    )
+    competitive_gap: float = Field(..., description="Primary brand gap vs best competitor")
 
 
 # ── Pipeline schemas ───────────────────────────────────────
@@ -116,5 +124,8 @@ class PipelineRunResponse(BaseModel):
     quarantine_count: int = Field(..., description="Quarantined results")
     cost_usd: float = Field(..., description="Estimated cost in USD")
     duration_sec: float | None = Field(None, description="Duration in seconds")
+    stage_timings: dict | None = Field(
+        None, description="Per-stage duration breakdown (count, sum, p50/p95, buckets)",
+    )
     started_at: datetime = Field(..., description="Start timestamp")
     completed_at: datetime | None = Field(None, description="Completion timestamp")
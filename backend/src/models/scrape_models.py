@@ -33,8 +33,17 @@ class ProcessedContent(BaseModel):
 class QuarantineError(Exception):
     """Raised when scrape content fails validation and should be quarantined."""
 
-    def __init__(self, error_type: str, error_detail: str, raw_content: str = "") -> None:
+    def __init__(
+        self,
+        error_type: str,
+        error_detail: str,
+        raw_content: str = "",
+        snapshot_id: str | None = None,
+    ) -> None:
         self.error_type = error_type
         self.error_detail = error_detail
         self.raw_content = raw_content
+        # Set by the scraper once the raw snapshot is stored, so quarantined
+        # content can be re-processed from the full snapshot later.
+        self.snapshot_id = snapshot_id
         super().__init__(f"{error_type}: {error_detail}")
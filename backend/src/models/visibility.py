@@ -2,7 +2,7 @@
 
 from datetime import datetime
 
-from sqlalchemy import BigInteger, Boolean, Float, Index, Integer, String, Text
+from sqlalchemy import BigInteger, Boolean, Float, Index, Integer, String, Text, text
 from sqlalchemy.dialects.postgresql import JSONB, TIMESTAMP
 from sqlalchemy.orm import Mapped, mapped_column
 
@@ -54,7 +54,7 @@ class VisBrand(Base):
 
 
 class VisRanking(Base):
-    """Single ranking result per scrape / platform / brand."""
+    """Single ranking result per scrape / platform / brand (monthly partitions on scraped_at)."""
 
     __tablename__ = "vis_ranking"
 
@@ -69,18 +69,44 @@ class VisRanking(Base):
     source_urls: Mapped[list | None] = mapped_column(JSONB, server_default="[]")
     snapshot_id: Mapped[str | None] = mapped_column(String(24), nullable=True)
     scraped_at: Mapped[datetime] = mapped_column(
-        TIMESTAMP(timezone=True), nullable=False, server_default="now()"
+        TIMESTAMP(timezone=True), primary_key=True, server_default="now()"
     )
     pipeline_run_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
 
     __table_args__ = (
         Index("idx_vis_ranking_query_time", "query_id", scraped_at.desc()),
         Index("idx_vis_ranking_brand_time", "brand", scraped_at.desc()),
+        Index(
+            "idx_vis_ranking_run_query", "pipeline_run_id", "query_id",
+            postgresql_include=["platform", "brand", "rank_position"],
+        ),
+        Index(
+            "idx_vis_ranking_query_plat_brand", "query_id", "platform", "brand",
+            scraped_at.desc(), postgresql_include=["rank_position"],
+        ),
+        {"postgresql_partition_by": "RANGE (scraped_at)"},
     )
 
 
+class VisRankingLatest(Base):
+    """Newest vis_ranking row per query / platform / brand, upserted by the pipeline."""
+
+    __tablename__ = "vis_ranking_latest"
+
+    query_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    platform: Mapped[str] = mapped_column(String(20), primary_key=True)
+    brand: Mapped[str] = mapped_column(String(100), primary_key=True)
+    ranking_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    rank_position: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    snippet: Mapped[str | None] = mapped_column(Text, nullable=True)
+    source_urls: Mapped[list | None] = mapped_column(JSONB, server_default="[]")
+    snapshot_id: Mapped[str | None] = mapped_column(String(24), nullable=True)
+    scraped_at: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    pipeline_run_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
 class VisScore(Base):
-    """Aggregated visibility score per query / brand."""
+    """Aggregated visibility score per query / brand (monthly partitions on computed_at)."""
 
     __tablename__ = "vis_score"
 
@@ -89,15 +115,54 @@ class VisScore(Base):
     brand: Mapped[str] = mapped_column(String(100), nullable=False)
     visibility_score: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
     competitive_gap: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sample_count: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     period: Mapped[str] = mapped_column(
         String(10), nullable=False, server_default="raw",
     )
+    # Aggregated periods (daily/weekly/monthly) store their bucket start here
+    computed_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), primary_key=True, server_default="now()"
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_vis_score_query_brand", "query_id", "brand", computed_at.desc(),
+            postgresql_include=["visibility_score"],
+        ),
+        Index(
+            "uq_vis_score_bucket", "query_id", "brand", "period", "computed_at",
+            unique=True, postgresql_where=text("period <> 'raw'"),
+        ),
+        {"postgresql_partition_by": "RANGE (computed_at)"},
+    )
+
+
+class VisAggregationWatermark(Base):
+    """Upper bound of ts_search_rank time already folded into each aggregated period."""
+
+    __tablename__ = "vis_aggregation_watermark"
+
+    period: Mapped[str] = mapped_column(String(10), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(TIMESTAMP(timezone=True), nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False, server_default="now()"
+    )
+
+
+class VisComparisonSnapshot(Base):
+    """Comparison rows materialized per pipeline run and query category."""
+
+    __tablename__ = "vis_comparison_snapshot"
+
+    pipeline_run_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    category: Mapped[str] = mapped_column(String(50), primary_key=True)
+    rows: Mapped[list] = mapped_column(JSONB, nullable=False)
     computed_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default="now()"
     )
 
     __table_args__ = (
-        Index("idx_vis_score_query_brand", "query_id", "brand", computed_at.desc()),
+        Index("idx_vis_comparison_snapshot_computed", computed_at.desc()),
     )
 
 
@@ -118,6 +183,8 @@ class VisPipelineRun(Base):
     cost_usd: Mapped[float] = mapped_column(Float, nullable=False, server_default="0")
     duration_sec: Mapped[float | None] = mapped_column(Float, nullable=True)
     error_detail: Mapped[str | None] = mapped_column(Text, nullable=True)
+    # Per-stage duration histograms — see src.shared.metrics.StageTimings.to_json
+    stage_timings: Mapped[dict | None] = mapped_column(JSONB, nullable=True)
     started_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default="now()"
     )
@@ -1 +1,5 @@
-"""Prefect pipeline flows for visibility monitoring."""
+"""Prefect pipeline flows for visibility monitoring.
+
+Flow and task implementations import without Prefect; see registry.py for the
+lazily built Prefect wrappers and runner.py for running flows without Prefect.
+"""
@@ -2,19 +2,19 @@
 
 Same pipeline as hourly_rank_check but:
   - Processes ALL active queries (high + medium + low priority)
-  - Computes daily aggregated visibility scores (period='daily')
+  - Aggregates visibility scores incrementally into period='daily' buckets and
+    rolls them up into 'weekly' / 'monthly' (reruns upsert, never duplicate)
   - Computes daily competitive gap metrics
+  - Snapshots the comparison view after the daily scores are in
+  - Maintains vis_ranking / vis_score monthly partitions (future months, retention)
 """
 
 import logging
 
-from prefect import flow
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.analyzer import CostTracker
-from src.services.scraper.orchestrator import OrchestratorResult, ScrapeOrchestrator
-
+from src.pipelines.registry import lazy_wrappers
 from src.pipelines.tasks import (
     check_daily_budget_impl,
     compute_daily_aggregated_scores_impl,
@@ -23,7 +23,12 @@ from src.pipelines.tasks import (
     extract_and_store_rankings_impl,
     fetch_active_queries_impl,
     finalize_pipeline_run_impl,
+    maintain_partitions_impl,
+    snapshot_comparison_impl,
 )
+from src.services.analyzer import CostTracker
+from src.services.scraper.orchestrator import OrchestratorResult, ScrapeOrchestrator
+from src.shared.metrics import StageTimings, collect_stage_timings, stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -72,44 +77,59 @@ async def daily_full_scan_impl(
 
     # 3. Create pipeline run
     run_id = await create_pipeline_run_impl(db, FLOW_NAME, len(queries))
+    timings = StageTimings()
 
     try:
-        # 4. Scrape all
-        query_dicts = [
-            {"id": q["id"], "query_text": q["query_text"], "brands": q.get("brands", [])}
-            for q in queries
-        ]
-        orch_result: OrchestratorResult = await orchestrator.run(query_dicts)
-
-        # 5. Process results — extract rankings and store
-        query_brands = {q["id"]: q.get("brands", []) for q in queries}
-        for query_id, platform, processed in orch_result.successes:
-            brands = query_brands.get(query_id, [])
-            await extract_and_store_rankings_impl(
-                db, ts_db, query_id, platform, processed, brands, run_id,
-            )
-
-        # 6. Compute raw scores for each query that had successes
-        seen_queries = {qid for qid, _, _ in orch_result.successes}
-        for query_id in seen_queries:
-            brands = query_brands.get(query_id, [])
-            await compute_scores_impl(db, query_id, brands, run_id)
-
-        # 7. Finalize scrape pipeline
+        with collect_stage_timings(timings):
+            # 4. Scrape all
+            query_dicts = [
+                {"id": q["id"], "query_text": q["query_text"], "brands": q.get("brands", [])}
+                for q in queries
+            ]
+            orch_result: OrchestratorResult = await orchestrator.run(query_dicts)
+
+            # 5. Process results — extract rankings and store
+            query_brands = {q["id"]: q.get("brands", []) for q in queries}
+            for query_id, platform, processed in orch_result.successes:
+                brands = query_brands.get(query_id, [])
+                await extract_and_store_rankings_impl(
+                    db, ts_db, query_id, platform, processed, brands, run_id,
+                )
+
+            # 6. Compute raw scores for each query that had successes
+            seen_queries = {qid for qid, _, _ in orch_result.successes}
+            for query_id in seen_queries:
+                brands = query_brands.get(query_id, [])
+                with stage_timer("score"):
+                    await compute_scores_impl(db, query_id, brands, run_id)
+
+            # 7. Aggregation — new ts_search_rank rows → daily buckets → weekly / monthly
+            with stage_timer("daily_aggregate"):
+                daily_count = await compute_daily_aggregated_scores_impl(db, ts_db)
+
+            # 8. Comparison snapshot — includes the daily scores just written
+            with stage_timer("comparison_snapshot"):
+                await snapshot_comparison_impl(db, run_id)
+
+            # 9. Partition maintenance — keep future months ready, retire expired ones
+            with stage_timer("partition_maintenance"):
+                await maintain_partitions_impl(db)
+
+        # 10. Finalize — after aggregation so duration and stage timings cover the whole run
         cost = await cost_tracker.get_today()
         await finalize_pipeline_run_impl(
             db, run_id, "completed",
             orch_result.success_count, orch_result.failure_count, cost,
+            quarantine_count=orch_result.quarantine_count,
+            stage_timings=timings.to_json(),
         )
 
-        # 8. Daily aggregation — compute daily averaged scores from ts_search_rank
-        daily_count = await compute_daily_aggregated_scores_impl(db, ts_db)
-
         return {
             "run_id": run_id,
             "status": "completed",
             "success_count": orch_result.success_count,
             "failure_count": orch_result.failure_count,
+            "quarantine_count": orch_result.quarantine_count,
             "daily_scores_count": daily_count,
         }
 
@@ -117,24 +137,12 @@ async def daily_full_scan_impl(
         cost = await cost_tracker.get_today()
         await finalize_pipeline_run_impl(
             db, run_id, "failed", 0, 0, cost, error_detail=str(e)[:500],
+            stage_timings=timings.to_json(),
         )
         logger.exception("Daily pipeline failed: %s", e)
         return {"run_id": run_id, "status": "failed", "error": str(e)}
 
 
-# ── Prefect-decorated entry point ─────────────────────────────
+# ── Prefect-decorated entry point (built on first access) ────
 
-@flow(name=FLOW_NAME)
-async def daily_full_scan(
-    *,
-    db: AsyncSession,
-    ts_db: AsyncSession,
-    redis: Redis,
-    orchestrator: ScrapeOrchestrator,
-    daily_budget_usd: float = 10.0,
-) -> dict:
-    """Prefect flow wrapper for daily_full_scan."""
-    return await daily_full_scan_impl(
-        db=db, ts_db=ts_db, redis=redis,
-        orchestrator=orchestrator, daily_budget_usd=daily_budget_usd,
-    )
+__getattr__ = lazy_wrappers(__name__, globals(), "flow", {FLOW_NAME: daily_full_scan_impl})
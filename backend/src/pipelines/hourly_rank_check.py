@@ -7,18 +7,16 @@ Pipeline steps:
   4. Scrape all via ScrapeOrchestrator
   5. Extract rankings → store in vis_ranking + ts_search_rank
   6. Compute visibility scores → store in vis_score
-  7. Finalize pipeline run (status, counts, duration)
+  7. Materialize the comparison snapshot served by /scores/comparison
+  8. Finalize pipeline run (status, counts, duration, per-stage timings)
 """
 
 import logging
 
-from prefect import flow
 from redis.asyncio import Redis
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from src.services.analyzer import CostTracker
-from src.services.scraper.orchestrator import OrchestratorResult, ScrapeOrchestrator
-
+from src.pipelines.registry import lazy_wrappers
 from src.pipelines.tasks import (
     check_daily_budget_impl,
     compute_scores_impl,
@@ -26,7 +24,11 @@ from src.pipelines.tasks import (
     extract_and_store_rankings_impl,
     fetch_active_queries_impl,
     finalize_pipeline_run_impl,
+    snapshot_comparison_impl,
 )
+from src.services.analyzer import CostTracker
+from src.services.scraper.orchestrator import OrchestratorResult, ScrapeOrchestrator
+from src.shared.metrics import StageTimings, collect_stage_timings, stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -72,34 +74,43 @@ async def hourly_rank_check_impl(
 
     # 3. Create pipeline run
     run_id = await create_pipeline_run_impl(db, FLOW_NAME, len(queries))
+    timings = StageTimings()
 
     try:
-        # 4. Scrape all
-        query_dicts = [
-            {"id": q["id"], "query_text": q["query_text"], "brands": q.get("brands", [])}
-            for q in queries
-        ]
-        orch_result: OrchestratorResult = await orchestrator.run(query_dicts)
-
-        # 5. Process results — extract rankings and store
-        query_brands = {q["id"]: q.get("brands", []) for q in queries}
-        for query_id, platform, processed in orch_result.successes:
-            brands = query_brands.get(query_id, [])
-            await extract_and_store_rankings_impl(
-                db, ts_db, query_id, platform, processed, brands, run_id,
-            )
-
-        # 6. Compute scores for each query that had successes
-        seen_queries = {qid for qid, _, _ in orch_result.successes}
-        for query_id in seen_queries:
-            brands = query_brands.get(query_id, [])
-            await compute_scores_impl(db, query_id, brands, run_id)
-
-        # 7. Finalize
+        with collect_stage_timings(timings):
+            # 4. Scrape all
+            query_dicts = [
+                {"id": q["id"], "query_text": q["query_text"], "brands": q.get("brands", [])}
+                for q in queries
+            ]
+            orch_result: OrchestratorResult = await orchestrator.run(query_dicts)
+
+            # 5. Process results — extract rankings and store
+            query_brands = {q["id"]: q.get("brands", []) for q in queries}
+            for query_id, platform, processed in orch_result.successes:
+                brands = query_brands.get(query_id, [])
+                await extract_and_store_rankings_impl(
+                    db, ts_db, query_id, platform, processed, brands, run_id,
+                )
+
+            # 6. Compute scores for each query that had successes
+            seen_queries = {qid for qid, _, _ in orch_result.successes}
+            for query_id in seen_queries:
+                brands = query_brands.get(query_id, [])
+                with stage_timer("score"):
+                    await compute_scores_impl(db, query_id, brands, run_id)
+
+            # 7. Comparison snapshot
+            with stage_timer("comparison_snapshot"):
+                await snapshot_comparison_impl(db, run_id)
+
+        # 8. Finalize
         cost = await cost_tracker.get_today()
         await finalize_pipeline_run_impl(
             db, run_id, "completed",
             orch_result.success_count, orch_result.failure_count, cost,
+            quarantine_count=orch_result.quarantine_count,
+            stage_timings=timings.to_json(),
         )
 
         return {
@@ -107,30 +118,19 @@ async def hourly_rank_check_impl(
             "status": "completed",
             "success_count": orch_result.success_count,
             "failure_count": orch_result.failure_count,
+            "quarantine_count": orch_result.quarantine_count,
         }
 
     except Exception as e:
         cost = await cost_tracker.get_today()
         await finalize_pipeline_run_impl(
             db, run_id, "failed", 0, 0, cost, error_detail=str(e)[:500],
+            stage_timings=timings.to_json(),
         )
         logger.exception("Pipeline failed: %s", e)
         return {"run_id": run_id, "status": "failed", "error": str(e)}
 
 
-# ── Prefect-decorated entry point ─────────────────────────────
+# ── Prefect-decorated entry point (built on first access) ────
 
-@flow(name=FLOW_NAME)
-async def hourly_rank_check(
-    *,
-    db: AsyncSession,
-    ts_db: AsyncSession,
-    redis: Redis,
-    orchestrator: ScrapeOrchestrator,
-    daily_budget_usd: float = 10.0,
-) -> dict:
-    """Prefect flow wrapper for hourly_rank_check."""
-    return await hourly_rank_check_impl(
-        db=db, ts_db=ts_db, redis=redis,
-        orchestrator=orchestrator, daily_budget_usd=daily_budget_usd,
-    )
+__getattr__ = lazy_wrappers(__name__, globals(), "flow", {FLOW_NAME: hourly_rank_check_impl})
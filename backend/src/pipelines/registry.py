@@ -0,0 +1,36 @@
+"""Lazy Prefect registration for pipeline modules.
+
+Pipeline modules hold plain async implementations (_impl suffix) and expose
+their Prefect task / flow wrappers through a module-level __getattr__ built
+here, so `import prefect` (≈2 s) only happens when a wrapper is first used —
+by schedules.serve_all() or a Prefect worker, never by the API, tests or the
+built-in runner (src/pipelines/runner.py).
+"""
+
+from collections.abc import Callable
+from typing import Any, Literal
+
+
+def lazy_wrappers(
+    module_name: str,
+    module_globals: dict[str, Any],
+    kind: Literal["task", "flow"],
+    impls: dict[str, Callable[..., Any]],
+) -> Callable[[str], Any]:
+    """Module __getattr__ wrapping impls[attr] with prefect.task / prefect.flow on access.
+
+    The Prefect name is the attribute name; the wrapper is cached in the module
+    globals, so each one is built at most once.
+    """
+
+    def __getattr__(attr: str) -> Any:  # noqa: N807 — becomes the module's PEP 562 __getattr__
+        impl = impls.get(attr)
+        if impl is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {attr!r}")
+        import prefect
+
+        wrapper = getattr(prefect, kind)(name=attr)(impl)
+        module_globals[attr] = wrapper
+        return wrapper
+
+    return __getattr__
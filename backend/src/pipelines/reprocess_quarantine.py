@@ -0,0 +1,149 @@
+"""Prefect flow: reprocess_quarantine — re-run processing over quarantined scrapes.
+
+Used after processing rules change (boilerplate keywords, error signatures,
+minimum length) to recover content that was already paid for, without
+calling Firecrawl again.
+
+Pipeline steps:
+  1. Fetch active queries (brands per query)
+  2. Create vis_pipeline_run record
+  3. Re-process unresolved quarantine docs via QuarantineReprocessor
+  4. Extract rankings → store in vis_ranking + ts_search_rank
+  5. Compute visibility scores → store in vis_score
+  6. Materialize the comparison snapshot (only when scores changed)
+  7. Mark the stored docs resolved (docs of a failed run stay unresolved)
+  8. Finalize pipeline run
+
+Recovered docs whose query is no longer active are not stored and stay
+unresolved, so they are picked up again if the query is re-activated.
+
+Usage (ad hoc):
+    python -m src.pipelines.reprocess_quarantine [error_type ...]
+"""
+
+import logging
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.pipelines.registry import lazy_wrappers
+from src.pipelines.tasks import (
+    compute_scores_impl,
+    create_pipeline_run_impl,
+    extract_and_store_rankings_impl,
+    fetch_active_queries_impl,
+    finalize_pipeline_run_impl,
+    snapshot_comparison_impl,
+)
+from src.services.scraper.processing import ScrapeProcessor
+from src.services.scraper.quarantine import QuarantineReprocessor
+from src.shared.metrics import StageTimings, collect_stage_timings, stage_timer
+
+logger = logging.getLogger(__name__)
+
+FLOW_NAME = "reprocess_quarantine"
+
+
+async def reprocess_quarantine_impl(
+    *,
+    db: AsyncSession,
+    ts_db: AsyncSession,
+    mongo: AsyncIOMotorDatabase,
+    processor: ScrapeProcessor | None = None,
+    error_types: list[str] | None = None,
+    limit: int = 500,
+) -> dict:
+    """Core re-processing logic (no Prefect dependency).
+
+    Args:
+        db: PostgreSQL session.
+        ts_db: TimescaleDB session.
+        mongo: MongoDB database holding the quarantine + snapshots collections.
+        processor: ScrapeProcessor with the current rules. Defaults to a new instance.
+        error_types: Only re-process these quarantine error types.
+        limit: Maximum number of quarantine docs to re-process.
+
+    Returns:
+        Summary dict with run_id, status, recovered_count, still_quarantined,
+        skipped_unloadable (raw content unavailable) and skipped_inactive
+        (recovered, but the query is no longer active).
+    """
+    queries = await fetch_active_queries_impl(db)
+    query_brands = {q["id"]: q.get("brands", []) for q in queries}
+
+    run_id = await create_pipeline_run_impl(db, FLOW_NAME, len(queries))
+    timings = StageTimings()
+
+    try:
+        with collect_stage_timings(timings):
+            reprocessor = QuarantineReprocessor(mongo, processor)
+            result = await reprocessor.run(error_types=error_types, limit=limit)
+
+            # Queries deactivated since quarantine are not re-scored
+            active = [
+                (doc_id, r)
+                for doc_id, r in zip(result.recovered_ids, result.recovered, strict=True)
+                if r[0] in query_brands
+            ]
+            recovered = [r for _, r in active]
+            skipped_inactive = result.recovered_count - len(recovered)
+            for query_id, platform, processed in recovered:
+                await extract_and_store_rankings_impl(
+                    db, ts_db, query_id, platform, processed, query_brands[query_id], run_id,
+                )
+
+            for query_id in {qid for qid, _, _ in recovered}:
+                with stage_timer("score"):
+                    await compute_scores_impl(db, query_id, query_brands[query_id], run_id)
+
+            if recovered:
+                with stage_timer("comparison_snapshot"):
+                    await snapshot_comparison_impl(db, run_id)
+
+            await reprocessor.mark_resolved([doc_id for doc_id, _ in active])
+
+        # No scrapes were made, so the run adds no cost; every doc that was
+        # neither stored nor re-quarantined counts as a failure
+        await finalize_pipeline_run_impl(
+            db, run_id, "completed",
+            len(recovered), result.skipped + skipped_inactive, 0.0,
+            quarantine_count=result.still_quarantined,
+            stage_timings=timings.to_json(),
+        )
+
+        return {
+            "run_id": run_id,
+            "status": "completed",
+            "recovered_count": len(recovered),
+            "still_quarantined": result.still_quarantined,
+            "skipped_unloadable": result.skipped,
+            "skipped_inactive": skipped_inactive,
+        }
+
+    except Exception as e:
+        await finalize_pipeline_run_impl(
+            db, run_id, "failed", 0, 0, 0.0, error_detail=str(e)[:500],
+            stage_timings=timings.to_json(),
+        )
+        logger.exception("Quarantine reprocess failed: %s", e)
+        return {"run_id": run_id, "status": "failed", "error": str(e)}
+
+
+# ── Prefect-decorated entry point (built on first access) ────
+
+__getattr__ = lazy_wrappers(__name__, globals(), "flow", {FLOW_NAME: reprocess_quarantine_impl})
+
+
+async def _main(error_types: list[str]) -> None:
+    from src.pipelines.runner import pipeline_services, run_flow
+
+    async with pipeline_services() as services:
+        print(await run_flow(FLOW_NAME, error_types=error_types or None, **services))
+
+
+if __name__ == "__main__":
+    import asyncio
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,161 @@
+"""Built-in pipeline runner — execute a flow without Prefect.
+
+Runs a flow's plain async implementation directly, for local runs, ad-hoc
+backfills and benchmarks: no Prefect import, no server, no task-run
+bookkeeping. Production scheduling stays with schedules.serve_all().
+
+Usage:
+    python -m src.pipelines.runner hourly_rank_check
+    python -m src.pipelines.runner daily_full_scan --budget 25
+    python -m src.pipelines.runner reprocess_quarantine --error-type insufficient_content
+"""
+
+import argparse
+import contextlib
+import importlib
+import inspect
+import json
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# Flow name → module holding its <name>_impl (module globals are read at call
+# time, so patches applied to the module — e.g. by benchmarks/load.py — apply)
+FLOWS: dict[str, str] = {
+    "hourly_rank_check": "src.pipelines.hourly_rank_check",
+    "daily_full_scan": "src.pipelines.daily_full_scan",
+    "reprocess_quarantine": "src.pipelines.reprocess_quarantine",
+}
+
+
+def load_flow(name: str) -> Callable[..., Any]:
+    """The plain async implementation of a flow."""
+    if name not in FLOWS:
+        raise ValueError(f"Unknown flow {name!r}; expected one of {', '.join(FLOWS)}")
+    return getattr(importlib.import_module(FLOWS[name]), f"{name}_impl")
+
+
+async def run_flow(name: str, **services: Any) -> dict:
+    """Run a flow with whichever of services its implementation accepts.
+
+    Callers can pass one superset of dependencies (db, ts_db, redis, mongo,
+    orchestrator, ...) to any flow; unknown keys are ignored.
+    """
+    impl = load_flow(name)
+    accepted = inspect.signature(impl).parameters
+    start = time.perf_counter()
+    result = await impl(**{k: v for k, v in services.items() if k in accepted})
+    logger.info(
+        "Flow %s finished in %.2fs: %s", name, time.perf_counter() - start, result.get("status"),
+    )
+    return result
+
+
+@contextlib.asynccontextmanager
+async def pipeline_services() -> AsyncIterator[dict[str, Any]]:
+    """db, ts_db, redis, mongo and the scrape orchestrators from settings.
+
+    "local_orchestrator" scrapes Firecrawl in this process; "orchestrator" is
+    the one flows use — the local one, or the queue (work_queue.py) when
+    SCRAPE_QUEUE_ENABLED. Database engines use the pipeline profile
+    (src/db/postgres.py) regardless of DB_ROLE; everything is closed on exit.
+    """
+    import httpx
+    import redis.asyncio as aioredis
+    from motor.motor_asyncio import AsyncIOMotorClient
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    from src.config import settings
+    from src.db.postgres import create_engine
+    from src.services.scraper.adaptive_concurrency import AimdConfig
+    from src.services.scraper.chatgpt import ChatGPTScraper
+    from src.services.scraper.google_ai import GoogleAIScraper
+    from src.services.scraper.orchestrator import ScrapeOrchestrator
+    from src.services.scraper.perplexity import PerplexityScraper
+    from src.services.scraper.processing import ScrapeProcessor
+    from src.services.scraper.quarantine import QuarantineSink
+    from src.services.scraper.rate_limiter import PlatformRateLimiter
+    from src.services.scraper.work_queue import QueuedScrapeOrchestrator
+
+    engine = create_engine(settings.database_url, role="pipeline")
+    ts_engine = create_engine(settings.timescale_url, role="pipeline")
+    redis = aioredis.from_url(settings.redis_url, decode_responses=True)
+    mongo_client = AsyncIOMotorClient(settings.mongo_url)
+    mongo = mongo_client[settings.mongo_db]
+    try:
+        async with (
+            httpx.AsyncClient() as http,
+            AsyncSession(engine, expire_on_commit=False) as db,
+            AsyncSession(ts_engine, expire_on_commit=False) as ts_db,
+        ):
+            processor = ScrapeProcessor()
+            local = ScrapeOrchestrator(
+                scrapers={
+                    cls.platform: cls(http, mongo, processor)
+                    for cls in (ChatGPTScraper, PerplexityScraper, GoogleAIScraper)
+                },
+                rate_limiter=PlatformRateLimiter(redis),
+                redis=redis,
+                quarantine_sink=QuarantineSink(mongo),
+                cluster_concurrency=settings.scrape_cluster_concurrency,
+                slot_lease_s=settings.scrape_slot_lease_s,
+                slot_timeout_s=settings.scrape_slot_timeout_s,
+                adaptive=(
+                    AimdConfig(
+                        min_limit=settings.scrape_concurrency_min,
+                        max_limit=settings.scrape_concurrency_max,
+                        target_p95_s=settings.scrape_target_p95_s,
+                        max_error_rate=settings.scrape_max_error_rate,
+                    )
+                    if settings.scrape_adaptive_concurrency
+                    else None
+                ),
+            )
+            yield {
+                "db": db, "ts_db": ts_db, "redis": redis, "mongo": mongo,
+                "orchestrator": (
+                    QueuedScrapeOrchestrator(redis) if settings.scrape_queue_enabled else local
+                ),
+                "local_orchestrator": local,
+                "daily_budget_usd": settings.daily_cost_budget_usd,
+            }
+    finally:
+        await redis.aclose()
+        mongo_client.close()
+        await engine.dispose()
+        await ts_engine.dispose()
+
+
+async def _main(args: argparse.Namespace) -> dict:
+    async with pipeline_services() as services:
+        if args.budget is not None:
+            services["daily_budget_usd"] = args.budget
+        if args.error_types:
+            services["error_types"] = args.error_types
+        return await run_flow(args.flow, **services)
+
+
+def main(argv: list[str] | None = None) -> int:
+    import asyncio
+
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipelines.runner", description=__doc__.split("\n")[0],
+    )
+    parser.add_argument("flow", choices=list(FLOWS))
+    parser.add_argument("--budget", type=float, help="daily cost budget in USD (default: settings)")
+    parser.add_argument("--error-type", dest="error_types", action="append",
+                        help="reprocess_quarantine only: error types to retry (repeatable)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    result = asyncio.run(_main(args))
+    print(json.dumps(result, default=str))
+    return 0 if result.get("status") != "failed" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
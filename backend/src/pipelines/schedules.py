@@ -2,13 +2,10 @@
 
 Schedule constants and serve() function for running both pipelines.
 
-Usage (production):
-    python -m src.pipelines.schedules
+Usage (production, with the pipeline engine profile):
+    DB_ROLE=pipeline python -m src.pipelines.schedules
 """
 
-from src.pipelines.daily_full_scan import daily_full_scan
-from src.pipelines.hourly_rank_check import hourly_rank_check
-
 # Every 6 hours (high-priority queries)
 HOURLY_CRON = "0 */6 * * *"
 
@@ -24,6 +21,9 @@ async def serve_all() -> None:
     """
     from prefect import serve as prefect_serve
 
+    from src.pipelines.daily_full_scan import daily_full_scan
+    from src.pipelines.hourly_rank_check import hourly_rank_check
+
     hourly_deployment = hourly_rank_check.to_deployment(
         name="hourly-rank-check",
         cron=HOURLY_CRON,
@@ -0,0 +1,56 @@
+"""Scrape queue worker — executes queued query × platform tasks for any pipeline run.
+
+Start as many as Firecrawl and the platforms allow; each claims tasks from the
+shared Redis stream (src/services/scraper/work_queue.py), scrapes them with a
+local ScrapeOrchestrator and reports back to the waiting flow. Flows enqueue
+instead of scraping in-process when SCRAPE_QUEUE_ENABLED=true.
+
+Usage:
+    DB_ROLE=pipeline python -m src.pipelines.scrape_worker [--consumer NAME]
+"""
+
+import argparse
+import asyncio
+import logging
+import signal
+import socket
+import sys
+
+from src.pipelines.runner import pipeline_services
+from src.services.scraper.work_queue import ScrapeWorker
+
+logger = logging.getLogger(__name__)
+
+
+async def _main(consumer: str) -> None:
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    async with pipeline_services() as services:
+        worker = ScrapeWorker(
+            services["redis"], services["local_orchestrator"], consumer=consumer,
+        )
+        # The current batch finishes (and is acked) before the worker exits
+        await worker.run_forever(stop)
+    logger.info("Scrape worker %s stopped", consumer)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.pipelines.scrape_worker", description=__doc__.split("\n")[0],
+    )
+    parser.add_argument(
+        "--consumer", default=socket.gethostname(),
+        help="consumer name in the group; keep it stable across restarts (default: hostname)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(args.consumer))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
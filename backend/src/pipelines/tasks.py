@@ -1,17 +1,22 @@
 """Shared Prefect tasks for visibility monitoring pipelines.
 
 Each task has a plain async implementation (_impl suffix) for testability,
-and a Prefect-decorated wrapper for production orchestration.
+and a Prefect-decorated wrapper for production orchestration. The wrappers
+are built on first access (src/pipelines/registry.py): importing this module
+does not import Prefect.
 """
 
-from datetime import datetime, timedelta, timezone
+import json
+from datetime import datetime, timezone
 
-from prefect import task
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db import partitions
 from src.models.enums import Platform
 from src.models.scrape_models import ProcessedContent
+from src.pipelines.registry import lazy_wrappers
+from src.services.aggregation_service import AggregationService
 from src.services.analyzer import (
     CostTracker,
     PlatformRanking,
@@ -20,6 +25,41 @@ from src.services.analyzer import (
     calculate_competitive_gap,
     calculate_visibility_score,
 )
+from src.services.score_service import ScoreService
+from src.shared.metrics import stage_timer
+
+# ── vis_ranking_latest ───────────────────────────────────────
+# One row per (query_id, platform, brand) mirroring its newest vis_ranking row.
+# The WHERE on the upsert keeps the newer row when two runs overlap.
+
+_LATEST_COLUMNS = (
+    "query_id, platform, brand, rank_position, snippet, source_urls, snapshot_id, "
+    "scraped_at, pipeline_run_id"
+)
+_LATEST_UPSERT = (
+    "ON CONFLICT (query_id, platform, brand) DO UPDATE SET "
+    "ranking_id = EXCLUDED.ranking_id, rank_position = EXCLUDED.rank_position, "
+    "snippet = EXCLUDED.snippet, source_urls = EXCLUDED.source_urls, "
+    "snapshot_id = EXCLUDED.snapshot_id, scraped_at = EXCLUDED.scraped_at, "
+    "pipeline_run_id = EXCLUDED.pipeline_run_id "
+    "WHERE vis_ranking_latest.scraped_at <= EXCLUDED.scraped_at"
+)
+
+
+async def rebuild_ranking_latest_impl(db: AsyncSession) -> int:
+    """Rebuild vis_ranking_latest from vis_ranking (seeding, backfills, repairs).
+
+    Returns the number of rows written.
+    """
+    result = await db.execute(text(
+        f"INSERT INTO vis_ranking_latest (ranking_id, {_LATEST_COLUMNS}) "
+        f"SELECT DISTINCT ON (query_id, platform, brand) id, {_LATEST_COLUMNS} "
+        "FROM vis_ranking "
+        "ORDER BY query_id, platform, brand, scraped_at DESC "
+        f"{_LATEST_UPSERT}"
+    ))
+    await db.commit()
+    return result.rowcount
 
 
 async def fetch_active_queries_impl(db: AsyncSession) -> list[dict]:
@@ -62,48 +102,59 @@ async def extract_and_store_rankings_impl(
     brands: list[str],
     pipeline_run_id: int,
 ) -> list[RankResult]:
-    """Extract rankings from scraped text and store in vis_ranking + ts_search_rank."""
+    """Extract rankings from scraped text and store in vis_ranking + ts_search_rank.
+
+    Each vis_ranking insert also upserts vis_ranking_latest in the same statement.
+    """
     extractor = RankExtractor()
-    rank_results = extractor.extract(processed.clean_text, brands)
+    with stage_timer("extract"):
+        rank_results = extractor.extract(processed.clean_text, brands)
     now = datetime.now(timezone.utc)
 
-    # Store in vis_ranking (PostgreSQL)
-    for rr in rank_results:
-        if rr.rank_position == 0:
-            continue
-        await db.execute(
-            text(
-                "INSERT INTO vis_ranking "
-                "(query_id, platform, brand, rank_position, snippet, snapshot_id, "
-                "scraped_at, pipeline_run_id) "
-                "VALUES (:qid, :plat, :brand, :rank, :snippet, :snap, :at, :run)"
-            ),
-            {
-                "qid": query_id, "plat": platform.value, "brand": rr.brand,
-                "rank": rr.rank_position, "snippet": rr.snippet,
-                "snap": processed.snapshot_id, "at": now, "run": pipeline_run_id,
-            },
-        )
-    await db.commit()
+    # Store in vis_ranking + vis_ranking_latest (PostgreSQL)
+    with stage_timer("ranking_insert"):
+        for rr in rank_results:
+            if rr.rank_position == 0:
+                continue
+            await db.execute(
+                text(
+                    "WITH inserted AS ("
+                    "INSERT INTO vis_ranking "
+                    "(query_id, platform, brand, rank_position, snippet, snapshot_id, "
+                    "scraped_at, pipeline_run_id) "
+                    "VALUES (:qid, :plat, :brand, :rank, :snippet, :snap, :at, :run) "
+                    f"RETURNING id, {_LATEST_COLUMNS}) "
+                    f"INSERT INTO vis_ranking_latest (ranking_id, {_LATEST_COLUMNS}) "
+                    f"SELECT id, {_LATEST_COLUMNS} FROM inserted "
+                    f"{_LATEST_UPSERT}"
+                ),
+                {
+                    "qid": query_id, "plat": platform.value, "brand": rr.brand,
+                    "rank": rr.rank_position, "snippet": rr.snippet,
+                    "snap": processed.snapshot_id, "at": now, "run": pipeline_run_id,
+                },
+            )
+        await db.commit()
 
     # Store in ts_search_rank (TimescaleDB)
-    for rr in rank_results:
-        if rr.rank_position == 0:
-            continue
-        pr = PlatformRanking(platform=platform, rank_position=rr.rank_position)
-        vis_score = calculate_visibility_score([pr])
-        await ts_db.execute(
-            text(
-                "INSERT INTO ts_search_rank "
-                "(time, query_id, platform, brand, rank_position, visibility_score) "
-                "VALUES (:time, :qid, :plat, :brand, :rank, :score)"
-            ),
-            {
-                "time": now, "qid": query_id, "plat": platform.value,
-                "brand": rr.brand, "rank": rr.rank_position, "score": vis_score,
-            },
-        )
-    await ts_db.commit()
+    with stage_timer("ts_insert"):
+        for rr in rank_results:
+            if rr.rank_position == 0:
+                continue
+            pr = PlatformRanking(platform=platform, rank_position=rr.rank_position)
+            vis_score = calculate_visibility_score([pr])
+            await ts_db.execute(
+                text(
+                    "INSERT INTO ts_search_rank "
+                    "(time, query_id, platform, brand, rank_position, visibility_score) "
+                    "VALUES (:time, :qid, :plat, :brand, :rank, :score)"
+                ),
+                {
+                    "time": now, "qid": query_id, "plat": platform.value,
+                    "brand": rr.brand, "rank": rr.rank_position, "score": vis_score,
+                },
+            )
+        await ts_db.commit()
 
     return rank_results
 
@@ -114,12 +165,17 @@ async def compute_scores_impl(
     brands: list[str],
     pipeline_run_id: int,
 ) -> None:
-    """Compute visibility scores for all brands on a query and store vis_score."""
+    """Compute visibility scores for all brands on a query and store vis_score.
+
+    Reads this run's own rankings from vis_ranking via idx_vis_ranking_run_query
+    (pipeline_run_id, query_id). vis_ranking_latest is not used here: a newer
+    run or a reprocess may already have replaced this run's rows there.
+    """
     result = await db.execute(
         text(
             "SELECT DISTINCT ON (platform, brand) platform, brand, rank_position "
             "FROM vis_ranking "
-            "WHERE query_id = :qid AND pipeline_run_id = :run "
+            "WHERE pipeline_run_id = :run AND query_id = :qid "
             "ORDER BY platform, brand, scraped_at DESC"
         ),
         {"qid": query_id, "run": pipeline_run_id},
@@ -159,6 +215,15 @@ async def compute_scores_impl(
     await db.commit()
 
 
+async def snapshot_comparison_impl(db: AsyncSession, run_id: int) -> int:
+    """Materialize the comparison view for this run (see ScoreService.snapshot_comparison).
+
+    Runs after the run's scores are stored, so the API serves them from one read.
+    Returns the number of category snapshots written.
+    """
+    return await ScoreService(db).snapshot_comparison(run_id)
+
+
 async def finalize_pipeline_run_impl(
     db: AsyncSession,
     run_id: int,
@@ -167,20 +232,26 @@ async def finalize_pipeline_run_impl(
     failure_count: int,
     cost_usd: float,
     error_detail: str | None = None,
+    quarantine_count: int = 0,
+    stage_timings: dict | None = None,
 ) -> None:
-    """Update vis_pipeline_run with final status."""
+    """Update vis_pipeline_run with final status and the per-stage timing breakdown."""
     now = datetime.now(timezone.utc)
     await db.execute(
         text(
             "UPDATE vis_pipeline_run SET "
             "status = :status, success_count = :sc, failure_count = :fc, "
+            "quarantine_count = :qc, "
             "cost_usd = :cost, error_detail = :err, completed_at = :at, "
-            "duration_sec = EXTRACT(EPOCH FROM (:at - started_at)) "
+            "duration_sec = EXTRACT(EPOCH FROM (:at - started_at)), "
+            "stage_timings = CAST(:timings AS JSONB) "
             "WHERE id = :id"
         ),
         {
             "id": run_id, "status": status, "sc": success_count,
-            "fc": failure_count, "cost": cost_usd, "err": error_detail, "at": now,
+            "fc": failure_count, "qc": quarantine_count,
+            "cost": cost_usd, "err": error_detail, "at": now,
+            "timings": json.dumps(stage_timings) if stage_timings is not None else None,
         },
     )
     await db.commit()
@@ -190,65 +261,30 @@ async def compute_daily_aggregated_scores_impl(
     db: AsyncSession,
     ts_db: AsyncSession,
 ) -> int:
-    """Compute daily aggregated visibility scores from today's ts_search_rank data.
+    """Fold ts_search_rank rows since the last run into daily / weekly / monthly vis_score.
 
-    Averages visibility_score per query_id × brand for the current day,
-    then stores in vis_score with period='daily'. Returns count of scores written.
+    Incremental and idempotent (see AggregationService). Returns the number of
+    daily rows upserted.
     """
-    today_start = datetime.now(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
-    tomorrow_start = today_start + timedelta(days=1)
+    report = await AggregationService(db, ts_db).aggregate()
+    return report["daily"]
 
-    result = await ts_db.execute(
-        text(
-            "SELECT query_id, brand, "
-            "AVG(visibility_score) AS avg_score "
-            "FROM ts_search_rank "
-            "WHERE time >= :start AND time < :end "
-            "GROUP BY query_id, brand"
-        ),
-        {"start": today_start, "end": tomorrow_start},
-    )
-    rows = result.mappings().all()
-    if not rows:
-        return 0
 
-    # Group by query_id
-    query_scores: dict[int, dict[str, float]] = {}
-    for row in rows:
-        qid = row["query_id"]
-        query_scores.setdefault(qid, {})[row["brand"]] = float(row["avg_score"])
+async def maintain_partitions_impl(db: AsyncSession) -> dict[str, list[str]]:
+    """Create upcoming vis_ranking / vis_score month partitions and apply retention."""
+    return await partitions.maintain_partitions(db)
 
-    # Compute competitive gap and store daily scores
-    now = datetime.now(timezone.utc)
-    count = 0
-    for qid, brand_scores in query_scores.items():
-        levoit_score = brand_scores.get("Levoit", 0.0)
-        competitor_scores = {b: s for b, s in brand_scores.items() if b.lower() != "levoit"}
-        gap = calculate_competitive_gap(levoit_score, competitor_scores)
-
-        for brand, score in brand_scores.items():
-            brand_gap = gap if brand.lower() == "levoit" else None
-            await db.execute(
-                text(
-                    "INSERT INTO vis_score "
-                    "(query_id, brand, visibility_score, competitive_gap, period, computed_at) "
-                    "VALUES (:qid, :brand, :score, :gap, 'daily', :at)"
-                ),
-                {"qid": qid, "brand": brand, "score": round(score, 2), "gap": brand_gap, "at": now},
-            )
-            count += 1
-    await db.commit()
-    return count
 
+# ── Prefect-decorated wrappers (built on first access) ───────
 
-# ── Prefect-decorated wrappers ───────────────────────────────
-
-fetch_active_queries = task(name="fetch_active_queries")(fetch_active_queries_impl)
-check_daily_budget = task(name="check_daily_budget")(check_daily_budget_impl)
-create_pipeline_run = task(name="create_pipeline_run")(create_pipeline_run_impl)
-extract_and_store_rankings = task(name="extract_and_store_rankings")(extract_and_store_rankings_impl)
-compute_scores = task(name="compute_scores")(compute_scores_impl)
-finalize_pipeline_run = task(name="finalize_pipeline_run")(finalize_pipeline_run_impl)
-compute_daily_aggregated_scores = task(name="compute_daily_aggregated_scores")(
-    compute_daily_aggregated_scores_impl
-)
+__getattr__ = lazy_wrappers(__name__, globals(), "task", {
+    "fetch_active_queries": fetch_active_queries_impl,
+    "check_daily_budget": check_daily_budget_impl,
+    "create_pipeline_run": create_pipeline_run_impl,
+    "extract_and_store_rankings": extract_and_store_rankings_impl,
+    "compute_scores": compute_scores_impl,
+    "snapshot_comparison": snapshot_comparison_impl,
+    "finalize_pipeline_run": finalize_pipeline_run_impl,
+    "compute_daily_aggregated_scores": compute_daily_aggregated_scores_impl,
+    "maintain_partitions": maintain_partitions_impl,
+})
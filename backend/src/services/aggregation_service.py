@@ -0,0 +1,214 @@
+"""AggregationService — incremental daily / weekly / monthly vis_score aggregation.
+
+Each run reads only the ts_search_rank rows from the start of the daily
+watermark's day onwards (ts_search_rank.time is the insert time, so new rows
+always land there), recomputes those period='daily' buckets, then recomputes
+the weekly and monthly buckets the days fall in from the daily rows,
+weighted by sample_count. Cost is the new rows plus at most the rest of one
+day; re-reading the watermark's day also picks up rows a concurrent pipeline
+committed just after the previous run read it.
+
+Every aggregated row is upserted on (query_id, brand, period, bucket) — the
+bucket start lives in computed_at — so reruns never duplicate rows, and the
+watermarks advance in the same transaction as the scores they cover.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.services.analyzer.score_calculator import calculate_competitive_gap
+from src.services.score_service import DEFAULT_PRIMARY_BRAND
+
+logger = logging.getLogger(__name__)
+
+# Periods rolled up from daily rows → date_trunc unit
+ROLLUP_UNITS: dict[str, str] = {"weekly": "week", "monthly": "month"}
+
+
+def bucket_start(period: str, ts: datetime) -> datetime:
+    """UTC start of the daily / weekly (Monday) / monthly bucket containing ts."""
+    ts = ts.astimezone(timezone.utc)
+    day = datetime(ts.year, ts.month, ts.day, tzinfo=timezone.utc)
+    if period == "weekly":
+        return day - timedelta(days=day.weekday())
+    if period == "monthly":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(period: str, start: datetime) -> datetime:
+    """Start of the bucket following the one starting at start."""
+    if period == "weekly":
+        return start + timedelta(days=7)
+    if period == "monthly":
+        return (start + timedelta(days=32)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def _is_primary(brand: str) -> bool:
+    return brand.lower() == DEFAULT_PRIMARY_BRAND.lower()
+
+
+class AggregationService:
+    """Folds new ts_search_rank rows into aggregated vis_score periods."""
+
+    def __init__(self, db: AsyncSession, ts_db: AsyncSession) -> None:
+        self._db = db
+        self._ts_db = ts_db
+
+    async def aggregate(self, *, now: datetime | None = None) -> dict[str, int]:
+        """Aggregate raw rows up to now and commit.
+
+        The first run (no watermark yet) starts at today's UTC midnight.
+        Returns the number of rows (query × brand × bucket) upserted per period.
+        """
+        until = now or datetime.now(timezone.utc)
+        watermarks = await self._watermarks()
+        since = watermarks.get("daily") or bucket_start("daily", until)
+        report = {"daily": 0, **{period: 0 for period in ROLLUP_UNITS}}
+        if until <= since:
+            return report
+
+        # (period, query_id, bucket) whose competitive gap needs recomputing
+        touched: set[tuple[str, int, datetime]] = set()
+
+        daily = await self._recompute_daily(bucket_start("daily", since), until)
+        report["daily"] = len(daily)
+        touched.update(("daily", qid, bucket) for qid, bucket in daily)
+
+        for period, unit in ROLLUP_UNITS.items():
+            start = bucket_start(period, watermarks.get(period) or since)
+            end = next_bucket(period, bucket_start(period, until))
+            rolled = await self._rollup(period, unit, start, end)
+            report[period] = len(rolled)
+            touched.update((period, qid, bucket) for qid, bucket in rolled)
+
+        await self._update_gaps(touched)
+        await self._db.execute(
+            text(
+                "INSERT INTO vis_aggregation_watermark (period, watermark, updated_at) "
+                "VALUES (:period, :watermark, :at) "
+                "ON CONFLICT (period) DO UPDATE SET "
+                "watermark = EXCLUDED.watermark, updated_at = EXCLUDED.updated_at"
+            ),
+            [{"period": period, "watermark": until, "at": until} for period in report],
+        )
+        await self._db.commit()
+        logger.info("Score aggregation up to %s: %s", until.isoformat(), report)
+        return report
+
+    async def _watermarks(self) -> dict[str, datetime]:
+        result = await self._db.execute(
+            text("SELECT period, watermark FROM vis_aggregation_watermark FOR UPDATE")
+        )
+        return {row["period"]: row["watermark"] for row in result.mappings().all()}
+
+    async def _recompute_daily(
+        self, start: datetime, until: datetime,
+    ) -> list[tuple[int, datetime]]:
+        """Rebuild daily buckets from raw rows in [start, until); (query_id, bucket) per row."""
+        result = await self._ts_db.execute(
+            text(
+                "SELECT query_id, brand, time_bucket('1 day', time) AS bucket, "
+                "AVG(visibility_score) AS avg_score, COUNT(*) AS sample_count "
+                "FROM ts_search_rank "
+                "WHERE time >= :start AND time < :until "
+                "GROUP BY query_id, brand, bucket"
+            ),
+            {"start": start, "until": until},
+        )
+        rows = result.mappings().all()
+        if not rows:
+            return []
+
+        await self._db.execute(
+            text(
+                "INSERT INTO vis_score "
+                "(query_id, brand, visibility_score, sample_count, period, computed_at) "
+                "VALUES (:qid, :brand, :score, :count, 'daily', :bucket) "
+                "ON CONFLICT (query_id, brand, period, computed_at) WHERE period <> 'raw' "
+                "DO UPDATE SET "
+                "visibility_score = EXCLUDED.visibility_score, "
+                "sample_count = EXCLUDED.sample_count"
+            ),
+            [
+                {
+                    "qid": row["query_id"], "brand": row["brand"],
+                    "score": float(row["avg_score"]), "count": int(row["sample_count"]),
+                    "bucket": row["bucket"],
+                }
+                for row in rows
+            ],
+        )
+        return [(row["query_id"], row["bucket"]) for row in rows]
+
+    async def _rollup(
+        self, period: str, unit: str, start: datetime, end: datetime,
+    ) -> list[tuple[int, datetime]]:
+        """Recompute period buckets in [start, end) from daily rows; (query_id, bucket) per row."""
+        # unit comes from ROLLUP_UNITS — safe to interpolate
+        result = await self._db.execute(
+            text(
+                "INSERT INTO vis_score "
+                "(query_id, brand, visibility_score, sample_count, period, computed_at) "
+                "SELECT query_id, brand, "
+                "SUM(visibility_score * sample_count) / SUM(sample_count), "
+                "SUM(sample_count), :period, "
+                f"date_trunc('{unit}', computed_at AT TIME ZONE 'UTC') "
+                "AT TIME ZONE 'UTC' AS bucket "
+                "FROM vis_score "
+                "WHERE period = 'daily' AND computed_at >= :start AND computed_at < :end "
+                "GROUP BY query_id, brand, bucket "
+                "ON CONFLICT (query_id, brand, period, computed_at) WHERE period <> 'raw' "
+                "DO UPDATE SET "
+                "visibility_score = EXCLUDED.visibility_score, "
+                "sample_count = EXCLUDED.sample_count "
+                "RETURNING query_id, computed_at"
+            ),
+            {"period": period, "start": start, "end": end},
+        )
+        return [(row[0], row[1]) for row in result.all()]
+
+    async def _update_gaps(self, touched: set[tuple[str, int, datetime]]) -> None:
+        """Recompute the primary brand's competitive gap for every touched bucket."""
+        if not touched:
+            return
+        result = await self._db.execute(
+            text(
+                "SELECT query_id, brand, period, computed_at, visibility_score "
+                "FROM vis_score "
+                "WHERE period <> 'raw' AND computed_at >= :start AND query_id = ANY(:qids)"
+            ),
+            {
+                "start": min(bucket for _, _, bucket in touched),
+                "qids": sorted({qid for _, qid, _ in touched}),
+            },
+        )
+        buckets: dict[tuple[str, int, datetime], dict[str, float]] = {}
+        for row in result.mappings().all():
+            key = (row["period"], row["query_id"], row["computed_at"])
+            if key in touched:
+                buckets.setdefault(key, {})[row["brand"]] = float(row["visibility_score"])
+
+        updates = []
+        for (period, qid, bucket), scores in buckets.items():
+            primary = next((b for b in scores if _is_primary(b)), None)
+            if primary is None:
+                continue
+            competitors = {b: s for b, s in scores.items() if not _is_primary(b)}
+            updates.append({
+                "qid": qid, "brand": primary, "period": period, "bucket": bucket,
+                "gap": calculate_competitive_gap(scores[primary], competitors),
+            })
+        if updates:
+            await self._db.execute(
+                text(
+                    "UPDATE vis_score SET competitive_gap = :gap "
+                    "WHERE query_id = :qid AND brand = :brand "
+                    "AND period = :period AND computed_at = :bucket"
+                ),
+                updates,
+            )
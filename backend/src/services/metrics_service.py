@@ -0,0 +1,62 @@
+"""MetricsService — Prometheus text exposition of pipeline stage timings."""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.shared.metrics import (
+    StageTimings,
+    format_labels,
+    render_histogram,
+    render_metric_header,
+)
+
+STAGE_DURATION_METRIC = "levoit_pipeline_stage_duration_seconds"
+RUN_DURATION_METRIC = "levoit_pipeline_last_run_duration_seconds"
+RUN_ID_METRIC = "levoit_pipeline_last_run_id"
+
+
+class MetricsService:
+    """Renders the stage breakdown of the latest completed run per flow."""
+
+    def __init__(self, db: AsyncSession) -> None:
+        self._db = db
+
+    async def latest_runs(self) -> list[dict]:
+        """Return the most recent finished run with stage timings for each flow."""
+        result = await self._db.execute(text(
+            "SELECT DISTINCT ON (flow_name) id, flow_name, status, duration_sec, stage_timings "
+            "FROM vis_pipeline_run "
+            "WHERE completed_at IS NOT NULL AND stage_timings IS NOT NULL "
+            "ORDER BY flow_name, completed_at DESC"
+        ))
+        return [dict(r) for r in result.mappings().all()]
+
+    async def render_pipeline_metrics(self) -> str:
+        runs = await self.latest_runs()
+
+        lines = render_metric_header(
+            STAGE_DURATION_METRIC, "histogram",
+            "Per-stage durations of the latest completed run of each pipeline flow.",
+        )
+        for run in runs:
+            timings = StageTimings.from_json(run["stage_timings"])
+            for stage, hist in sorted(timings.histograms.items()):
+                lines += render_histogram(
+                    STAGE_DURATION_METRIC, hist, {"flow": run["flow_name"], "stage": stage},
+                )
+
+        lines += render_metric_header(
+            RUN_DURATION_METRIC, "gauge", "Wall-clock duration of the latest completed run.",
+        )
+        for run in runs:
+            if run["duration_sec"] is not None:
+                labels = format_labels({"flow": run["flow_name"], "status": run["status"]})
+                lines.append(f"{RUN_DURATION_METRIC}{labels} {float(run['duration_sec'])!r}")
+
+        lines += render_metric_header(
+            RUN_ID_METRIC, "gauge", "vis_pipeline_run.id the stage histograms were taken from.",
+        )
+        for run in runs:
+            lines.append(f"{RUN_ID_METRIC}{format_labels({'flow': run['flow_name']})} {run['id']}")
+
+        return "\n".join(lines) + "\n"
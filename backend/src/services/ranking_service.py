@@ -1,16 +1,97 @@
 """RankingService — list, latest (cached), and trend queries for rankings."""
 
+import asyncio
 import json
+import math
+import random
+import time
 from datetime import datetime
 
+from pydantic import TypeAdapter
 from redis.asyncio import Redis
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.schemas import RankingResponse, TrendPoint
 from src.models.visibility import VisRanking
+from src.shared.metrics import record_cache_lookup
+from src.shared.responses import as_bytes
 
 LATEST_CACHE_TTL = 3600  # 1 hour
+LATEST_CACHE_PREFIX = "rankings:latest:"
+
+# Queries with no rankings yet: short TTL so new pipeline results show up quickly
+LATEST_NEGATIVE_TTL = 60
+
+# Single-flight lock on a miss. The TTL frees the key if the holder dies;
+# waiters poll the cache for at most LATEST_LOCK_WAIT before querying themselves.
+LATEST_LOCK_TTL = 10
+LATEST_LOCK_WAIT = 2.0
+LATEST_LOCK_POLL = 0.05
+
+# XFetch beta: >1 refreshes earlier, <1 later (Vattani et al., "Optimal Probabilistic
+# Cache Stampede Prevention")
+LATEST_EARLY_REFRESH_BETA = 1.0
+
+# get_trends granularity → time_bucket width over the daily aggregates
+TREND_BUCKETS = {"daily": "1 day", "weekly": "1 week", "monthly": "1 month"}
+
+
+# Serializes / validates a latest-rankings list straight to / from JSON bytes
+_LATEST_ADAPTER = TypeAdapter(list[RankingResponse])
+
+# vis_ranking_latest columns in RankingResponse shape (ranking_id is the vis_ranking id)
+_LATEST_SELECT = (
+    "ranking_id AS id, query_id, platform, brand, rank_position, "
+    "snippet, source_urls, snapshot_id, scraped_at, pipeline_run_id"
+)
+
+
+def _ranking_from_row(row) -> RankingResponse:
+    return RankingResponse(
+        id=row["id"],
+        query_id=row["query_id"],
+        platform=row["platform"],
+        brand=row["brand"],
+        rank_position=row["rank_position"],
+        snippet=row["snippet"],
+        source_urls=row["source_urls"],
+        snapshot_id=row["snapshot_id"],
+        scraped_at=row["scraped_at"],
+        pipeline_run_id=row["pipeline_run_id"],
+    )
+
+
+def _encode_latest(body: bytes, delta: float, ttl: int) -> bytes:
+    """Cache envelope: one JSON line of early-refresh metadata, then the response body.
+
+    Compact JSON never contains a raw newline, so the body is everything after the
+    first one and is served as-is on a hit.
+    """
+    meta = json.dumps({"delta": delta, "expires_at": time.time() + ttl})
+    return meta.encode() + b"\n" + body
+
+
+def _decode_latest(raw: str | bytes) -> tuple[bytes, float, float | None]:
+    """Return (body, delta, expires_at) of a cache entry.
+
+    Entries written before the bytes envelope are a plain JSON list, served
+    as-is and never refreshed early.
+    """
+    raw = as_bytes(raw)
+    meta, sep, body = raw.partition(b"\n")
+    if not sep:
+        return raw, 0.0, None
+    data = json.loads(meta)
+    return body, float(data["delta"]), float(data["expires_at"])
+
+
+def _should_refresh_early(delta: float, expires_at: float | None) -> bool:
+    """XFetch: refresh when now - delta * beta * ln(U) >= expiry, with U ~ (0, 1]."""
+    if expires_at is None or delta <= 0:
+        return False
+    jitter = -delta * LATEST_EARLY_REFRESH_BETA * math.log(1.0 - random.random())
+    return time.time() + jitter >= expires_at
 
 
 class RankingService:
@@ -66,95 +147,221 @@ class RankingService:
     # ── Latest per query (Redis-cached) ──────────────────────
 
     async def get_latest(self, query_id: int) -> list[RankingResponse]:
-        """Return most recent ranking per platform+brand, cached 1h in Redis."""
-        cache_key = f"rankings:latest:{query_id}"
+        """Return most recent ranking per platform+brand (see get_latest_json)."""
+        if self._redis is None:
+            items, _ = await self._query_latest(query_id)
+            return items
+        return _LATEST_ADAPTER.validate_json(await self.get_latest_json(query_id))
+
+    async def get_latest_json(self, query_id: int) -> bytes:
+        """Most recent ranking per platform+brand as response JSON bytes, cached 1h in Redis.
 
-        # Try cache
-        if self._redis:
+        Hits return the stored bytes without building a single model.
+        Stampede protection for the dashboard's polling load:
+          - empty results are cached for LATEST_NEGATIVE_TTL (negative caching)
+          - on a miss one request per key recomputes under a Redis SET NX lock;
+            the others wait briefly for its result instead of querying too
+          - hits are refreshed early with a probability that rises towards
+            expiry (XFetch), so hot keys don't all expire at the same moment
+        """
+        if self._redis is None:
+            items, _ = await self._query_latest(query_id)
+            return _LATEST_ADAPTER.dump_json(items)
+
+        cache_key = f"{LATEST_CACHE_PREFIX}{query_id}"
+        lock_key = f"{cache_key}:lock"
+
+        cached = await self._redis.get(cache_key)
+        record_cache_lookup("rankings:latest", hit=cached is not None)
+        if cached is not None:
+            body, delta, expires_at = _decode_latest(cached)
+            if _should_refresh_early(delta, expires_at) and await self._try_lock(lock_key):
+                return await self._recompute_latest(query_id, cache_key, lock_key)
+            return body
+
+        if await self._try_lock(lock_key):
+            return await self._recompute_latest(query_id, cache_key, lock_key)
+
+        # Another request is computing this key — wait for its result
+        deadline = time.monotonic() + LATEST_LOCK_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(LATEST_LOCK_POLL)
             cached = await self._redis.get(cache_key)
             if cached is not None:
-                return [RankingResponse(**item) for item in json.loads(cached)]
-
-        # DISTINCT ON: latest row per (platform, brand) for this query
-        stmt = text("""
-            SELECT DISTINCT ON (platform, brand)
-                id, query_id, platform, brand, rank_position,
-                snippet, source_urls, snapshot_id, scraped_at, pipeline_run_id
-            FROM vis_ranking
+                return _decode_latest(cached)[0]
+
+        # Lock holder is slow or gone: answer from the DB, leave caching to the holder
+        items, _ = await self._query_latest(query_id)
+        return _LATEST_ADAPTER.dump_json(items)
+
+    async def _try_lock(self, lock_key: str) -> bool:
+        return bool(await self._redis.set(lock_key, "1", nx=True, ex=LATEST_LOCK_TTL))
+
+    async def _recompute_latest(self, query_id: int, cache_key: str, lock_key: str) -> bytes:
+        try:
+            items, delta = await self._query_latest(query_id)
+            body = _LATEST_ADAPTER.dump_json(items)
+            ttl = LATEST_CACHE_TTL if items else LATEST_NEGATIVE_TTL
+            await self._redis.set(cache_key, _encode_latest(body, delta, ttl), ex=ttl)
+            return body
+        finally:
+            # Plain DEL: if the lock already expired and was re-taken, the worst
+            # case is one extra recompute, which the lock TTL bounds anyway
+            await self._redis.delete(lock_key)
+
+    async def _query_latest(self, query_id: int) -> tuple[list[RankingResponse], float]:
+        """Read the query's latest rankings; return the items and the seconds it took."""
+        start = time.perf_counter()
+
+        # vis_ranking_latest: one row per (platform, brand), primary-key prefix lookup
+        stmt = text(f"""
+            SELECT {_LATEST_SELECT}
+            FROM vis_ranking_latest
             WHERE query_id = :query_id
-            ORDER BY platform, brand, scraped_at DESC
+            ORDER BY platform, brand
         """)
         result = await self._db.execute(stmt, {"query_id": query_id})
         rows = result.mappings().all()
 
-        items = [
-            RankingResponse(
-                id=row["id"],
-                query_id=row["query_id"],
-                platform=row["platform"],
-                brand=row["brand"],
-                rank_position=row["rank_position"],
-                snippet=row["snippet"],
-                source_urls=row["source_urls"],
-                snapshot_id=row["snapshot_id"],
-                scraped_at=row["scraped_at"],
-                pipeline_run_id=row["pipeline_run_id"],
-            )
-            for row in rows
-        ]
+        items = [_ranking_from_row(row) for row in rows]
+        return items, time.perf_counter() - start
+
+    # ── Latest for many queries (one MGET, one query, one pipeline) ──
+
+    async def get_latest_many(self, query_ids: list[int]) -> dict[int, list[RankingResponse]]:
+        """Batch get_latest (see get_latest_many_json)."""
+        bodies = await self.get_latest_many_json(query_ids)
+        return {qid: _LATEST_ADAPTER.validate_json(body) for qid, body in bodies.items()}
+
+    async def get_latest_many_json(self, query_ids: list[int]) -> dict[int, bytes]:
+        """Batch get_latest_json: cached entries via one MGET, misses via one DB query.
 
-        # Cache non-empty results
-        if self._redis and items:
-            data = [item.model_dump(mode="json") for item in items]
-            await self._redis.setex(cache_key, LATEST_CACHE_TTL, json.dumps(data))
+        Misses (and hits due for early refresh) are recomputed together and
+        written back in one pipeline, with the same envelope and TTLs as
+        get_latest. Result keys follow the order of `query_ids` (deduplicated).
+        """
+        query_ids = list(dict.fromkeys(query_ids))
+        results: dict[int, bytes] = {}
+        misses = query_ids
 
-        return items
+        if self._redis is not None and query_ids:
+            keys = [f"{LATEST_CACHE_PREFIX}{qid}" for qid in query_ids]
+            cached_values = await self._redis.mget(keys)
+            misses = []
+            for qid, cached in zip(query_ids, cached_values):
+                record_cache_lookup("rankings:latest", hit=cached is not None)
+                if cached is None:
+                    misses.append(qid)
+                    continue
+                body, delta, expires_at = _decode_latest(cached)
+                if _should_refresh_early(delta, expires_at):
+                    misses.append(qid)
+                results[qid] = body
+
+        if misses:
+            start = time.perf_counter()
+            stmt = text(f"""
+                SELECT {_LATEST_SELECT}
+                FROM vis_ranking_latest
+                WHERE query_id = ANY(:query_ids)
+                ORDER BY query_id, platform, brand
+            """)
+            rows = (await self._db.execute(stmt, {"query_ids": misses})).mappings().all()
+            delta = time.perf_counter() - start
+
+            computed: dict[int, list[RankingResponse]] = {qid: [] for qid in misses}
+            for row in rows:
+                computed[row["query_id"]].append(_ranking_from_row(row))
+            bodies = {qid: _LATEST_ADAPTER.dump_json(items) for qid, items in computed.items()}
+            results.update(bodies)
+
+            if self._redis is not None:
+                pipe = self._redis.pipeline(transaction=False)
+                for qid, items in computed.items():
+                    ttl = LATEST_CACHE_TTL if items else LATEST_NEGATIVE_TTL
+                    entry = _encode_latest(bodies[qid], delta, ttl)
+                    pipe.set(f"{LATEST_CACHE_PREFIX}{qid}", entry, ex=ttl)
+                await pipe.execute()
+
+        return {qid: results[qid] for qid in query_ids}
 
     # ── Trends from TimescaleDB ──────────────────────────────
 
     async def get_trends(
         self,
         *,
-        query_id: int,
+        query_id: int | None = None,
+        category: str | None = None,
         brands: list[str] | None = None,
+        platform: str | None = None,
+        by_platform: bool = False,
         from_date: datetime | None = None,
         to_date: datetime | None = None,
         granularity: str = "daily",
     ) -> list[TrendPoint]:
-        """Return time-bucketed trend data from TimescaleDB."""
+        """Return time-bucketed trend data from TimescaleDB's daily continuous aggregates.
+
+        Scope is one query, every query of a category, or (neither given) all queries.
+        platform restricts to one platform; by_platform returns a series per platform
+        instead of folding them together. Weekly/monthly buckets and multi-query scopes
+        are re-aggregated from the daily rows weighted by sample_count, so no closed
+        day is ever read from raw ts_search_rank. Date bounds are day-granular.
+        """
         if self._ts_db is None:
             return []
 
-        bucket_map = {"daily": "1 day", "weekly": "1 week", "monthly": "1 month"}
-        bucket = bucket_map.get(granularity, "1 day")
+        bucket = TREND_BUCKETS.get(granularity, "1 day")
+        query_ids: list[int] | None = None
+        if query_id is not None:
+            query_ids = [query_id]
+        elif category is not None:
+            query_ids = await self._category_query_ids(category)
+            if not query_ids:
+                return []
 
-        params: dict = {"query_id": query_id}
-        where_clauses = ["query_id = :query_id"]
+        split = by_platform or platform is not None
+        if query_ids is None:
+            view = "ts_daily_brand_rank"
+        elif split:
+            view = "ts_daily_platform_rank"
+        else:
+            view = "ts_daily_rank"
 
+        params: dict = {}
+        where_clauses: list[str] = []
+        if query_ids is not None:
+            where_clauses.append("query_id = ANY(:query_ids)")
+            params["query_ids"] = query_ids
+        if platform is not None:
+            where_clauses.append("platform = :platform")
+            params["platform"] = platform
         if brands:
             where_clauses.append("brand = ANY(:brands)")
             params["brands"] = brands
         if from_date:
-            where_clauses.append("time >= :from_date")
+            where_clauses.append("day >= time_bucket('1 day', CAST(:from_date AS timestamptz))")
             params["from_date"] = from_date
         if to_date:
-            where_clauses.append("time <= :to_date")
+            where_clauses.append("day <= :to_date")
             params["to_date"] = to_date
 
-        where_sql = " AND ".join(where_clauses)
+        where_sql = " AND ".join(where_clauses) or "TRUE"
+        group_sql = "timestamp, brand, platform" if split else "timestamp, brand"
+        platform_sql = "platform" if split else "NULL"
 
-        # bucket comes from controlled dict — safe to interpolate
+        # bucket and view come from controlled values — safe to interpolate
         sql = text(f"""
             SELECT
-                time_bucket('{bucket}', time) AS timestamp,
+                time_bucket('{bucket}', day) AS timestamp,
                 brand,
-                AVG(rank_position)    AS avg_rank,
-                AVG(visibility_score) AS avg_score,
-                COUNT(*)              AS sample_count
-            FROM ts_search_rank
+                {platform_sql} AS platform,
+                SUM(avg_rank * sample_count) / SUM(sample_count)  AS avg_rank,
+                SUM(avg_score * sample_count) / SUM(sample_count) AS avg_score,
+                SUM(sample_count)                                 AS sample_count
+            FROM {view}
             WHERE {where_sql}
-            GROUP BY timestamp, brand
-            ORDER BY timestamp, brand
+            GROUP BY {group_sql}
+            ORDER BY {group_sql}
         """)
 
         result = await self._ts_db.execute(sql, params)
@@ -164,9 +371,18 @@ class RankingService:
             TrendPoint(
                 timestamp=row["timestamp"],
                 brand=row["brand"],
+                platform=row["platform"],
                 avg_rank=round(float(row["avg_rank"]), 2),
                 avg_score=round(float(row["avg_score"]), 2),
                 sample_count=int(row["sample_count"]),
             )
             for row in rows
         ]
+
+    async def _category_query_ids(self, category: str) -> list[int]:
+        """Query IDs of a category, resolved in PostgreSQL (the ts DB has no vis_query)."""
+        result = await self._db.execute(
+            text("SELECT id FROM vis_query WHERE category = :category ORDER BY id"),
+            {"category": category},
+        )
+        return [row[0] for row in result.all()]
@@ -1,17 +1,50 @@
-"""ScoreService — list scores and build comparison rows."""
+"""ScoreService — list scores, build comparison rows and per-run comparison snapshots."""
 
 import json
-from datetime import datetime
+from collections.abc import Mapping
+from datetime import datetime, timedelta, timezone
 
+from pydantic import TypeAdapter
 from redis.asyncio import Redis
 from sqlalchemy import func, select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.models.schemas import ComparisonRow, ScoreResponse
 from src.models.visibility import VisScore
+from src.services.analyzer.score_calculator import calculate_competitive_gap
+from src.shared.metrics import record_cache_lookup
+from src.shared.responses import as_bytes
 
 COMPARISON_CACHE_TTL = 3600  # 1 hour
 
+# Older per-run comparison snapshots are pruned whenever a new one is written
+COMPARISON_SNAPSHOT_RETENTION = timedelta(days=7)
+
+# Serializes / validates comparison rows straight to / from JSON bytes
+_COMPARISON_ADAPTER = TypeAdapter(list[ComparisonRow])
+
+# Gap reference when no vis_brand row is flagged is_primary (matches the pipeline)
+DEFAULT_PRIMARY_BRAND = "Levoit"
+
+
+def _clamp(v: float) -> float:
+    return max(0.0, min(100.0, v))
+
+
+def _comparison_row(row: Mapping) -> ComparisonRow:
+    """Build a comparison row from a pivoted result row; unseen tracked brands score 0."""
+    found = {brand: _clamp(float(score)) for brand, score in row["scores"].items()}
+    scores = {brand: found.get(brand, 0.0) for brand in row["brands"]}
+    primary = row["primary_brand"] or DEFAULT_PRIMARY_BRAND
+    competitors = {b: v for b, v in scores.items() if b != primary}
+    return ComparisonRow(
+        query_id=row["query_id"],
+        query_text=row["query_text"],
+        primary_brand=primary,
+        scores=scores,
+        competitive_gap=calculate_competitive_gap(scores.get(primary, 0.0), competitors),
+    )
+
 
 class ScoreService:
     """Handles score listing and competitive comparison queries."""
@@ -60,15 +93,58 @@ class ScoreService:
         from_date: datetime | None = None,
         to_date: datetime | None = None,
     ) -> list[ComparisonRow]:
-        """Return competitive comparison rows, one per query."""
+        """Return competitive comparison rows (see get_comparison_json)."""
+        body = await self.get_comparison_json(
+            category=category, from_date=from_date, to_date=to_date,
+        )
+        return _COMPARISON_ADAPTER.validate_json(body)
+
+    async def get_comparison_json(
+        self,
+        *,
+        category: str | None = None,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> bytes:
+        """Comparison rows, one per query scored for every tracked brand, as JSON bytes.
+
+        The default view (no date range) is the newest pipeline snapshot, aggregated
+        to JSON text by PostgreSQL; custom date ranges are computed on the fly and
+        cached as serialized bytes. Neither path builds models on a hit.
+        """
+        if from_date is None and to_date is None:
+            snapshot = await self._read_snapshot(category)
+            if snapshot is not None:
+                return snapshot
+
         cache_key = f"scores:comparison:{category}:{from_date}:{to_date}"
 
         # Try cache
         if self._redis:
             cached = await self._redis.get(cache_key)
+            record_cache_lookup("scores:comparison", hit=cached is not None)
             if cached is not None:
-                return [ComparisonRow(**item) for item in json.loads(cached)]
+                return as_bytes(cached)
+
+        pairs = await self._compute_comparison(
+            category=category, from_date=from_date, to_date=to_date,
+        )
+        body = _COMPARISON_ADAPTER.dump_json([row for _, row in pairs])
+
+        # Cache non-empty results
+        if self._redis and pairs:
+            await self._redis.set(cache_key, body, ex=COMPARISON_CACHE_TTL)
 
+        return body
+
+    async def _compute_comparison(
+        self,
+        *,
+        category: str | None = None,
+        from_date: datetime | None = None,
+        to_date: datetime | None = None,
+    ) -> list[tuple[str, ComparisonRow]]:
+        """Run the comparison pivot; returns (category, row) pairs ordered by query_id."""
         params: dict = {}
         where_clauses = ["vq.is_active = true"]
 
@@ -84,63 +160,98 @@ class ScoreService:
 
         where_sql = " AND ".join(where_clauses)
 
-        # Conditional aggregation to pivot brand scores into columns.
-        # Uses the most recent score per query+brand via DISTINCT ON subquery.
+        # Latest score per query+brand (DISTINCT ON walks idx_vis_score_query_brand),
+        # restricted to tracked brands by exact name, then pivoted into one JSONB map
+        # per query. The brand list and primary brand ride along as one-off InitPlans.
         sql = text(f"""
             WITH latest_scores AS (
                 SELECT DISTINCT ON (vs.query_id, vs.brand)
-                    vs.query_id, vs.brand, vs.visibility_score, vs.computed_at,
-                    vq.query_text, vq.category
+                    vs.query_id, vs.brand, vs.visibility_score, vq.query_text, vq.category
                 FROM vis_score vs
                 JOIN vis_query vq ON vs.query_id = vq.id
+                JOIN vis_brand vb ON vb.name = vs.brand
                 WHERE {where_sql}
                 ORDER BY vs.query_id, vs.brand, vs.computed_at DESC
             )
             SELECT
                 query_id,
                 query_text,
-                COALESCE(MAX(CASE WHEN LOWER(brand) = 'levoit' THEN visibility_score END), 0)
-                    AS levoit_score,
-                COALESCE(MAX(CASE WHEN LOWER(brand) = 'dyson' THEN visibility_score END), 0)
-                    AS dyson_score,
-                COALESCE(MAX(CASE WHEN LOWER(brand) = 'coway' THEN visibility_score END), 0)
-                    AS coway_score,
-                COALESCE(MAX(CASE WHEN LOWER(brand) = 'honeywell' THEN visibility_score END), 0)
-                    AS honeywell_score
+                category,
+                jsonb_object_agg(brand, visibility_score) AS scores,
+                (SELECT jsonb_agg(name ORDER BY id) FROM vis_brand) AS brands,
+                (SELECT name FROM vis_brand WHERE is_primary ORDER BY id LIMIT 1)
+                    AS primary_brand
             FROM latest_scores
-            GROUP BY query_id, query_text
+            GROUP BY query_id, query_text, category
             ORDER BY query_id
         """)
 
         result = await self._db.execute(sql, params)
-        rows = result.mappings().all()
-
-        def _clamp(v: float) -> float:
-            return max(0.0, min(100.0, v))
-
-        items = []
-        for row in rows:
-            levoit = _clamp(float(row["levoit_score"]))
-            dyson = _clamp(float(row["dyson_score"]))
-            coway = _clamp(float(row["coway_score"]))
-            honeywell = _clamp(float(row["honeywell_score"]))
-            competitors = [dyson, coway, honeywell]
-            best_competitor = max(competitors) if competitors else 0.0
-            gap = round(levoit - best_competitor, 2)
-
-            items.append(ComparisonRow(
-                query_id=row["query_id"],
-                query_text=row["query_text"],
-                levoit_score=levoit,
-                dyson_score=dyson,
-                coway_score=coway,
-                honeywell_score=honeywell,
-                competitive_gap=gap,
-            ))
+        return [(row["category"], _comparison_row(row)) for row in result.mappings().all()]
 
-        # Cache non-empty results
-        if self._redis and items:
-            data = [item.model_dump(mode="json") for item in items]
-            await self._redis.setex(cache_key, COMPARISON_CACHE_TTL, json.dumps(data))
+    # ── Comparison snapshots (materialized per pipeline run) ─
 
-        return items
+    async def _read_snapshot(self, category: str | None) -> bytes | None:
+        """Rows of the newest snapshot as JSON bytes, or None before the first pipeline run.
+
+        Categories are merged back into query order by jsonb_agg, so the stored rows
+        go out as-is.
+        """
+        category_sql = "AND s.category = :category" if category else ""
+        sql = text(f"""
+            WITH newest AS (
+                SELECT pipeline_run_id FROM vis_comparison_snapshot
+                ORDER BY computed_at DESC
+                LIMIT 1
+            )
+            SELECT
+                newest.pipeline_run_id,
+                COALESCE(
+                    jsonb_agg(item ORDER BY (item->>'query_id')::int)
+                        FILTER (WHERE item IS NOT NULL),
+                    '[]'::jsonb
+                )::text AS rows
+            FROM newest
+            LEFT JOIN vis_comparison_snapshot s
+                ON s.pipeline_run_id = newest.pipeline_run_id {category_sql}
+            LEFT JOIN LATERAL jsonb_array_elements(s.rows) AS item ON TRUE
+            GROUP BY newest.pipeline_run_id
+        """)
+        params = {"category": category} if category else {}
+        result = await self._db.execute(sql, params)
+        row = result.mappings().first()
+        if row is None:
+            return None
+        return as_bytes(row["rows"])
+
+    async def snapshot_comparison(self, run_id: int) -> int:
+        """Materialize the default comparison view for a pipeline run, one row per category.
+
+        Also prunes snapshots older than COMPARISON_SNAPSHOT_RETENTION.
+        Returns the number of categories written.
+        """
+        by_category: dict[str, list[dict]] = {}
+        for category, row in await self._compute_comparison():
+            by_category.setdefault(category, []).append(row.model_dump(mode="json"))
+
+        now = datetime.now(timezone.utc)
+        if by_category:
+            await self._db.execute(
+                text(
+                    "INSERT INTO vis_comparison_snapshot "
+                    "(pipeline_run_id, category, rows, computed_at) "
+                    "VALUES (:run, :category, CAST(:rows AS JSONB), :at) "
+                    "ON CONFLICT (pipeline_run_id, category) DO UPDATE SET "
+                    "rows = EXCLUDED.rows, computed_at = EXCLUDED.computed_at"
+                ),
+                [
+                    {"run": run_id, "category": category, "rows": json.dumps(rows), "at": now}
+                    for category, rows in by_category.items()
+                ],
+            )
+        await self._db.execute(
+            text("DELETE FROM vis_comparison_snapshot WHERE computed_at < :cutoff"),
+            {"cutoff": now - COMPARISON_SNAPSHOT_RETENTION},
+        )
+        await self._db.commit()
+        return len(by_category)
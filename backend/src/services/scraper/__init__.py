@@ -5,6 +5,7 @@ from src.services.scraper.chatgpt import ChatGPTScraper
 from src.services.scraper.google_ai import GoogleAIScraper
 from src.services.scraper.perplexity import PerplexityScraper
 from src.services.scraper.processing import ScrapeProcessor
+from src.services.scraper.quarantine import QuarantineReprocessor, QuarantineSink
 from src.services.scraper.rate_limiter import PlatformRateLimiter
 
 __all__ = [
@@ -13,5 +14,7 @@ __all__ = [
     "GoogleAIScraper",
     "PerplexityScraper",
     "ScrapeProcessor",
+    "QuarantineReprocessor",
+    "QuarantineSink",
     "PlatformRateLimiter",
 ]
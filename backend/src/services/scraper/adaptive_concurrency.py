@@ -0,0 +1,163 @@
+"""Adaptive per-platform scrape concurrency (AIMD) driven by observed latency and errors.
+
+Algorithm:
+    - Every Firecrawl attempt (including ones later retried) is classified
+      as ok, error or overload, so a 429 that succeeds on retry still backs off
+    - Overload (timeouts, HTTP 429, quarantined error/block pages and 429
+      statuses) halves the limit at once; scrapes that were already in flight
+      when it was halved saw the old load and cannot halve it again
+    - Ok and error outcomes fill an evaluation window of WINDOW attempts; when
+      the window's p95 latency is within target_p95_s and its error rate
+      within max_error_rate the limit grows by one, otherwise it holds
+    - The limit always stays within [min_limit, max_limit]
+
+ScrapeOrchestrator keeps one AimdLimiter per platform when SCRAPE_ADAPTIVE_CONCURRENCY
+is enabled. In-process slots come from AdaptiveSemaphore.
+
+With SCRAPE_CLUSTER_CONCURRENCY each process sets the shared RedisSemaphore's
+limit to its own AIMD view before acquiring, i.e. a process only admits a
+scrape while the cluster-wide holder count is below its local limit. The
+cluster therefore never runs more than the largest limit among the processes
+currently acquiring (at most scrape_concurrency_max); a process that has
+backed off takes no slots while the others keep the pool at or above its
+limit, and limiters are not shared between processes.
+"""
+
+import asyncio
+import contextlib
+import logging
+import math
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Literal
+
+import httpx
+
+from src.models.scrape_models import QuarantineError
+
+logger = logging.getLogger(__name__)
+
+Outcome = Literal["ok", "error", "overload"]
+
+# Completed scrapes per evaluation window (additive increase happens at most once per window)
+WINDOW = 20
+
+# Multiplicative decrease applied on an overload signal
+BACKOFF_FACTOR = 0.5
+
+# Quarantine reasons that mean the platform is pushing back rather than the content being bad
+OVERLOAD_QUARANTINE_TYPES = frozenset({"error_page"})
+
+
+@dataclass(frozen=True)
+class AimdConfig:
+    """Bounds and health targets for adaptive concurrency (see settings.scrape_concurrency_*)."""
+
+    min_limit: int
+    max_limit: int
+    target_p95_s: float
+    max_error_rate: float
+
+
+def classify(error: Exception | None) -> Outcome:
+    """Map a scrape's exception (None on success) to an AIMD outcome."""
+    if error is None:
+        return "ok"
+    if isinstance(error, (TimeoutError, httpx.TimeoutException)):
+        return "overload"
+    if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+        return "overload"
+    if isinstance(error, QuarantineError) and (
+        error.error_type in OVERLOAD_QUARANTINE_TYPES or error.error_detail == "HTTP 429"
+    ):
+        return "overload"
+    return "error"
+
+
+def p95(values: list[float]) -> float:
+    """Nearest-rank 95th percentile."""
+    ordered = sorted(values)
+    return ordered[math.ceil(0.95 * len(ordered)) - 1]
+
+
+class AimdLimiter:
+    """Concurrency limit for one platform, adjusted from the outcomes recorded into it."""
+
+    def __init__(
+        self,
+        name: str,
+        config: AimdConfig,
+        *,
+        initial: int,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.name = name
+        self._config = config
+        self._clock = clock
+        self._limit = float(min(max(initial, config.min_limit), config.max_limit))
+        self._window: list[tuple[float, bool]] = []
+        self._decreased_at = -math.inf
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    def record(self, started_at: float, outcome: Outcome) -> None:
+        """Feed one finished scrape (started_at from this limiter's clock)."""
+        now = self._clock()
+        if outcome == "overload":
+            if started_at >= self._decreased_at:
+                self._set(self._limit * BACKOFF_FACTOR, "overload")
+                self._decreased_at = now
+                self._window.clear()
+            return
+
+        self._window.append((now - started_at, outcome == "ok"))
+        if len(self._window) < WINDOW:
+            return
+        latency = p95([seconds for seconds, _ in self._window])
+        error_rate = sum(not ok for _, ok in self._window) / len(self._window)
+        self._window.clear()
+        if latency <= self._config.target_p95_s and error_rate <= self._config.max_error_rate:
+            self._set(self._limit + 1, f"p95 {latency:.1f}s, {error_rate:.0%} errors")
+
+    @contextlib.contextmanager
+    def observe(self) -> Iterator[None]:
+        """Time the enclosed scrape and record its outcome; exceptions propagate."""
+        started_at = self._clock()
+        try:
+            yield
+        except Exception as e:
+            self.record(started_at, classify(e))
+            raise
+        self.record(started_at, "ok")
+
+    def _set(self, value: float, reason: str) -> None:
+        previous = self.limit
+        self._limit = min(max(value, self._config.min_limit), self._config.max_limit)
+        if self.limit != previous:
+            logger.info("%s concurrency %d → %d (%s)", self.name, previous, self.limit, reason)
+
+
+class AdaptiveSemaphore:
+    """In-process semaphore whose capacity follows an AimdLimiter's current limit.
+
+    Lowering the limit never interrupts running scrapes; new ones wait until
+    enough of them finish.
+    """
+
+    def __init__(self, limiter: AimdLimiter) -> None:
+        self._limiter = limiter
+        self._in_flight = 0
+        self._changed = asyncio.Condition()
+
+    async def __aenter__(self) -> None:
+        async with self._changed:
+            await self._changed.wait_for(lambda: self._in_flight < self._limiter.limit)
+            self._in_flight += 1
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        async with self._changed:
+            self._in_flight -= 1
+            self._changed.notify_all()
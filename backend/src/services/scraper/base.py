@@ -8,10 +8,12 @@ Retry logic: 3x with exponential backoff (5s, 15s, 45s) per R-DC-06.
 """
 
 import asyncio
+import contextlib
 import hashlib
 import logging
 import time
 from abc import ABC, abstractmethod
+from collections.abc import Callable
 from datetime import datetime, timezone
 
 import httpx
@@ -21,6 +23,7 @@ from src.config import settings
 from src.models.enums import Platform
 from src.models.scrape_models import ProcessedContent, QuarantineError, ScrapeResult
 from src.services.scraper.processing import ScrapeProcessor
+from src.shared.metrics import stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +31,9 @@ logger = logging.getLogger(__name__)
 MAX_RETRIES = 3
 RETRY_DELAYS = [5, 15, 45]
 
+# Context manager factory wrapping each scrape attempt (e.g. AimdLimiter.observe)
+AttemptObserver = Callable[[], contextlib.AbstractContextManager[None]]
+
 
 class AbstractPlatformScraper(ABC):
     """Base class for all AI platform scrapers."""
@@ -50,20 +56,32 @@ class AbstractPlatformScraper(ABC):
         """Build the platform-specific search URL for a query."""
         ...
 
-    async def scrape(self, query: str) -> ProcessedContent:
+    async def scrape(
+        self, query: str, observe_attempt: AttemptObserver | None = None,
+    ) -> ProcessedContent:
         """Execute a scrape: Firecrawl → MongoDB snapshot → Processing → return.
 
         Implements retry logic per R-DC-06: 3x with exponential backoff.
         On all-retries-fail: raises the last exception per R-DC-07.
+        observe_attempt wraps every attempt (not the retry sleeps), so a failed
+        attempt is seen even when a later retry succeeds.
         """
         url = self.build_search_url(query)
         last_error: Exception | None = None
 
         for attempt in range(MAX_RETRIES):
             try:
-                raw = await self._call_firecrawl(url)
-                snapshot_id = await self._store_snapshot(raw, query)
-                processed = self._processor.process(raw)
+                with observe_attempt() if observe_attempt else contextlib.nullcontext():
+                    with stage_timer("firecrawl"):
+                        raw = await self._call_firecrawl(url)
+                    with stage_timer("snapshot"):
+                        snapshot_id = await self._store_snapshot(raw, query)
+                    try:
+                        with stage_timer("process"):
+                            processed = self._processor.process(raw)
+                    except QuarantineError as qe:
+                        qe.snapshot_id = snapshot_id
+                        raise
                 processed.snapshot_id = snapshot_id
                 return processed
 
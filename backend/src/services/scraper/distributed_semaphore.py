@@ -0,0 +1,205 @@
+"""Cluster-wide counting semaphore backed by Redis, with expiring leases and fencing tokens.
+
+Algorithm:
+    - Each semaphore has a ZSET `sem:{name}:holders`: members are lease tokens,
+      scores their expiry (epoch seconds)
+    - Acquire (WATCH/MULTI): count unexpired holders; if below the limit, prune
+      expired ones, INCR `sem:{name}:fence` and add the token. A concurrent
+      change to the holders aborts the transaction and the attempt is retried
+    - Holders renew their lease every lease_s / 3 while working; a holder
+      that crashes stops renewing and its slot frees itself after lease_s
+    - Renew and release only touch the holder's own token, so a holder
+      whose lease already expired cannot renew or release someone else's slot
+    - hold() cancels its body as soon as the lease is found lost (a renewal
+      finds it expired or pruned, or renewals fail until the expiry passes)
+      and raises LeaseLostError, logged with the fence number (monotonic per
+      acquisition) so overlapping holders can be told apart
+
+The limit is exact while holders renew on time. After an expiry it is
+best-effort: a stalled holder keeps running for at most one renewal interval
+(lease_s / 3) past its expiry before it is cancelled, and may overlap with
+the holder that took its slot during that window.
+
+Used by ScrapeOrchestrator to hold MAX_CONCURRENT_PER_PLATFORM across every
+pipeline process and queue worker when SCRAPE_CLUSTER_CONCURRENCY is enabled.
+Expiry scores use each process's wall clock, so lease_s must comfortably
+exceed the clock skew between hosts.
+"""
+
+import asyncio
+import contextlib
+import logging
+import random
+import time
+import uuid
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import WatchError
+
+logger = logging.getLogger(__name__)
+
+# Default lease length in seconds (renewed every third of it while held)
+DEFAULT_LEASE_SECONDS = 30.0
+
+# Base delay between acquire attempts while the semaphore is full (jittered ±50%)
+POLL_INTERVAL = 0.1
+
+
+class SemaphoreTimeoutError(TimeoutError):
+    """No slot became free within the acquire timeout."""
+
+
+class LeaseLostError(Exception):
+    """The holder's lease expired while it was held; its body was cancelled."""
+
+
+@dataclass
+class Lease:
+    """One acquired slot; fence increases with every acquisition of the semaphore."""
+
+    token: str
+    fence: int
+    expires_at: float
+    lost: bool = False
+
+
+class RedisSemaphore:
+    """Counting semaphore shared by every process using the same Redis and name."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        name: str,
+        limit: int,
+        *,
+        lease_s: float = DEFAULT_LEASE_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self._redis = redis
+        self.name = name
+        self.limit = limit
+        self._lease_s = lease_s
+        self._clock = clock
+        self._holders_key = f"sem:{name}:holders"
+        self._fence_key = f"sem:{name}:fence"
+
+    async def try_acquire(self) -> Lease | None:
+        """Take a slot if one is free right now."""
+        token = uuid.uuid4().hex
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self._holders_key)
+                    now = self._clock()
+                    if await pipe.zcount(self._holders_key, f"({now}", "+inf") >= self.limit:
+                        await pipe.unwatch()
+                        return None
+                    expires_at = now + self._lease_s
+                    pipe.multi()
+                    pipe.zremrangebyscore(self._holders_key, "-inf", now)
+                    pipe.incr(self._fence_key)
+                    pipe.zadd(self._holders_key, {token: expires_at})
+                    pipe.expire(self._holders_key, int(self._lease_s) + 60)
+                    _, fence, _, _ = await pipe.execute()
+                    return Lease(token, int(fence), expires_at)
+                except WatchError:
+                    continue
+
+    async def acquire(self, timeout: float | None = None) -> Lease:
+        """Wait for a slot; SemaphoreTimeoutError after timeout seconds (None waits forever)."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease = await self.try_acquire()
+            if lease is not None:
+                return lease
+            delay = POLL_INTERVAL * random.uniform(0.5, 1.5)
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SemaphoreTimeoutError(
+                        f"No {self.name} slot free within {timeout:g}s (limit {self.limit})"
+                    )
+                delay = min(delay, remaining)
+            await asyncio.sleep(delay)
+
+    async def renew(self, lease: Lease) -> bool:
+        """Extend an unexpired lease; False (and lease.lost) once it has expired or been pruned."""
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self._holders_key)
+                    now = self._clock()
+                    score = await pipe.zscore(self._holders_key, lease.token)
+                    if score is None or score <= now:
+                        await pipe.unwatch()
+                        lease.lost = True
+                        return False
+                    expires_at = now + self._lease_s
+                    pipe.multi()
+                    pipe.zadd(self._holders_key, {lease.token: expires_at}, xx=True)
+                    await pipe.execute()
+                    lease.expires_at = expires_at
+                    return True
+                except WatchError:
+                    continue
+
+    async def release(self, lease: Lease) -> None:
+        await self._redis.zrem(self._holders_key, lease.token)
+
+    async def holders(self) -> int:
+        """Unexpired leases right now (monitoring / tests)."""
+        return await self._redis.zcount(self._holders_key, f"({self._clock()}", "+inf")
+
+    @contextlib.asynccontextmanager
+    async def hold(self, timeout: float | None = None) -> AsyncIterator[Lease]:
+        """Acquire, keep the lease renewed while the body runs, then release.
+
+        Raises SemaphoreTimeoutError if no slot frees up within timeout, and
+        LeaseLostError (after cancelling the body) if the lease is lost.
+        """
+        lease = await self.acquire(timeout)
+        holder = asyncio.current_task()
+        lost = asyncio.Event()
+        keeper = asyncio.create_task(self._keep_alive(lease, holder, lost))
+        try:
+            yield lease
+        except asyncio.CancelledError:
+            # Only our own cancellation becomes LeaseLostError; others propagate
+            if lost.is_set() and holder is not None and holder.uncancel() == 0:
+                raise LeaseLostError(
+                    f"{self.name} lease {lease.fence} expired while held"
+                ) from None
+            raise
+        finally:
+            keeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keeper
+            try:
+                await self.release(lease)
+            except Exception as e:  # the lease expires on its own
+                logger.warning("Releasing %s lease %d failed: %s", self.name, lease.fence, e)
+
+    async def _keep_alive(
+        self, lease: Lease, holder: asyncio.Task | None, lost: asyncio.Event,
+    ) -> None:
+        while True:
+            await asyncio.sleep(self._lease_s / 3)
+            try:
+                renewed = await self.renew(lease)
+            except Exception as e:  # transient Redis error; retry until the lease runs out
+                logger.warning("Renewing %s lease %d failed: %s", self.name, lease.fence, e)
+                if self._clock() < lease.expires_at:
+                    continue
+                renewed = False
+            if not renewed:
+                logger.warning(
+                    "%s lease %d expired while held — cancelling its holder",
+                    self.name, lease.fence,
+                )
+                lease.lost = True
+                lost.set()
+                if holder is not None:
+                    holder.cancel()
+                return
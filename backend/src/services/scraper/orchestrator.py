@@ -4,11 +4,15 @@ Responsibilities:
   - Expand VisQuery list into query × platform task matrix
   - Dedup via Redis key (dedup:{query_id}:{platform}, TTL 6h) per R-DC-05
   - Acquire rate limit before each scrape
-  - Limit concurrency per platform with asyncio.Semaphore(3)
+  - Limit concurrency per platform to 3 — per process with asyncio.Semaphore, or
+    across every process with RedisSemaphore leases when cluster_concurrency is set
+  - Optionally adapt that limit per platform (AIMD) from scrape latency and errors
   - Collect results, record failures, never block the pipeline per R-DC-07
+  - Persist QuarantineError payloads via the optional QuarantineSink
 """
 
 import asyncio
+import contextlib
 import logging
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -16,9 +20,17 @@ from datetime import datetime, timezone
 from redis.asyncio import Redis
 
 from src.models.enums import Platform
-from src.models.scrape_models import ProcessedContent
+from src.models.scrape_models import ProcessedContent, QuarantineError
+from src.services.scraper.adaptive_concurrency import AdaptiveSemaphore, AimdConfig, AimdLimiter
 from src.services.scraper.base import AbstractPlatformScraper
+from src.services.scraper.distributed_semaphore import (
+    DEFAULT_LEASE_SECONDS,
+    RedisSemaphore,
+    SemaphoreTimeoutError,
+)
+from src.services.scraper.quarantine import QuarantineSink
 from src.services.scraper.rate_limiter import PlatformRateLimiter
+from src.shared.metrics import stage_timer
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +43,9 @@ MAX_CONCURRENT_PER_PLATFORM = 3
 # Rate limit acquire timeout per task
 RATE_LIMIT_TIMEOUT = 120.0
 
+# Cluster-wide scrape slot acquire timeout per task (cluster_concurrency only)
+SLOT_TIMEOUT = 300.0
+
 
 @dataclass
 class ScrapeFailure:
@@ -52,6 +67,7 @@ class OrchestratorResult:
     failures: list[ScrapeFailure] = field(default_factory=list)
     skipped_dedup: int = 0
     skipped_rate_limit: int = 0
+    quarantine_count: int = 0
 
     @property
     def total_tasks(self) -> int:
@@ -67,8 +83,8 @@ class OrchestratorResult:
 
 
 @dataclass
-class _ScrapeTask:
-    """Internal: a single query × platform scrape task."""
+class ScrapeTask:
+    """A single query × platform scrape task."""
 
     query_id: int
     query_text: str
@@ -76,6 +92,20 @@ class _ScrapeTask:
     brands: list[str]
 
 
+def expand_tasks(queries: list[dict], platforms: list[Platform]) -> list[ScrapeTask]:
+    """Build the query × platform task matrix (query dicts: id, query_text, brands)."""
+    return [
+        ScrapeTask(
+            query_id=q["id"],
+            query_text=q["query_text"],
+            platform=platform,
+            brands=q.get("brands", []),
+        )
+        for q in queries
+        for platform in platforms
+    ]
+
+
 class ScrapeOrchestrator:
     """Dispatches and manages concurrent scrape tasks across platforms."""
 
@@ -84,13 +114,49 @@ class ScrapeOrchestrator:
         scrapers: dict[Platform, AbstractPlatformScraper],
         rate_limiter: PlatformRateLimiter,
         redis: Redis,
+        quarantine_sink: QuarantineSink | None = None,
+        *,
+        cluster_concurrency: bool = False,
+        slot_lease_s: float = DEFAULT_LEASE_SECONDS,
+        slot_timeout_s: float = SLOT_TIMEOUT,
+        adaptive: AimdConfig | None = None,
     ) -> None:
         self._scrapers = scrapers
         self._rate_limiter = rate_limiter
         self._redis = redis
-        # Per-platform semaphores for concurrency control
-        self._semaphores: dict[Platform, asyncio.Semaphore] = {
-            p: asyncio.Semaphore(MAX_CONCURRENT_PER_PLATFORM)
+        self._quarantine = quarantine_sink
+        self._slot_timeout_s = slot_timeout_s
+        # Per-platform AIMD limits, starting from MAX_CONCURRENT_PER_PLATFORM
+        self._limiters: dict[Platform, AimdLimiter] = (
+            {
+                p: AimdLimiter(p.value, adaptive, initial=MAX_CONCURRENT_PER_PLATFORM)
+                for p in Platform
+            }
+            if adaptive is not None
+            else {}
+        )
+        # Per-platform semaphores for concurrency control; Redis-backed ones hold
+        # the limit across every orchestrator sharing this Redis
+        self._semaphores = {
+            p: self._make_semaphore(p, cluster_concurrency, slot_lease_s) for p in Platform
+        }
+
+    def _make_semaphore(
+        self, platform: Platform, cluster_concurrency: bool, lease_s: float
+    ) -> asyncio.Semaphore | AdaptiveSemaphore | RedisSemaphore:
+        if cluster_concurrency:
+            return RedisSemaphore(
+                self._redis, f"scrape:{platform.value}", MAX_CONCURRENT_PER_PLATFORM,
+                lease_s=lease_s,
+            )
+        if platform in self._limiters:
+            return AdaptiveSemaphore(self._limiters[platform])
+        return asyncio.Semaphore(MAX_CONCURRENT_PER_PLATFORM)
+
+    def concurrency_limits(self) -> dict[Platform, int]:
+        """Current per-platform scrape concurrency (adapted when AIMD is enabled)."""
+        return {
+            p: self._limiters[p].limit if p in self._limiters else MAX_CONCURRENT_PER_PLATFORM
             for p in Platform
         }
 
@@ -111,18 +177,7 @@ class ScrapeOrchestrator:
         target_platforms = platforms or list(self._scrapers.keys())
         result = OrchestratorResult()
 
-        # Build task matrix: query × platform
-        tasks: list[_ScrapeTask] = []
-        for q in queries:
-            for platform in target_platforms:
-                if platform not in self._scrapers:
-                    continue
-                tasks.append(_ScrapeTask(
-                    query_id=q["id"],
-                    query_text=q["query_text"],
-                    platform=platform,
-                    brands=q.get("brands", []),
-                ))
+        tasks = expand_tasks(queries, [p for p in target_platforms if p in self._scrapers])
 
         logger.info("Orchestrator: %d tasks (%d queries × %d platforms)",
                      len(tasks), len(queries), len(target_platforms))
@@ -130,17 +185,36 @@ class ScrapeOrchestrator:
         # Execute all tasks concurrently (bounded by per-platform semaphores)
         coros = [self._execute_task(task, result) for task in tasks]
         await asyncio.gather(*coros)
+        await self._flush_quarantine()
 
         logger.info(
-            "Orchestrator complete: %d success, %d failed, %d dedup-skipped, %d rate-limited",
+            "Orchestrator complete: %d success, %d failed (%d quarantined), "
+            "%d dedup-skipped, %d rate-limited",
             result.success_count,
             result.failure_count,
+            result.quarantine_count,
             result.skipped_dedup,
             result.skipped_rate_limit,
         )
         return result
 
-    async def _execute_task(self, task: _ScrapeTask, result: OrchestratorResult) -> None:
+    async def execute_each(self, tasks: list[ScrapeTask]) -> list[OrchestratorResult]:
+        """Execute tasks concurrently into one OrchestratorResult per task.
+
+        Used by queue workers (work_queue.ScrapeWorker), which report and
+        acknowledge every task separately. Quarantined payloads are flushed
+        before returning, so an acknowledged task never loses its payload.
+        """
+        results = [OrchestratorResult() for _ in tasks]
+        await asyncio.gather(*(self._execute_task(t, r) for t, r in zip(tasks, results)))
+        await self._flush_quarantine()
+        return results
+
+    async def _flush_quarantine(self) -> None:
+        if self._quarantine is not None:
+            await self._quarantine.flush()
+
+    async def _execute_task(self, task: ScrapeTask, result: OrchestratorResult) -> None:
         """Execute a single scrape task with dedup, rate limit, and concurrency control."""
         # 1. Check dedup
         dedup_key = f"dedup:{task.query_id}:{task.platform.value}"
@@ -150,38 +224,87 @@ class ScrapeOrchestrator:
             return
 
         # 2. Acquire rate limit
-        acquired = await self._rate_limiter.wait_and_acquire(
-            task.platform.value, timeout=RATE_LIMIT_TIMEOUT
-        )
+        with stage_timer("rate_limit_wait"):
+            acquired = await self._rate_limiter.wait_and_acquire(
+                task.platform.value, timeout=RATE_LIMIT_TIMEOUT
+            )
         if not acquired:
             logger.warning("Rate limit timeout: query=%d platform=%s", task.query_id, task.platform)
             result.skipped_rate_limit += 1
             return
 
-        # 3. Execute with per-platform semaphore
-        semaphore = self._semaphores[task.platform]
-        async with semaphore:
-            try:
-                scraper = self._scrapers[task.platform]
-                processed = await scraper.scrape(task.query_text)
+        # 3. Execute with per-platform semaphore (a Redis error taking the slot,
+        #    or a cluster lease lost mid-scrape, is recorded as a failure)
+        try:
+            async with self._slot(task.platform):
+                processed = await self._scrape(task)
 
-                # Mark dedup key (TTL 6h)
-                await self._redis.set(dedup_key, "1", ex=DEDUP_TTL_SECONDS)
+            # Mark dedup key (TTL 6h)
+            await self._redis.set(dedup_key, "1", ex=DEDUP_TTL_SECONDS)
 
-                result.successes.append((task.query_id, task.platform, processed))
-                logger.debug("Success: query=%d platform=%s", task.query_id, task.platform)
+            result.successes.append((task.query_id, task.platform, processed))
+            logger.debug("Success: query=%d platform=%s", task.query_id, task.platform)
 
-            except Exception as e:
-                error_type = type(e).__name__
-                error_detail = str(e)[:500]
-                result.failures.append(ScrapeFailure(
+        except SemaphoreTimeoutError:
+            # No cluster slot in time: skipped like a rate-limit timeout, to be
+            # picked up by a later run
+            logger.warning(
+                "Scrape slot timeout: query=%d platform=%s", task.query_id, task.platform,
+            )
+            result.skipped_rate_limit += 1
+
+        except QuarantineError as e:
+            # Bad content, not a transient failure — still counts as a failure,
+            # but the payload is kept so it can be re-processed later.
+            result.quarantine_count += 1
+            result.failures.append(ScrapeFailure(
+                query_id=task.query_id,
+                query_text=task.query_text,
+                platform=task.platform,
+                error_type=type(e).__name__,
+                error_detail=str(e)[:500],
+            ))
+            logger.warning(
+                "Scrape quarantined: query=%d platform=%s %s",
+                task.query_id, task.platform, e,
+            )
+            if self._quarantine is not None:
+                await self._quarantine.add(
+                    e,
                     query_id=task.query_id,
                     query_text=task.query_text,
                     platform=task.platform,
-                    error_type=error_type,
-                    error_detail=error_detail,
-                ))
-                logger.error(
-                    "Scrape failed: query=%d platform=%s error=%s: %s",
-                    task.query_id, task.platform, error_type, error_detail,
                 )
+
+        except Exception as e:
+            error_type = type(e).__name__
+            error_detail = str(e)[:500]
+            result.failures.append(ScrapeFailure(
+                query_id=task.query_id,
+                query_text=task.query_text,
+                platform=task.platform,
+                error_type=error_type,
+                error_detail=error_detail,
+            ))
+            logger.error(
+                "Scrape failed: query=%d platform=%s error=%s: %s",
+                task.query_id, task.platform, error_type, error_detail,
+            )
+
+    def _slot(self, platform: Platform) -> contextlib.AbstractAsyncContextManager:
+        semaphore = self._semaphores[platform]
+        if isinstance(semaphore, RedisSemaphore):
+            if platform in self._limiters:
+                # Admit only while the cluster holds fewer slots than this
+                # process's own AIMD limit (see adaptive_concurrency)
+                semaphore.limit = self._limiters[platform].limit
+            return semaphore.hold(timeout=self._slot_timeout_s)
+        return semaphore
+
+    async def _scrape(self, task: ScrapeTask) -> ProcessedContent:
+        """Scrape, feeding every attempt to the platform's AIMD limiter, if any."""
+        scraper = self._scrapers[task.platform]
+        limiter = self._limiters.get(task.platform)
+        if limiter is None:
+            return await scraper.scrape(task.query_text)
+        return await scraper.scrape(task.query_text, observe_attempt=limiter.observe)
@@ -8,6 +8,9 @@ Token optimization: ~20KB raw → ~3KB processed (85% reduction).
 
 import hashlib
 import re
+from functools import lru_cache
+from html import unescape
+from html.entities import html5
 
 from src.models.scrape_models import ProcessedContent, QuarantineError, ScrapeResult
 
@@ -17,11 +20,20 @@ MAX_CONTENT_CHARS = 10_000
 # Minimum meaningful content length
 MIN_CONTENT_CHARS = 50
 
+# Raw characters cleaned per step; cleaning stops once MAX_CONTENT_CHARS of
+# clean text exists, so huge pages only pay for the chunks actually used
+CHUNK_CHARS = 16_384
+
+# How far past the nominal cut a chunk may grow to reach the ">" closing a tag
+# opened before the cut; a "<" not closed within it (e.g. "price < 200" in
+# markdown) is left as literal text
+TAG_MARGIN_CHARS = 4_096
+
 # Patterns for HTML / boilerplate removal
-_HTML_TAG_RE = re.compile(r"<[^>]+>")
-_HTML_ENTITY_RE = re.compile(r"&[a-zA-Z]+;|&#\d+;")
 _SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript)[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
-_MULTI_NEWLINE_RE = re.compile(r"\n{3,}")
+_SCRIPT_OPEN_RE = re.compile(r"<(?:script|style|noscript)", re.IGNORECASE)
+_HTML_TAG_RE = re.compile(r"<[^>]+>")
+_HTML_ENTITY_RE = re.compile(r"&(?:[a-zA-Z][a-zA-Z0-9]*|#\d+|#[xX][0-9a-fA-F]+);")
 _MULTI_SPACE_RE = re.compile(r"[ \t]{2,}")
 _BOILERPLATE_KEYWORDS = [
     "skip to content", "skip to main",
@@ -37,6 +49,24 @@ _BOILERPLATE_KEYWORDS = [
 _COPYRIGHT_RE = re.compile(r"©\s*\d{4}", re.IGNORECASE)
 
 
+@lru_cache(maxsize=2048)
+def _decode_entity(entity: str) -> str:
+    """Decode one HTML entity (named, decimal or hex); unknown names become a space.
+
+    Non-breaking spaces decode to a plain space so whitespace collapsing and
+    word-boundary brand matching treat them like any other space.
+    """
+    if entity[1] == "#":
+        decoded = unescape(entity)
+    else:
+        decoded = html5.get(entity[1:], " ")
+    return decoded.replace("\xa0", " ")
+
+
+def _decode_entity_match(match: re.Match[str]) -> str:
+    return _decode_entity(match.group())
+
+
 class ScrapeProcessor:
     """Cleans and validates Firecrawl scrape output.
 
@@ -46,6 +76,7 @@ class ScrapeProcessor:
         3. Decode HTML entities
         4. Remove navigation / boilerplate lines
         5. Collapse whitespace
+           (1-5 run as a single chunked pass in _clean, stopping at MAX_CONTENT_CHARS)
         6. Validate minimum length
         7. Truncate to MAX_CONTENT_CHARS
         8. Compute SHA-256 content hash
@@ -81,10 +112,9 @@ class ScrapeProcessor:
                 raw_content=content[:2000],
             )
 
-        # Clean the content
-        clean = self._strip_html(content)
-        clean = self._remove_boilerplate(clean)
-        clean = self._collapse_whitespace(clean)
+        # Clean the content (stops once the output budget is filled — anything
+        # past MAX_CONTENT_CHARS is truncated below anyway)
+        clean = self._clean(content, limit=MAX_CONTENT_CHARS)
 
         # Check for error page signatures (before length check so short
         # error pages get the correct error_type)
@@ -115,38 +145,151 @@ class ScrapeProcessor:
             scrape_duration_ms=raw.scrape_duration_ms,
         )
 
-    def _strip_html(self, text: str) -> str:
-        """Remove HTML tags, scripts, styles, and entities."""
-        # Remove script/style blocks first (before stripping tags)
-        text = _SCRIPT_STYLE_RE.sub("", text)
-        # Strip remaining HTML tags
-        text = _HTML_TAG_RE.sub(" ", text)
-        # Decode common HTML entities
-        text = _HTML_ENTITY_RE.sub(" ", text)
-        return text
-
-    def _remove_boilerplate(self, text: str) -> str:
-        """Remove lines containing navigation, cookie banners, and common boilerplate."""
-        lines = text.splitlines()
-        filtered = []
-        for line in lines:
-            lower = line.lower().strip()
-            if any(kw in lower for kw in _BOILERPLATE_KEYWORDS):
+    def _clean(self, text: str, limit: int | None = None) -> str:
+        """Strip markup, drop boilerplate lines and collapse whitespace in one pass.
+
+        The raw text is consumed in chunks of ~CHUNK_CHARS and the scan stops
+        as soon as `limit` characters of clean text have been produced, so
+        the cost is bounded by the budget rather than the input size. Output
+        is identical to cleaning the whole document (see _next_chunk).
+        """
+        kept: list[str] = []
+        size = -1  # joined length: one "\n" between kept lines
+        start = 0
+        while start < len(text):
+            start, chunk = self._next_chunk(text, start)
+            for line in self._clean_lines(chunk):
+                kept.append(line)
+                size += len(line) + 1
+                if limit is not None and size >= limit:
+                    return "\n".join(kept)
+        return "\n".join(kept)
+
+    @staticmethod
+    def _next_chunk(text: str, start: int) -> tuple[int, str]:
+        """Cut the next chunk of raw text and remove its script/style blocks.
+
+        The cut is extended past the nominal chunk size (the safety margin)
+        until it is a point where cleaning the chunks separately equals
+        cleaning the whole text: right after a "\n", outside any
+        script/style block, and with no tag still open. An open tag extends
+        the cut at most TAG_MARGIN_CHARS past the nominal cut; only a "<"
+        whose ">" lies further away than that is cleaned differently from
+        the whole text (kept as text instead of swallowing everything up to
+        the distant ">"). Each pass looks only at the text it added, so the
+        cost stays linear in the input size.
+
+        Returns:
+            (end offset of the chunk in text, chunk with script/style blocks removed)
+        """
+        n = len(text)
+
+        def line_end(pos: int) -> int:
+            nl = text.find("\n", pos)
+            return n if nl < 0 else nl + 1
+
+        nominal = end = line_end(start + CHUNK_CHARS) if start + CHUNK_CHARS < n else n
+        pieces: list[str] = []
+        pos = start
+        tag_open = False
+        while True:
+            added = len(pieces)
+            # Remove script/style blocks first (before stripping tags). Blocks
+            # are matched against the full text so one may extend the chunk.
+            opening = _SCRIPT_OPEN_RE.search(text, pos, end)
+            while opening is not None:
+                block = _SCRIPT_STYLE_RE.match(text, opening.start())
+                if block is None:
+                    opening = _SCRIPT_OPEN_RE.search(text, opening.start() + 1, end)
+                    continue
+                pieces.append(text[pos:opening.start()])
+                pos = block.end()
+                if pos > end:
+                    end = line_end(pos)
+                opening = _SCRIPT_OPEN_RE.search(text, pos, end)
+            pieces.append(text[pos:end])
+            pos = end
+
+            # A tag is open when the last "<" or ">" of the chunk is a "<";
+            # only the pieces added in this pass can change that
+            for piece in reversed(pieces[added:]):
+                last_open = piece.rfind("<")
+                if piece.find(">", last_open + 1) >= 0:
+                    tag_open = False
+                    break
+                if last_open >= 0:
+                    tag_open = True
+                    break
+
+            if end >= n or not tag_open:
+                return end, "".join(pieces)
+            # The tag may continue past the cut — take in the line that closes it
+            close = text.find(">", end, nominal + TAG_MARGIN_CHARS)
+            if close < 0:
+                return end, "".join(pieces)
+            end = line_end(close + 1)
+
+    def _clean_lines(self, chunk: str) -> list[str]:
+        """Clean one chunk (script/style already removed) into non-empty lines."""
+        # Strip remaining HTML tags, then decode entities (decoded "&lt;" etc.
+        # is literal text, so it must not be seen by the tag pattern)
+        if "<" in chunk:
+            chunk = _HTML_TAG_RE.sub(" ", chunk)
+        if "&" in chunk:
+            chunk = _HTML_ENTITY_RE.sub(_decode_entity_match, chunk)
+
+        lines = chunk.splitlines()
+        boilerplate = self._boilerplate_lines(chunk, lines)
+        check_copyright = "©" in chunk
+
+        kept: list[str] = []
+        for i, line in enumerate(lines):
+            if i in boilerplate:
                 continue
-            if _COPYRIGHT_RE.search(line):
+            if check_copyright and "©" in line and _COPYRIGHT_RE.search(line):
                 continue
-            filtered.append(line)
-        return "\n".join(filtered)
-
-    def _collapse_whitespace(self, text: str) -> str:
-        """Normalize whitespace: collapse runs, trim lines."""
-        text = _MULTI_SPACE_RE.sub(" ", text)
-        # Trim each line
-        lines = [line.strip() for line in text.splitlines()]
-        # Remove empty lines, collapse multiple newlines
-        text = "\n".join(line for line in lines if line)
-        text = _MULTI_NEWLINE_RE.sub("\n\n", text)
-        return text.strip()
+            line = line.strip()
+            if not line:
+                continue
+            if "  " in line or "\t" in line:
+                line = _MULTI_SPACE_RE.sub(" ", line)
+            kept.append(line)
+        return kept
+
+    @staticmethod
+    def _boilerplate_lines(text: str, lines: list[str]) -> set[int]:
+        """Return indices of lines containing a boilerplate keyword (case-insensitive)."""
+        lower = text.lower()
+        present = [kw for kw in _BOILERPLATE_KEYWORDS if kw in lower]
+        if not present:
+            return set()
+
+        # Keywords never span a line break. When every line break is "\n" or
+        # "\r\n", a hit's line index is the number of "\n" before it, so only
+        # the hits themselves need to be visited.
+        expected_lines = lower.count("\n") + (0 if lower.endswith("\n") else 1)
+        if len(lines) != expected_lines:
+            return {
+                i for i, line in enumerate(lower.splitlines())
+                if any(kw in line for kw in present)
+            }
+
+        hits: list[int] = []
+        for kw in present:
+            pos = lower.find(kw)
+            while pos >= 0:
+                hits.append(pos)
+                pos = lower.find(kw, pos + 1)
+        hits.sort()
+
+        indices: set[int] = set()
+        line_no = 0
+        prev = 0
+        for pos in hits:
+            line_no += lower.count("\n", prev, pos)
+            prev = pos
+            indices.add(line_no)
+        return indices
 
     def _check_error_page(self, clean: str, raw: str) -> None:
         """Detect common error/block pages that look like valid content."""
@@ -0,0 +1,228 @@
+"""Quarantine sink — persists rejected scrape content to MongoDB.
+
+Content that fails the processing layer (QuarantineError) was still paid for,
+so instead of discarding it we keep it in the `quarantine` collection
+(TTL 30 days, see db/init_mongo.py). After processing rules change, the
+quarantined documents can be re-run through ScrapeProcessor without a new
+Firecrawl call (see pipelines/reprocess_quarantine.py). A recovered document
+is only marked resolved once its rankings and scores are stored, so a failed
+re-process run leaves it to be retried.
+
+Document layout:
+    query_id, query_text, platform, error_type, error_detail,
+    raw_content, snapshot_id, created_at, reprocessed_at, resolved
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+
+from src.models.enums import Platform
+from src.models.scrape_models import ProcessedContent, QuarantineError, ScrapeResult
+from src.services.scraper.processing import ScrapeProcessor
+
+logger = logging.getLogger(__name__)
+
+QUARANTINE_COLLECTION = "quarantine"
+
+# Buffered documents are written with one insert_many per batch
+DEFAULT_BATCH_SIZE = 50
+
+
+class QuarantineSink:
+    """Buffers quarantined scrape content and writes it to MongoDB in batches.
+
+    Write failures are logged and swallowed — quarantine bookkeeping must never
+    block the pipeline per R-DC-07.
+    """
+
+    def __init__(
+        self,
+        mongo_db: AsyncIOMotorDatabase,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> None:
+        self._collection = mongo_db[QUARANTINE_COLLECTION]
+        self._batch_size = batch_size
+        self._buffer: list[dict] = []
+        self._lock = asyncio.Lock()
+
+    async def add(
+        self,
+        error: QuarantineError,
+        *,
+        query_id: int,
+        query_text: str,
+        platform: Platform,
+    ) -> None:
+        """Queue a quarantined result; flushes when the batch is full."""
+        self._buffer.append({
+            "query_id": query_id,
+            "query_text": query_text,
+            "platform": platform.value,
+            "error_type": error.error_type,
+            "error_detail": error.error_detail,
+            "raw_content": error.raw_content,
+            "snapshot_id": error.snapshot_id,
+            "created_at": datetime.now(timezone.utc),
+            "reprocessed_at": None,
+            "resolved": False,
+        })
+
+        if len(self._buffer) >= self._batch_size:
+            await self.flush()
+
+    async def flush(self) -> int:
+        """Write all buffered documents. Returns the number of documents written."""
+        async with self._lock:
+            if not self._buffer:
+                return 0
+            batch, self._buffer = self._buffer, []
+            try:
+                await self._collection.insert_many(batch, ordered=False)
+            except Exception as e:
+                logger.error("Failed to write %d quarantine docs: %s", len(batch), e)
+                return 0
+            logger.debug("Quarantine sink: wrote %d docs", len(batch))
+            return len(batch)
+
+
+@dataclass
+class ReprocessResult:
+    """Outcome of re-running the processing layer over quarantined docs."""
+
+    recovered: list[tuple[int, Platform, ProcessedContent]] = field(default_factory=list)
+    # Quarantine doc _id of each recovered entry (same order as recovered)
+    recovered_ids: list[ObjectId] = field(default_factory=list)
+    still_quarantined: int = 0
+    skipped: int = 0
+
+    @property
+    def recovered_count(self) -> int:
+        return len(self.recovered)
+
+
+class QuarantineReprocessor:
+    """Re-runs ScrapeProcessor over quarantined documents without re-scraping.
+
+    The full raw content is loaded from the original snapshot when available;
+    otherwise the (possibly truncated) raw_content stored on the quarantine
+    document is used.
+    """
+
+    def __init__(
+        self,
+        mongo_db: AsyncIOMotorDatabase,
+        processor: ScrapeProcessor | None = None,
+    ) -> None:
+        self._quarantine = mongo_db[QUARANTINE_COLLECTION]
+        self._snapshots = mongo_db["snapshots"]
+        self._processor = processor or ScrapeProcessor()
+
+    async def run(
+        self,
+        *,
+        error_types: list[str] | None = None,
+        since: datetime | None = None,
+        limit: int = 500,
+    ) -> ReprocessResult:
+        """Re-process unresolved quarantine docs.
+
+        Args:
+            error_types: Only re-process these error types (e.g. ["insufficient_content"]).
+            since: Only re-process docs quarantined at or after this time.
+            limit: Maximum number of docs to re-process in one call.
+
+        Recovered docs are left unresolved; call mark_resolved() with their
+        recovered_ids once the content has been stored.
+
+        Returns:
+            ReprocessResult with recovered (query_id, platform, ProcessedContent) tuples.
+        """
+        filters: dict = {"resolved": {"$ne": True}}
+        if error_types:
+            filters["error_type"] = {"$in": error_types}
+        if since is not None:
+            filters["created_at"] = {"$gte": since}
+
+        result = ReprocessResult()
+        cursor = self._quarantine.find(filters).sort("created_at", 1).limit(limit)
+        async for doc in cursor:
+            raw = await self._load_raw(doc)
+            if raw is None:
+                result.skipped += 1
+                continue
+
+            now = datetime.now(timezone.utc)
+            try:
+                processed = self._processor.process(raw)
+            except QuarantineError as e:
+                result.still_quarantined += 1
+                await self._quarantine.update_one(
+                    {"_id": doc["_id"]},
+                    {"$set": {
+                        "error_type": e.error_type,
+                        "error_detail": e.error_detail,
+                        "reprocessed_at": now,
+                    }},
+                )
+                continue
+
+            processed.snapshot_id = doc.get("snapshot_id")
+            result.recovered.append((doc["query_id"], Platform(doc["platform"]), processed))
+            result.recovered_ids.append(doc["_id"])
+
+        logger.info(
+            "Quarantine reprocess: %d recovered, %d still quarantined, %d skipped",
+            result.recovered_count,
+            result.still_quarantined,
+            result.skipped,
+        )
+        return result
+
+    async def mark_resolved(self, ids: list[ObjectId]) -> None:
+        """Resolve recovered docs whose content has been stored."""
+        if not ids:
+            return
+        await self._quarantine.update_many(
+            {"_id": {"$in": ids}},
+            {"$set": {"resolved": True, "reprocessed_at": datetime.now(timezone.utc)}},
+        )
+
+    async def _load_raw(self, doc: dict) -> ScrapeResult | None:
+        """Rebuild the ScrapeResult from the stored snapshot (or the quarantine doc)."""
+        snapshot = None
+        snapshot_id = doc.get("snapshot_id")
+        if snapshot_id:
+            try:
+                snapshot = await self._snapshots.find_one({"_id": ObjectId(snapshot_id)})
+            except (InvalidId, TypeError):
+                snapshot = None
+
+        if snapshot is not None:
+            metadata = snapshot.get("metadata") or {}
+            content = snapshot.get("raw_content") or ""
+            return ScrapeResult(
+                url=metadata.get("url", ""),
+                content=content,
+                status_code=metadata.get("status_code", 200),
+                content_length=metadata.get("content_length", len(content.encode("utf-8"))),
+                scrape_duration_ms=snapshot.get("scrape_duration_ms") or 0,
+                scraped_at=snapshot.get("scraped_at") or doc["created_at"],
+            )
+
+        # Without the snapshot the original HTTP status is unknown — never
+        # let an http_error doc pass as a 200.
+        content = doc.get("raw_content") or ""
+        if not content or doc.get("error_type") == "http_error":
+            return None
+        return ScrapeResult(
+            url="",
+            content=content,
+            content_length=len(content.encode("utf-8")),
+            scraped_at=doc["created_at"],
+        )
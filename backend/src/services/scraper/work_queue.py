@@ -0,0 +1,371 @@
+"""Distributed scrape work queue on Redis Streams — many workers share one pipeline run.
+
+  flow process                           worker processes (any number)
+  ────────────                           ─────────────────────────────
+  QueuedScrapeOrchestrator.run()         ScrapeWorker.run_forever()
+    XADD scrape:queue  (task per           XAUTOCLAIM stale pending entries
+         query × platform)                 XREADGROUP scrape-workers  >
+    XREAD scrape:run:{run}:results  ◄──    ScrapeOrchestrator.execute_each()
+    until every task reported              MULTI  XADD result · XACK · XDEL  EXEC
+
+Tasks go to one stream, consumed through the consumer group
+TASK_GROUP. A worker reports a task and acknowledges it in one
+transaction, so a task is never reported without being acked, or acked
+without being reported.
+
+Crash recovery: if a worker dies mid-task, the entry stays in the group's
+pending list. Another worker reclaims it (XAUTOCLAIM) once it has been
+idle for settings.scrape_queue_claim_idle_s. While a live worker runs a
+batch, it re-claims the batch's entries (XCLAIM JUSTID) every third of that
+idle time. Slow batches (rate-limit waits, retry sleeps, waits for a scrape
+slot) are therefore never taken over while still running. An entry delivered more than
+MAX_DELIVERIES times is reported as failed instead of being retried forever.
+A reclaimed task may already have been scraped: its dedup key then skips
+the rescrape, and the flow keeps the first result per (query, platform).
+
+The flow process needs no scrapers. It turns the results back into the
+OrchestratorResult the pipelines already consume. Tasks still unreported at
+settings.scrape_queue_run_timeout_s are counted as failures. The run is
+then marked cancelled, and workers acknowledge its leftover tasks without
+scraping them.
+"""
+
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+
+from redis.asyncio import Redis
+from redis.exceptions import ResponseError
+
+from src.config import settings
+from src.models.enums import Platform
+from src.models.scrape_models import ProcessedContent
+from src.services.scraper.orchestrator import (
+    OrchestratorResult,
+    ScrapeFailure,
+    ScrapeOrchestrator,
+    ScrapeTask,
+    expand_tasks,
+)
+
+logger = logging.getLogger(__name__)
+
+# Shared task stream and its consumer group
+TASK_STREAM = "scrape:queue"
+TASK_GROUP = "scrape-workers"
+
+# Deliveries after which a task is reported failed instead of retried
+MAX_DELIVERIES = 3
+
+# Per-run result streams and cancel flags outlive a crashed flow by a day at most
+RUN_KEY_TTL_SECONDS = 24 * 3600
+
+# Longest single blocking read (flow and workers re-check their deadline in between)
+BLOCK_MS = 5_000
+
+# Tasks per XADD round trip when enqueueing a run
+ENQUEUE_CHUNK = 500
+
+# Shortest interval between keep-alive claims of a running batch, in seconds
+MIN_KEEPALIVE_INTERVAL = 0.1
+
+def results_key(run: str) -> str:
+    return f"scrape:run:{run}:results"
+
+
+def cancelled_key(run: str) -> str:
+    return f"scrape:run:{run}:cancelled"
+
+
+# ── Wire format ──────────────────────────────────────────────
+
+
+def encode_task(run: str, task: ScrapeTask) -> dict[str, str]:
+    return {
+        "run": run,
+        "query_id": str(task.query_id),
+        "query_text": task.query_text,
+        "platform": task.platform.value,
+        "brands": json.dumps(task.brands),
+    }
+
+
+def decode_task(fields: dict[str, str]) -> ScrapeTask:
+    return ScrapeTask(
+        query_id=int(fields["query_id"]),
+        query_text=fields["query_text"],
+        platform=Platform(fields["platform"]),
+        brands=json.loads(fields["brands"]),
+    )
+
+
+def encode_outcome(task: ScrapeTask, result: OrchestratorResult) -> dict[str, str]:
+    """One task's OrchestratorResult (from execute_each) as a result-stream entry.
+
+    outcome is one of success / failure / quarantined / dedup / rate_limited.
+    """
+    entry = {"query_id": str(task.query_id), "platform": task.platform.value}
+    if result.successes:
+        _, _, processed = result.successes[0]
+        return {**entry, "outcome": "success", "payload": processed.model_dump_json()}
+    if result.failures:
+        failure = result.failures[0]
+        return {
+            **entry,
+            "outcome": "quarantined" if result.quarantine_count else "failure",
+            "payload": json.dumps({
+                "error_type": failure.error_type, "error_detail": failure.error_detail,
+            }),
+        }
+    outcome = "dedup" if result.skipped_dedup else "rate_limited"
+    return {**entry, "outcome": outcome, "payload": ""}
+
+
+def failure_outcome(task: ScrapeTask, error_type: str, error_detail: str) -> dict[str, str]:
+    return {
+        "query_id": str(task.query_id), "platform": task.platform.value,
+        "outcome": "failure",
+        "payload": json.dumps({"error_type": error_type, "error_detail": error_detail}),
+    }
+
+
+def merge_outcome(result: OrchestratorResult, task: ScrapeTask, fields: dict[str, str]) -> None:
+    """Fold a result-stream entry into the run's OrchestratorResult."""
+    outcome = fields["outcome"]
+    if outcome == "success":
+        processed = ProcessedContent.model_validate_json(fields["payload"])
+        result.successes.append((task.query_id, task.platform, processed))
+    elif outcome in ("failure", "quarantined"):
+        error = json.loads(fields["payload"])
+        result.failures.append(ScrapeFailure(
+            query_id=task.query_id,
+            query_text=task.query_text,
+            platform=task.platform,
+            error_type=error["error_type"],
+            error_detail=error["error_detail"],
+        ))
+        if outcome == "quarantined":
+            result.quarantine_count += 1
+    elif outcome == "dedup":
+        result.skipped_dedup += 1
+    else:
+        result.skipped_rate_limit += 1
+
+
+async def ensure_group(redis: Redis) -> None:
+    """Create the task stream and consumer group if missing."""
+    try:
+        await redis.xgroup_create(TASK_STREAM, TASK_GROUP, id="0", mkstream=True)
+    except ResponseError as e:
+        if "BUSYGROUP" not in str(e):
+            raise
+
+
+# ── Flow side ────────────────────────────────────────────────
+
+
+class QueuedScrapeOrchestrator:
+    """Drop-in for ScrapeOrchestrator.run() that fans tasks out to queue workers."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        platforms: list[Platform] | None = None,
+        *,
+        run_timeout: float | None = None,
+    ) -> None:
+        self._redis = redis
+        self._platforms = platforms or list(Platform)
+        self._run_timeout = run_timeout or settings.scrape_queue_run_timeout_s
+
+    async def run(
+        self,
+        queries: list[dict],
+        platforms: list[Platform] | None = None,
+    ) -> OrchestratorResult:
+        """Enqueue query × platform tasks and wait until workers reported each one."""
+        tasks = expand_tasks(queries, platforms or self._platforms)
+        run = uuid.uuid4().hex
+        await ensure_group(self._redis)
+        for start in range(0, len(tasks), ENQUEUE_CHUNK):
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for task in tasks[start:start + ENQUEUE_CHUNK]:
+                    pipe.xadd(TASK_STREAM, encode_task(run, task))
+                await pipe.execute()
+        logger.info("Queued run %s: %d tasks (%d queries)", run, len(tasks), len(queries))
+
+        result = await self._collect(run, tasks)
+        logger.info(
+            "Queued run %s complete: %d success, %d failed (%d quarantined), "
+            "%d dedup-skipped, %d rate-limited",
+            run, result.success_count, result.failure_count, result.quarantine_count,
+            result.skipped_dedup, result.skipped_rate_limit,
+        )
+        return result
+
+    async def _collect(self, run: str, tasks: list[ScrapeTask]) -> OrchestratorResult:
+        pending = {(t.query_id, t.platform.value): t for t in tasks}
+        result = OrchestratorResult()
+        key = results_key(run)
+        last_id = "0-0"
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._run_timeout
+
+        while pending and (remaining := deadline - loop.time()) > 0:
+            block_ms = max(1, min(BLOCK_MS, int(remaining * 1000)))
+            response = await self._redis.xread({key: last_id}, count=ENQUEUE_CHUNK, block=block_ms)
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    last_id = entry_id
+                    # First report wins; a reclaimed task may report twice
+                    task = pending.pop((int(fields["query_id"]), fields["platform"]), None)
+                    if task is not None:
+                        merge_outcome(result, task, fields)
+
+        if pending:
+            await self._redis.set(cancelled_key(run), "1", ex=RUN_KEY_TTL_SECONDS)
+            logger.warning("Queued run %s timed out with %d tasks unreported", run, len(pending))
+            for task in pending.values():
+                merge_outcome(result, task, failure_outcome(
+                    task, "QueueTimeout", f"not reported within {self._run_timeout:g}s",
+                ))
+        await self._redis.delete(key)
+        return result
+
+
+# ── Worker side ──────────────────────────────────────────────
+
+
+class ScrapeWorker:
+    """Claims queued tasks, executes them with a local ScrapeOrchestrator, reports and acks."""
+
+    def __init__(
+        self,
+        redis: Redis,
+        orchestrator: ScrapeOrchestrator,
+        *,
+        consumer: str | None = None,
+        batch_size: int | None = None,
+        claim_idle_ms: int | None = None,
+    ) -> None:
+        self._redis = redis
+        self._orchestrator = orchestrator
+        self.consumer = consumer or f"worker-{uuid.uuid4().hex[:8]}"
+        self._batch_size = batch_size or settings.scrape_worker_batch_size
+        self._claim_idle_ms = (
+            claim_idle_ms if claim_idle_ms is not None
+            else int(settings.scrape_queue_claim_idle_s * 1000)
+        )
+
+    async def run_forever(self, stop: asyncio.Event | None = None) -> None:
+        await ensure_group(self._redis)
+        logger.info("Scrape worker %s consuming %s", self.consumer, TASK_STREAM)
+        await self.resume()
+        while stop is None or not stop.is_set():
+            await self.run_once()
+
+    async def resume(self) -> int:
+        """Re-run entries this consumer took but never acked (restart after a crash)."""
+        response = await self._redis.xreadgroup(
+            TASK_GROUP, self.consumer, {TASK_STREAM: "0"}, count=self._batch_size,
+        )
+        entries = [entry for _, batch in response or [] for entry in batch if entry[1]]
+        if entries:
+            logger.warning("Resuming %d unacknowledged tasks", len(entries))
+            await self._handle(entries)
+        return len(entries)
+
+    async def run_once(self, block_ms: int = BLOCK_MS) -> int:
+        """Handle one batch, stale pending entries first; returns the number of entries handled."""
+        entries = await self._reclaim()
+        if len(entries) < self._batch_size:
+            response = await self._redis.xreadgroup(
+                TASK_GROUP, self.consumer, {TASK_STREAM: ">"},
+                count=self._batch_size - len(entries), block=block_ms,
+            )
+            for _, new in response or []:
+                entries += new
+        if entries:
+            await self._handle(entries)
+        return len(entries)
+
+    async def _reclaim(self) -> list[tuple[str, dict[str, str]]]:
+        """Take over entries another consumer left unacknowledged for claim_idle_ms."""
+        _, claimed, _ = await self._redis.xautoclaim(
+            TASK_STREAM, TASK_GROUP, self.consumer,
+            min_idle_time=self._claim_idle_ms, start_id="0-0", count=self._batch_size,
+        )
+        entries = []
+        for entry_id, fields in claimed:
+            if not fields:  # deleted while pending
+                await self._redis.xack(TASK_STREAM, TASK_GROUP, entry_id)
+                continue
+            [info] = await self._redis.xpending_range(
+                TASK_STREAM, TASK_GROUP, min=entry_id, max=entry_id, count=1,
+            )
+            if info["times_delivered"] > MAX_DELIVERIES:
+                task = decode_task(fields)
+                logger.error(
+                    "Giving up on query=%d platform=%s after %d deliveries",
+                    task.query_id, task.platform, info["times_delivered"] - 1,
+                )
+                await self._report(entry_id, fields["run"], failure_outcome(
+                    task, "MaxDeliveriesExceeded",
+                    f"worker lost the task {MAX_DELIVERIES} times",
+                ))
+                continue
+            logger.warning("Reclaimed %s from a stalled worker", entry_id)
+            entries.append((entry_id, fields))
+        return entries
+
+    async def _handle(self, entries: list[tuple[str, dict[str, str]]]) -> None:
+        runnable = []
+        for entry_id, fields in entries:
+            if await self._redis.exists(cancelled_key(fields["run"])):
+                await self._ack(entry_id)
+            else:
+                runnable.append((entry_id, fields["run"], decode_task(fields)))
+
+        keeper = asyncio.create_task(self._keep_claimed([entry_id for entry_id, _, _ in runnable]))
+        try:
+            results = await self._orchestrator.execute_each([task for _, _, task in runnable])
+        finally:
+            keeper.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await keeper
+        for (entry_id, run, task), result in zip(runnable, results):
+            await self._report(entry_id, run, encode_outcome(task, result))
+
+    async def _keep_claimed(self, entry_ids: list[str]) -> None:
+        """Reset the batch's pending idle time so no other worker reclaims it mid-run.
+
+        JUSTID claims leave the delivery count alone, so keep-alives never
+        count towards MAX_DELIVERIES.
+        """
+        if not entry_ids:
+            return
+        interval = max(self._claim_idle_ms / 3000, MIN_KEEPALIVE_INTERVAL)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self._redis.xclaim(
+                    TASK_STREAM, TASK_GROUP, self.consumer, 0, entry_ids, justid=True,
+                )
+            except Exception as e:  # transient Redis error; retry before the claim idle passes
+                logger.warning("Keep-alive for %d running tasks failed: %s", len(entry_ids), e)
+
+    async def _report(self, entry_id: str, run: str, outcome: dict[str, str]) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(results_key(run), outcome)
+            pipe.expire(results_key(run), RUN_KEY_TTL_SECONDS)
+            pipe.xack(TASK_STREAM, TASK_GROUP, entry_id)
+            pipe.xdel(TASK_STREAM, entry_id)
+            await pipe.execute()
+
+    async def _ack(self, entry_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.xack(TASK_STREAM, TASK_GROUP, entry_id)
+            pipe.xdel(TASK_STREAM, entry_id)
+            await pipe.execute()
@@ -0,0 +1,292 @@
+"""Lightweight metrics primitives — histograms, per-run stage timings, Prometheus text.
+
+Pipeline code marks its stages with ``stage_timer``:
+
+    with stage_timer("firecrawl"):
+        raw = await self._call_firecrawl(url)
+
+Durations are recorded into the StageTimings collector installed for the
+current pipeline run by ``collect_stage_timings()``. The collector lives in a
+ContextVar, so the scrape tasks the orchestrator spawns with asyncio.gather()
+all record into the run that started them; outside a run the timer is a no-op.
+
+At the end of a run the aggregated histograms are stored as JSON on
+vis_pipeline_run.stage_timings and exported in Prometheus text format at
+/metrics (see src/services/metrics_service.py).
+
+Process-wide instruments (CounterVec, HistogramVec) cover the API side —
+request counts and latency (src/api/metrics.py), Redis cache hit/miss
+counts (CACHE_REQUESTS) and read-replica routing (DB_READ_ROUTES). They
+live in process memory, so each API worker exports its own series;
+Prometheus sums across workers.
+"""
+
+import math
+import time
+from bisect import bisect_left
+from collections.abc import Iterable, Iterator, Mapping
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Histogram upper bounds in seconds — covers cache hits (ms) to slow Firecrawl pages (min)
+DEFAULT_BUCKETS: tuple[float, ...] = (
+    0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0,
+)
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if math.isinf(bound) else repr(float(bound))
+
+
+class Histogram:
+    """Fixed-bucket histogram with Prometheus ``le`` (inclusive upper bound) semantics."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        # One slot per bound plus the +Inf overflow slot; counts are not cumulative
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def cumulative(self) -> list[tuple[str, int]]:
+        """Return ``(le, cumulative_count)`` pairs ending with ``+Inf``."""
+        pairs: list[tuple[str, int]] = []
+        running = 0
+        for bound, n in zip((*self.buckets, math.inf), self.counts):
+            running += n
+            pairs.append((_format_bound(bound), running))
+        return pairs
+
+    def quantile(self, q: float) -> float:
+        """Estimate the q-quantile by linear interpolation inside the target bucket.
+
+        Same estimate as Prometheus' histogram_quantile(); values in the +Inf
+        bucket are reported as the observed maximum.
+        """
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        running = 0
+        lower = 0.0
+        for bound, n in zip((*self.buckets, math.inf), self.counts):
+            if n and running + n >= rank:
+                if math.isinf(bound):
+                    return self.max
+                upper = min(bound, self.max)
+                return lower + (upper - lower) * (rank - running) / n
+            running += n
+            lower = bound
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "max": self.max,
+            "buckets": dict(self.cumulative()),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping) -> "Histogram":
+        """Rebuild a histogram from ``to_dict()`` output (e.g. a stored run breakdown)."""
+        bounds = [float(le) for le in data["buckets"] if le != "+Inf"]
+        hist = cls(bounds)
+        previous = 0
+        for i, le in enumerate((*map(_format_bound, hist.buckets), "+Inf")):
+            cumulative = int(data["buckets"].get(le, previous))
+            hist.counts[i] = cumulative - previous
+            previous = cumulative
+        hist.count = int(data["count"])
+        hist.sum = float(data["sum"])
+        hist.max = float(data.get("max", 0.0))
+        return hist
+
+
+class StageTimings:
+    """Per-run collector: one duration histogram per pipeline stage."""
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS) -> None:
+        self._buckets = tuple(buckets)
+        self.histograms: dict[str, Histogram] = {}
+
+    def observe(self, stage: str, seconds: float) -> None:
+        hist = self.histograms.get(stage)
+        if hist is None:
+            hist = self.histograms[stage] = Histogram(self._buckets)
+        hist.observe(seconds)
+
+    def to_json(self) -> dict:
+        """Breakdown stored on vis_pipeline_run.stage_timings."""
+        return {
+            stage: {
+                "count": hist.count,
+                "sum_sec": round(hist.sum, 6),
+                "p50_sec": round(hist.quantile(0.5), 6),
+                "p95_sec": round(hist.quantile(0.95), 6),
+                "max_sec": round(hist.max, 6),
+                "buckets": dict(hist.cumulative()),
+            }
+            for stage, hist in sorted(self.histograms.items())
+        }
+
+    @classmethod
+    def from_json(cls, data: Mapping) -> "StageTimings":
+        timings = cls()
+        for stage, entry in data.items():
+            timings.histograms[stage] = Histogram.from_dict({
+                "count": entry["count"],
+                "sum": entry["sum_sec"],
+                "max": entry.get("max_sec", 0.0),
+                "buckets": entry["buckets"],
+            })
+        return timings
+
+
+# ── Current-run collector ────────────────────────────────────
+
+_current_timings: ContextVar[StageTimings | None] = ContextVar("stage_timings", default=None)
+
+
+@contextmanager
+def collect_stage_timings(timings: StageTimings | None = None) -> Iterator[StageTimings]:
+    """Install a collector for ``stage_timer`` calls made in this context."""
+    timings = timings if timings is not None else StageTimings()
+    token = _current_timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _current_timings.reset(token)
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """Time the enclosed block into the current run's collector, if any.
+
+    Failed attempts are timed too — a slow 500 costs the run as much as a slow 200.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.observe(stage, time.perf_counter() - start)
+
+
+# ── Prometheus text exposition ───────────────────────────────
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def format_labels(labels: Mapping[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape_label(str(v))}"' for k, v in labels.items()) + "}"
+
+
+def render_metric_header(name: str, metric_type: str, help_text: str) -> list[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {metric_type}"]
+
+
+def render_histogram(name: str, hist: Histogram, labels: Mapping[str, str]) -> list[str]:
+    """Return the ``_bucket``/``_sum``/``_count`` sample lines for one histogram series."""
+    lines = [
+        f"{name}_bucket{format_labels({**labels, 'le': le})} {n}"
+        for le, n in hist.cumulative()
+    ]
+    lines.append(f"{name}_sum{format_labels(labels)} {hist.sum!r}")
+    lines.append(f"{name}_count{format_labels(labels)} {hist.count}")
+    return lines
+
+
+def _label_key(label_names: tuple[str, ...], labels: Mapping[str, str]) -> tuple[str, ...]:
+    if set(labels) != set(label_names):
+        raise ValueError(f"Expected labels {label_names}, got {tuple(labels)}")
+    return tuple(str(labels[name]) for name in label_names)
+
+
+class CounterVec:
+    """Monotonic counter with a fixed label set."""
+
+    def __init__(self, name: str, help_text: str, label_names: Iterable[str]) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = _label_key(self.label_names, labels)
+        self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels: str) -> float:
+        return self.values.get(_label_key(self.label_names, labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = render_metric_header(self.name, "counter", self.help_text)
+        for key, value in sorted(self.values.items()):
+            labels = format_labels(dict(zip(self.label_names, key)))
+            lines.append(f"{self.name}{labels} {value:g}")
+        return lines
+
+
+class HistogramVec:
+    """Histogram family with a fixed label set."""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Iterable[str],
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._buckets = tuple(buckets)
+        self.histograms: dict[tuple[str, ...], Histogram] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = _label_key(self.label_names, labels)
+        hist = self.histograms.get(key)
+        if hist is None:
+            hist = self.histograms[key] = Histogram(self._buckets)
+        hist.observe(value)
+
+    def render(self) -> list[str]:
+        lines = render_metric_header(self.name, "histogram", self.help_text)
+        for key, hist in sorted(self.histograms.items()):
+            lines += render_histogram(self.name, hist, dict(zip(self.label_names, key)))
+        return lines
+
+
+# ── Process-wide instruments ─────────────────────────────────
+
+# Redis read-through caches (RankingService.get_latest, ScoreService.get_comparison)
+CACHE_REQUESTS = CounterVec(
+    "levoit_cache_requests_total",
+    "Redis cache lookups by cache and result (hit/miss).",
+    ("cache", "result"),
+)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+# Read-only API sessions (src/db/replicas.py) by engine and target (replica/primary)
+DB_READ_ROUTES = CounterVec(
+    "levoit_db_read_routes_total",
+    "Read-only sessions by engine and the database that served them.",
+    ("engine", "target"),
+)
@@ -0,0 +1,29 @@
+"""Pre-serialized JSON responses — cached payloads are served as the bytes they were stored as."""
+
+from typing import Any
+
+from pydantic_core import to_json
+from starlette.responses import JSONResponse
+
+
+class JSONBytesResponse(JSONResponse):
+    """JSON response that passes already-serialized bytes straight through.
+
+    Anything else is serialized with pydantic-core (models, datetimes and enums
+    natively), so routes can return it on both cache hits and misses.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return to_json(content)
+
+
+def as_bytes(value: str | bytes) -> bytes:
+    """Redis values come back as str when the client decodes responses."""
+    return value.encode() if isinstance(value, str) else value
+
+
+def join_json_array(items: list[bytes]) -> bytes:
+    """Splice serialized JSON values into one JSON array without re-parsing them."""
+    return b"[" + b",".join(items) + b"]"
@@ -80,6 +80,7 @@ async def integration_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession,
     # Clean all tables
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
@@ -113,6 +114,7 @@ async def integration_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession,
     # Cleanup
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
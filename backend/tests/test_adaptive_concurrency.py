@@ -0,0 +1,222 @@
+"""Tests for adaptive concurrency — outcome classification, AIMD limits, resizable semaphore."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.models.scrape_models import QuarantineError
+from src.services.scraper.adaptive_concurrency import (
+    WINDOW,
+    AdaptiveSemaphore,
+    AimdConfig,
+    AimdLimiter,
+    classify,
+    p95,
+)
+
+CONFIG = AimdConfig(min_limit=1, max_limit=6, target_p95_s=10.0, max_error_rate=0.1)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _limiter(initial: int = 3) -> tuple[AimdLimiter, FakeClock]:
+    clock = FakeClock()
+    return AimdLimiter("chatgpt", CONFIG, initial=initial, clock=clock), clock
+
+
+def _window(limiter: AimdLimiter, clock: FakeClock, latency: float, errors: int = 0) -> None:
+    """Record one full evaluation window of scrapes taking `latency` seconds each."""
+    for i in range(WINDOW):
+        started = clock.now
+        clock.now += latency
+        limiter.record(started, "error" if i < errors else "ok")
+
+
+def _status_error(status: int) -> httpx.HTTPStatusError:
+    request = httpx.Request("POST", "http://firecrawl/v1/scrape")
+    return httpx.HTTPStatusError(
+        "error", request=request, response=httpx.Response(status, request=request)
+    )
+
+
+# ── Test: classification ─────────────────────────────────────
+
+
+class TestClassify:
+    def test_success(self) -> None:
+        assert classify(None) == "ok"
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            TimeoutError(),
+            httpx.ReadTimeout("slow"),
+            _status_error(429),
+            QuarantineError("error_page", "Detected error page signature: 'captcha'"),
+            QuarantineError("http_error", "HTTP 429"),
+        ],
+    )
+    def test_overload(self, error: Exception) -> None:
+        assert classify(error) == "overload"
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            _status_error(500),
+            ConnectionError("refused"),
+            QuarantineError("insufficient_content", "Content too short"),
+            QuarantineError("http_error", "HTTP 404"),
+        ],
+    )
+    def test_error(self, error: Exception) -> None:
+        assert classify(error) == "error"
+
+    def test_p95_nearest_rank(self) -> None:
+        assert p95([float(i) for i in range(1, 21)]) == 19.0
+
+
+# ── Test: AIMD limit ─────────────────────────────────────────
+
+
+class TestAimdLimiter:
+    def test_initial_clamped_to_bounds(self) -> None:
+        assert _limiter(initial=20)[0].limit == CONFIG.max_limit
+        assert _limiter(initial=0)[0].limit == CONFIG.min_limit
+
+    def test_healthy_window_increases_by_one(self) -> None:
+        limiter, clock = _limiter()
+
+        _window(limiter, clock, latency=2.0)
+
+        assert limiter.limit == 4
+
+    def test_no_change_before_window_fills(self) -> None:
+        limiter, clock = _limiter()
+        for _ in range(WINDOW - 1):
+            limiter.record(clock.now, "ok")
+
+        assert limiter.limit == 3
+
+    def test_slow_window_holds(self) -> None:
+        limiter, clock = _limiter()
+
+        _window(limiter, clock, latency=15.0)
+
+        assert limiter.limit == 3
+
+    def test_error_rate_above_target_holds(self) -> None:
+        limiter, clock = _limiter()
+
+        _window(limiter, clock, latency=1.0, errors=3)
+
+        assert limiter.limit == 3
+
+    def test_increase_stops_at_max(self) -> None:
+        limiter, clock = _limiter()
+
+        for _ in range(10):
+            _window(limiter, clock, latency=1.0)
+
+        assert limiter.limit == CONFIG.max_limit
+
+    def test_overload_halves(self) -> None:
+        limiter, clock = _limiter(initial=6)
+        clock.now = 5.0
+
+        limiter.record(4.0, "overload")
+
+        assert limiter.limit == 3
+
+    def test_overload_never_below_min(self) -> None:
+        limiter, clock = _limiter(initial=1)
+
+        limiter.record(clock.now, "overload")
+
+        assert limiter.limit == 1
+
+    def test_inflight_overloads_back_off_once(self) -> None:
+        limiter, clock = _limiter(initial=6)
+        clock.now = 10.0
+
+        # Three scrapes started together all hit 429s: one congestion event
+        for _ in range(3):
+            limiter.record(1.0, "overload")
+        assert limiter.limit == 3
+
+        # A scrape started after the backoff still overloading backs off again
+        clock.now = 20.0
+        limiter.record(15.0, "overload")
+        assert limiter.limit == 1
+
+    def test_overload_restarts_window(self) -> None:
+        limiter, clock = _limiter(initial=4)
+        for _ in range(WINDOW - 1):
+            limiter.record(clock.now, "ok")
+
+        limiter.record(clock.now, "overload")
+        limiter.record(clock.now, "ok")
+
+        assert limiter.limit == 2
+
+    def test_observe_records_outcome(self) -> None:
+        limiter, clock = _limiter(initial=4)
+
+        with pytest.raises(TimeoutError), limiter.observe():
+            raise TimeoutError()
+
+        assert limiter.limit == 2
+
+
+# ── Test: resizable semaphore ────────────────────────────────
+
+
+class TestAdaptiveSemaphore:
+    @pytest.mark.asyncio
+    async def test_capacity_follows_limit(self) -> None:
+        limiter, clock = _limiter(initial=2)
+        semaphore = AdaptiveSemaphore(limiter)
+        release = asyncio.Event()
+        running = 0
+        peak = 0
+
+        async def scrape() -> None:
+            nonlocal running, peak
+            async with semaphore:
+                running += 1
+                peak = max(peak, running)
+                await release.wait()
+                running -= 1
+
+        tasks = [asyncio.create_task(scrape()) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert running == 2
+
+        _window(limiter, clock, latency=1.0)  # limit 2 → 3
+        async with semaphore:  # a finishing scrape wakes the waiters
+            pass
+        await asyncio.sleep(0.01)
+        assert running == 3
+
+        release.set()
+        await asyncio.gather(*tasks)
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_lower_limit_does_not_interrupt_running(self) -> None:
+        limiter, clock = _limiter(initial=2)
+        semaphore = AdaptiveSemaphore(limiter)
+
+        async with semaphore, semaphore:
+            limiter.record(clock.now, "overload")  # limit 2 → 1 while two run
+            waiter = asyncio.create_task(semaphore.__aenter__())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+
+        await asyncio.wait_for(waiter, 1)
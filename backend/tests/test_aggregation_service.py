@@ -0,0 +1,137 @@
+"""Tests for AggregationService — bucket helpers, watermarks, idempotent reruns, rollups.
+
+DB-free: runs against the load harness's in-memory FakeDatabase (benchmarks/fakes.py),
+which mirrors the service's SQL. Real upserts against PostgreSQL are covered in
+test_pipeline_daily.py.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.fakes import FakeDatabase
+from src.services.aggregation_service import AggregationService, bucket_start, next_bucket
+
+# Wednesday
+NOW = datetime(2026, 2, 11, 12, 0, tzinfo=timezone.utc)
+
+
+def _ts_row(at: datetime, brand: str, score: float, qid: int = 1) -> dict:
+    return {"time": at, "qid": qid, "plat": "chatgpt", "brand": brand, "rank": 1, "score": score}
+
+
+def _scores(pg: FakeDatabase, period: str) -> dict[tuple[str, datetime], dict]:
+    return {
+        (r["brand"], r["at"]): r
+        for r in pg.tables.get("vis_score", []) if r.get("period") == period
+    }
+
+
+# ── Test: bucket helpers ─────────────────────────────────────
+
+
+class TestBuckets:
+    def test_bucket_start(self) -> None:
+        assert bucket_start("daily", NOW) == datetime(2026, 2, 11, tzinfo=timezone.utc)
+        assert bucket_start("weekly", NOW) == datetime(2026, 2, 9, tzinfo=timezone.utc)
+        assert bucket_start("monthly", NOW) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    def test_bucket_start_is_utc(self) -> None:
+        local = datetime(2026, 3, 1, 1, 0, tzinfo=timezone(timedelta(hours=8)))
+        assert bucket_start("monthly", local) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+
+    def test_next_bucket(self) -> None:
+        jan = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        assert next_bucket("monthly", jan) == datetime(2026, 2, 1, tzinfo=timezone.utc)
+        assert next_bucket("weekly", jan) == jan + timedelta(days=7)
+        assert next_bucket("daily", jan) == jan + timedelta(days=1)
+
+
+# ── Test: incremental aggregation ────────────────────────────
+
+
+class TestAggregate:
+    @pytest.mark.asyncio
+    async def test_first_run_covers_today(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        ts.tables["ts_search_rank"] = [
+            _ts_row(NOW - timedelta(days=1), "Levoit", 10.0),  # before the first watermark
+            _ts_row(NOW - timedelta(hours=2), "Levoit", 40.0),
+            _ts_row(NOW - timedelta(hours=1), "Levoit", 60.0),
+            _ts_row(NOW - timedelta(hours=1), "Dyson", 30.0),
+        ]
+
+        report = await AggregationService(pg.session(), ts.session()).aggregate(now=NOW)
+
+        assert report == {"daily": 2, "weekly": 2, "monthly": 2}
+        today = bucket_start("daily", NOW)
+        daily = _scores(pg, "daily")
+        assert daily[("Levoit", today)]["score"] == 50.0
+        assert daily[("Levoit", today)]["count"] == 2
+        assert daily[("Levoit", today)]["gap"] == 20.0
+        assert daily[("Dyson", today)]["gap"] is None
+        marks = {m["period"]: m["watermark"] for m in pg.tables["vis_aggregation_watermark"]}
+        assert marks == {"daily": NOW, "weekly": NOW, "monthly": NOW}
+
+    @pytest.mark.asyncio
+    async def test_rerun_upserts_without_duplicates(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        ts.tables["ts_search_rank"] = [_ts_row(NOW - timedelta(hours=1), "Levoit", 40.0)]
+        svc = AggregationService(pg.session(), ts.session())
+
+        await svc.aggregate(now=NOW)
+        ts.tables["ts_search_rank"].append(_ts_row(NOW + timedelta(minutes=30), "Levoit", 80.0))
+        await svc.aggregate(now=NOW + timedelta(hours=1))
+
+        for period in ("daily", "weekly", "monthly"):
+            rows = _scores(pg, period)
+            assert len(rows) == 1, period
+            (row,) = rows.values()
+            assert row["score"] == 60.0 and row["count"] == 2
+
+    @pytest.mark.asyncio
+    async def test_reads_only_from_watermark_day(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        pg.tables["vis_aggregation_watermark"] = [
+            {"period": p, "watermark": NOW - timedelta(hours=1)}
+            for p in ("daily", "weekly", "monthly")
+        ]
+        ts.tables["ts_search_rank"] = [
+            _ts_row(NOW - timedelta(days=3), "Levoit", 10.0),  # closed day, already aggregated
+            _ts_row(NOW - timedelta(hours=3), "Levoit", 20.0),
+        ]
+
+        report = await AggregationService(pg.session(), ts.session()).aggregate(now=NOW)
+
+        assert report["daily"] == 1
+        assert list(_scores(pg, "daily")) == [("Levoit", bucket_start("daily", NOW))]
+
+    @pytest.mark.asyncio
+    async def test_rollups_weight_days_by_samples(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        monday = bucket_start("weekly", NOW)
+        pg.tables["vis_aggregation_watermark"] = [
+            {"period": p, "watermark": monday} for p in ("daily", "weekly", "monthly")
+        ]
+        ts.tables["ts_search_rank"] = [
+            _ts_row(monday + timedelta(hours=1), "Levoit", 90.0),
+            _ts_row(NOW - timedelta(hours=2), "Levoit", 30.0),
+            _ts_row(NOW - timedelta(hours=1), "Levoit", 30.0),
+        ]
+
+        await AggregationService(pg.session(), ts.session()).aggregate(now=NOW)
+
+        weekly = _scores(pg, "weekly")[("Levoit", monday)]
+        assert weekly["score"] == 50.0 and weekly["count"] == 3
+        monthly = _scores(pg, "monthly")[("Levoit", bucket_start("monthly", NOW))]
+        assert monthly["count"] == 3
+
+    @pytest.mark.asyncio
+    async def test_no_new_rows_still_advances_watermark(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+
+        report = await AggregationService(pg.session(), ts.session()).aggregate(now=NOW)
+
+        assert report == {"daily": 0, "weekly": 0, "monthly": 0}
+        assert {m["watermark"] for m in pg.tables["vis_aggregation_watermark"]} == {NOW}
+        assert not pg.unhandled and not ts.unhandled
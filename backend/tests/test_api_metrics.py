@@ -0,0 +1,134 @@
+"""Tests for API request metrics (middleware, pool gauges) and the /metrics endpoint.
+
+No database needed: the middleware is exercised on a throwaway app, and the
+real app's /metrics runs with a mocked DB session.
+"""
+
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.api.deps import _get_db
+from src.api.metrics import (
+    HTTP_LATENCY,
+    HTTP_REQUESTS,
+    UNMATCHED_ROUTE,
+    MetricsMiddleware,
+    render_pool_gauges,
+)
+from src.main import app
+
+
+def _demo_app() -> FastAPI:
+    demo = FastAPI()
+    demo.add_middleware(MetricsMiddleware)
+
+    @demo.get("/items/{item_id}")
+    async def get_item(item_id: int) -> dict:
+        if item_id == 0:
+            raise HTTPException(status_code=404)
+        return {"id": item_id}
+
+    return demo
+
+
+async def _get(target: FastAPI, *paths: str) -> None:
+    async with AsyncClient(transport=ASGITransport(app=target), base_url="http://t") as client:
+        for path in paths:
+            await client.get(path)
+
+
+# ── Test: middleware ─────────────────────────────────────────
+
+
+class TestMetricsMiddleware:
+    @pytest.mark.asyncio
+    async def test_counts_by_route_template_and_status(self) -> None:
+        ok = {"method": "GET", "route": "/items/{item_id}", "status": "200"}
+        missing = {**ok, "status": "404"}
+        before_ok, before_missing = HTTP_REQUESTS.get(**ok), HTTP_REQUESTS.get(**missing)
+
+        await _get(_demo_app(), "/items/1", "/items/2", "/items/0")
+
+        assert HTTP_REQUESTS.get(**ok) == before_ok + 2
+        assert HTTP_REQUESTS.get(**missing) == before_missing + 1
+        assert HTTP_LATENCY.histograms[("GET", "/items/{item_id}")].count >= 3
+
+    @pytest.mark.asyncio
+    async def test_unmatched_paths_share_one_label(self) -> None:
+        labels = {"method": "GET", "route": UNMATCHED_ROUTE, "status": "404"}
+        before = HTTP_REQUESTS.get(**labels)
+
+        await _get(_demo_app(), "/nope/1", "/nope/2")
+
+        assert HTTP_REQUESTS.get(**labels) == before + 2
+
+
+# ── Test: pool gauges ────────────────────────────────────────
+
+
+class TestPoolGauges:
+    def test_idle_engine_reports_zero_overflow(self) -> None:
+        engine = create_async_engine(
+            "postgresql+asyncpg://u:p@localhost/db", pool_size=3, max_overflow=2,
+        )
+        text_lines = render_pool_gauges({"postgres": engine})
+
+        assert 'levoit_db_pool_size{engine="postgres"} 3' in text_lines
+        assert 'levoit_db_pool_checked_out{engine="postgres"} 0' in text_lines
+        assert 'levoit_db_pool_overflow{engine="postgres"} 0' in text_lines
+
+
+# ── Test: /metrics endpoint ──────────────────────────────────
+
+
+def _override_db(session: AsyncMock):
+    async def _db() -> AsyncGenerator[AsyncMock, None]:
+        yield session
+
+    return _db
+
+
+class TestMetricsEndpoint:
+    @pytest.mark.asyncio
+    async def test_exposes_request_pool_and_cache_series(self) -> None:
+        session = AsyncMock()
+        session.execute.return_value = MagicMock(
+            mappings=MagicMock(return_value=MagicMock(all=MagicMock(return_value=[]))),
+        )
+        app.dependency_overrides[_get_db] = _override_db(session)
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as c:
+                await c.get("/health")
+                resp = await c.get("/metrics")
+        finally:
+            app.dependency_overrides.clear()
+
+        body = resp.text
+        assert resp.status_code == 200
+        assert resp.headers["content-type"].startswith("text/plain")
+        assert 'levoit_http_requests_total{method="GET",route="/health",status="200"}' in body
+        assert "# TYPE levoit_http_request_duration_seconds histogram" in body
+        assert "# TYPE levoit_cache_requests_total counter" in body
+        assert 'levoit_db_pool_checked_out{engine="timescale"}' in body
+        assert "# TYPE levoit_pipeline_stage_duration_seconds histogram" in body
+
+    @pytest.mark.asyncio
+    async def test_database_outage_keeps_in_process_series(self) -> None:
+        session = AsyncMock()
+        session.execute.side_effect = OperationalError("SELECT", {}, Exception("down"))
+        app.dependency_overrides[_get_db] = _override_db(session)
+        try:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://t") as c:
+                resp = await c.get("/metrics")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert resp.status_code == 200
+        assert "levoit_http_requests_total" in resp.text
+        assert "levoit_pipeline_stage_duration_seconds" not in resp.text
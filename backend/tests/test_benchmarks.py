@@ -0,0 +1,175 @@
+"""Tests for the benchmark suites — hot path (corpus generator + runner) and trend queries.
+
+The trend benchmark needs TimescaleDB to run; only its pure helpers are tested here.
+"""
+
+import argparse
+
+import pytest
+
+from benchmarks.corpus import BRAND_POOL, build_corpus, generate_answer
+from benchmarks.hot_path import (
+    STAGES,
+    BenchResult,
+    compare,
+    load_baseline,
+    measure,
+    run_benchmarks,
+    save_baseline,
+)
+from benchmarks.trends import (
+    TrendTiming,
+    expected_rows,
+    format_report,
+    parse_ranges,
+    setup_sql,
+    speedups,
+)
+from src.db.timescale import CHUNK_INTERVAL, compression_sql
+from src.models.scrape_models import ScrapeResult
+from src.services.analyzer.rank_extractor import RankExtractor
+from src.services.scraper.processing import ScrapeProcessor
+
+# ── Test: corpus generator ───────────────────────────────────
+
+
+class TestCorpus:
+    def test_generation_is_deterministic(self) -> None:
+        a = generate_answer(10_240, BRAND_POOL[:4], "html", seed=1)
+        b = generate_answer(10_240, BRAND_POOL[:4], "html", seed=1)
+        c = generate_answer(10_240, BRAND_POOL[:4], "html", seed=2)
+        assert a == b
+        assert a != c
+
+    @pytest.mark.parametrize("size", [1_024, 51_200, 102_400])
+    def test_size_close_to_target(self, size: int) -> None:
+        doc = generate_answer(size, BRAND_POOL[:8], "markdown")
+        assert size <= len(doc.encode("utf-8")) < size + 1_024
+
+    def test_unknown_format_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown format"):
+            generate_answer(1_024, ["Levoit"], "pdf")
+
+    def test_grid_covers_sizes_brands_formats(self) -> None:
+        corpus = build_corpus(sizes=(1_024, 10_240), brand_counts=(2, 8))
+        assert len(corpus) == 8
+        assert {d.name for d in corpus} >= {"html-1kb-2b", "markdown-10kb-8b"}
+
+    @pytest.mark.parametrize("fmt", ["html", "markdown"])
+    def test_documents_survive_processing_and_rank(self, fmt: str) -> None:
+        brands = BRAND_POOL[:8]
+        content = generate_answer(10_240, brands, fmt)
+        processed = ScrapeProcessor().process(ScrapeResult(url="u", content=content))
+        results = RankExtractor().extract(processed.clean_text, brands)
+
+        ranked = [r for r in results if r.rank_position > 0]
+        assert len(ranked) >= len(brands) // 2
+        assert "<" not in processed.clean_text
+
+
+# ── Test: runner ─────────────────────────────────────────────
+
+
+class TestRunner:
+    def test_measure_returns_loops_and_times(self) -> None:
+        loops, best, median = measure(lambda: sum(range(100)), min_time=0.001, repeat=3)
+        assert loops >= 1
+        assert 0 < best <= median
+
+    def test_runs_every_stage(self) -> None:
+        corpus = build_corpus(sizes=(1_024,), brand_counts=(4,))
+        results = run_benchmarks(corpus, min_time=0.001, repeat=1)
+
+        assert {r.stage for r in results} == set(STAGES)
+        # Score runs once per brand count, every other stage once per document
+        assert sum(r.stage == "score" for r in results) == 1
+        assert sum(r.stage == "process" for r in results) == len(corpus)
+
+    def test_stage_filter(self) -> None:
+        corpus = build_corpus(sizes=(1_024,), brand_counts=(2,), formats=("html",))
+        results = run_benchmarks(corpus, stages=("brand_match",), min_time=0.001, repeat=1)
+        assert [r.name for r in results] == ["brand_match/html-1kb-2b"]
+
+
+# ── Test: baselines ──────────────────────────────────────────
+
+
+def _result(name: str, best_us: float) -> BenchResult:
+    return BenchResult(name, name.split("/")[0], 1_024, 10, best_us, best_us)
+
+
+class TestBaselines:
+    def test_round_trip(self, tmp_path) -> None:
+        path = tmp_path / "baseline.json"
+        save_baseline([_result("process/html-1kb-2b", 40.0)], path)
+        baseline = load_baseline(path)
+        assert baseline["process/html-1kb-2b"]["best_us"] == 40.0
+
+    def test_missing_baseline_is_empty(self, tmp_path) -> None:
+        assert load_baseline(tmp_path / "nope.json") == {}
+
+    def test_compare_flags_only_regressions_beyond_tolerance(self) -> None:
+        baseline = {
+            "process/a": {"best_us": 100.0},
+            "extract/a": {"best_us": 100.0},
+        }
+        results = [
+            _result("process/a", 120.0),   # within 25%
+            _result("extract/a", 180.0),   # regressed
+            _result("score/4b", 999.0),    # no baseline entry
+        ]
+        assert compare(results, baseline, tolerance=0.25) == [("extract/a", 100.0, 180.0)]
+
+
+# ── Test: trend benchmark helpers ────────────────────────────
+
+
+class TestTrendBench:
+    def test_parse_ranges(self) -> None:
+        assert parse_ranges("30, 90,365") == (30, 90, 365)
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_ranges("30,-1")
+
+    def test_expected_rows_counts_series_ends(self) -> None:
+        # 2 days × 4 runs + 1 samples × 10 queries × 3 platforms × 4 brands
+        assert expected_rows(queries=10, brands=4, days=2, runs_per_day=4) == 9 * 10 * 3 * 4
+
+    def test_speedups_pair_states_by_shape(self) -> None:
+        timings = [
+            TrendTiming("uncompressed", 90, "daily", 12.0, 13.0, 90),
+            TrendTiming("compressed", 90, "daily", 4.0, 5.0, 90),
+            TrendTiming("uncompressed", 30, "weekly", 3.0, 3.0, 5),
+        ]
+        assert speedups(timings) == {(90, "daily"): 3.0}
+
+    def test_speedups_against_materialized_aggregate(self) -> None:
+        timings = [
+            TrendTiming("uncompressed", 365, "monthly", 40.0, 41.0, 72),
+            TrendTiming("materialized", 365, "monthly", 2.0, 2.5, 72),
+        ]
+        assert speedups(timings, "materialized") == {(365, "monthly"): 20.0}
+        assert speedups(timings) == {}
+
+    def test_scratch_table_uses_migration_layout(self) -> None:
+        statements = setup_sql()
+        assert any(f"INTERVAL '{CHUNK_INTERVAL}'" in s for s in statements)
+        assert "compress_segmentby = 'query_id, brand'" in compression_sql()[1]
+        assert "compress_orderby = 'time DESC'" in compression_sql()[1]
+        # The aggregate get_trends reads, without a policy job racing the measurements
+        assert any("VIEW IF NOT EXISTS ts_daily_rank" in s for s in statements)
+        assert not any("add_continuous_aggregate_policy" in s for s in statements)
+
+    def test_format_report(self) -> None:
+        report = {
+            "rows": 1000, "chunk_interval": "14 days", "compress_after": "3 days",
+            "size_bytes": {"uncompressed": 8_000_000, "compressed": 1_000_000},
+            "timings": [{
+                "state": "compressed", "range_days": 90, "granularity": "daily",
+                "best_ms": 4.0, "median_ms": 5.0, "points": 90,
+            }],
+            "speedup": {"90d/daily": 3.0},
+        }
+        text = format_report(report)
+        assert "8.0x smaller" in text
+        assert "90d/daily" in text
+        assert "3.00x" in text
@@ -0,0 +1,195 @@
+"""Tests for RedisSemaphore — shared limit, lease expiry, fencing, renewal, timeouts."""
+
+import asyncio
+from unittest.mock import patch
+
+import fakeredis.aioredis
+import pytest
+
+from src.services.scraper.distributed_semaphore import (
+    LeaseLostError,
+    RedisSemaphore,
+    SemaphoreTimeoutError,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.aioredis.FakeRedis(decode_responses=True)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _semaphore(redis, clock, limit: int = 2, lease_s: float = 30.0) -> RedisSemaphore:
+    return RedisSemaphore(redis, "test", limit, lease_s=lease_s, clock=clock)
+
+
+# ── Test: acquire / release ──────────────────────────────────
+
+
+class TestAcquire:
+    @pytest.mark.asyncio
+    async def test_limit_shared_between_instances(self, redis, clock) -> None:
+        # Two instances stand in for two processes sharing one Redis
+        a, b = _semaphore(redis, clock), _semaphore(redis, clock)
+
+        assert await a.try_acquire() is not None
+        assert await b.try_acquire() is not None
+        assert await a.try_acquire() is None
+        assert await b.try_acquire() is None
+        assert await a.holders() == 2
+
+    @pytest.mark.asyncio
+    async def test_release_frees_slot(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1)
+        lease = await sem.try_acquire()
+
+        await sem.release(lease)
+
+        assert await sem.try_acquire() is not None
+
+    @pytest.mark.asyncio
+    async def test_fence_increases_per_acquisition(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock)
+        first = await sem.try_acquire()
+        await sem.release(first)
+        second = await sem.try_acquire()
+
+        assert second.fence > first.fence
+
+    @pytest.mark.asyncio
+    async def test_names_are_independent(self, redis, clock) -> None:
+        chatgpt = RedisSemaphore(redis, "chatgpt", 1, clock=clock)
+        perplexity = RedisSemaphore(redis, "perplexity", 1, clock=clock)
+
+        assert await chatgpt.try_acquire() is not None
+        assert await perplexity.try_acquire() is not None
+
+
+# ── Test: lease expiry and fencing ───────────────────────────
+
+
+class TestLeases:
+    @pytest.mark.asyncio
+    async def test_crashed_holder_slot_frees_after_lease(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1, lease_s=30.0)
+        await sem.try_acquire()  # holder never releases
+
+        clock.now += 29
+        assert await sem.try_acquire() is None
+        clock.now += 2
+        assert await sem.try_acquire() is not None
+
+    @pytest.mark.asyncio
+    async def test_renew_extends_lease(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1, lease_s=30.0)
+        lease = await sem.try_acquire()
+
+        clock.now += 20
+        assert await sem.renew(lease) is True
+        clock.now += 20
+
+        assert await sem.try_acquire() is None
+
+    @pytest.mark.asyncio
+    async def test_expired_lease_cannot_renew_or_release_new_holder(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1, lease_s=30.0)
+        stale = await sem.try_acquire()
+        clock.now += 31
+        current = await sem.try_acquire()
+
+        assert await sem.renew(stale) is False
+        assert stale.lost
+        await sem.release(stale)
+
+        assert await sem.holders() == 1
+        assert current.fence > stale.fence
+
+
+# ── Test: waiting and holding ────────────────────────────────
+
+
+class TestHold:
+    @pytest.mark.asyncio
+    async def test_acquire_times_out(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1)
+        await sem.try_acquire()
+
+        with pytest.raises(SemaphoreTimeoutError):
+            await sem.acquire(timeout=0.05)
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits_for_release(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1)
+        lease = await sem.try_acquire()
+
+        waiter = asyncio.create_task(sem.acquire(timeout=2))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        await sem.release(lease)
+
+        assert (await waiter).fence > lease.fence
+
+    @pytest.mark.asyncio
+    async def test_hold_releases_on_error(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1)
+
+        with pytest.raises(RuntimeError):
+            async with sem.hold():
+                assert await sem.holders() == 1
+                raise RuntimeError("scrape failed")
+
+        assert await sem.holders() == 0
+
+    @pytest.mark.asyncio
+    async def test_hold_keeps_lease_alive(self, redis) -> None:
+        sem = RedisSemaphore(redis, "test", 1, lease_s=0.3)
+
+        with patch.object(sem, "renew", wraps=sem.renew) as renew:
+            async with sem.hold() as lease:
+                await asyncio.sleep(0.5)  # longer than one lease
+                assert await sem.holders() == 1
+
+        assert renew.await_count >= 2
+        assert not lease.lost
+
+    @pytest.mark.asyncio
+    async def test_lost_lease_cancels_body(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1, lease_s=0.3)
+        finished = False
+
+        with pytest.raises(LeaseLostError):
+            async with sem.hold() as lease:
+                clock.now += 1  # the holder stalled past its expiry
+                await asyncio.sleep(5)
+                finished = True
+
+        assert lease.lost and not finished
+        assert asyncio.current_task().cancelling() == 0
+
+    @pytest.mark.asyncio
+    async def test_outside_cancellation_propagates(self, redis, clock) -> None:
+        sem = _semaphore(redis, clock, limit=1)
+
+        async def body() -> None:
+            async with sem.hold():
+                await asyncio.sleep(5)
+
+        task = asyncio.create_task(body())
+        await asyncio.sleep(0.05)
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert await sem.holders() == 0
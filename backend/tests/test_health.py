@@ -0,0 +1,57 @@
+"""Tests for the concurrent startup dependency checks (src/db/health.py)."""
+
+import asyncio
+import time
+
+import pytest
+
+from src.db.health import DependencyCheckError, check_dependencies
+
+
+def _sleeper(seconds: float, error: Exception | None = None):
+    async def probe() -> None:
+        await asyncio.sleep(seconds)
+        if error:
+            raise error
+
+    return probe
+
+
+class TestCheckDependencies:
+    @pytest.mark.asyncio
+    async def test_probes_run_concurrently(self) -> None:
+        start = time.perf_counter()
+        elapsed = await check_dependencies(
+            {name: _sleeper(0.1) for name in ("postgres", "timescale", "mongodb", "redis")},
+            timeout=1.0,
+        )
+
+        assert set(elapsed) == {"postgres", "timescale", "mongodb", "redis"}
+        assert time.perf_counter() - start < 0.3
+
+    @pytest.mark.asyncio
+    async def test_timeout_bounds_a_hung_dependency(self) -> None:
+        start = time.perf_counter()
+        with pytest.raises(DependencyCheckError) as info:
+            await check_dependencies(
+                {"postgres": _sleeper(0), "mongodb": _sleeper(10)}, timeout=0.1,
+            )
+
+        assert time.perf_counter() - start < 1.0
+        assert list(info.value.failures) == ["mongodb"]
+        assert "mongodb: timed out" in str(info.value)
+
+    @pytest.mark.asyncio
+    async def test_reports_every_failure(self) -> None:
+        with pytest.raises(DependencyCheckError) as info:
+            await check_dependencies(
+                {
+                    "redis": _sleeper(0, ConnectionError("refused")),
+                    "timescale": _sleeper(0, OSError("no route")),
+                    "postgres": _sleeper(0),
+                },
+                timeout=1.0,
+            )
+
+        assert set(info.value.failures) == {"redis", "timescale"}
+        assert "redis: ConnectionError: refused" in str(info.value)
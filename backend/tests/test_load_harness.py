@@ -0,0 +1,224 @@
+"""Tests for the end-to-end load harness (fake Firecrawl, in-process DB fakes, runner)."""
+
+import random
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pytest
+from sqlalchemy import text
+
+from benchmarks.fake_firecrawl import FirecrawlProfile, create_app
+from benchmarks.fakes import FakeDatabase, FakeMongo, load_queries
+from benchmarks.load import LoadConfig, StageTimer, percentile, run_load
+from src.db.seed import BRANDS, generate_load_queries
+from src.models.enums import Platform
+from src.models.scrape_models import ProcessedContent
+from src.pipelines.tasks import (
+    compute_scores_impl,
+    create_pipeline_run_impl,
+    extract_and_store_rankings_impl,
+    fetch_active_queries_impl,
+)
+
+
+def _fast_profile(**overrides) -> FirecrawlProfile:
+    params = dict(latency_ms=1.0, latency_sigma=0.0, error_rate=0.0, rate_limit_rate=0.0,
+                  empty_rate=0.0, min_kb=1, max_kb=4)
+    params.update(overrides)
+    return FirecrawlProfile(**params)
+
+
+# ── Test: seed query generator ───────────────────────────────
+
+
+class TestGenerateLoadQueries:
+    def test_distinct_and_deterministic(self) -> None:
+        first = generate_load_queries(3_000)
+        assert len({q["text"] for q in first}) == 3_000
+        assert first == generate_load_queries(3_000)
+
+    def test_brands_always_include_core_brands(self) -> None:
+        for q in generate_load_queries(200, random.Random(7)):
+            assert q["brands"][:len(BRANDS)] == BRANDS
+            assert q["priority"] in {"high", "medium", "low"}
+
+
+# ── Test: fake Firecrawl ─────────────────────────────────────
+
+
+class TestFakeFirecrawl:
+    @pytest.mark.asyncio
+    async def test_answers_in_firecrawl_envelope(self) -> None:
+        app = create_app(_fast_profile())
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            resp = await client.post("http://fc/v1/scrape", json={"url": "https://x"})
+        body = resp.json()
+        assert resp.status_code == 200
+        assert body["data"]["metadata"]["statusCode"] == 200
+        assert len(body["data"]["markdown"]) >= 1_024
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize(("overrides", "status"), [
+        ({"rate_limit_rate": 1.0}, 429),
+        ({"error_rate": 1.0}, 500),
+    ])
+    async def test_error_distributions(self, overrides: dict, status: int) -> None:
+        app = create_app(_fast_profile(**overrides))
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app)) as client:
+            resp = await client.post("http://fc/v1/scrape", json={"url": "https://x"})
+        assert resp.status_code == status
+        assert app.state.stats[status] == 1
+
+    def test_latency_distribution(self) -> None:
+        rng = random.Random(0)
+        assert _fast_profile(latency_ms=50).sample_latency(rng) == 0.05
+        samples = sorted(
+            FirecrawlProfile(latency_ms=100, latency_sigma=0.5).sample_latency(rng)
+            for _ in range(2_000)
+        )
+        assert 0.09 < samples[1_000] < 0.11
+
+
+# ── Test: in-process DB fakes ────────────────────────────────
+
+
+class TestFakeDatabase:
+    @pytest.mark.asyncio
+    async def test_pipeline_tasks_round_trip(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        load_queries(pg, generate_load_queries(3))
+        db, ts_db = pg.session(), ts.session()
+
+        queries = await fetch_active_queries_impl(db)
+        order = {"high": 1, "medium": 2, "low": 3}
+        ranks = [order[q["priority"]] for q in queries]
+        assert ranks == sorted(ranks)
+        run_id = await create_pipeline_run_impl(db, "load", len(queries))
+
+        processed = ProcessedContent(
+            clean_text="1. Levoit Core 300S is the best pick.\n\n2. Dyson is a premium option.",
+            content_hash="h", char_count=70, url="u", status_code=200,
+            scraped_at=datetime.now(timezone.utc),
+        )
+        await extract_and_store_rankings_impl(
+            db, ts_db, 1, Platform.chatgpt, processed, ["Levoit", "Dyson"], run_id,
+        )
+        await compute_scores_impl(db, 1, ["Levoit", "Dyson"], run_id)
+
+        scores = {r["brand"]: r["score"] for r in pg.tables["vis_score"]}
+        assert scores == {"Levoit": 40.0, "Dyson": 30.0}
+        assert len(ts.tables["ts_search_rank"]) == 2
+        assert pg.round_trips == pg.statements + pg.commits > 0
+        assert not pg.unhandled
+
+    @pytest.mark.asyncio
+    async def test_scores_use_own_run_after_newer_run_upserts(self) -> None:
+        pg, ts = FakeDatabase("postgres"), FakeDatabase("timescale")
+        db, ts_db = pg.session(), ts.session()
+        now = datetime.now(timezone.utc)
+
+        async def store(run_id: int, text: str, at: datetime) -> None:
+            processed = ProcessedContent(
+                clean_text=text, content_hash="h", char_count=len(text), url="u",
+                status_code=200, scraped_at=at,
+            )
+            await extract_and_store_rankings_impl(
+                db, ts_db, 1, Platform.chatgpt, processed, ["Levoit", "Dyson"], run_id,
+            )
+
+        await store(1, "1. Levoit Core 300S is the best pick.\n\n2. Dyson is premium.", now)
+        # An overlapping run replaces the query's vis_ranking_latest rows first
+        await store(2, "1. Dyson is the best pick.", now + timedelta(minutes=5))
+        await compute_scores_impl(db, 1, ["Levoit", "Dyson"], 1)
+
+        scores = {r["brand"]: r["score"] for r in pg.tables["vis_score"]}
+        assert scores == {"Levoit": 40.0, "Dyson": 30.0}
+
+    @pytest.mark.asyncio
+    async def test_executemany_is_one_round_trip(self) -> None:
+        pg = FakeDatabase("postgres")
+        session = pg.session()
+        await session.execute(text("INSERT INTO vis_brand (name) VALUES (:name)"),
+                              [{"name": "a"}, {"name": "b"}])
+        assert pg.statements == 1
+        assert len(pg.tables["vis_brand"]) == 2
+
+    @pytest.mark.asyncio
+    async def test_unknown_sql_counted(self) -> None:
+        pg = FakeDatabase("postgres")
+        result = await pg.session().execute(text("DELETE FROM vis_score"))
+        assert result.mappings().all() == []
+        assert sum(pg.unhandled.values()) == 1
+
+    @pytest.mark.asyncio
+    async def test_fake_mongo_counts_ops(self) -> None:
+        mongo = FakeMongo()
+        res = await mongo["snapshots"].insert_one({"raw_content": "x"})
+        assert (await mongo["snapshots"].find_one({"_id": res.inserted_id}))["raw_content"] == "x"
+        assert mongo.ops == 2
+
+
+# ── Test: stage timer ────────────────────────────────────────
+
+
+class TestStageTimer:
+    def test_percentile_nearest_rank(self) -> None:
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 50) == 0.0
+
+    @pytest.mark.asyncio
+    async def test_wraps_sync_and_async(self) -> None:
+        timer = StageTimer()
+
+        async def coro() -> int:
+            return 1
+
+        assert await timer.wrap("a", coro)() == 1
+        assert timer.wrap("b", lambda: 2)() == 2
+        summary = timer.summary()
+        assert summary["a"]["count"] == 1
+        assert summary["b"]["count"] == 1
+
+
+# ── Test: end-to-end runs ────────────────────────────────────
+
+
+class TestRunLoad:
+    @pytest.mark.asyncio
+    async def test_hourly_run_reports_stages_and_round_trips(self) -> None:
+        config = LoadConfig(queries=8, firecrawl=_fast_profile(), db_latency_ms=0,
+                            mongo_latency_ms=0)
+        report = await run_load(config)
+
+        assert report.result["status"] == "completed"
+        assert report.result["success_count"] == 24
+        assert report.tasks == 24
+        for stage in ("firecrawl", "snapshot", "process", "scrape", "rate_limit_wait",
+                      "extract_store", "score"):
+            assert report.stages[stage]["count"] > 0
+        assert report.round_trips["postgres"]["total"] > 0
+        assert report.round_trips["mongo"]["ops"] >= 24
+        assert report.unhandled_sql == {}
+        assert "tasks/s" in report.format()
+
+    @pytest.mark.asyncio
+    async def test_daily_run_with_errors_and_retries(self) -> None:
+        config = LoadConfig(
+            queries=6,
+            flow="daily",
+            firecrawl=_fast_profile(error_rate=0.2, rate_limit_rate=0.2, empty_rate=0.1),
+            retry_delay_scale=0.0,
+            db_latency_ms=0,
+            mongo_latency_ms=0,
+        )
+        report = await run_load(config)
+
+        assert report.result["status"] == "completed"
+        assert report.stages["daily_aggregate"]["count"] == 1
+        assert report.result["daily_scores_count"] > 0
+        assert report.unhandled_sql == {}
+        # Retries mean more Firecrawl calls than scrape tasks
+        assert report.stages["firecrawl"]["count"] > report.tasks
+        assert sum(report.firecrawl_responses.values()) == report.stages["firecrawl"]["count"]
@@ -0,0 +1,74 @@
+"""Tests for the app entry point — lifespan startup and import cost.
+
+No services needed: startup probes are replaced, and clients and engines
+connect lazily, so creating them opens no sockets.
+"""
+
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src import main
+from src.db import postgres
+from src.db.health import DependencyCheckError
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+# Wall-clock budget for a cold `import src.main` in a fresh interpreter (≈1.4 s locally)
+IMPORT_BUDGET_S = 3.0
+
+IMPORT_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import src.main
+from src.db import postgres
+print(json.dumps({
+    "seconds": time.perf_counter() - start,
+    "asyncpg": "asyncpg" in sys.modules,
+    "engines": len(postgres._engines),
+}))
+"""
+
+
+def _probes(delays: dict[str, float]):
+    async def sleep(seconds: float) -> None:
+        await asyncio.sleep(seconds)
+
+    return lambda: {name: (lambda s=s: sleep(s)) for name, s in delays.items()}
+
+
+class TestLifespan:
+    @pytest.mark.asyncio
+    async def test_startup_creates_engines_and_shutdown_disposes(self, monkeypatch) -> None:
+        monkeypatch.setattr(main, "_startup_probes", _probes({"postgres": 0, "redis": 0}))
+
+        async with main.lifespan(main.app):
+            assert set(postgres._engines) == {"postgres", "timescale"}
+        assert postgres._engines == {}
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_aborts_startup_and_closes(self, monkeypatch) -> None:
+        monkeypatch.setattr(main.settings, "startup_check_timeout", 0.05)
+        monkeypatch.setattr(main, "_startup_probes", _probes({"postgres": 0, "mongodb": 5}))
+
+        with pytest.raises(DependencyCheckError, match="mongodb"):
+            async with main.lifespan(main.app):
+                pass
+        assert postgres._engines == {}
+
+
+class TestImportCost:
+    def test_import_within_budget_and_lazy(self) -> None:
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        )
+        report = json.loads(out.stdout.strip().splitlines()[-1])
+
+        assert report["engines"] == 0
+        assert report["asyncpg"] is False
+        assert report["seconds"] < IMPORT_BUDGET_S, report
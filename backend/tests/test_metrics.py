@@ -0,0 +1,233 @@
+"""Tests for metrics primitives — histograms, stage timings, instruments, Prometheus export."""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.services.metrics_service import MetricsService
+from src.services.ranking_service import RankingService
+from src.shared.metrics import (
+    CACHE_REQUESTS,
+    CounterVec,
+    Histogram,
+    HistogramVec,
+    StageTimings,
+    collect_stage_timings,
+    format_labels,
+    render_histogram,
+    stage_timer,
+)
+
+
+def _mock_db(rows: list[dict]) -> AsyncMock:
+    db = AsyncMock()
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    db.execute.return_value = result
+    return db
+
+
+# ── Test: histogram ──────────────────────────────────────────
+
+
+class TestHistogram:
+    def test_bucket_bounds_are_inclusive(self) -> None:
+        hist = Histogram([0.1, 1.0])
+        for value in (0.1, 0.5, 1.0, 3.0):
+            hist.observe(value)
+
+        assert hist.cumulative() == [("0.1", 1), ("1.0", 3), ("+Inf", 4)]
+        assert hist.count == 4
+        assert hist.sum == pytest.approx(4.6)
+        assert hist.max == 3.0
+
+    def test_quantile_interpolates_within_bucket(self) -> None:
+        hist = Histogram([1.0, 2.0])
+        for _ in range(10):
+            hist.observe(1.5)
+
+        # All samples in (1, 2]; the upper edge is clamped to the observed max
+        assert hist.quantile(0.5) == pytest.approx(1.25)
+        assert hist.quantile(1.0) == pytest.approx(1.5)
+
+    def test_quantile_in_overflow_bucket_reports_max(self) -> None:
+        hist = Histogram([1.0])
+        hist.observe(0.5)
+        hist.observe(42.0)
+        assert hist.quantile(0.99) == 42.0
+
+    def test_empty_quantile_is_zero(self) -> None:
+        assert Histogram().quantile(0.5) == 0.0
+
+    def test_dict_round_trip(self) -> None:
+        hist = Histogram()
+        for value in (0.002, 0.3, 0.3, 7.0, 500.0):
+            hist.observe(value)
+
+        restored = Histogram.from_dict(json.loads(json.dumps(hist.to_dict())))
+        assert restored.cumulative() == hist.cumulative()
+        assert restored.sum == hist.sum
+        assert restored.max == hist.max
+
+
+# ── Test: run collector ──────────────────────────────────────
+
+
+class TestStageTimings:
+    def test_timer_is_noop_outside_a_run(self) -> None:
+        with stage_timer("firecrawl"):
+            pass  # nothing to assert against — must simply not fail
+
+    def test_timer_records_into_current_run(self) -> None:
+        with collect_stage_timings() as timings:
+            with stage_timer("extract"):
+                pass
+            with stage_timer("extract"):
+                pass
+        with stage_timer("extract"):
+            pass  # after the run: not recorded
+
+        assert timings.histograms["extract"].count == 2
+
+    def test_failed_block_is_still_timed(self) -> None:
+        with collect_stage_timings() as timings:
+            with pytest.raises(RuntimeError), stage_timer("firecrawl"):
+                raise RuntimeError("boom")
+        assert timings.histograms["firecrawl"].count == 1
+
+    @pytest.mark.asyncio
+    async def test_gathered_tasks_share_the_run_collector(self) -> None:
+        async def scrape() -> None:
+            with stage_timer("firecrawl"):
+                await asyncio.sleep(0)
+
+        with collect_stage_timings() as timings:
+            await asyncio.gather(*(scrape() for _ in range(5)))
+
+        assert timings.histograms["firecrawl"].count == 5
+
+    def test_json_breakdown_round_trip(self) -> None:
+        timings = StageTimings()
+        for value in (0.2, 0.4, 0.8):
+            timings.observe("firecrawl", value)
+        timings.observe("score", 0.01)
+
+        data = json.loads(json.dumps(timings.to_json()))
+        assert list(data) == ["firecrawl", "score"]
+        assert data["firecrawl"]["count"] == 3
+        assert data["firecrawl"]["sum_sec"] == pytest.approx(1.4)
+        assert data["firecrawl"]["max_sec"] == 0.8
+        assert 0.25 <= data["firecrawl"]["p50_sec"] <= 0.5
+        assert data["firecrawl"]["buckets"]["+Inf"] == 3
+
+        restored = StageTimings.from_json(data)
+        assert restored.to_json() == data
+
+
+# ── Test: Prometheus exposition ──────────────────────────────
+
+
+class TestPrometheusText:
+    def test_labels_are_escaped(self) -> None:
+        assert format_labels({"flow": 'a"b\\c'}) == '{flow="a\\"b\\\\c"}'
+        assert format_labels({}) == ""
+
+    def test_histogram_series(self) -> None:
+        hist = Histogram([0.5])
+        hist.observe(0.25)
+        hist.observe(2.0)
+
+        lines = render_histogram("m", hist, {"stage": "score"})
+        assert lines == [
+            'm_bucket{stage="score",le="0.5"} 1',
+            'm_bucket{stage="score",le="+Inf"} 2',
+            'm_sum{stage="score"} 2.25',
+            'm_count{stage="score"} 2',
+        ]
+
+
+# ── Test: process-wide instruments ───────────────────────────
+
+
+class TestInstruments:
+    def test_counter_vec(self) -> None:
+        counter = CounterVec("c_total", "help", ("cache", "result"))
+        counter.inc(cache="a", result="hit")
+        counter.inc(2, cache="a", result="hit")
+
+        assert counter.get(cache="a", result="hit") == 3
+        assert counter.render() == [
+            "# HELP c_total help",
+            "# TYPE c_total counter",
+            'c_total{cache="a",result="hit"} 3',
+        ]
+
+    def test_label_set_is_enforced(self) -> None:
+        counter = CounterVec("c_total", "help", ("cache",))
+        with pytest.raises(ValueError, match="Expected labels"):
+            counter.inc(route="/x")
+
+    def test_histogram_vec_series_per_label_set(self) -> None:
+        hist = HistogramVec("h", "help", ("route",), buckets=(1.0,))
+        hist.observe(0.5, route="/a")
+        hist.observe(2.0, route="/b")
+
+        lines = hist.render()
+        assert 'h_bucket{route="/a",le="1.0"} 1' in lines
+        assert 'h_bucket{route="/b",le="1.0"} 0' in lines
+        assert 'h_count{route="/b"} 1' in lines
+
+    @pytest.mark.asyncio
+    async def test_cache_lookups_counted(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        db = _mock_db([])
+        hit = {"cache": "rankings:latest", "result": "hit"}
+        miss = {"cache": "rankings:latest", "result": "miss"}
+        hits, misses = CACHE_REQUESTS.get(**hit), CACHE_REQUESTS.get(**miss)
+
+        service = RankingService(db, redis=redis)
+        await service.get_latest(1)  # empty result: miss, nothing cached
+        await redis.set("rankings:latest:2", "[]")
+        await service.get_latest(2)
+
+        assert CACHE_REQUESTS.get(**miss) == misses + 1
+        assert CACHE_REQUESTS.get(**hit) == hits + 1
+        await redis.aclose()
+
+
+# ── Test: metrics service ────────────────────────────────────
+
+
+class TestMetricsService:
+    @pytest.mark.asyncio
+    async def test_renders_latest_run_per_flow(self) -> None:
+        timings = StageTimings()
+        timings.observe("firecrawl", 0.9)
+        timings.observe("score", 0.02)
+        db = _mock_db([{
+            "id": 7, "flow_name": "hourly_rank_check", "status": "completed",
+            "duration_sec": 12.5, "stage_timings": timings.to_json(),
+        }])
+
+        body = await MetricsService(db).render_pipeline_metrics()
+
+        assert "# TYPE levoit_pipeline_stage_duration_seconds histogram" in body
+        assert (
+            'levoit_pipeline_stage_duration_seconds_count'
+            '{flow="hourly_rank_check",stage="firecrawl"} 1'
+        ) in body
+        assert (
+            'levoit_pipeline_last_run_duration_seconds'
+            '{flow="hourly_rank_check",status="completed"} 12.5'
+        ) in body
+        assert 'levoit_pipeline_last_run_id{flow="hourly_rank_check"} 7' in body
+        assert body.endswith("\n")
+
+    @pytest.mark.asyncio
+    async def test_no_runs_renders_headers_only(self) -> None:
+        body = await MetricsService(_mock_db([])).render_pipeline_metrics()
+        samples = [line for line in body.splitlines() if not line.startswith("#")]
+        assert samples == []
@@ -1,5 +1,6 @@
 """Tests for ScrapeOrchestrator — concurrency, dedup, rate limiting, failure handling."""
 
+import contextlib
 from datetime import datetime, timezone
 from unittest.mock import AsyncMock, patch
 
@@ -11,6 +12,7 @@ from src.models.scrape_models import ProcessedContent, QuarantineError
 from src.services.scraper.orchestrator import (
     DEDUP_TTL_SECONDS,
     ScrapeOrchestrator,
+    ScrapeTask,
 )
 from src.services.scraper.rate_limiter import PlatformRateLimiter
 
@@ -30,13 +32,17 @@ def _make_processed(query: str, platform: str) -> ProcessedContent:
 
 
 def _make_scraper(platform: Platform, succeed: bool = True, error: Exception | None = None):
-    """Create a mock scraper that either succeeds or fails."""
+    """Create a mock scraper that either succeeds or fails in a single observed attempt."""
     scraper = AsyncMock()
     scraper.platform = platform
-    if succeed and error is None:
-        scraper.scrape.side_effect = lambda q: _make_processed(q, platform.value)
-    else:
-        scraper.scrape.side_effect = error or Exception("scrape failed")
+
+    async def scrape(query: str, observe_attempt=None) -> ProcessedContent:
+        with observe_attempt() if observe_attempt else contextlib.nullcontext():
+            if succeed and error is None:
+                return _make_processed(query, platform.value)
+            raise error or Exception("scrape failed")
+
+    scraper.scrape.side_effect = scrape
     return scraper
 
 
@@ -237,6 +243,48 @@ class TestFailureHandling:
         assert result.success_count == 0
 
 
+# ── Test: per-task execution (queue workers) ─────────────────
+
+
+class TestExecuteEach:
+    @pytest.mark.asyncio
+    async def test_one_result_per_task(self, rate_limiter, redis) -> None:
+        scrapers = {
+            Platform.chatgpt: _make_scraper(Platform.chatgpt),
+            Platform.perplexity: _make_scraper(Platform.perplexity, succeed=False),
+        }
+        orch = ScrapeOrchestrator(scrapers=scrapers, rate_limiter=rate_limiter, redis=redis)
+        tasks = [
+            ScrapeTask(1, "q1", Platform.chatgpt, ["Levoit"]),
+            ScrapeTask(1, "q1", Platform.perplexity, ["Levoit"]),
+            ScrapeTask(2, "q2", Platform.chatgpt, ["Levoit"]),
+        ]
+
+        first, second, third = await orch.execute_each(tasks)
+
+        assert first.success_count == 1 and first.failure_count == 0
+        assert second.success_count == 0 and second.failure_count == 1
+        assert third.successes[0][0] == 2
+
+    @pytest.mark.asyncio
+    async def test_quarantine_flushed_before_returning(self, rate_limiter, redis) -> None:
+        sink = AsyncMock()
+        scrapers = {
+            Platform.chatgpt: _make_scraper(
+                Platform.chatgpt, succeed=False, error=QuarantineError("empty_content", "none"),
+            ),
+        }
+        orch = ScrapeOrchestrator(
+            scrapers=scrapers, rate_limiter=rate_limiter, redis=redis, quarantine_sink=sink,
+        )
+
+        [result] = await orch.execute_each([ScrapeTask(1, "q1", Platform.chatgpt, [])])
+
+        assert result.quarantine_count == 1
+        sink.add.assert_awaited_once()
+        sink.flush.assert_awaited_once()
+
+
 # ── Test: concurrency ────────────────────────────────────────
 
 
@@ -272,3 +320,129 @@ class TestConcurrency:
 
         assert result.success_count == 6
         assert max_concurrent <= 3
+
+    @pytest.mark.asyncio
+    async def test_cluster_limit_spans_orchestrators(self, rate_limiter, redis) -> None:
+        """Two orchestrators sharing Redis stay within 3 concurrent scrapes together."""
+        import asyncio
+
+        max_concurrent = 0
+        current_concurrent = 0
+
+        async def tracked_scrape(query: str) -> ProcessedContent:
+            nonlocal max_concurrent, current_concurrent
+            current_concurrent += 1
+            max_concurrent = max(max_concurrent, current_concurrent)
+            await asyncio.sleep(0.02)
+            current_concurrent -= 1
+            return _make_processed(query, "chatgpt")
+
+        def orchestrator() -> ScrapeOrchestrator:
+            scraper = AsyncMock()
+            scraper.platform = Platform.chatgpt
+            scraper.scrape.side_effect = tracked_scrape
+            return ScrapeOrchestrator(
+                scrapers={Platform.chatgpt: scraper}, rate_limiter=rate_limiter, redis=redis,
+                cluster_concurrency=True,
+            )
+
+        queries = _make_queries(8)
+        results = await asyncio.gather(
+            orchestrator().run(queries[:4], platforms=[Platform.chatgpt]),
+            orchestrator().run(queries[4:], platforms=[Platform.chatgpt]),
+        )
+
+        assert sum(r.success_count for r in results) == 8
+        assert max_concurrent == 3
+        assert await redis.zcard("sem:scrape:chatgpt:holders") == 0
+
+    @pytest.mark.asyncio
+    async def test_slot_error_recorded_as_failure(self, scrapers, rate_limiter, redis) -> None:
+        orch = ScrapeOrchestrator(
+            scrapers=scrapers, rate_limiter=rate_limiter, redis=redis, cluster_concurrency=True,
+        )
+
+        with patch(
+            "src.services.scraper.distributed_semaphore.RedisSemaphore.try_acquire",
+            side_effect=ConnectionError("redis down"),
+        ):
+            result = await orch.run(_make_queries(1), platforms=[Platform.chatgpt])
+
+        assert result.success_count == 0
+        assert result.failures[0].error_type == "ConnectionError"
+
+    @pytest.mark.asyncio
+    async def test_cluster_slot_timeout_skips_task(self, scrapers, rate_limiter, redis) -> None:
+        from src.services.scraper.distributed_semaphore import RedisSemaphore
+
+        busy = RedisSemaphore(redis, "scrape:chatgpt", 3)
+        for _ in range(3):  # other processes hold every chatgpt slot
+            await busy.try_acquire()
+        orch = ScrapeOrchestrator(
+            scrapers=scrapers, rate_limiter=rate_limiter, redis=redis,
+            cluster_concurrency=True, slot_timeout_s=0.05,
+        )
+
+        result = await orch.run(_make_queries(1), platforms=[Platform.chatgpt])
+
+        assert result.skipped_rate_limit == 1 and result.failure_count == 0
+        scrapers[Platform.chatgpt].scrape.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_adaptive_backs_off_on_rate_limit_pages(self, rate_limiter, redis) -> None:
+        from src.services.scraper.adaptive_concurrency import AimdConfig
+
+        scraper = _make_scraper(
+            Platform.chatgpt,
+            error=QuarantineError("error_page", "Detected error page signature: 'captcha'"),
+        )
+        orch = ScrapeOrchestrator(
+            scrapers={Platform.chatgpt: scraper}, rate_limiter=rate_limiter, redis=redis,
+            adaptive=AimdConfig(min_limit=1, max_limit=8, target_p95_s=30.0, max_error_rate=0.1),
+        )
+        assert orch.concurrency_limits()[Platform.chatgpt] == 3
+
+        result = await orch.run(_make_queries(4), platforms=[Platform.chatgpt])
+
+        assert result.quarantine_count == 4
+        assert orch.concurrency_limits()[Platform.chatgpt] == 1
+        assert orch.concurrency_limits()[Platform.perplexity] == 3
+
+    @pytest.mark.asyncio
+    async def test_adaptive_grows_when_healthy(self, rate_limiter, redis) -> None:
+        from src.services.scraper.adaptive_concurrency import WINDOW, AimdConfig
+
+        orch = ScrapeOrchestrator(
+            scrapers={Platform.chatgpt: _make_scraper(Platform.chatgpt)},
+            rate_limiter=rate_limiter, redis=redis,
+            adaptive=AimdConfig(min_limit=1, max_limit=8, target_p95_s=30.0, max_error_rate=0.1),
+        )
+
+        result = await orch.run(_make_queries(WINDOW), platforms=[Platform.chatgpt])
+
+        assert result.success_count == WINDOW
+        assert orch.concurrency_limits()[Platform.chatgpt] == 4
+
+    @pytest.mark.asyncio
+    async def test_adaptive_cluster_admits_below_local_limit(self, rate_limiter, redis) -> None:
+        """A backed-off process waits while the cluster holds its limit, even if others may not."""
+        from src.services.scraper.adaptive_concurrency import AimdConfig
+        from src.services.scraper.distributed_semaphore import RedisSemaphore
+
+        other = RedisSemaphore(redis, "scrape:chatgpt", 3)
+        await other.try_acquire()  # another process (limit 3) is scraping
+        scraper = _make_scraper(Platform.chatgpt)
+        orch = ScrapeOrchestrator(
+            scrapers={Platform.chatgpt: scraper}, rate_limiter=rate_limiter, redis=redis,
+            cluster_concurrency=True, slot_timeout_s=0.05,
+            adaptive=AimdConfig(min_limit=1, max_limit=8, target_p95_s=30.0, max_error_rate=0.1),
+        )
+        orch._limiters[Platform.chatgpt].record(0.0, "overload")  # limit 3 → 1
+
+        result = await orch.run(_make_queries(1), platforms=[Platform.chatgpt])
+
+        assert result.skipped_rate_limit == 1
+        scraper.scrape.assert_not_called()
+        # The other process still admits up to its own limit of 3
+        assert await other.try_acquire() is not None
+        assert await other.holders() == 2
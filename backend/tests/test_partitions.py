@@ -0,0 +1,128 @@
+"""Tests for monthly partition maintenance (src/db/partitions.py).
+
+DB-free: the session is an AsyncMock that records executed SQL.
+"""
+
+from datetime import date, datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.db.partitions import (
+    add_months,
+    create_partition_sql,
+    maintain_partitions,
+    month_start,
+    partition_month,
+    partition_name,
+)
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+
+
+def _mock_db(existing: dict[str, list[str]]) -> AsyncMock:
+    """Session answering the pg_inherits lookup from `existing`, recording everything else."""
+
+    async def execute(statement, params=None):
+        result = MagicMock()
+        if "pg_inherits" in str(statement):
+            result.all.return_value = [(name,) for name in existing.get(params["table"], [])]
+        return result
+
+    return AsyncMock(execute=AsyncMock(side_effect=execute))
+
+
+def _statements(db: AsyncMock) -> list[str]:
+    return [str(call.args[0]) for call in db.execute.await_args_list]
+
+
+# ── Test: naming and bounds ──────────────────────────────────
+
+
+class TestMonths:
+    def test_add_months_crosses_years(self) -> None:
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+    def test_partition_name_round_trip(self) -> None:
+        name = partition_name("vis_ranking", month_start(NOW))
+        assert name == "vis_ranking_p202610"
+        assert partition_month("vis_ranking", name) == date(2026, 10, 1)
+        assert partition_month("vis_ranking", "vis_ranking_default") is None
+        assert partition_month("vis_score", name) is None
+
+    def test_bounds_are_pinned_to_utc(self) -> None:
+        sql = create_partition_sql("vis_score", date(2026, 12, 1))
+        assert "FROM ('2026-12-01 00:00:00+00') TO ('2027-01-01 00:00:00+00')" in sql
+
+
+# ── Test: maintenance ────────────────────────────────────────
+
+
+class TestMaintainPartitions:
+    @pytest.mark.asyncio
+    async def test_creates_missing_future_months_only(self) -> None:
+        existing = {
+            "vis_ranking": ["vis_ranking_p202610", "vis_ranking_p202611", "vis_ranking_default"],
+            "vis_score": ["vis_score_p202610"],
+        }
+        db = _mock_db(existing)
+
+        report = await maintain_partitions(db, now=NOW, months_ahead=2, retention={})
+
+        assert report["created"] == [
+            "vis_ranking_p202612", "vis_score_p202611", "vis_score_p202612",
+        ]
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_new_partition_drains_default_before_attach(self) -> None:
+        db = _mock_db({"vis_score": ["vis_score_p202610"]})
+
+        await maintain_partitions(db, now=NOW, months_ahead=0, retention={})
+
+        ranking = [s for s in _statements(db) if "vis_ranking" in s]
+        assert ranking[0].startswith("CREATE TABLE vis_ranking_p202610 (LIKE vis_ranking")
+        assert "DELETE FROM vis_ranking_default WHERE scraped_at >=" in ranking[1]
+        assert ranking[2].startswith("ALTER TABLE vis_ranking ATTACH PARTITION vis_ranking_p202610")
+
+    @pytest.mark.asyncio
+    async def test_expired_partitions_are_archived(self) -> None:
+        existing = {
+            "vis_ranking": [
+                "vis_ranking_p202409", "vis_ranking_p202410", "vis_ranking_p202411",
+                "vis_ranking_default",
+            ],
+        }
+        db = _mock_db(existing)
+
+        report = await maintain_partitions(
+            db, now=NOW, months_ahead=0, retention={"vis_ranking": 24}, archive=True,
+        )
+
+        # Keep 24 months back from October 2026: October 2024 onwards stays
+        assert report["archived"] == ["vis_ranking_p202409"]
+        statements = _statements(db)
+        assert "ALTER TABLE vis_ranking DETACH PARTITION vis_ranking_p202409" in statements
+        assert "ALTER TABLE vis_ranking_p202409 SET SCHEMA archive" in statements
+
+    @pytest.mark.asyncio
+    async def test_expired_partitions_dropped_when_not_archiving(self) -> None:
+        db = _mock_db({"vis_score": ["vis_score_p202001"]})
+
+        report = await maintain_partitions(
+            db, now=NOW, months_ahead=0, retention={"vis_score": 36}, archive=False,
+        )
+
+        assert report["dropped"] == ["vis_score_p202001"]
+        assert "DROP TABLE vis_score_p202001" in _statements(db)
+
+    @pytest.mark.asyncio
+    async def test_zero_retention_keeps_everything(self) -> None:
+        db = _mock_db({"vis_score": ["vis_score_p201001"]})
+
+        report = await maintain_partitions(
+            db, now=NOW, months_ahead=0, retention={"vis_score": 0},
+        )
+
+        assert report["archived"] == report["dropped"] == []
@@ -65,6 +65,8 @@ async def pipeline_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession, Fa
     # Clean tables (dependents first)
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_aggregation_watermark"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
@@ -93,6 +95,8 @@ async def pipeline_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession, Fa
 
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_aggregation_watermark"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
@@ -157,6 +161,36 @@ class TestDailyFullScan:
         assert len(levoit_daily) > 0
         assert levoit_daily[0]["competitive_gap"] is not None
 
+    @pytest.mark.asyncio
+    async def test_rerun_upserts_aggregates(self, pipeline_deps) -> None:
+        """A second daily run updates the same buckets instead of adding rows."""
+        pg, ts, redis = pipeline_deps
+
+        mock_orch = AsyncMock()
+        mock_orch.run.return_value = OrchestratorResult(
+            successes=[(1, Platform.chatgpt, _make_processed(CHATGPT_RESPONSE))],
+        )
+
+        for _ in range(2):
+            result = await daily_full_scan_impl(
+                db=pg, ts_db=ts, redis=redis, orchestrator=mock_orch,
+            )
+            assert result["status"] == "completed"
+
+        counts = await pg.execute(
+            text("SELECT period, brand, COUNT(*) AS n, MAX(sample_count) AS samples "
+                 "FROM vis_score WHERE query_id = 1 AND period <> 'raw' "
+                 "GROUP BY period, brand"),
+        )
+        rows = counts.mappings().all()
+        assert {r["period"] for r in rows} == {"daily", "weekly", "monthly"}
+        # One row per bucket, covering both runs' samples
+        assert all(r["n"] == 1 for r in rows)
+        assert all(r["samples"] == 2 for r in rows if r["brand"] == "Levoit")
+
+        marks = await pg.execute(text("SELECT period FROM vis_aggregation_watermark"))
+        assert {r[0] for r in marks.all()} == {"daily", "weekly", "monthly"}
+
     @pytest.mark.asyncio
     async def test_processes_all_priorities(self, pipeline_deps) -> None:
         """Daily scan includes low-priority queries (unlike hourly)."""
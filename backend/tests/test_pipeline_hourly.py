@@ -66,6 +66,7 @@ async def pipeline_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession, Fa
     # Clean tables (dependents first)
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
@@ -92,6 +93,7 @@ async def pipeline_deps() -> AsyncGenerator[tuple[AsyncSession, AsyncSession, Fa
 
     async with pg_engine.begin() as conn:
         await conn.execute(text("DELETE FROM vis_score"))
+        await conn.execute(text("DELETE FROM vis_ranking_latest"))
         await conn.execute(text("DELETE FROM vis_ranking"))
         await conn.execute(text("DELETE FROM vis_pipeline_run"))
         await conn.execute(text("DELETE FROM vis_query"))
@@ -141,6 +143,13 @@ class TestHourlyRankCheck:
         assert run_row["success_count"] == 2
         assert run_row["completed_at"] is not None
 
+        # Per-stage breakdown (scrape stages ran inside the mocked orchestrator)
+        stage_timings = run_row["stage_timings"]
+        assert stage_timings["extract"]["count"] == 2
+        assert stage_timings["score"]["count"] == 1
+        assert stage_timings["ranking_insert"]["buckets"]["+Inf"] == 2
+        assert stage_timings["comparison_snapshot"]["count"] == 1
+
         # vis_ranking records
         rankings = await pg.execute(
             text("SELECT * FROM vis_ranking WHERE pipeline_run_id = :run"),
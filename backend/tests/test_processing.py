@@ -13,7 +13,9 @@ processor = ScrapeProcessor()
 # ── Fixture: typical Firecrawl HTML output ──────────────────
 
 
-def _make_raw(content: str, status_code: int = 200, url: str = "https://example.com") -> ScrapeResult:
+def _make_raw(
+    content: str, status_code: int = 200, url: str = "https://example.com"
+) -> ScrapeResult:
     return ScrapeResult(
         url=url,
         content=content,
@@ -184,7 +186,9 @@ class TestQuarantine:
 
     def test_captcha_page_rejected(self) -> None:
         with pytest.raises(QuarantineError, match="error_page"):
-            processor.process(_make_raw("Please verify you are a human. Complete the captcha below."))
+            processor.process(
+                _make_raw("Please verify you are a human. Complete the captcha below.")
+            )
 
     def test_access_denied_rejected(self) -> None:
         with pytest.raises(QuarantineError, match="error_page"):
@@ -199,3 +203,229 @@ class TestQuarantine:
             processor.process(_make_raw("", status_code=200))
         assert exc_info.value.error_type == "empty_content"
         assert isinstance(exc_info.value.raw_content, str)
+
+
+# ── Test: HTML entity decoding ──────────────────────────────
+
+
+class TestEntityDecoding:
+    @pytest.mark.parametrize(
+        ("text", "expected"),
+        [
+            ("Levoit &amp; Dyson", "Levoit & Dyson"),
+            ("Levoit&#39;s pick", "Levoit's pick"),
+            ("Dyson&#x27;s pick", "Dyson's pick"),
+            ("Dyson&nbsp;Purifier", "Dyson Purifier"),
+            ("&lt;b&gt;not a tag&lt;/b&gt;", "<b>not a tag</b>"),
+            ("em&mdash;dash caf&eacute;", "em\u2014dash caf\u00e9"),
+            ("unknown &bogus; entity", "unknown entity"),
+        ],
+    )
+    def test_entities_decoded(self, text: str, expected: str) -> None:
+        assert processor._clean(text) == expected
+
+    def test_encoded_brand_name_matched(self) -> None:
+        from src.services.analyzer.brand_matcher import BrandMatcher
+
+        doc = (
+            "<p>1. <b>Black &amp; Decker BXAP</b> tops the budget list.</p>\n"
+            "<p>2. Levoit&#39;s Core 300S follows closely.</p>\n"
+        ) * 20
+        result = processor.process(_make_raw(doc))
+        matches = BrandMatcher(["Black & Decker", "Levoit"]).find_all(result.clean_text)
+        assert len(matches["Black & Decker"]) == 20
+        assert len(matches["Levoit"]) == 20
+
+
+# ── Test: single-pass cleaner vs. reference pipeline ────────
+
+
+def _reference_clean(text: str) -> str:
+    """Reference: the original whole-document strip → decode → boilerplate → collapse pipeline."""
+    import re
+
+    from src.services.scraper.processing import (
+        _BOILERPLATE_KEYWORDS,
+        _COPYRIGHT_RE,
+        _HTML_ENTITY_RE,
+        _decode_entity_match,
+    )
+
+    text = re.sub(
+        r"<(script|style|noscript)[^>]*>.*?</\1>", "", text, flags=re.DOTALL | re.IGNORECASE
+    )
+    text = re.sub(r"<[^>]+>", " ", text)
+    text = _HTML_ENTITY_RE.sub(_decode_entity_match, text)
+
+    filtered = []
+    for line in text.splitlines():
+        lower = line.lower().strip()
+        if any(kw in lower for kw in _BOILERPLATE_KEYWORDS):
+            continue
+        if _COPYRIGHT_RE.search(line):
+            continue
+        filtered.append(line)
+    text = "\n".join(filtered)
+
+    text = re.sub(r"[ \t]{2,}", " ", text)
+    lines = [line.strip() for line in text.splitlines()]
+    text = "\n".join(line for line in lines if line)
+    text = re.sub(r"\n{3,}", "\n\n", text)
+    return text.strip()
+
+
+def _fixture_markdown(name: str) -> str:
+    import json
+    from pathlib import Path
+
+    path = Path(__file__).parent / "fixtures" / name
+    return json.loads(path.read_text())["data"]["markdown"]
+
+
+_EDGE_CASES = [
+    "Sign In\r\nLevoit Core 300S is great\rCookie Policy\x0cmore text",
+    "line one SIGN UP today Levoit\x85Dyson\x1cCoway\x1dHoneywell\x1e end",
+    "price < 100\nand > 50 with Levoit",
+    "<a\nhref='x'>multi-line tag</a> &amp; &#39; &nbsp;&copy; text",
+    "&am<script>x</script>p; and <<style>y</style>b>bold",
+    "tabs\t\tand   spaces \t mixed\n\n\n\n   \n",
+    "© 2026 Corp\n©\n2026 split copyright\nCopyright ©2025 Corp",
+    "İstanbul signİn ſign in KELVIN sign in",
+    "sign  in (double space is not boilerplate)",
+    "trailing lone cr\r",
+    "\n\n\nleading blank lines\n",
+    "<SCRIPT type='x'>alert(1)</script>after <noscript>n</NOSCRIPT> done",
+    "Levoit&#39;s &AMP; Dyson&#x27;s &lt;b&gt;literal&lt;/b&gt; &unknown; &amp no-semicolon",
+    "hex &#X2F; &#x1F600; &#0; &#99999999; sign&#32;in &#10;split&#13;lines &#xa0;nbsp",
+]
+
+
+def _random_docs(count: int, seed: int = 1234) -> list[str]:
+    import random
+
+    rng = random.Random(seed)
+    pieces = [
+        "Levoit Core 300S", "Dyson", "Coway Airmega", " ", "  ", "\t", "\n", "\r\n", "\r",
+        " ", "<b>", "</b>", "<div\nclass='x'>", "<", ">", "&amp;", "&#8212;", "&",
+        "<script>var a = 1;</script>", "<style>.x{}</style>", "Sign In", "NEWSLETTER",
+        "privacy policy", "©", "2026", "recommend", "1.", "## ", "İ", "é", "ſ", "—",
+    ]
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(1, 400))) for _ in range(count)]
+
+
+_DIFFERENTIAL_CORPUS = [
+    SAMPLE_CHATGPT_HTML,
+    SAMPLE_PERPLEXITY_MARKDOWN,
+    SAMPLE_GOOGLE_AI_HTML,
+    SAMPLE_CHATGPT_HTML * 40,
+    _fixture_markdown("firecrawl_chatgpt.json"),
+    _fixture_markdown("firecrawl_perplexity.json"),
+    _fixture_markdown("firecrawl_google_ai.json"),
+    *_EDGE_CASES,
+    *_random_docs(150),
+]
+
+
+class TestSinglePassDifferential:
+    @pytest.mark.parametrize("doc", _DIFFERENTIAL_CORPUS)
+    def test_clean_matches_reference_pipeline(self, doc: str) -> None:
+        assert processor._clean(doc) == _reference_clean(doc)
+
+    @pytest.mark.parametrize("doc", _DIFFERENTIAL_CORPUS)
+    def test_budgeted_clean_is_prefix_of_full_output(self, doc: str) -> None:
+        full = _reference_clean(doc)
+        budgeted = processor._clean(doc, limit=200)
+        assert full.startswith(budgeted)
+        assert budgeted[:200] == full[:200]
+
+    @pytest.mark.parametrize("doc", _DIFFERENTIAL_CORPUS)
+    def test_process_output_byte_identical(self, doc: str) -> None:
+        expected_text = _reference_clean(doc)[:MAX_CONTENT_CHARS]
+        try:
+            result = processor.process(_make_raw(doc))
+        except QuarantineError:
+            # Same rejection as the reference pipeline would produce
+            assert len(expected_text) < 500 or not doc.strip()
+            return
+        assert result.clean_text.encode("utf-8") == expected_text.encode("utf-8")
+
+
+# ── Test: budgeted chunked cleaning ─────────────────────────
+
+
+class TestBudgetedChunks:
+    @pytest.mark.parametrize("doc", _DIFFERENTIAL_CORPUS)
+    def test_small_chunks_match_reference_pipeline(self, doc: str, monkeypatch) -> None:
+        monkeypatch.setattr("src.services.scraper.processing.CHUNK_CHARS", 32)
+        assert processor._clean(doc) == _reference_clean(doc)
+
+    def test_blocks_and_tags_spanning_chunk_boundary(self, monkeypatch) -> None:
+        monkeypatch.setattr("src.services.scraper.processing.CHUNK_CHARS", 16)
+        doc = (
+            "Levoit intro line\n"
+            "<script>\nvar x = '<b>';\n" + "filler\n" * 20 + "</script>after script\n"
+            "<div\n" + "data-x='1'\n" * 10 + ">Dyson after tag\n"
+            "&am<style>\n.x{}\n</style>p; joined entity\n"
+        )
+        assert processor._clean(doc) == _reference_clean(doc)
+
+    def test_stops_after_budget_is_filled(self, monkeypatch) -> None:
+        calls = 0
+        original = ScrapeProcessor._next_chunk
+
+        def counting(text: str, start: int) -> tuple[int, str]:
+            nonlocal calls
+            calls += 1
+            return original(text, start)
+
+        monkeypatch.setattr(ScrapeProcessor, "_next_chunk", staticmethod(counting))
+        huge = "This is a meaningful paragraph about air purifiers.\n" * 40_000  # ~2MB
+        result = processor.process(_make_raw(huge))
+
+        assert result.char_count == MAX_CONTENT_CHARS
+        assert result.clean_text == _reference_clean(huge)[:MAX_CONTENT_CHARS]
+        assert calls == 1
+
+    def test_error_page_detected_with_large_boilerplate_tail(self) -> None:
+        doc = "Access Denied. You do not have permission.\n" + "Sign in to continue\n" * 20_000
+        with pytest.raises(QuarantineError, match="error_page"):
+            processor.process(_make_raw(doc))
+
+    def test_error_signature_in_long_page_not_quarantined(self) -> None:
+        doc = "Captcha mentioned in passing. " + "Levoit Core 300S is a top pick.\n" * 5_000
+        result = processor.process(_make_raw(doc))
+        assert result.char_count == MAX_CONTENT_CHARS
+
+    @pytest.mark.parametrize("lines", [200, 800])
+    def test_stray_open_bracket_stays_linear(self, lines: int, monkeypatch) -> None:
+        monkeypatch.setattr("src.services.scraper.processing.CHUNK_CHARS", 64)
+        monkeypatch.setattr("src.services.scraper.processing.TAG_MARGIN_CHARS", 128)
+        line = "Levoit Core 300S is a quiet purifier for bedrooms and offices.\n"
+        doc = "price < 200\n" + line * lines  # no ">" anywhere
+        spans: list[tuple[int, int]] = []
+        next_chunk = ScrapeProcessor._next_chunk
+
+        def recording(text: str, start: int) -> tuple[int, str]:
+            end, chunk = next_chunk(text, start)
+            spans.append((start, end))
+            return end, chunk
+
+        monkeypatch.setattr(ScrapeProcessor, "_next_chunk", staticmethod(recording))
+
+        assert processor._clean(doc) == _reference_clean(doc)
+        # Chunks tile the input once and none grows past chunk + margin + a
+        # line, so the number of chunks (and the work) is linear in its size
+        assert [end for _, end in spans[:-1]] == [start for start, _ in spans[1:]]
+        assert spans[-1][1] == len(doc)
+        assert max(end - start for start, end in spans) <= 64 + 128 + len(line)
+        assert len(spans) >= len(doc) // (64 + 128 + len(line))
+
+    def test_tag_closed_beyond_margin_is_literal_text(self, monkeypatch) -> None:
+        monkeypatch.setattr("src.services.scraper.processing.CHUNK_CHARS", 16)
+        monkeypatch.setattr("src.services.scraper.processing.TAG_MARGIN_CHARS", 32)
+        doc = "a < b\n" + "Levoit filler line\n" * 10 + "<b>Dyson</b>\n"
+
+        cleaned = processor._clean(doc)
+
+        assert cleaned.startswith("a < b\nLevoit filler line")
+        assert cleaned.endswith("Dyson")
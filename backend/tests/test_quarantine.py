@@ -0,0 +1,358 @@
+"""Tests for QuarantineSink and QuarantineReprocessor.
+
+MongoDB is replaced by a small in-memory collection fake (insert_many,
+find/sort/limit, find_one, update_one, update_many) — enough for the sink and
+reprocessor. The reprocess flow runs with its pipeline tasks patched out.
+"""
+
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, patch
+
+import fakeredis.aioredis
+import pytest
+from bson import ObjectId
+
+from src.models.enums import Platform
+from src.models.scrape_models import QuarantineError
+from src.pipelines.reprocess_quarantine import reprocess_quarantine_impl
+from src.services.scraper.orchestrator import ScrapeOrchestrator
+from src.services.scraper.processing import ScrapeProcessor
+from src.services.scraper.quarantine import QuarantineReprocessor, QuarantineSink
+from src.services.scraper.rate_limiter import PlatformRateLimiter
+
+GOOD_CONTENT = (
+    "# Best Air Purifiers\n\n"
+    "1. Levoit Core 300S is the best value air purifier for most rooms.\n\n"
+    "2. Dyson Purifier Big Quiet is a premium alternative.\n"
+)
+
+
+# ── In-memory Mongo fake ─────────────────────────────────────
+
+
+class _FakeCursor:
+    def __init__(self, docs: list[dict]) -> None:
+        self._docs = docs
+
+    def sort(self, key: str, direction: int) -> "_FakeCursor":
+        self._docs = sorted(self._docs, key=lambda d: d[key], reverse=direction < 0)
+        return self
+
+    def limit(self, n: int) -> "_FakeCursor":
+        self._docs = self._docs[:n]
+        return self
+
+    def __aiter__(self):
+        async def _gen():
+            for d in self._docs:
+                yield d
+        return _gen()
+
+
+def _matches(doc: dict, filters: dict) -> bool:
+    for key, cond in filters.items():
+        value = doc.get(key)
+        if isinstance(cond, dict):
+            if "$ne" in cond and value == cond["$ne"]:
+                return False
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$gte" in cond and not value >= cond["$gte"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class _FakeCollection:
+    def __init__(self) -> None:
+        self.docs: list[dict] = []
+        self.insert_many_calls = 0
+
+    async def insert_many(self, docs: list[dict], ordered: bool = True) -> None:
+        self.insert_many_calls += 1
+        for d in docs:
+            self.docs.append({"_id": ObjectId(), **d})
+
+    def find(self, filters: dict) -> _FakeCursor:
+        return _FakeCursor([d for d in self.docs if _matches(d, filters)])
+
+    async def find_one(self, filters: dict) -> dict | None:
+        return next((d for d in self.docs if _matches(d, filters)), None)
+
+    async def update_one(self, filters: dict, update: dict) -> None:
+        doc = await self.find_one(filters)
+        if doc is not None:
+            doc.update(update["$set"])
+
+    async def update_many(self, filters: dict, update: dict) -> None:
+        for doc in self.docs:
+            if _matches(doc, filters):
+                doc.update(update["$set"])
+
+
+class _FakeMongo(dict):
+    def __missing__(self, name: str) -> _FakeCollection:
+        self[name] = _FakeCollection()
+        return self[name]
+
+
+def _error(error_type: str = "insufficient_content", raw: str = "Hi", snapshot_id=None):
+    return QuarantineError(error_type, "test detail", raw_content=raw, snapshot_id=snapshot_id)
+
+
+# ── Test: sink batching ──────────────────────────────────────
+
+
+class TestQuarantineSink:
+    @pytest.mark.asyncio
+    async def test_buffers_until_flush(self) -> None:
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo, batch_size=10)
+
+        await sink.add(_error(), query_id=1, query_text="q1", platform=Platform.chatgpt)
+        assert mongo["quarantine"].docs == []
+
+        written = await sink.flush()
+        assert written == 1
+        doc = mongo["quarantine"].docs[0]
+        assert doc["query_id"] == 1
+        assert doc["query_text"] == "q1"
+        assert doc["platform"] == "chatgpt"
+        assert doc["error_type"] == "insufficient_content"
+        assert doc["raw_content"] == "Hi"
+        assert doc["resolved"] is False
+        assert isinstance(doc["created_at"], datetime)
+
+    @pytest.mark.asyncio
+    async def test_flushes_when_batch_full(self) -> None:
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo, batch_size=2)
+
+        for i in range(5):
+            await sink.add(_error(), query_id=i, query_text="q", platform=Platform.perplexity)
+
+        assert mongo["quarantine"].insert_many_calls == 2
+        assert len(mongo["quarantine"].docs) == 4
+        await sink.flush()
+        assert len(mongo["quarantine"].docs) == 5
+
+    @pytest.mark.asyncio
+    async def test_write_failure_does_not_raise(self) -> None:
+        mongo = _FakeMongo()
+        mongo["quarantine"].insert_many = AsyncMock(side_effect=Exception("mongo down"))
+        sink = QuarantineSink(mongo)
+
+        await sink.add(_error(), query_id=1, query_text="q", platform=Platform.chatgpt)
+        assert await sink.flush() == 0
+
+
+# ── Test: orchestrator integration ───────────────────────────
+
+
+class TestOrchestratorSink:
+    @pytest.mark.asyncio
+    async def test_quarantined_results_persisted_and_counted(self) -> None:
+        redis = fakeredis.aioredis.FakeRedis(decode_responses=True)
+        rate_limiter = PlatformRateLimiter(redis)
+        rate_limiter._limits = {"chatgpt": 100, "perplexity": 100, "google_ai": 100}
+
+        scraper = AsyncMock()
+        scraper.platform = Platform.chatgpt
+        scraper.scrape.side_effect = _error("error_page", snapshot_id="507f1f77bcf86cd799439011")
+
+        mongo = _FakeMongo()
+        orch = ScrapeOrchestrator(
+            scrapers={Platform.chatgpt: scraper},
+            rate_limiter=rate_limiter,
+            redis=redis,
+            quarantine_sink=QuarantineSink(mongo),
+        )
+        queries = [{"id": 7, "query_text": "best purifier", "brands": ["Levoit"]}]
+        result = await orch.run(queries)
+
+        assert result.failure_count == 1
+        assert result.quarantine_count == 1
+        docs = mongo["quarantine"].docs
+        assert len(docs) == 1
+        assert docs[0]["query_id"] == 7
+        assert docs[0]["error_type"] == "error_page"
+        assert docs[0]["snapshot_id"] == "507f1f77bcf86cd799439011"
+
+
+# ── Test: reprocessing ───────────────────────────────────────
+
+
+class TestQuarantineReprocessor:
+    @pytest.mark.asyncio
+    async def test_recovers_from_snapshot_raw_content(self) -> None:
+        mongo = _FakeMongo()
+        snap_id = ObjectId()
+        mongo["snapshots"].docs.append({
+            "_id": snap_id,
+            "raw_content": GOOD_CONTENT,
+            "scraped_at": datetime(2026, 2, 10, tzinfo=timezone.utc),
+            "scrape_duration_ms": 420,
+            "metadata": {"url": "https://chatgpt.com/search?q=x", "status_code": 200},
+        })
+        sink = QuarantineSink(mongo)
+        # Quarantine doc only holds a (truncated) prefix of the raw content
+        await sink.add(
+            _error(raw=GOOD_CONTENT[:10], snapshot_id=str(snap_id)),
+            query_id=3, query_text="q", platform=Platform.chatgpt,
+        )
+        await sink.flush()
+
+        result = await QuarantineReprocessor(mongo).run()
+
+        assert result.recovered_count == 1
+        query_id, platform, processed = result.recovered[0]
+        assert query_id == 3
+        assert platform == Platform.chatgpt
+        assert "Levoit Core 300S" in processed.clean_text
+        assert processed.snapshot_id == str(snap_id)
+        assert processed.url == "https://chatgpt.com/search?q=x"
+        assert result.recovered_ids == [mongo["quarantine"].docs[0]["_id"]]
+        assert mongo["quarantine"].docs[0]["resolved"] is False
+
+    @pytest.mark.asyncio
+    async def test_still_invalid_content_stays_quarantined(self) -> None:
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo)
+        await sink.add(_error(raw="Hi"), query_id=1, query_text="q", platform=Platform.chatgpt)
+        await sink.flush()
+
+        result = await QuarantineReprocessor(mongo).run()
+
+        assert result.recovered_count == 0
+        assert result.still_quarantined == 1
+        doc = mongo["quarantine"].docs[0]
+        assert doc["resolved"] is False
+        assert doc["reprocessed_at"] is not None
+
+    @pytest.mark.asyncio
+    async def test_relaxed_rules_recover_content(self) -> None:
+        """A processor with looser rules recovers previously rejected content."""
+
+        class _LenientProcessor(ScrapeProcessor):
+            def _check_error_page(self, clean: str, raw: str) -> None:
+                return None
+
+        content = "Access denied for bots, but Levoit Core 300S is the best pick here."
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo)
+        await sink.add(_error("error_page", raw=content), query_id=1, query_text="q",
+                       platform=Platform.google_ai)
+        await sink.flush()
+
+        strict = await QuarantineReprocessor(mongo).run()
+        assert strict.recovered_count == 0
+
+        lenient = await QuarantineReprocessor(mongo, _LenientProcessor()).run()
+        assert lenient.recovered_count == 1
+
+    @pytest.mark.asyncio
+    async def test_filters_by_error_type_and_skips_resolved(self) -> None:
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo)
+        await sink.add(_error("insufficient_content", raw=GOOD_CONTENT), query_id=1,
+                       query_text="q", platform=Platform.chatgpt)
+        await sink.add(_error("error_page", raw=GOOD_CONTENT), query_id=2,
+                       query_text="q", platform=Platform.chatgpt)
+        await sink.flush()
+
+        reprocessor = QuarantineReprocessor(mongo)
+        first = await reprocessor.run(error_types=["error_page"])
+        assert [r[0] for r in first.recovered] == [2]
+        await reprocessor.mark_resolved(first.recovered_ids)
+
+        second = await QuarantineReprocessor(mongo).run()
+        assert [r[0] for r in second.recovered] == [1]
+
+    @pytest.mark.asyncio
+    async def test_http_error_without_snapshot_skipped(self) -> None:
+        mongo = _FakeMongo()
+        sink = QuarantineSink(mongo)
+        await sink.add(_error("http_error", raw=GOOD_CONTENT), query_id=1,
+                       query_text="q", platform=Platform.chatgpt)
+        await sink.flush()
+
+        result = await QuarantineReprocessor(mongo).run()
+        assert result.skipped == 1
+        assert result.recovered_count == 0
+
+
+# ── Test: reprocess flow ─────────────────────────────────────
+
+
+def _flow_tasks(**overrides) -> dict[str, AsyncMock]:
+    """AsyncMocks for the pipeline tasks used by reprocess_quarantine (query 1 active)."""
+    tasks = {
+        "fetch_active_queries_impl": AsyncMock(return_value=[{"id": 1, "brands": ["Levoit"]}]),
+        "create_pipeline_run_impl": AsyncMock(return_value=7),
+        "extract_and_store_rankings_impl": AsyncMock(),
+        "compute_scores_impl": AsyncMock(),
+        "snapshot_comparison_impl": AsyncMock(),
+        "finalize_pipeline_run_impl": AsyncMock(),
+    }
+    tasks.update(overrides)
+    return tasks
+
+
+class TestReprocessFlow:
+    async def _quarantine(self, mongo: _FakeMongo, *query_ids: int) -> None:
+        sink = QuarantineSink(mongo)
+        for query_id in query_ids:
+            await sink.add(_error(raw=GOOD_CONTENT), query_id=query_id, query_text="q",
+                           platform=Platform.chatgpt)
+        await sink.flush()
+
+    @pytest.mark.asyncio
+    async def test_stored_docs_resolved(self) -> None:
+        mongo = _FakeMongo()
+        await self._quarantine(mongo, 1)
+        tasks = _flow_tasks()
+
+        with patch.multiple("src.pipelines.reprocess_quarantine", **tasks):
+            summary = await reprocess_quarantine_impl(db=None, ts_db=None, mongo=mongo)
+
+        assert summary["status"] == "completed" and summary["recovered_count"] == 1
+        tasks["extract_and_store_rankings_impl"].assert_awaited_once()
+        assert mongo["quarantine"].docs[0]["resolved"] is True
+
+    @pytest.mark.asyncio
+    async def test_storage_failure_leaves_docs_unresolved(self) -> None:
+        mongo = _FakeMongo()
+        await self._quarantine(mongo, 1)
+        tasks = _flow_tasks(
+            extract_and_store_rankings_impl=AsyncMock(side_effect=RuntimeError("db down")),
+        )
+
+        with patch.multiple("src.pipelines.reprocess_quarantine", **tasks):
+            summary = await reprocess_quarantine_impl(db=None, ts_db=None, mongo=mongo)
+
+        assert summary["status"] == "failed"
+        assert mongo["quarantine"].docs[0]["resolved"] is False
+        # The next run picks the doc up again
+        assert (await QuarantineReprocessor(mongo).run()).recovered_count == 1
+
+    @pytest.mark.asyncio
+    async def test_inactive_and_unloadable_docs_counted(self) -> None:
+        mongo = _FakeMongo()
+        await self._quarantine(mongo, 1, 2)  # query 2 is no longer active
+        sink = QuarantineSink(mongo)
+        await sink.add(_error("http_error", raw=GOOD_CONTENT), query_id=1,
+                       query_text="q", platform=Platform.chatgpt)
+        await sink.flush()
+        tasks = _flow_tasks()
+
+        with patch.multiple("src.pipelines.reprocess_quarantine", **tasks):
+            summary = await reprocess_quarantine_impl(db=None, ts_db=None, mongo=mongo)
+
+        assert summary["recovered_count"] == 1
+        assert summary["skipped_unloadable"] == 1
+        assert summary["skipped_inactive"] == 1
+        # Failure count on the run row covers both
+        assert tasks["finalize_pipeline_run_impl"].await_args.args[4] == 2
+        inactive = next(d for d in mongo["quarantine"].docs if d["query_id"] == 2)
+        assert inactive["resolved"] is False
@@ -0,0 +1,326 @@
+"""Tests for RankingService — get_latest caching (negative cache, single-flight, early
+refresh) and the continuous aggregate each get_trends scope reads.
+
+DB-free: the session is an AsyncMock returning fixed rows, Redis is fakeredis.
+End-to-end behaviour against PostgreSQL lives in test_api_rankings.py.
+"""
+
+import asyncio
+import json
+from collections.abc import AsyncGenerator
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.services import ranking_service
+from src.services.ranking_service import (
+    LATEST_CACHE_TTL,
+    LATEST_NEGATIVE_TTL,
+    RankingService,
+    _encode_latest,
+)
+
+ROW = {
+    "id": 1, "query_id": 1, "platform": "chatgpt", "brand": "Levoit", "rank_position": 1,
+    "snippet": "Levoit is top rated", "source_urls": [], "snapshot_id": None,
+    "scraped_at": datetime(2026, 2, 10, tzinfo=timezone.utc), "pipeline_run_id": 1,
+}
+
+
+def _mock_db(rows: list[dict], delay: float = 0.0) -> AsyncMock:
+    async def execute(*args, **kwargs):
+        await asyncio.sleep(delay)
+        result = MagicMock()
+        result.mappings.return_value.all.return_value = rows
+        return result
+
+    return AsyncMock(execute=AsyncMock(side_effect=execute))
+
+
+@pytest.fixture
+async def redis() -> AsyncGenerator[FakeRedis, None]:
+    client = FakeRedis(decode_responses=True)
+    yield client
+    await client.aclose()
+
+
+# ── Test: cache fill ─────────────────────────────────────────
+
+
+class TestCacheFill:
+    @pytest.mark.asyncio
+    async def test_hit_skips_database(self, redis: FakeRedis) -> None:
+        db = _mock_db([ROW])
+        svc = RankingService(db, redis=redis)
+
+        first = await svc.get_latest(1)
+        second = await svc.get_latest(1)
+
+        assert first == second
+        assert db.execute.await_count == 1
+        assert 0 < await redis.ttl("rankings:latest:1") <= LATEST_CACHE_TTL
+
+    @pytest.mark.asyncio
+    async def test_empty_result_is_negatively_cached(self, redis: FakeRedis) -> None:
+        db = _mock_db([])
+        svc = RankingService(db, redis=redis)
+
+        assert await svc.get_latest(9999) == []
+        assert await svc.get_latest(9999) == []
+
+        assert db.execute.await_count == 1
+        assert 0 < await redis.ttl("rankings:latest:9999") <= LATEST_NEGATIVE_TTL
+
+    @pytest.mark.asyncio
+    async def test_legacy_list_entry_is_served(self, redis: FakeRedis) -> None:
+        legacy = [{**ROW, "scraped_at": "2026-02-10T00:00:00Z"}]
+        await redis.set("rankings:latest:1", json.dumps(legacy))
+        db = _mock_db([])
+
+        items = await RankingService(db, redis=redis).get_latest(1)
+
+        assert items[0].brand == "Levoit"
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_entry_stores_response_body(self, redis: FakeRedis) -> None:
+        body = await RankingService(_mock_db([ROW]), redis=redis).get_latest_json(1)
+
+        meta, _, stored = (await redis.get("rankings:latest:1")).partition("\n")
+        assert stored.encode() == body
+        assert set(json.loads(meta)) == {"delta", "expires_at"}
+        assert json.loads(body)[0]["scraped_at"] == "2026-02-10T00:00:00Z"
+
+    @pytest.mark.asyncio
+    async def test_hit_skips_model_construction(
+        self, redis: FakeRedis, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        svc = RankingService(_mock_db([ROW]), redis=redis)
+        body = await svc.get_latest_json(1)
+
+        def no_models(*args, **kwargs):
+            raise AssertionError("cache hit built a model")
+
+        monkeypatch.setattr(ranking_service, "_ranking_from_row", no_models)
+        monkeypatch.setattr(ranking_service.RankingResponse, "__init__", no_models)
+
+        assert await svc.get_latest_json(1) == body
+        assert (await svc.get_latest_many_json([1]))[1] == body
+
+    @pytest.mark.asyncio
+    async def test_without_redis_queries_directly(self) -> None:
+        items = await RankingService(_mock_db([ROW])).get_latest(1)
+        assert [i.brand for i in items] == ["Levoit"]
+
+
+# ── Test: single-flight lock ─────────────────────────────────
+
+
+class TestSingleFlight:
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_query_once(self, redis: FakeRedis) -> None:
+        db = _mock_db([ROW], delay=0.05)
+        svc = RankingService(db, redis=redis)
+
+        results = await asyncio.gather(*(svc.get_latest(1) for _ in range(10)))
+
+        assert db.execute.await_count == 1
+        assert all(r == results[0] for r in results)
+        assert await redis.exists("rankings:latest:1:lock") == 0
+
+    @pytest.mark.asyncio
+    async def test_waiter_falls_back_when_holder_stalls(
+        self, redis: FakeRedis, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ranking_service, "LATEST_LOCK_WAIT", 0.1)
+        await redis.set("rankings:latest:1:lock", "1", ex=10)
+        db = _mock_db([ROW])
+
+        items = await RankingService(db, redis=redis).get_latest(1)
+
+        assert [i.brand for i in items] == ["Levoit"]
+        # Caching is left to the lock holder
+        assert await redis.exists("rankings:latest:1") == 0
+
+    @pytest.mark.asyncio
+    async def test_lock_released_when_query_fails(self, redis: FakeRedis) -> None:
+        db = AsyncMock(execute=AsyncMock(side_effect=RuntimeError("db down")))
+
+        with pytest.raises(RuntimeError):
+            await RankingService(db, redis=redis).get_latest(1)
+
+        assert await redis.exists("rankings:latest:1:lock") == 0
+
+
+# ── Test: probabilistic early refresh ────────────────────────
+
+
+def _envelope(delta: float, expires_in: float) -> bytes:
+    item = {**ROW, "scraped_at": "2026-02-10T00:00:00Z", "rank_position": 5}
+    return _encode_latest(json.dumps([item]).encode(), delta, expires_in)
+
+
+class TestEarlyRefresh:
+    @pytest.mark.asyncio
+    async def test_refreshes_close_to_expiry(
+        self, redis: FakeRedis, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ranking_service.random, "random", lambda: 0.5)
+        # delta * ln(2) ≈ 0.7s of jitter against 0.5s left: refresh now
+        await redis.set("rankings:latest:1", _envelope(delta=1.0, expires_in=0.5), ex=60)
+        db = _mock_db([ROW])
+
+        items = await RankingService(db, redis=redis).get_latest(1)
+
+        assert items[0].rank_position == 1
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_is_served(
+        self, redis: FakeRedis, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ranking_service.random, "random", lambda: 0.5)
+        await redis.set("rankings:latest:1", _envelope(delta=0.01, expires_in=3000), ex=3000)
+        db = _mock_db([ROW])
+
+        items = await RankingService(db, redis=redis).get_latest(1)
+
+        assert items[0].rank_position == 5
+        db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_refresh_skipped_while_another_request_holds_lock(
+        self, redis: FakeRedis, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr(ranking_service.random, "random", lambda: 0.5)
+        await redis.set("rankings:latest:1", _envelope(delta=1.0, expires_in=0.5), ex=60)
+        await redis.set("rankings:latest:1:lock", "1", ex=10)
+        db = _mock_db([ROW])
+
+        items = await RankingService(db, redis=redis).get_latest(1)
+
+        assert items[0].rank_position == 5
+        db.execute.assert_not_awaited()
+
+
+# ── Test: batch latest ───────────────────────────────────────
+
+
+def _row(query_id: int, brand: str) -> dict:
+    return {**ROW, "id": query_id * 10, "query_id": query_id, "brand": brand}
+
+
+class TestLatestMany:
+    @pytest.mark.asyncio
+    async def test_hits_from_mget_misses_from_one_query(self, redis: FakeRedis) -> None:
+        await redis.set("rankings:latest:1", _envelope(delta=0.01, expires_in=3000), ex=3000)
+        db = _mock_db([_row(2, "Dyson"), _row(2, "Levoit")])
+
+        latest = await RankingService(db, redis=redis).get_latest_many([2, 1, 3, 2])
+
+        assert list(latest) == [2, 1, 3]
+        assert latest[1][0].rank_position == 5
+        assert sorted(r.brand for r in latest[2]) == ["Dyson", "Levoit"]
+        assert latest[3] == []
+        db.execute.assert_awaited_once()
+        assert db.execute.await_args.args[1] == {"query_ids": [2, 3]}
+
+    @pytest.mark.asyncio
+    async def test_misses_backfilled_with_ttls(self, redis: FakeRedis) -> None:
+        db = _mock_db([_row(2, "Levoit")])
+        svc = RankingService(db, redis=redis)
+
+        await svc.get_latest_many([2, 3])
+        again = await svc.get_latest_many([2, 3])
+
+        assert db.execute.await_count == 1
+        assert [r.brand for r in again[2]] == ["Levoit"]
+        assert LATEST_NEGATIVE_TTL < await redis.ttl("rankings:latest:2") <= LATEST_CACHE_TTL
+        assert 0 < await redis.ttl("rankings:latest:3") <= LATEST_NEGATIVE_TTL
+        # Entries are shared with the single-query path
+        assert (await svc.get_latest(2))[0].brand == "Levoit"
+        assert db.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_without_redis(self) -> None:
+        latest = await RankingService(_mock_db([_row(1, "Levoit")])).get_latest_many([1, 2])
+        assert {qid: len(items) for qid, items in latest.items()} == {1: 1, 2: 0}
+
+
+# ── Test: trends over continuous aggregates ──────────────────
+
+TREND_ROW = {
+    "timestamp": datetime(2026, 2, 9, tzinfo=timezone.utc), "brand": "Levoit",
+    "platform": None, "avg_rank": 1.5, "avg_score": 87.5, "sample_count": 2,
+}
+
+
+def _trend_sql(ts_db: AsyncMock) -> tuple[str, dict]:
+    sql, params = ts_db.execute.await_args.args
+    return " ".join(str(sql).split()), params
+
+
+class TestTrends:
+    @pytest.mark.asyncio
+    async def test_single_query_reads_daily_rank(self) -> None:
+        ts_db = _mock_db([TREND_ROW])
+
+        points = await RankingService(AsyncMock(), ts_db=ts_db).get_trends(
+            query_id=1, granularity="weekly",
+        )
+
+        sql, params = _trend_sql(ts_db)
+        assert "FROM ts_daily_rank" in sql
+        assert "time_bucket('1 week', day)" in sql
+        assert "ts_search_rank" not in sql
+        assert params == {"query_ids": [1]}
+        assert points[0].avg_rank == 1.5 and points[0].platform is None
+
+    @pytest.mark.asyncio
+    async def test_platform_reads_platform_aggregate(self) -> None:
+        ts_db = _mock_db([{**TREND_ROW, "platform": "chatgpt"}])
+
+        points = await RankingService(AsyncMock(), ts_db=ts_db).get_trends(
+            query_id=1, platform="chatgpt",
+        )
+
+        sql, params = _trend_sql(ts_db)
+        assert "FROM ts_daily_platform_rank" in sql
+        assert "GROUP BY timestamp, brand, platform" in sql
+        assert params["platform"] == "chatgpt"
+        assert points[0].platform == "chatgpt"
+
+    @pytest.mark.asyncio
+    async def test_category_resolves_query_ids_in_postgres(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value.all = MagicMock(return_value=[(1,), (4,)])
+        ts_db = _mock_db([TREND_ROW])
+
+        await RankingService(db, ts_db=ts_db).get_trends(category="general", by_platform=True)
+
+        assert db.execute.await_args.args[1] == {"category": "general"}
+        sql, params = _trend_sql(ts_db)
+        assert "FROM ts_daily_platform_rank" in sql
+        assert params == {"query_ids": [1, 4]}
+
+    @pytest.mark.asyncio
+    async def test_empty_category_skips_timescale(self) -> None:
+        db = AsyncMock()
+        db.execute.return_value.all = MagicMock(return_value=[])
+        ts_db = _mock_db([TREND_ROW])
+
+        assert await RankingService(db, ts_db=ts_db).get_trends(category="general") == []
+        ts_db.execute.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_all_queries_reads_brand_aggregate(self) -> None:
+        ts_db = _mock_db([TREND_ROW])
+
+        await RankingService(AsyncMock(), ts_db=ts_db).get_trends(brands=["Levoit"])
+
+        sql, params = _trend_sql(ts_db)
+        assert "FROM ts_daily_brand_rank" in sql
+        assert "query_id" not in sql
+        assert params == {"brands": ["Levoit"]}
@@ -0,0 +1,141 @@
+"""Tests for read-replica routing (src/db/replicas.py) and the read-only session dependency.
+
+DB-free: replica engines are stand-ins answering the lag probe.
+"""
+
+import asyncio
+import math
+from contextlib import asynccontextmanager
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from src.db import postgres
+from src.db.replicas import ReplicaRouter, parse_urls
+from src.shared.metrics import DB_READ_ROUTES
+
+
+class FakeEngine:
+    """Answers LAG_SQL with `lag` (an exception is raised, a float returned)."""
+
+    def __init__(self, lag: float | None | Exception) -> None:
+        self.lag = lag
+        self.probes = 0
+        self.url = MagicMock(host="replica")
+
+    @asynccontextmanager
+    async def connect(self):
+        self.probes += 1
+        if isinstance(self.lag, Exception):
+            raise self.lag
+        yield MagicMock(execute=self._execute)
+
+    async def _execute(self, statement):
+        return MagicMock(scalar=MagicMock(return_value=self.lag))
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def _router(*engines: FakeEngine, clock: Clock | None = None) -> ReplicaRouter:
+    return ReplicaRouter(
+        list(engines), max_lag_s=10.0, check_interval_s=5.0, clock=clock or Clock(),
+    )
+
+
+class TestParseUrls:
+    def test_comma_separated(self) -> None:
+        assert parse_urls(" postgresql://a/db, postgresql://b/db ,") == [
+            "postgresql://a/db", "postgresql://b/db",
+        ]
+        assert parse_urls("") == []
+
+
+class TestReplicaRouter:
+    @pytest.mark.asyncio
+    async def test_round_robin_over_fresh_replicas(self) -> None:
+        a, b = FakeEngine(0.0), FakeEngine(2.5)
+        router = _router(a, b)
+
+        assert [await router.pick() for _ in range(4)] == [a, b, a, b]
+
+    @pytest.mark.asyncio
+    async def test_lagging_replica_skipped(self) -> None:
+        stale, fresh = FakeEngine(60.0), FakeEngine(1.0)
+        router = _router(stale, fresh)
+
+        assert [await router.pick() for _ in range(3)] == [fresh, fresh, fresh]
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("lag", [60.0, None, ConnectionRefusedError("down")])
+    async def test_falls_back_to_primary(self, lag) -> None:
+        assert await _router(FakeEngine(lag)).pick() is None
+
+    @pytest.mark.asyncio
+    async def test_no_replicas_means_primary(self) -> None:
+        assert await _router().pick() is None
+
+    @pytest.mark.asyncio
+    async def test_lag_cached_for_check_interval(self) -> None:
+        clock = Clock()
+        replica = FakeEngine(60.0)
+        router = _router(replica, clock=clock)
+
+        assert await router.pick() is None
+        replica.lag = 0.0
+        clock.now = 4.9
+        assert await router.pick() is None
+        clock.now = 5.0
+        assert await router.pick() is replica
+        assert replica.probes == 2
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reads_share_one_probe(self) -> None:
+        replica = FakeEngine(0.0)
+        router = _router(replica)
+
+        picks = await asyncio.gather(*(router.pick() for _ in range(20)))
+
+        assert set(picks) == {replica}
+        assert replica.probes == 1
+
+    @pytest.mark.asyncio
+    async def test_unreachable_replica_counts_as_infinitely_behind(self) -> None:
+        router = _router(FakeEngine(OSError("no route")))
+        assert await router._lag(router._replicas[0]) == math.inf
+
+
+class TestReadSession:
+    @pytest.mark.asyncio
+    async def test_without_replicas_reads_the_primary(self, monkeypatch) -> None:
+        monkeypatch.setattr(postgres, "_routers", {"postgres": _router()})
+        before = DB_READ_ROUTES.get(engine="postgres", target="primary")
+
+        async for session in postgres.get_read_db():
+            assert session.bind is postgres.get_engine("postgres")
+
+        assert DB_READ_ROUTES.get(engine="postgres", target="primary") == before + 1
+
+    @pytest.mark.asyncio
+    async def test_fresh_replica_serves_the_read(self, monkeypatch) -> None:
+        replica = create_async_engine("postgresql+asyncpg://u:p@replica/levoit_ts")
+        router = _router()
+
+        async def pick():
+            return replica
+
+        monkeypatch.setattr(router, "pick", pick)
+        monkeypatch.setattr(postgres, "_routers", {"timescale": router})
+        before = DB_READ_ROUTES.get(engine="timescale", target="replica")
+
+        async for session in postgres.get_read_ts_db():
+            assert session.bind is replica
+
+        assert DB_READ_ROUTES.get(engine="timescale", target="replica") == before + 1
+        await replica.dispose()
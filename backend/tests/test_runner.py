@@ -0,0 +1,72 @@
+"""Tests for the Prefect-free pipeline layer — lazy wrappers and the built-in runner."""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.pipelines import hourly_rank_check, runner, tasks
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+IMPORT_PROBE = """
+import json, sys
+import src.pipelines.tasks, src.pipelines.hourly_rank_check, src.pipelines.daily_full_scan
+import src.pipelines.reprocess_quarantine, src.pipelines.runner, src.pipelines.schedules
+print(json.dumps("prefect" in sys.modules))
+"""
+
+
+class TestLazyWrappers:
+    def test_importing_pipelines_does_not_import_prefect(self) -> None:
+        out = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE],
+            cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+        )
+        assert json.loads(out.stdout.strip().splitlines()[-1]) is False
+
+    def test_task_wrapper_built_once(self) -> None:
+        from prefect import Task
+
+        wrapper = tasks.compute_scores
+        assert isinstance(wrapper, Task)
+        assert wrapper.name == "compute_scores"
+        assert wrapper.fn is tasks.compute_scores_impl
+        assert tasks.compute_scores is wrapper
+
+    def test_flow_wrapper_named_after_flow(self) -> None:
+        from prefect import Flow
+
+        wrapper = hourly_rank_check.hourly_rank_check
+        assert isinstance(wrapper, Flow)
+        assert wrapper.name == hourly_rank_check.FLOW_NAME
+
+    def test_unknown_attribute(self) -> None:
+        with pytest.raises(AttributeError, match="no_such_task"):
+            tasks.no_such_task  # noqa: B018
+
+
+class TestRunFlow:
+    @pytest.mark.asyncio
+    async def test_passes_only_accepted_services(self, monkeypatch) -> None:
+        seen = {}
+
+        async def fake_impl(*, db, redis, daily_budget_usd: float = 10.0) -> dict:
+            seen.update(db=db, redis=redis, budget=daily_budget_usd)
+            return {"status": "completed"}
+
+        monkeypatch.setattr(hourly_rank_check, "hourly_rank_check_impl", fake_impl)
+
+        result = await runner.run_flow(
+            "hourly_rank_check", db="db", redis="redis", mongo="mongo", daily_budget_usd=3.0,
+        )
+
+        assert result == {"status": "completed"}
+        assert seen == {"db": "db", "redis": "redis", "budget": 3.0}
+
+    def test_load_flow(self) -> None:
+        assert runner.load_flow("daily_full_scan").__name__ == "daily_full_scan_impl"
+        with pytest.raises(ValueError, match="weekly"):
+            runner.load_flow("weekly")
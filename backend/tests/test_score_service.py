@@ -0,0 +1,213 @@
+"""Tests for ScoreService.get_comparison — dynamic brand pivot, snapshots and caching.
+
+DB-free: the session is an AsyncMock returning canned rows, Redis is fakeredis.
+End-to-end behaviour against PostgreSQL lives in test_api_scores.py.
+"""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.services import score_service
+from src.services.score_service import DEFAULT_PRIMARY_BRAND, ScoreService
+
+BRANDS = ["Levoit", "Dyson", "Coway", "Honeywell", "Blueair", "Winix"]
+
+
+# A custom range skips the snapshot, so these hit the on-the-fly pivot directly
+RANGE = {"from_date": datetime(2026, 2, 1, tzinfo=timezone.utc)}
+
+
+def _result(rows: list[dict]) -> MagicMock:
+    result = MagicMock()
+    result.mappings.return_value.all.return_value = rows
+    result.mappings.return_value.first.return_value = rows[0] if rows else None
+    return result
+
+
+def _mock_db(*results: list[dict]) -> AsyncMock:
+    """Session whose successive execute() calls return the given row lists."""
+    db = AsyncMock()
+    db.execute.side_effect = [_result(rows) for rows in results]
+    return db
+
+
+def _row(scores: dict[str, float], primary: str | None = "Levoit", query_id: int = 1) -> dict:
+    return {
+        "query_id": query_id, "query_text": "best air purifier", "category": "general",
+        "scores": scores, "brands": BRANDS, "primary_brand": primary,
+    }
+
+
+# ── Test: pivot ──────────────────────────────────────────────
+
+
+class TestComparisonPivot:
+    @pytest.mark.asyncio
+    async def test_every_tracked_brand_gets_a_score(self) -> None:
+        db = _mock_db([_row({"Levoit": 70.0, "Winix": 82.5})])
+
+        [row] = await ScoreService(db).get_comparison(**RANGE)
+
+        assert list(row.scores) == BRANDS
+        assert row.scores["Winix"] == 82.5
+        assert row.scores["Dyson"] == 0.0
+        # Winix is the best competitor, not one of the original four
+        assert row.competitive_gap == -12.5
+
+    @pytest.mark.asyncio
+    async def test_scores_are_clamped(self) -> None:
+        db = _mock_db([_row({"Levoit": 104.0, "Dyson": -3.0})])
+
+        [row] = await ScoreService(db).get_comparison(**RANGE)
+
+        assert row.scores["Levoit"] == 100.0
+        assert row.scores["Dyson"] == 0.0
+
+    @pytest.mark.asyncio
+    async def test_missing_primary_flag_falls_back_to_default(self) -> None:
+        db = _mock_db([_row({"Levoit": 50.0, "Dyson": 40.0}, primary=None)])
+
+        [row] = await ScoreService(db).get_comparison(**RANGE)
+
+        assert row.primary_brand == DEFAULT_PRIMARY_BRAND
+        assert row.competitive_gap == 10.0
+
+    @pytest.mark.asyncio
+    async def test_single_query_with_exact_brand_match(self) -> None:
+        db = _mock_db([])
+
+        await ScoreService(db).get_comparison(category="general", **RANGE)
+
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.await_args.args[0])
+        assert "LOWER(" not in sql
+        assert "vb.name = vs.brand" in sql
+        assert "jsonb_object_agg" in sql
+
+
+# ── Test: cache ──────────────────────────────────────────────
+
+
+class TestComparisonCache:
+    @pytest.mark.asyncio
+    async def test_hit_round_trips_brand_map(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        db = _mock_db([_row({"Levoit": 70.0, "Blueair": 20.0})])
+        svc = ScoreService(db, redis=redis)
+
+        first = await svc.get_comparison(**RANGE)
+        second = await svc.get_comparison(**RANGE)
+
+        assert first == second
+        assert list(second[0].scores) == BRANDS
+        assert db.execute.await_count == 1
+        await redis.aclose()
+
+    @pytest.mark.asyncio
+    async def test_hit_serves_stored_bytes(
+        self, monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        redis = FakeRedis(decode_responses=True)
+        db = _mock_db([_row({"Levoit": 70.0})])
+        svc = ScoreService(db, redis=redis)
+        body = await svc.get_comparison_json(**RANGE)
+
+        def no_models(*args, **kwargs):
+            raise AssertionError("cache hit built a model")
+
+        monkeypatch.setattr(score_service, "_comparison_row", no_models)
+        monkeypatch.setattr(score_service.ComparisonRow, "__init__", no_models)
+
+        assert await svc.get_comparison_json(**RANGE) == body
+        assert json.loads(body)[0]["scores"]["Levoit"] == 70.0
+        await redis.aclose()
+
+
+# ── Test: per-run snapshot ───────────────────────────────────
+
+
+def _snapshot(run_id: int, rows: list[dict]) -> dict:
+    """Snapshot read result: rows already merged and serialized by jsonb_agg."""
+    return {"pipeline_run_id": run_id, "rows": json.dumps(rows)}
+
+
+def _comparison_dict(query_id: int, levoit: float) -> dict:
+    return {
+        "query_id": query_id, "query_text": f"q{query_id}", "primary_brand": "Levoit",
+        "scores": {"Levoit": levoit, "Dyson": 50.0}, "competitive_gap": levoit - 50.0,
+    }
+
+
+class TestComparisonSnapshot:
+    @pytest.mark.asyncio
+    async def test_default_view_is_one_snapshot_read(self) -> None:
+        rows = [_comparison_dict(1, 40.0), _comparison_dict(2, 55.0), _comparison_dict(3, 60.0)]
+        db = _mock_db([_snapshot(7, rows)])
+        redis = FakeRedis(decode_responses=True)
+        svc = ScoreService(db, redis=redis)
+
+        body = await svc.get_comparison_json()
+
+        assert json.loads(body) == rows
+        db.execute.assert_awaited_once()
+        sql = str(db.execute.await_args.args[0])
+        assert "vis_comparison_snapshot" in sql
+        # Categories are merged back into query order by the database
+        assert "ORDER BY (item->>'query_id')::int" in sql
+        assert await redis.keys("scores:comparison:*") == []
+        await redis.aclose()
+
+    @pytest.mark.asyncio
+    async def test_snapshot_rows_validate_as_models(self) -> None:
+        db = _mock_db([_snapshot(7, [_comparison_dict(1, 40.0)])])
+
+        [row] = await ScoreService(db).get_comparison()
+
+        assert row.competitive_gap == -10.0
+
+    @pytest.mark.asyncio
+    async def test_category_missing_from_newest_snapshot_is_empty(self) -> None:
+        db = _mock_db([_snapshot(7, [])])
+
+        rows = await ScoreService(db).get_comparison(category="brand_search")
+
+        assert rows == []
+        assert db.execute.await_args.args[1] == {"category": "brand_search"}
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_pivot_before_first_snapshot(self) -> None:
+        db = _mock_db([], [_row({"Levoit": 70.0})])
+
+        [row] = await ScoreService(db).get_comparison()
+
+        assert row.scores["Levoit"] == 70.0
+        assert db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_snapshot_written_per_category(self) -> None:
+        general = _row({"Levoit": 70.0})
+        brand = {**_row({"Levoit": 20.0}, query_id=2), "category": "brand_search"}
+        also_general = _row({"Dyson": 30.0}, query_id=3)
+        db = _mock_db([general, brand, also_general], [], [])
+
+        written = await ScoreService(db).snapshot_comparison(run_id=7)
+
+        assert written == 2
+        insert = db.execute.await_args_list[1].args
+        assert "INSERT INTO vis_comparison_snapshot" in str(insert[0])
+        by_category = {p["category"]: json.loads(p["rows"]) for p in insert[1]}
+        assert [r["query_id"] for r in by_category["general"]] == [1, 3]
+        assert all(p["run"] == 7 for p in insert[1])
+        assert "DELETE FROM vis_comparison_snapshot" in str(db.execute.await_args_list[2].args[0])
+        db.commit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_no_scores_writes_nothing_but_still_prunes(self) -> None:
+        db = _mock_db([], [])
+
+        assert await ScoreService(db).snapshot_comparison(run_id=7) == 0
+        assert db.execute.await_count == 2
@@ -19,6 +19,7 @@ from src.models.scrape_models import QuarantineError
 from src.services.scraper.chatgpt import ChatGPTScraper
 from src.services.scraper.google_ai import GoogleAIScraper
 from src.services.scraper.perplexity import PerplexityScraper
+from src.shared.metrics import collect_stage_timings
 
 
 # ── Firecrawl response fixtures ─────────────────────────────
@@ -215,6 +216,28 @@ class TestSnapshotStorage:
         assert "content_length" in doc["metadata"]
 
 
+# ── Test: stage timings ──────────────────────────────────────
+
+
+class TestStageTimings:
+    @pytest.mark.asyncio
+    @patch("src.services.scraper.base.asyncio.sleep", new_callable=AsyncMock)
+    async def test_scrape_records_each_stage(self, mock_sleep: AsyncMock) -> None:
+        mongo_db, _ = _mock_mongo_db()
+        http_client = _mock_http_client(FIRECRAWL_CHATGPT_RESPONSE)
+        ok_response = http_client.post.return_value
+        http_client.post.side_effect = [httpx.ConnectError("refused"), ok_response]
+
+        scraper = ChatGPTScraper(http_client=http_client, mongo_db=mongo_db)
+        with collect_stage_timings() as timings:
+            await scraper.scrape("best air purifier")
+
+        # Failed Firecrawl attempts are timed too
+        assert timings.histograms["firecrawl"].count == 2
+        assert timings.histograms["snapshot"].count == 1
+        assert timings.histograms["process"].count == 1
+
+
 # ── Test: retry logic ────────────────────────────────────────
 
 
@@ -282,3 +305,51 @@ class TestRetryLogic:
 
         # Should only call Firecrawl once (no retries for quarantine)
         http_client.post.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_quarantine_error_carries_snapshot_id(self) -> None:
+        """The stored snapshot is linked so quarantined content can be re-processed."""
+        mongo_db, _ = _mock_mongo_db()
+        short_response = {
+            "success": True,
+            "data": {"markdown": "Hi", "metadata": {"statusCode": 200}},
+        }
+        http_client = _mock_http_client(short_response)
+
+        scraper = ChatGPTScraper(http_client=http_client, mongo_db=mongo_db)
+
+        with pytest.raises(QuarantineError) as exc_info:
+            await scraper.scrape("test query")
+
+        assert exc_info.value.snapshot_id == "507f1f77bcf86cd799439011"
+
+    @pytest.mark.asyncio
+    @patch("src.services.scraper.base.asyncio.sleep", new_callable=AsyncMock)
+    async def test_each_attempt_is_observed(self, mock_sleep: AsyncMock) -> None:
+        """A 429 that succeeds on retry still reaches the adaptive limiter."""
+        from src.services.scraper.adaptive_concurrency import AimdConfig, AimdLimiter
+
+        mongo_db, _ = _mock_mongo_db()
+        http_client = AsyncMock(spec=httpx.AsyncClient)
+        request = httpx.Request("POST", "http://firecrawl/v1/scrape")
+        rate_limited = MagicMock(spec=httpx.Response)
+        rate_limited.raise_for_status.side_effect = httpx.HTTPStatusError(
+            "429", request=request, response=httpx.Response(429, request=request),
+        )
+        success_response = MagicMock(spec=httpx.Response)
+        success_response.status_code = 200
+        success_response.json.return_value = FIRECRAWL_CHATGPT_RESPONSE
+        success_response.raise_for_status = MagicMock()
+        http_client.post.side_effect = [rate_limited, success_response]
+        limiter = AimdLimiter(
+            "chatgpt",
+            AimdConfig(min_limit=1, max_limit=8, target_p95_s=30.0, max_error_rate=0.1),
+            initial=4,
+        )
+
+        scraper = ChatGPTScraper(http_client=http_client, mongo_db=mongo_db)
+        result = await scraper.scrape("test query", observe_attempt=limiter.observe)
+
+        assert "Levoit" in result.clean_text
+        assert http_client.post.call_count == 2
+        assert limiter.limit == 2
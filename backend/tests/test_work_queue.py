@@ -0,0 +1,234 @@
+"""Tests for the Redis Streams scrape queue (src/services/scraper/work_queue.py).
+
+Uses fakeredis; workers run a stub orchestrator, so no Firecrawl is involved.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from fakeredis.aioredis import FakeRedis
+
+from src.models.enums import Platform
+from src.models.scrape_models import ProcessedContent
+from src.services.scraper.orchestrator import OrchestratorResult, ScrapeFailure, ScrapeTask
+from src.services.scraper.work_queue import (
+    MAX_DELIVERIES,
+    TASK_GROUP,
+    TASK_STREAM,
+    QueuedScrapeOrchestrator,
+    ScrapeWorker,
+    cancelled_key,
+    decode_task,
+    encode_task,
+    ensure_group,
+    results_key,
+)
+
+QUERIES = [
+    {"id": 1, "query_text": "best air purifier", "brands": ["Levoit", "Dyson"]},
+    {"id": 2, "query_text": "quiet humidifier", "brands": ["Levoit"]},
+]
+
+
+def _processed(text: str) -> ProcessedContent:
+    return ProcessedContent(
+        clean_text=text, content_hash="h", char_count=len(text), url="https://x",
+        status_code=200, scraped_at=datetime(2026, 10, 19, tzinfo=timezone.utc),
+    )
+
+
+def _failure(task: ScrapeTask, error_type: str) -> ScrapeFailure:
+    return ScrapeFailure(task.query_id, task.query_text, task.platform, error_type, "boom")
+
+
+class StubOrchestrator:
+    """execute_each() by query id: 1 succeeds, 2 fails on perplexity and is deduped elsewhere."""
+
+    def __init__(self) -> None:
+        self.executed: list[tuple[int, Platform]] = []
+
+    async def execute_each(self, tasks: list[ScrapeTask]) -> list[OrchestratorResult]:
+        results = []
+        for task in tasks:
+            self.executed.append((task.query_id, task.platform))
+            result = OrchestratorResult()
+            if task.query_id == 1:
+                result.successes.append((1, task.platform, _processed(task.query_text)))
+            elif task.platform == Platform.perplexity:
+                result.failures.append(_failure(task, "boilerplate"))
+                result.quarantine_count = 1
+            else:
+                result.skipped_dedup = 1
+            results.append(result)
+        return results
+
+
+class SlowOrchestrator(StubOrchestrator):
+    """StubOrchestrator whose batches take `delay` seconds."""
+
+    def __init__(self, delay: float) -> None:
+        super().__init__()
+        self._delay = delay
+
+    async def execute_each(self, tasks: list[ScrapeTask]) -> list[OrchestratorResult]:
+        await asyncio.sleep(self._delay)
+        return await super().execute_each(tasks)
+
+
+async def _drain(
+    redis: FakeRedis, worker: ScrapeWorker, orchestrator: QueuedScrapeOrchestrator,
+) -> OrchestratorResult:
+    """Run the flow side while the worker polls until the flow returns."""
+    await ensure_group(redis)
+    flow = asyncio.create_task(orchestrator.run(QUERIES))
+    while not flow.done():
+        await worker.run_once(block_ms=10)
+    return await flow
+
+
+class TestWireFormat:
+    def test_task_round_trip(self) -> None:
+        task = ScrapeTask(7, "q", Platform.google_ai, ["Levoit", "Coway"])
+        fields = encode_task("run1", task)
+        assert fields["run"] == "run1"
+        assert decode_task(fields) == task
+
+
+class TestQueuedRun:
+    @pytest.mark.asyncio
+    async def test_workers_results_merge_into_orchestrator_result(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        stub = StubOrchestrator()
+        worker = ScrapeWorker(redis, stub, consumer="w1", batch_size=4, claim_idle_ms=60_000)
+
+        result = await _drain(redis, worker, QueuedScrapeOrchestrator(redis, run_timeout=5))
+
+        assert len(stub.executed) == len(QUERIES) * len(Platform)
+        assert {(qid, p) for qid, p, _ in result.successes} == {(1, p) for p in Platform}
+        assert result.successes[0][2].clean_text == "best air purifier"
+        assert [(f.query_id, f.platform, f.error_type) for f in result.failures] == [
+            (2, Platform.perplexity, "boilerplate"),
+        ]
+        assert result.quarantine_count == 1
+        assert result.skipped_dedup == len(Platform) - 1
+        # Every task acked and removed; the run's result stream is cleaned up
+        assert (await redis.xpending(TASK_STREAM, TASK_GROUP))["pending"] == 0
+        assert await redis.xlen(TASK_STREAM) == 0
+        assert not await redis.keys("scrape:run:*")
+
+    @pytest.mark.asyncio
+    async def test_several_workers_share_a_run(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        stubs = [StubOrchestrator(), StubOrchestrator()]
+        workers = [
+            ScrapeWorker(redis, stub, consumer=f"w{i}", batch_size=2, claim_idle_ms=60_000)
+            for i, stub in enumerate(stubs)
+        ]
+        await ensure_group(redis)
+        flow = asyncio.create_task(QueuedScrapeOrchestrator(redis, run_timeout=5).run(QUERIES))
+        while not flow.done():
+            await asyncio.gather(*(w.run_once(block_ms=10) for w in workers))
+        result = await flow
+
+        assert all(stub.executed for stub in stubs)
+        assert result.total_tasks == len(QUERIES) * len(Platform)
+
+    @pytest.mark.asyncio
+    async def test_timeout_fails_unreported_tasks_and_cancels_run(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+
+        result = await QueuedScrapeOrchestrator(redis, run_timeout=0.05).run(QUERIES[:1])
+
+        assert result.failure_count == len(Platform)
+        assert {f.error_type for f in result.failures} == {"QueueTimeout"}
+        assert len(await redis.keys(cancelled_key("*"))) == 1
+
+        stub = StubOrchestrator()
+        worker = ScrapeWorker(redis, stub, consumer="late", claim_idle_ms=60_000)
+        assert await worker.run_once(block_ms=10) == len(Platform)
+        assert stub.executed == []
+        assert await redis.xlen(TASK_STREAM) == 0
+
+
+class TestCrashRecovery:
+    async def _enqueue_and_crash(self, redis: FakeRedis) -> str:
+        """Enqueue one task, deliver it to a consumer that dies without acking."""
+        await ensure_group(redis)
+        task = ScrapeTask(1, "best air purifier", Platform.chatgpt, ["Levoit"])
+        await redis.xadd(TASK_STREAM, encode_task("run1", task))
+        await redis.xreadgroup(TASK_GROUP, "crashed", {TASK_STREAM: ">"}, count=1)
+        return "run1"
+
+    @pytest.mark.asyncio
+    async def test_stale_pending_entry_is_reclaimed(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        run = await self._enqueue_and_crash(redis)
+        stub = StubOrchestrator()
+        worker = ScrapeWorker(redis, stub, consumer="rescuer", claim_idle_ms=0)
+
+        assert await worker.run_once(block_ms=10) == 1
+
+        assert stub.executed == [(1, Platform.chatgpt)]
+        [(_, fields)] = await redis.xrange(results_key(run))
+        assert fields["outcome"] == "success"
+        assert (await redis.xpending(TASK_STREAM, TASK_GROUP))["pending"] == 0
+
+    @pytest.mark.asyncio
+    async def test_fresh_pending_entry_is_left_alone(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        await self._enqueue_and_crash(redis)
+        worker = ScrapeWorker(redis, StubOrchestrator(), consumer="other", claim_idle_ms=60_000)
+
+        assert await worker.run_once(block_ms=10) == 0
+        assert (await redis.xpending(TASK_STREAM, TASK_GROUP))["pending"] == 1
+
+    @pytest.mark.asyncio
+    async def test_restarted_consumer_resumes_its_own_entries(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        await self._enqueue_and_crash(redis)
+        stub = StubOrchestrator()
+
+        resumed = await ScrapeWorker(redis, stub, consumer="crashed").resume()
+
+        assert resumed == 1 and stub.executed == [(1, Platform.chatgpt)]
+
+    @pytest.mark.asyncio
+    async def test_poison_task_reported_failed_after_max_deliveries(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        run = await self._enqueue_and_crash(redis)
+        [entry_id] = [e["message_id"] for e in await redis.xpending_range(
+            TASK_STREAM, TASK_GROUP, min="-", max="+", count=1,
+        )]
+        for _ in range(MAX_DELIVERIES - 1):
+            await redis.xclaim(TASK_STREAM, TASK_GROUP, "crashed", 0, [entry_id])
+        stub = StubOrchestrator()
+
+        await ScrapeWorker(redis, stub, consumer="rescuer", claim_idle_ms=0).run_once(block_ms=10)
+
+        assert stub.executed == []
+        [(_, fields)] = await redis.xrange(results_key(run))
+        assert fields["outcome"] == "failure"
+        assert "MaxDeliveriesExceeded" in fields["payload"]
+
+    @pytest.mark.asyncio
+    async def test_batch_outliving_claim_idle_is_not_reclaimed(self) -> None:
+        redis = FakeRedis(decode_responses=True)
+        await ensure_group(redis)
+        task = ScrapeTask(1, "best air purifier", Platform.chatgpt, ["Levoit"])
+        await redis.xadd(TASK_STREAM, encode_task("run1", task))
+        slow, other = SlowOrchestrator(delay=0.6), StubOrchestrator()
+        busy_worker = ScrapeWorker(redis, slow, consumer="busy", claim_idle_ms=300)
+        other_worker = ScrapeWorker(redis, other, consumer="other", claim_idle_ms=300)
+
+        running = asyncio.create_task(busy_worker.run_once(block_ms=10))
+        while (await redis.xpending(TASK_STREAM, TASK_GROUP))["pending"] == 0:
+            await asyncio.sleep(0.01)
+        while not running.done():
+            await other_worker.run_once(block_ms=10)
+
+        assert await running == 1
+        assert slow.executed == [(1, Platform.chatgpt)]
+        assert other.executed == []
+        [(_, fields)] = await redis.xrange(results_key("run1"))
+        assert fields["outcome"] == "success"
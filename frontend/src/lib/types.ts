@@ -253,6 +253,7 @@ export interface ScoreResponse {
 export interface TrendPoint {
   timestamp: string;
   brand: string;
+  platform: string | null;
   avg_rank: number;
   avg_score: number;
   sample_count: number;
@@ -261,10 +262,8 @@ export interface TrendPoint {
 export interface ComparisonRow {
   query_id: number;
   query_text: string;
-  levoit_score: number;
-  dyson_score: number;
-  coway_score: number;
-  honeywell_score: number;
+  primary_brand: string;
+  scores: Record<string, number>;
   competitive_gap: number;
 }
 